@@ -339,7 +339,7 @@ def _start_client_internal(
                 # Receive
                 task_ins = receive()
                 if task_ins is None:
-                    time.sleep(3)  # Wait for 3s before asking again
+                    # `receive` has already waited for TaskIns (long-poll)
                     continue
 
                 # Handle control message
@@ -507,7 +507,19 @@ def _init_connection(
     if transport is None:
         transport = TRANSPORT_TYPE_GRPC_BIDI
 
-    # Use either gRPC bidirectional streaming or REST request/response
+    # Use either gRPC bidirectional streaming or REST request/response. The
+    # request/response connections take further optional arguments
+    connection: Callable[
+        [str, bool, int, Union[bytes, str, None]],
+        ContextManager[
+            Tuple[
+                Callable[[], Optional[TaskIns]],
+                Callable[[TaskRes], None],
+                Optional[Callable[[], None]],
+                Optional[Callable[[], None]],
+            ]
+        ],
+    ]
     if transport == TRANSPORT_TYPE_REST:
         try:
             from .rest_client.connection import http_request_response
@@ -15,20 +15,24 @@
 """Contextmanager for a gRPC request-response channel to the Flower server."""
 
 
+import time
+from collections import deque
 from contextlib import contextmanager
 from logging import DEBUG, ERROR
 from pathlib import Path
-from typing import Callable, Dict, Iterator, Optional, Tuple, Union, cast
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union, cast
+
+import grpc
 
 from flwr.client.message_handler.task_handler import (
     configure_task_res,
-    get_task_ins,
-    validate_task_ins,
+    get_task_ins_list,
     validate_task_res,
 )
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH
 from flwr.common.grpc import create_channel
 from flwr.common.logger import log, warn_experimental_feature
+from flwr.common.retry_invoker import RetryInvoker, exponential
 from flwr.proto.fleet_pb2 import (
     CreateNodeRequest,
     DeleteNodeRequest,
@@ -42,6 +46,18 @@ from flwr.proto.task_pb2 import TaskIns, TaskRes
 KEY_NODE = "node"
 KEY_TASK_INS = "current_task_ins"
 
+# Minimum time between two PullTaskIns requests which returned no TaskIns
+MIN_PULL_INTERVAL = 3.0
+
+
+def _should_giveup(exc: Exception) -> bool:
+    """Retry PullTaskIns only if the server is (temporarily) unreachable or busy."""
+    return cast(grpc.Call, exc).code() not in (
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.DEADLINE_EXCEEDED,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+    )
+
 
 def on_channel_state_change(channel_connectivity: str) -> None:
     """Log channel connectivity."""
@@ -54,6 +70,8 @@ def grpc_request_response(
     insecure: bool,
     max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,  # pylint: disable=W0613
     root_certificates: Optional[Union[bytes, str]] = None,
+    max_task_ins: int = 8,
+    pull_timeout: float = 30.0,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[TaskIns]],
@@ -79,6 +97,16 @@ def grpc_request_response(
         Path of the root certificate. If provided, a secure
         connection using the certificates will be established to an SSL-enabled
         Flower server. Bytes won't work for the REST API.
+    max_task_ins : int (default: 8)
+        Maximum number of TaskIns pulled from the server in one request. The
+        TaskIns are then returned one by one by `receive`, and the TaskRes of a
+        batch are pushed together once all of them have been sent.
+    pull_timeout : float (default: 30.0)
+        Maximum number of seconds the server holds a PullTaskIns request until
+        TaskIns are available (long-poll). `receive` returns `None` only once
+        this time has passed without TaskIns, or at least `MIN_PULL_INTERVAL`
+        seconds if the server does not support long-polling. Failed requests
+        are retried with jittered exponential backoff.
 
     Returns
     -------
@@ -100,10 +128,21 @@ def grpc_request_response(
     )
     channel.subscribe(on_channel_state_change)
     stub = FleetStub(channel)
+    retry_invoker = RetryInvoker(
+        lambda: exponential(max_delay=60),
+        grpc.RpcError,
+        max_tries=None,
+        max_time=None,
+        should_giveup=_should_giveup,
+    )
 
     # Necessary state to link TaskRes to TaskIns
     state: Dict[str, Optional[TaskIns]] = {KEY_TASK_INS: None}
 
+    # TaskIns pulled but not yet received, and TaskRes sent but not yet pushed
+    task_ins_queue: Deque[TaskIns] = deque()
+    task_res_list: List[TaskRes] = []
+
     # Enable create_node and delete_node to store node
     node_store: Dict[str, Optional[Node]] = {KEY_NODE: None}
 
@@ -127,31 +166,55 @@ def grpc_request_response(
             return
         node: Node = cast(Node, node_store[KEY_NODE])
 
+        # Do not drop the TaskRes of an unfinished batch
+        push_task_res()
+
         delete_node_request = DeleteNodeRequest(node=node)
         stub.DeleteNode(request=delete_node_request)
 
         del node_store[KEY_NODE]
 
+    def push_task_res() -> None:
+        """Push all buffered TaskRes to the server in one request."""
+        if not task_res_list:
+            return
+        request = PushTaskResRequest(task_res_list=task_res_list)
+        _ = stub.PushTaskRes(request)
+        task_res_list.clear()
+
     def receive() -> Optional[TaskIns]:
         """Receive next task from server."""
+        start = time.monotonic()
+        task_ins = pull_task_ins()
+        if task_ins is None:
+            # Do not hammer servers which answer at once when there is no TaskIns
+            time.sleep(max(0.0, MIN_PULL_INTERVAL - (time.monotonic() - start)))
+        return task_ins
+
+    def pull_task_ins() -> Optional[TaskIns]:
+        """Return the next TaskIns, waiting for the server if none is left."""
         # Get Node
         if node_store[KEY_NODE] is None:
             log(ERROR, "Node instance missing")
             return None
         node: Node = cast(Node, node_store[KEY_NODE])
 
-        # Request instructions (task) from server
-        request = PullTaskInsRequest(node=node)
-        response = stub.PullTaskIns(request=request)
+        # Request a batch of instructions (tasks) from server, if none is left
+        if not task_ins_queue:
+            request = PullTaskInsRequest(
+                node=node, max_task_ins=max_task_ins, timeout=pull_timeout
+            )
+            response = retry_invoker.invoke(stub.PullTaskIns, request=request)
 
-        # Get the current TaskIns
-        task_ins: Optional[TaskIns] = get_task_ins(response)
+            # Keep the valid TaskIns only
+            task_ins_queue.extend(
+                get_task_ins_list(response, discard_reconnect_ins=True)
+            )
 
-        # Discard the current TaskIns if not valid
-        if task_ins is not None and not validate_task_ins(
-            task_ins, discard_reconnect_ins=True
-        ):
-            task_ins = None
+        # Get the current TaskIns
+        task_ins: Optional[TaskIns] = (
+            task_ins_queue.popleft() if task_ins_queue else None
+        )
 
         # Remember `task_ins` until `task_res` is available
         state[KEY_TASK_INS] = task_ins
@@ -181,12 +244,13 @@ def grpc_request_response(
         # Configure TaskRes
         task_res = configure_task_res(task_res, task_ins, node)
 
-        # Serialize ProtoBuf to bytes
-        request = PushTaskResRequest(task_res_list=[task_res])
-        _ = stub.PushTaskRes(request)
-
+        task_res_list.append(task_res)
         state[KEY_TASK_INS] = None
 
+        # Push the TaskRes of the batch once it has been fully handled
+        if not task_ins_queue:
+            push_task_res()
+
     try:
         # Yield methods
         yield (receive, send, create_node, delete_node)
@@ -15,7 +15,17 @@
 """Client-side message handler."""
 
 
-from typing import Optional, Tuple
+from typing import (
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
 from flwr.client.client import (
     Client,
@@ -30,10 +40,13 @@ from flwr.client.message_handler.task_handler import (
     get_server_message_from_task_ins,
     wrap_client_message_in_task_res,
 )
+from flwr.client.numpy_client import NumPyClient, has_get_coalition_utility
 from flwr.client.run_state import RunState
 from flwr.client.secure_aggregation import SecureAggregationHandler
 from flwr.client.typing import ClientFn
-from flwr.common import serde, typing
+from flwr.common import ShapleyEstimator, serde, typing
+from flwr.common.context_registry import ContextRegistry
+from flwr.common.gradient_codec import encode_gradients
 from flwr.proto.task_pb2 import SecureAggregation, Task, TaskIns, TaskRes
 from flwr.proto.transport_pb2 import ClientMessage, Reason, ServerMessage
 
@@ -181,19 +194,19 @@ def handle_legacy_message(
     if field == "get_pk_ins":
         message = _get_pk(client, server_msg.get_pk_ins)
     if field == "get_parms_ins":
-        message = _get_parms(client, server_msg.get_parms_ins)
+        message = _get_parms(client, server_msg.get_parms_ins, state.contexts)
     if field == "send_pk_ins":
-        message = _set_pk(client, server_msg.send_pk_ins)
+        message = _set_pk(client, server_msg.send_pk_ins, state.contexts)
     if field == "send_enc_ins":
-        message = _get_ds(client, server_msg.send_enc_ins)
+        message = _get_ds(client, server_msg.send_enc_ins, state.contexts)
     if field == "send_ds_ins":
-        message = _fit_enc(client, server_msg.send_ds_ins)
+        message = _fit_enc(client, server_msg.send_ds_ins, state.contexts)
     if field == "identify_ins":
         message = _identify(client, server_msg.identify_ins)
     if field == "get_gradients_ins":
         message = _get_gradients(client, server_msg.get_gradients_ins)
     if field == "get_contributions_ins":
-        message = _get_contributions(client, server_msg.get_contributions_ins)
+        message = _get_contributions(client, server_msg.get_contributions_ins, state)
     if field == "send_public_key_ins":
         message = _set_public_key(client, server_msg.send_public_key_ins)
     if server_msg.HasField("send_sum_ins"):
@@ -290,19 +303,29 @@ def _get_pk(client: Client, get_pk_msg: ServerMessage.GetPKIns) -> ClientMessage
     get_pk_res = serde.get_pk_res_to_proto(ctx)
     return ClientMessage(get_pk_res=get_pk_res)
 
-def _set_pk(client: Client, send_pk_msg: ServerMessage.SendPKIns) -> ClientMessage:
+def _set_pk(
+    client: Client, send_pk_msg: ServerMessage.SendPKIns, contexts: ContextRegistry
+) -> ClientMessage:
     # Deserialize set_pk instruction
     send_pk_ins = serde.send_pk_ins_from_proto(send_pk_msg)
 
     # Perform set_pk
     client.numpy_client.set_pk(send_pk_ins)
 
+    # Register the local context under the id chosen by the server, so that
+    # later messages only need to carry the id instead of the full context
+    if send_pk_msg.ctx_id:
+        contexts.clear()
+        contexts.register(client.numpy_client.get_context(), send_pk_msg.ctx_id)
+
     # Serialize set_pk result
     send_pk_res_proto = serde.send_pk_res_to_proto("ok")
     #TODO not ok
     return ClientMessage(send_pk_res=send_pk_res_proto)
 
-def _get_parms(client: Client, get_parms_msg: ServerMessage.GetParmsIns) -> ClientMessage:
+def _get_parms(
+    client: Client, get_parms_msg: ServerMessage.GetParmsIns, contexts: ContextRegistry
+) -> ClientMessage:
     # Deserialize get_parms instruction
     get_parms_ins = serde.get_parms_ins_from_proto(get_parms_msg)
 
@@ -310,21 +333,27 @@ def _get_parms(client: Client, get_parms_msg: ServerMessage.GetParmsIns) -> Clie
     ctx,parms = client.numpy_client.get_parms_enc()
 
     # Serialize get_parms result
-    get_parms_res_proto = serde.get_parms_res_to_proto(ctx=ctx,parms=parms)
+    get_parms_res_proto = serde.get_parms_res_to_proto(
+        ctx=ctx, parms=parms, ctx_id=contexts.current_id
+    )
     return ClientMessage(get_parms_res=get_parms_res_proto)
 
-def _get_ds(client: Client, get_ds_msg: ServerMessage.SendEncIns) -> ClientMessage:
+def _get_ds(
+    client: Client, get_ds_msg: ServerMessage.SendEncIns, contexts: ContextRegistry
+) -> ClientMessage:
     #Deserialize get_ds instruction
-    enc = serde.send_enc_ins_from_proto(get_ds_msg)
+    enc = serde.send_enc_ins_from_proto(get_ds_msg, contexts)
 
     #Perform get_ds
     ctx,ds = client.numpy_client.get_decryption_share(enc)
 
     #Serialize get_ds result
-    get_ds_res_proto = serde.send_enc_res_to_proto(ctx,ds)
+    get_ds_res_proto = serde.send_enc_res_to_proto(ctx, ds, ctx_id=contexts.current_id)
     return ClientMessage(send_enc_res=get_ds_res_proto)
 
-def _fit_enc(client: Client, send_ds_msg: ServerMessage.SendDSIns) -> ClientMessage:
+def _fit_enc(
+    client: Client, send_ds_msg: ServerMessage.SendDSIns, contexts: ContextRegistry
+) -> ClientMessage:
     # Deserialize send_ds instruction
     parms = serde.send_ds_ins_from_proto(send_ds_msg)
     #Perform evaluation
@@ -348,7 +377,9 @@ def _fit_enc(client: Client, send_ds_msg: ServerMessage.SendDSIns) -> ClientMess
     ctx, enc_new = client.numpy_client.get_parms_enc(train=True)
     # Serialize fit result
     #TODO check here if length 
-    fit_res_proto = serde.send_ds_res_to_proto(ctx,enc_new,l,length,acc)
+    fit_res_proto = serde.send_ds_res_to_proto(
+        ctx, enc_new, l, length, acc, ctx_id=contexts.current_id
+    )
     return ClientMessage(send_ds_res=fit_res_proto)
 
 def _evaluate_enc(client: Client, evaluate_msg: ServerMessage.EvaluateIns) -> ClientMessage:
@@ -384,21 +415,130 @@ def _get_gradients(
 
     # Request gradients
     gradients = client.numpy_client.get_gradients()
-    
+    if get_gradients_ins is not None and not isinstance(gradients, bytes):
+        # Compress the NDArrays with the codec requested by the server, opaque
+        # (e.g., encrypted) gradients are sent as they are
+        gradients = encode_gradients(gradients, **get_gradients_ins)
+
     # Serialize response
     get_gradients_res_proto = serde.get_gradients_res_to_proto(gradients)
     return ClientMessage(get_gradients_res=get_gradients_res_proto)
-    
+
+
 def _get_contributions(
-    client: Client, get_contributions_msg: ServerMessage.GetContributionsIns
+    client: Client,
+    get_contributions_msg: ServerMessage.GetContributionsIns,
+    state: RunState,
 ) -> ClientMessage:
-    # Deserialize `get_contributions` instruction
-    get_contributions_ins = serde.get_contributions_ins_from_proto(get_contributions_msg)
+    gradient_chunks = state.gradient_chunks
+    # Round 0 means that the server did not say which round the gradients are of
+    server_round = get_contributions_msg.server_round or None
+    if not get_contributions_msg.gradients:
+        # Streamed gradients: buffer the chunks until the last message
+        if get_contributions_msg.final and get_contributions_msg.index >= 0:
+            try:
+                return _get_contributions_res(
+                    client, state, _GradientChunks(gradient_chunks), server_round
+                )
+            finally:
+                gradient_chunks.clear()
+        if get_contributions_msg.final:
+            # A negative index drops the chunks of an interrupted stream
+            gradient_chunks.clear()
+        else:
+            gradient_chunks.setdefault(get_contributions_msg.index, []).append(
+                get_contributions_msg.chunk
+            )
+        get_contributions_res_proto = serde.get_contributions_res_to_proto([])
+        return ClientMessage(get_contributions_res=get_contributions_res_proto)
 
+    # The repeated field is indexed directly by the Shapley estimation
+    return _get_contributions_res(
+        client, state, get_contributions_msg.gradients, server_round
+    )
+
+
+def _get_contributions_res(
+    client: Client,
+    state: RunState,
+    gradients: Sequence[bytes],
+    server_round: Optional[int],
+) -> ClientMessage:
     # Request contributions
-    get_contributions_res = client.numpy_client.get_contributions(get_contributions_ins)
+    numpy_client = client.numpy_client  # type: ignore
+    if has_get_coalition_utility(numpy_client):
+        get_contributions_res = _estimate_contributions(
+            numpy_client, state, gradients, server_round
+        )
+    else:
+        # `get_contributions` consumes the gradients one client at a time
+        get_contributions_res = numpy_client.get_contributions(
+            gradients.drain()
+            if isinstance(gradients, _GradientChunks)
+            else iter(gradients)
+        )
 
     # Serialize response
-    get_contributions_res_proto = serde.get_contributions_res_to_proto(get_contributions_res)
+    get_contributions_res_proto = serde.get_contributions_res_to_proto(
+        get_contributions_res
+    )
     return ClientMessage(get_contributions_res=get_contributions_res_proto)
-    
+
+
+def _estimate_contributions(
+    numpy_client: NumPyClient,
+    state: RunState,
+    gradients: Sequence[bytes],
+    server_round: Optional[int],
+) -> List[float]:
+    """Estimate the Shapley value of each client from coalition utilities.
+
+    The estimator is kept in the run state, so coalition utilities cached while
+    evaluating the gradients of `server_round` are reused for the same round.
+    """
+
+    def _utility(coalition: FrozenSet[Hashable]) -> float:
+        members = sorted(cast(int, index) for index in coalition)
+        return numpy_client.get_coalition_utility([gradients[i] for i in members])
+
+    if state.shapley_estimator is None:
+        state.shapley_estimator = ShapleyEstimator(_utility)
+    estimator = state.shapley_estimator
+    # The cached utilities refer to the gradients by index
+    estimator.utility_fn = _utility
+    try:
+        values = estimator.estimate(range(len(gradients)), server_round=server_round)
+    finally:
+        # Do not keep the gradients alive until the next evaluation
+        estimator.utility_fn = _released_utility
+    return [values[index] for index in range(len(gradients))]
+
+
+def _released_utility(coalition: FrozenSet[Hashable]) -> float:
+    raise RuntimeError("The gradients of the coalition have been released")
+
+
+class _GradientChunks(Sequence[bytes]):
+    """The buffered gradients of each client, joined when first accessed.
+
+    The chunks of a client are replaced by their concatenation, so only the
+    gradients of one client are held twice at any time.
+    """
+
+    def __init__(self, chunks: Dict[int, List[bytes]]) -> None:
+        self._chunks = chunks
+        self._indices = sorted(chunks)
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, index: int) -> bytes:  # type: ignore
+        parts = self._chunks[self._indices[index]]
+        if len(parts) > 1:
+            parts[:] = [b"".join(parts)]
+        return parts[0]
+
+    def drain(self) -> Iterator[bytes]:
+        """Join and release the buffered gradients one client at a time."""
+        for index in self._indices:
+            yield b"".join(self._chunks.pop(index))
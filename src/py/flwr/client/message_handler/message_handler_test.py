@@ -16,8 +16,11 @@
 
 
 import uuid
+from typing import List
 
-from flwr.client import Client
+import pytest
+
+from flwr.client import Client, NumPyClient
 from flwr.client.run_state import RunState
 from flwr.client.typing import ClientFn
 from flwr.common import (
@@ -37,7 +40,7 @@ from flwr.proto.node_pb2 import Node
 from flwr.proto.task_pb2 import Task, TaskIns, TaskRes
 from flwr.proto.transport_pb2 import ClientMessage, Code, ServerMessage, Status
 
-from .message_handler import handle, handle_control_message
+from .message_handler import _get_contributions, handle, handle_control_message
 
 
 class ClientWithoutProps(Client):
@@ -250,3 +253,76 @@ def test_client_with_get_properties() -> None:
     assert actual_msg == expected_msg
     assert not disconnect_task_res
     assert actual_sleep_duration == 0
+
+
+class AdditiveCEClient(NumPyClient):
+    """CE server whose coalition utility is the sum of the gradient bytes."""
+
+    def get_coalition_utility(self, gradients: List[bytes]) -> float:
+        """Add up the first byte of each gradient."""
+        return float(sum(gradient[0] for gradient in gradients))
+
+
+def test_get_contributions_from_coalition_utility() -> None:
+    """Test that Shapley values are estimated from coalition utilities."""
+    # Prepare
+    client = AdditiveCEClient().to_client()
+    msg = ServerMessage.GetContributionsIns(gradients=[b"\x01", b"\x02", b"\x04"])
+
+    # Execute
+    client_msg = _get_contributions(client, msg, RunState(state={}))
+
+    # Assert
+    contributions = serde.get_contributions_res_from_proto(
+        client_msg.get_contributions_res
+    )
+    assert list(contributions) == pytest.approx([1.0, 2.0, 4.0])
+
+
+def test_get_contributions_reuses_utilities_within_round() -> None:
+    """Test that the run keeps its estimator and its cache for the round."""
+    # Prepare
+    client = AdditiveCEClient().to_client()
+    state = RunState(state={})
+    msg = ServerMessage.GetContributionsIns(
+        gradients=[b"\x01", b"\x02", b"\x04"], server_round=1
+    )
+    _get_contributions(client, msg, state)
+    estimator = state.shapley_estimator
+    assert estimator is not None
+    evaluations = estimator.evaluations
+
+    # Execute
+    client_msg = _get_contributions(client, msg, state)
+
+    # Assert
+    assert state.shapley_estimator is estimator
+    assert estimator.evaluations == evaluations
+    contributions = serde.get_contributions_res_from_proto(
+        client_msg.get_contributions_res
+    )
+    assert list(contributions) == pytest.approx([1.0, 2.0, 4.0])
+
+
+def test_get_contributions_recomputes_utilities_of_new_round() -> None:
+    """Test that the cached utilities are not reused for another round."""
+    # Prepare
+    client = AdditiveCEClient().to_client()
+    state = RunState(state={})
+    _get_contributions(
+        client,
+        ServerMessage.GetContributionsIns(gradients=[b"\x01", b"\x02"], server_round=1),
+        state,
+    )
+    msg = ServerMessage.GetContributionsIns(
+        gradients=[b"\x08", b"\x02"], server_round=2
+    )
+
+    # Execute
+    client_msg = _get_contributions(client, msg, state)
+
+    # Assert
+    contributions = serde.get_contributions_res_from_proto(
+        client_msg.get_contributions_res
+    )
+    assert list(contributions) == pytest.approx([8.0, 2.0])
@@ -18,6 +18,7 @@
 from flwr.client.message_handler.task_handler import (
     get_server_message_from_task_ins,
     get_task_ins,
+    get_task_ins_list,
     validate_task_ins,
     validate_task_res,
     wrap_client_message_in_task_res,
@@ -136,6 +137,29 @@ def test_get_task_ins_multiple_ins() -> None:
     assert actual_task_ins == expected_task_ins
 
 
+def test_get_task_ins_list() -> None:
+    """Test get_task_ins_list."""
+    fit_ins = TaskIns(
+        task_id="1",
+        task=Task(legacy_server_message=ServerMessage(fit_ins=ServerMessage.FitIns())),
+    )
+    reconnect_ins = TaskIns(
+        task_id="2",
+        task=Task(
+            legacy_server_message=ServerMessage(
+                reconnect_ins=ServerMessage.ReconnectIns()
+            )
+        ),
+    )
+    res = PullTaskInsResponse(task_ins_list=[fit_ins, TaskIns(), reconnect_ins])
+
+    assert get_task_ins_list(res, discard_reconnect_ins=True) == [fit_ins]
+    assert get_task_ins_list(res, discard_reconnect_ins=False) == [
+        fit_ins,
+        reconnect_ins,
+    ]
+
+
 def test_get_server_message_from_task_ins_invalid() -> None:
     """Test get_server_message_from_task_ins."""
     task_ins = TaskIns(task=Task(legacy_server_message=None))
@@ -240,6 +240,29 @@ class NumPyClient(ABC):
         _ = (self, parameters, config)
         return 0.0, 0, {}
 
+    def get_coalition_utility(self, gradients: List[bytes]) -> float:
+        """Return the utility of a coalition of clients.
+
+        The contribution evaluation (CE) server can implement this method
+        instead of `get_contributions`. Flower then estimates the Shapley value
+        of each client with `flwr.common.ShapleyEstimator`, which may call this
+        method from several threads.
+
+        Parameters
+        ----------
+        gradients : List[bytes]
+            The gradients of the members of the coalition, in the order in
+            which the server sent them. Empty for the empty coalition.
+
+        Returns
+        -------
+        utility : float
+            The utility of the coalition, e.g., the accuracy of the model
+            updated with the gradients of its members.
+        """
+        _ = (self, gradients)
+        return 0.0
+
     def get_state(self) -> RunState:
         """Get the run state from this client."""
         return self.state
@@ -299,6 +322,11 @@ def has_evaluate_enc(client: NumPyClient) -> bool:
     """Check if NumPyClient implements evaluate_enc."""
     return type(client).evaluate_enc != NumPyClient.evaluate_enc
     
+def has_get_coalition_utility(client: NumPyClient) -> bool:
+    """Check if NumPyClient implements get_coalition_utility."""
+    return type(client).get_coalition_utility != NumPyClient.get_coalition_utility
+
+
 def has_identify(client: NumPyClient) -> bool:
     """Check if NumPyClient implements evaluate_enc."""
     return callable(getattr(client, "identify", None))
@@ -350,7 +378,10 @@ def _fit(self: Client, ins: FitIns) -> FitRes:
 
     # Return FitRes
     parameters_prime, num_examples, metrics = results
-    parameters_prime_proto = ndarrays_to_parameters(parameters_prime)
+    # Reply in the same wire format as the server
+    parameters_prime_proto = ndarrays_to_parameters(
+        parameters_prime, tensor_type=ins.parameters.tensor_type
+    )
     return FitRes(
         status=Status(code=Code.OK, message="Success"),
         parameters=parameters_prime_proto,
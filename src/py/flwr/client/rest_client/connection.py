@@ -16,19 +16,21 @@
 
 
 import sys
+import time
+from collections import deque
 from contextlib import contextmanager
 from logging import ERROR, INFO, WARN
-from typing import Callable, Dict, Iterator, Optional, Tuple, Union, cast
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union, cast
 
 from flwr.client.message_handler.task_handler import (
     configure_task_res,
-    get_task_ins,
-    validate_task_ins,
+    get_task_ins_list,
     validate_task_res,
 )
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH
 from flwr.common.constant import MISSING_EXTRA_REST
 from flwr.common.logger import log
+from flwr.common.retry_invoker import RetryInvoker, exponential
 from flwr.proto.fleet_pb2 import (
     CreateNodeRequest,
     CreateNodeResponse,
@@ -56,6 +58,9 @@ PATH_DELETE_NODE: str = "api/v0/fleet/delete-node"
 PATH_PULL_TASK_INS: str = "api/v0/fleet/pull-task-ins"
 PATH_PUSH_TASK_RES: str = "api/v0/fleet/push-task-res"
 
+# Minimum time between two PullTaskIns requests which returned no TaskIns
+MIN_PULL_INTERVAL = 3.0
+
 
 @contextmanager
 # pylint: disable-next=too-many-statements
@@ -66,6 +71,8 @@ def http_request_response(
     root_certificates: Optional[
         Union[bytes, str]
     ] = None,  # pylint: disable=unused-argument
+    max_task_ins: int = 8,
+    pull_timeout: float = 30.0,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[TaskIns]],
@@ -91,6 +98,16 @@ def http_request_response(
         Path of the root certificate. If provided, a secure
         connection using the certificates will be established to an SSL-enabled
         Flower server. Bytes won't work for the REST API.
+    max_task_ins : int (default: 8)
+        Maximum number of TaskIns pulled from the server in one request. The
+        TaskIns are then returned one by one by `receive`, and the TaskRes of a
+        batch are pushed together once all of them have been sent.
+    pull_timeout : float (default: 30.0)
+        Maximum number of seconds the server holds a PullTaskIns request until
+        TaskIns are available (long-poll). `receive` returns `None` only once
+        this time has passed without TaskIns, or at least `MIN_PULL_INTERVAL`
+        seconds if the server does not support long-polling. Failed requests
+        are retried with jittered exponential backoff.
 
     Returns
     -------
@@ -120,9 +137,21 @@ def http_request_response(
             "must be provided as a string path to the client.",
         )
 
+    # Retry requests failing because of the network or the server
+    retry_invoker = RetryInvoker(
+        lambda: exponential(max_delay=60),
+        requests.RequestException,
+        max_tries=None,
+        max_time=None,
+    )
+
     # Necessary state to link TaskRes to TaskIns
     state: Dict[str, Optional[TaskIns]] = {KEY_TASK_INS: None}
 
+    # TaskIns pulled but not yet received, and TaskRes sent but not yet pushed
+    task_ins_queue: Deque[TaskIns] = deque()
+    task_res_list: List[TaskRes] = []
+
     # Enable create_node and delete_node to store node
     node_store: Dict[str, Optional[Node]] = {KEY_NODE: None}
 
@@ -175,6 +204,10 @@ def http_request_response(
             log(ERROR, "Node instance missing")
             return
         node: Node = cast(Node, node_store[KEY_NODE])
+
+        # Do not drop the TaskRes of an unfinished batch
+        push_task_res()
+
         delete_node_req_proto = DeleteNodeRequest(node=node)
         delete_node_req_req_bytes: bytes = delete_node_req_proto.SerializeToString()
         res = requests.post(
@@ -206,26 +239,49 @@ def http_request_response(
 
     def receive() -> Optional[TaskIns]:
         """Receive next task from server."""
-        # Get Node
-        if node_store[KEY_NODE] is None:
-            log(ERROR, "Node instance missing")
-            return None
-        node: Node = cast(Node, node_store[KEY_NODE])
-
-        # Request instructions (task) from server
-        pull_task_ins_req_proto = PullTaskInsRequest(node=node)
-        pull_task_ins_req_bytes: bytes = pull_task_ins_req_proto.SerializeToString()
+        start = time.monotonic()
+        task_ins = pull_task_ins()
+        if task_ins is None:
+            # Do not hammer servers which answer at once when there is no TaskIns
+            time.sleep(max(0.0, MIN_PULL_INTERVAL - (time.monotonic() - start)))
+        return task_ins
 
-        # Request instructions (task) from server
+    def post_pull_task_ins(data: bytes) -> requests.Response:
+        """Send PullTaskIns, raising an exception on server errors."""
         res = requests.post(
             url=f"{base_url}/{PATH_PULL_TASK_INS}",
             headers={
                 "Accept": "application/protobuf",
                 "Content-Type": "application/protobuf",
             },
-            data=pull_task_ins_req_bytes,
+            data=data,
             verify=verify,
         )
+        if res.status_code >= 500 or res.status_code == 429:
+            res.raise_for_status()
+        return res
+
+    def pull_task_ins() -> Optional[TaskIns]:
+        """Return the next TaskIns, waiting for the server if none is left."""
+        # Get Node
+        if node_store[KEY_NODE] is None:
+            log(ERROR, "Node instance missing")
+            return None
+        node: Node = cast(Node, node_store[KEY_NODE])
+
+        # Return the next TaskIns of the current batch, if any
+        if task_ins_queue:
+            state[KEY_TASK_INS] = task_ins_queue.popleft()
+            return state[KEY_TASK_INS]
+
+        # Request a batch of instructions (tasks) from server
+        pull_task_ins_req_proto = PullTaskInsRequest(
+            node=node, max_task_ins=max_task_ins, timeout=pull_timeout
+        )
+        pull_task_ins_req_bytes: bytes = pull_task_ins_req_proto.SerializeToString()
+
+        # Request instructions (task) from server
+        res = retry_invoker.invoke(post_pull_task_ins, pull_task_ins_req_bytes)
 
         # Check status code and headers
         if res.status_code != 200:
@@ -249,14 +305,15 @@ def http_request_response(
         pull_task_ins_response_proto = PullTaskInsResponse()
         pull_task_ins_response_proto.ParseFromString(res.content)
 
-        # Get the current TaskIns
-        task_ins: Optional[TaskIns] = get_task_ins(pull_task_ins_response_proto)
+        # Keep the valid TaskIns only
+        task_ins_queue.extend(
+            get_task_ins_list(pull_task_ins_response_proto, discard_reconnect_ins=True)
+        )
 
-        # Discard the current TaskIns if not valid
-        if task_ins is not None and not validate_task_ins(
-            task_ins, discard_reconnect_ins=True
-        ):
-            task_ins = None
+        # Get the current TaskIns
+        task_ins: Optional[TaskIns] = (
+            task_ins_queue.popleft() if task_ins_queue else None
+        )
 
         # Remember `task_ins` until `task_res` is available
         state[KEY_TASK_INS] = task_ins
@@ -288,8 +345,20 @@ def http_request_response(
         # Configure TaskRes
         task_res = configure_task_res(task_res, task_ins, node)
 
+        task_res_list.append(task_res)
+        state[KEY_TASK_INS] = None
+
+        # Push the TaskRes of the batch once it has been fully handled
+        if not task_ins_queue:
+            push_task_res()
+
+    def push_task_res() -> None:
+        """Push all buffered TaskRes to the server in one request."""
+        if not task_res_list:
+            return
+
         # Serialize ProtoBuf to bytes
-        push_task_res_request_proto = PushTaskResRequest(task_res_list=[task_res])
+        push_task_res_request_proto = PushTaskResRequest(task_res_list=task_res_list)
         push_task_res_request_bytes: bytes = (
             push_task_res_request_proto.SerializeToString()
         )
@@ -305,7 +374,7 @@ def http_request_response(
             verify=verify,
         )
 
-        state[KEY_TASK_INS] = None
+        task_res_list.clear()
 
         # Check status code and headers
         if res.status_code != 200:
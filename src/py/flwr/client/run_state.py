@@ -14,8 +14,11 @@
 # ==============================================================================
 """Run state."""
 
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from flwr.common.context_registry import ContextRegistry
+from flwr.common.shapley import ShapleyEstimator
 
 
 @dataclass
@@ -23,3 +26,8 @@ class RunState:
     """State of a run executed by a client node."""
 
     state: Dict[str, str]
+    contexts: ContextRegistry = field(default_factory=ContextRegistry)
+    # Chunks of the gradients streamed to the CE server, by client index
+    gradient_chunks: Dict[int, List[bytes]] = field(default_factory=dict)
+    # Estimator of the contributions, caching coalition utilities of a round
+    shapley_estimator: Optional[ShapleyEstimator] = None
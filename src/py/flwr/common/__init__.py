@@ -19,10 +19,15 @@ from .date import now as now
 from .grpc import GRPC_MAX_MESSAGE_LENGTH
 from .logger import configure as configure
 from .logger import log as log
+from .parameter import TENSOR_TYPE_NUMPY as TENSOR_TYPE_NUMPY
+from .parameter import TENSOR_TYPE_NUMPY_RAW as TENSOR_TYPE_NUMPY_RAW
 from .parameter import bytes_to_ndarray as bytes_to_ndarray
 from .parameter import ndarray_to_bytes as ndarray_to_bytes
+from .parameter import ndarray_to_raw_bytes as ndarray_to_raw_bytes
 from .parameter import ndarrays_to_parameters as ndarrays_to_parameters
 from .parameter import parameters_to_ndarrays as parameters_to_ndarrays
+from .parameter import raw_bytes_to_ndarray as raw_bytes_to_ndarray
+from .shapley import ShapleyEstimator as ShapleyEstimator
 from .telemetry import EventType as EventType
 from .telemetry import event as event
 from .typing import ClientMessage as ClientMessage
@@ -70,6 +75,7 @@ __all__ = [
     "Metrics",
     "MetricsAggregationFn",
     "ndarray_to_bytes",
+    "ndarray_to_raw_bytes",
     "now",
     "NDArray",
     "NDArrays",
@@ -77,8 +83,12 @@ __all__ = [
     "Parameters",
     "parameters_to_ndarrays",
     "Properties",
+    "raw_bytes_to_ndarray",
     "ReconnectIns",
     "Scalar",
     "ServerMessage",
+    "ShapleyEstimator",
     "Status",
+    "TENSOR_TYPE_NUMPY",
+    "TENSOR_TYPE_NUMPY_RAW",
 ]
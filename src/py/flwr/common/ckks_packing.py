@@ -0,0 +1,166 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Packing of model layers into fixed-size CKKS ciphertexts."""
+
+
+import concurrent.futures
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .parameter import TENSOR_TYPE_NUMPY_RAW, ndarrays_to_parameters
+from .typing import NDArray, NDArrays, Parameters
+
+# Number of slots of a CKKS ciphertext with poly_modulus_degree=8192
+DEFAULT_SLOT_COUNT = 4096
+
+
+class CKKSPacking:
+    """Layout of a model in a flat vector split into ciphertext-sized chunks.
+
+    The layout is computed once from the layer shapes. Layer `i` occupies
+    `offsets[i]:offsets[i + 1]` of the flat vector, and chunk `j` holds
+    `chunks[j]`, a `(start, end)` range of at most `slot_count` values, so
+    that every chunk fits into a single ciphertext. The chunks are encrypted
+    and decrypted in parallel on a thread pool, TenSEAL releases the GIL.
+
+    Decoded values are written in place into a float32 buffer, `out` if given
+    or a newly allocated one, and the returned layers are views into it.
+
+    Parameters
+    ----------
+    shapes : Sequence[Sequence[int]]
+        Shapes of the model layers, in order.
+    slot_count : int (default: 4096)
+        Number of values packed into one ciphertext. Must not exceed half the
+        `poly_modulus_degree` of the context.
+    max_workers : Optional[int] (default: None)
+        Number of threads used to encrypt or decrypt the chunks.
+    """
+
+    def __init__(
+        self,
+        shapes: Sequence[Sequence[int]],
+        slot_count: int = DEFAULT_SLOT_COUNT,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        if slot_count <= 0:
+            raise ValueError("slot_count must be positive")
+        self.shapes: List[Tuple[int, ...]] = [tuple(shape) for shape in shapes]
+        self.offsets: List[int] = [0]
+        for shape in self.shapes:
+            self.offsets.append(self.offsets[-1] + int(np.prod(shape)))
+        self.size: int = self.offsets[-1]
+        self.slot_count = slot_count
+        self.max_workers = max_workers
+        self.chunks: List[Tuple[int, int]] = [
+            (start, min(start + slot_count, self.size))
+            for start in range(0, self.size, slot_count)
+        ]
+        # Reused by `to_parameters`, whose layers are copied when serialized
+        self._buffer = np.empty(self.size, dtype=np.float32)
+
+    def __len__(self) -> int:
+        """Return the number of chunks."""
+        return len(self.chunks)
+
+    def flatten(self, ndarrays: NDArrays, out: Optional[NDArray] = None) -> NDArray:
+        """Copy the layers into a flat float32 array."""
+        if len(ndarrays) != len(self.shapes):
+            raise ValueError(f"Expected {len(self.shapes)} layers, got {len(ndarrays)}")
+        flat = self._out(out)
+        for layer, start, end in zip(ndarrays, self.offsets, self.offsets[1:]):
+            if np.size(layer) != end - start:
+                raise ValueError("Layer size does not match the packing layout")
+            flat[start:end] = np.ravel(layer)
+        return flat
+
+    def unflatten(self, flat: NDArray) -> NDArrays:
+        """Return the layers as views into `flat`."""
+        return [
+            flat[start:end].reshape(shape)
+            for shape, start, end in zip(self.shapes, self.offsets, self.offsets[1:])
+        ]
+
+    def decode(
+        self, values: Sequence[float], out: Optional[NDArray] = None
+    ) -> NDArrays:
+        """Write the decoded values of the model into `out` and split them.
+
+        `values` may be longer than the model, e.g. when the decoded vector is
+        padded to the slot count, the trailing values are ignored.
+        """
+        if len(values) < self.size:
+            raise ValueError(f"Expected at least {self.size} values, got {len(values)}")
+        flat = self._out(out)
+        flat[:] = values[: self.size]
+        return self.unflatten(flat)
+
+    def to_parameters(self, values: Sequence[float]) -> Parameters:
+        """Decode `values` and serialize the layers in the raw wire format."""
+        return ndarrays_to_parameters(
+            self.decode(values, out=self._buffer), tensor_type=TENSOR_TYPE_NUMPY_RAW
+        )
+
+    def encrypt(self, context: Any, ndarrays: NDArrays) -> List[Any]:
+        """Encrypt the model into one CKKS vector per chunk."""
+        # Imported here so that the layout can be used without TenSEAL
+        import tenseal as ts  # pylint: disable=import-outside-toplevel
+
+        flat = self.flatten(ndarrays)
+        return self._map(
+            lambda chunk: ts.ckks_vector(context, flat[chunk[0] : chunk[1]]),
+            self.chunks,
+        )
+
+    def decrypt(
+        self,
+        ciphertexts: Sequence[Any],
+        decrypt_fn: Optional[Callable[[Any], Sequence[float]]] = None,
+        out: Optional[NDArray] = None,
+    ) -> NDArrays:
+        """Decrypt one CKKS vector per chunk in place into `out`.
+
+        `decrypt_fn` defaults to `ciphertext.decrypt()`. Pass, e.g.,
+        `lambda c: c.mk_decode()` for aggregated MK-CKKS ciphertexts.
+        """
+        if len(ciphertexts) != len(self.chunks):
+            raise ValueError(
+                f"Expected {len(self.chunks)} ciphertexts, got {len(ciphertexts)}"
+            )
+        if decrypt_fn is None:
+            decrypt_fn = lambda ciphertext: ciphertext.decrypt()  # noqa: E731
+        flat = self._out(out)
+
+        def _decrypt(index: int) -> None:
+            start, end = self.chunks[index]
+            values = decrypt_fn(ciphertexts[index])
+            flat[start:end] = values[: end - start]
+
+        self._map(_decrypt, range(len(self.chunks)))
+        return self.unflatten(flat)
+
+    def _out(self, out: Optional[NDArray]) -> NDArray:
+        if out is None:
+            return np.empty(self.size, dtype=np.float32)
+        if out.shape != (self.size,):
+            raise ValueError(f"Expected a buffer of shape ({self.size},)")
+        return out
+
+    def _map(self, fn: Callable[[Any], Any], items: Sequence[Any]) -> List[Any]:
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as executor:
+            return list(executor.map(fn, items))
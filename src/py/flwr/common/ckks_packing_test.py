@@ -0,0 +1,106 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""CKKS packing layout tests."""
+
+
+import numpy as np
+import pytest
+import tenseal as ts
+
+from .ckks_packing import CKKSPacking
+from .parameter import TENSOR_TYPE_NUMPY_RAW, parameters_to_ndarrays
+
+
+def test_chunks() -> None:
+    """Test that the flat model is split into chunks of at most slot_count."""
+    # Execute
+    packing = CKKSPacking([(3, 4), (5,), ()], slot_count=5)
+
+    # Assert
+    assert packing.size == 18
+    assert packing.offsets == [0, 12, 17, 18]
+    assert packing.chunks == [(0, 5), (5, 10), (10, 15), (15, 18)]
+    assert len(packing) == 4
+
+
+def test_decode_to_parameters() -> None:
+    """Test that a decoded vector is split into layers and serialized."""
+    # Prepare
+    packing = CKKSPacking([(2, 3), ()])
+    values = [float(i) for i in range(7)] + [0.0, 0.0]
+
+    # Execute
+    parameters = packing.to_parameters(values)
+    actual = parameters_to_ndarrays(parameters)
+
+    # Assert
+    assert parameters.tensor_type == TENSOR_TYPE_NUMPY_RAW
+    assert actual[0].dtype == np.float32
+    np.testing.assert_equal(actual[0], np.arange(6).reshape(2, 3))
+    np.testing.assert_equal(actual[1], np.float32(6.0))
+
+
+def test_decode_too_short() -> None:
+    """Test that a vector shorter than the model is rejected."""
+    with pytest.raises(ValueError):
+        CKKSPacking([(4,)]).decode([1.0, 2.0])
+
+
+def test_calls_do_not_share_memory() -> None:
+    """Test that results of earlier calls are not overwritten."""
+    # Prepare
+    packing = CKKSPacking([(2,), (1,)])
+
+    # Execute
+    first = packing.decode([1.0, 2.0, 3.0])
+    flat = packing.flatten(first)
+    second = packing.decode([4.0, 5.0, 6.0])
+
+    # Assert
+    np.testing.assert_equal(first[0], [1.0, 2.0])
+    np.testing.assert_equal(flat, [1.0, 2.0, 3.0])
+    np.testing.assert_equal(second[1], [6.0])
+
+
+def test_decode_in_place() -> None:
+    """Test that decoded values are written into the given buffer."""
+    # Prepare
+    packing = CKKSPacking([(2,), (1,)])
+    out = np.zeros(3, dtype=np.float32)
+
+    # Execute
+    layers = packing.decode([1.0, 2.0, 3.0, 0.0], out=out)
+
+    # Assert
+    np.testing.assert_equal(out, [1.0, 2.0, 3.0])
+    assert all(np.shares_memory(layer, out) for layer in layers)
+
+
+def test_encrypt_decrypt() -> None:
+    """Test that a model spanning several ciphertexts survives a round trip."""
+    # Prepare
+    ctx = ts.context(ts.SCHEME_TYPE.CKKS, 8192, coeff_mod_bit_sizes=[60, 40, 40, 60])
+    ctx.global_scale = 2**40
+    packing = CKKSPacking([(3, 7), (10,)], slot_count=8, max_workers=2)
+    ndarrays = [np.random.randn(3, 7), np.random.randn(10)]
+
+    # Execute
+    ciphertexts = packing.encrypt(ctx, ndarrays)
+    actual = packing.decrypt(ciphertexts)
+
+    # Assert
+    assert len(ciphertexts) == 4
+    for expected, layer in zip(ndarrays, actual):
+        np.testing.assert_allclose(layer, expected, atol=1e-3)
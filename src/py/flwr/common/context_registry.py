@@ -0,0 +1,65 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Per-run registry of negotiated TenSEAL contexts."""
+
+
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+
+class ContextRegistry:
+    """Cache of TenSEAL contexts keyed by a short context id.
+
+    The full context is only exchanged once, during the `get_pk`/`send_pk`
+    handshake. Both sides register their local context under the id chosen by
+    the server, and every later MK-CKKS message only carries that id next to
+    the ciphertext.
+    """
+
+    def __init__(self) -> None:
+        self._contexts: Dict[str, Any] = {}
+        self._current_id: str = ""
+
+    def register(self, ctx: Any, ctx_id: Optional[str] = None) -> str:
+        """Register `ctx` under `ctx_id` (or a newly generated id) and return it."""
+        if ctx_id is None or ctx_id == "":
+            ctx_id = uuid4().hex
+        self._contexts[ctx_id] = ctx
+        self._current_id = ctx_id
+        return ctx_id
+
+    def get(self, ctx_id: str) -> Any:
+        """Return the context registered under `ctx_id`."""
+        if ctx_id not in self._contexts:
+            raise KeyError(f"No TenSEAL context registered for ctx_id={ctx_id}")
+        return self._contexts[ctx_id]
+
+    @property
+    def current_id(self) -> str:
+        """Id of the most recently registered context, or "" if there is none."""
+        return self._current_id
+
+    def clear(self) -> None:
+        """Forget all registered contexts, e.g., before a new key handshake."""
+        self._contexts.clear()
+        self._current_id = ""
+
+    def __contains__(self, ctx_id: object) -> bool:
+        """Check if a context is registered under `ctx_id`."""
+        return ctx_id in self._contexts
+
+    def __len__(self) -> int:
+        """Return the number of registered contexts."""
+        return len(self._contexts)
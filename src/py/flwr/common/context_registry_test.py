@@ -0,0 +1,64 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for ContextRegistry."""
+
+
+import pytest
+
+from .context_registry import ContextRegistry
+
+
+def test_register_and_get() -> None:
+    """Test that registered contexts can be resolved by id."""
+    # Prepare
+    contexts = ContextRegistry()
+    ctx = object()
+
+    # Execute
+    ctx_id = contexts.register(ctx)
+
+    # Assert
+    assert ctx_id in contexts
+    assert contexts.get(ctx_id) is ctx
+    assert contexts.current_id == ctx_id
+
+
+def test_register_with_given_id() -> None:
+    """Test that the id chosen by the server is kept."""
+    # Prepare
+    contexts = ContextRegistry()
+
+    # Execute
+    ctx_id = contexts.register(object(), ctx_id="abc")
+
+    # Assert
+    assert ctx_id == "abc"
+    assert contexts.current_id == "abc"
+
+
+def test_clear() -> None:
+    """Test that clearing the registry forgets all contexts."""
+    # Prepare
+    contexts = ContextRegistry()
+    ctx_id = contexts.register(object())
+
+    # Execute
+    contexts.clear()
+
+    # Assert
+    assert len(contexts) == 0
+    assert contexts.current_id == ""
+    with pytest.raises(KeyError):
+        contexts.get(ctx_id)
@@ -0,0 +1,191 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Compression of gradients sent for contribution evaluation."""
+
+
+import math
+import struct
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from .parameter import ndarray_to_raw_bytes, raw_bytes_to_ndarray
+from .typing import NDArray, NDArrays
+
+GRADIENT_CODEC_NONE = "none"
+GRADIENT_CODEC_FLOAT16 = "float16"
+GRADIENT_CODEC_TOPK = "topk"
+GRADIENT_CODEC_PROJECTION = "projection"
+
+_CODECS = [
+    GRADIENT_CODEC_NONE,
+    GRADIENT_CODEC_FLOAT16,
+    GRADIENT_CODEC_TOPK,
+    GRADIENT_CODEC_PROJECTION,
+]
+
+# Every array of an encoded message is prefixed with its length, padded to 16
+# bytes so that the raw array buffers stay aligned
+_LENGTH = struct.Struct("<Q8x")
+
+# Byte budget of one block of the random projection matrix
+_PROJECTION_BLOCK_BYTES = 1 << 24
+
+
+def encode_gradients(
+    gradients: NDArrays,
+    codec: str = GRADIENT_CODEC_FLOAT16,
+    ratio: float = 0.01,
+    seed: int = 0,
+) -> bytes:
+    """Compress gradients into a self-describing byte string.
+
+    Parameters
+    ----------
+    gradients : NDArrays
+        The gradients of the model layers.
+    codec : str (default: "float16")
+        `"none"` keeps float32 values, `"float16"` halves their precision,
+        `"topk"` keeps the `ratio` fraction of the entries with the largest
+        magnitude, and `"projection"` sends a random projection of the
+        gradients to `ratio` times as many dimensions.
+    ratio : float (default: 0.01)
+        Fraction of the entries kept by the `"topk"` and `"projection"` codecs.
+    seed : int (default: 0)
+        Seed of the random projection, shared by all clients of a round so
+        that their sketches can be compared.
+    """
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown gradient codec: {codec}")
+    shapes = [np.shape(layer) for layer in gradients]
+    meta = [_CODECS.index(codec), seed, len(shapes)]
+    meta += [len(shape) for shape in shapes]
+    meta += [dim for shape in shapes for dim in shape]
+    arrays: List[NDArray] = [np.asarray(meta, dtype=np.int64)]
+
+    if codec == GRADIENT_CODEC_NONE:
+        arrays += [np.asarray(layer, dtype=np.float32) for layer in gradients]
+    elif codec == GRADIENT_CODEC_FLOAT16:
+        arrays += [np.asarray(layer, dtype=np.float16) for layer in gradients]
+    else:
+        flat = _flatten(gradients)
+        size = max(1, math.ceil(ratio * flat.size))
+        if codec == GRADIENT_CODEC_TOPK:
+            size = min(size, flat.size)
+            indices = np.argpartition(np.abs(flat), flat.size - size)[-size:]
+            indices.sort()
+            index_dtype = np.uint32 if flat.size < 2**32 else np.int64
+            arrays += [indices.astype(index_dtype), flat[indices]]
+        else:
+            arrays.append(_project(flat, size, seed))
+    return b"".join(
+        _LENGTH.pack(len(data)) + data
+        for data in (ndarray_to_raw_bytes(array) for array in arrays)
+    )
+
+
+def decode_gradients(data: bytes, sketch: bool = False) -> NDArrays:
+    """Decompress gradients encoded with `encode_gradients`.
+
+    `"float16"` gradients are returned as float16 arrays. `"topk"` gradients
+    are zero outside of the kept entries. `"projection"` gradients are the
+    unbiased estimate obtained by projecting the sketch back, or the sketch
+    itself (a single 1-D array) if `sketch` is True. Sketches with the same
+    seed approximately preserve distances and inner products of gradients.
+    """
+    arrays = _split(data)
+    meta = arrays[0].tolist()
+    codec, seed, num_layers = _CODECS[meta[0]], meta[1], meta[2]
+    ndims = meta[3 : 3 + num_layers]
+    dims = meta[3 + num_layers :]
+    shapes: List[Tuple[int, ...]] = []
+    for ndim in ndims:
+        shapes.append(tuple(dims[:ndim]))
+        dims = dims[ndim:]
+
+    if codec in (GRADIENT_CODEC_NONE, GRADIENT_CODEC_FLOAT16):
+        return arrays[1:]
+    if sketch and codec == GRADIENT_CODEC_PROJECTION:
+        return arrays[1:]
+    total = sum(int(np.prod(shape)) for shape in shapes)
+    if codec == GRADIENT_CODEC_TOPK:
+        flat = np.zeros(total, dtype=np.float32)
+        flat[arrays[1]] = arrays[2]
+    else:
+        flat = _project_back(arrays[1], total, seed)
+    offsets = np.cumsum([0] + [int(np.prod(shape)) for shape in shapes])
+    return [
+        flat[start:end].reshape(shape)
+        for shape, start, end in zip(shapes, offsets, offsets[1:])
+    ]
+
+
+def iter_chunks(data: bytes, chunk_size: int) -> Iterator[bytes]:
+    """Split `data` into chunks of at most `chunk_size` bytes.
+
+    At least one (possibly empty) chunk is returned.
+    """
+    view = memoryview(data)
+    yield bytes(view[:chunk_size])
+    for start in range(chunk_size, len(data), chunk_size):
+        yield bytes(view[start : start + chunk_size])
+
+
+def _flatten(gradients: NDArrays) -> NDArray:
+    if not gradients:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(
+        [np.asarray(layer, dtype=np.float32).ravel() for layer in gradients]
+    )
+
+
+def _split(data: bytes) -> NDArrays:
+    arrays = []
+    view = memoryview(data)
+    offset = 0
+    while offset < len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        arrays.append(raw_bytes_to_ndarray(view[offset : offset + length]))
+        offset += length
+    return arrays
+
+
+def _projection_blocks(
+    size: int, total: int, seed: int
+) -> Iterator[Tuple[int, int, NDArray]]:
+    """Yield the column blocks of the (size, total) Gaussian projection."""
+    rng = np.random.default_rng(seed)
+    step = max(1, _PROJECTION_BLOCK_BYTES // (4 * size))
+    scale = np.float32(1.0 / math.sqrt(size))
+    for start in range(0, total, step):
+        end = min(start + step, total)
+        block = rng.standard_normal((size, end - start), dtype=np.float32)
+        block *= scale
+        yield start, end, block
+
+
+def _project(flat: NDArray, size: int, seed: int) -> NDArray:
+    sketch = np.zeros(size, dtype=np.float32)
+    for start, end, block in _projection_blocks(size, flat.size, seed):
+        sketch += block @ flat[start:end]
+    return sketch
+
+
+def _project_back(sketch: NDArray, total: int, seed: int) -> NDArray:
+    flat = np.empty(total, dtype=np.float32)
+    for start, end, block in _projection_blocks(sketch.size, total, seed):
+        flat[start:end] = sketch @ block
+    return flat
@@ -0,0 +1,90 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Gradient compression tests."""
+
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from .gradient_codec import decode_gradients, encode_gradients, iter_chunks
+from .typing import NDArray
+
+
+def _gradients() -> List[NDArray]:
+    rng = np.random.default_rng(0)
+    return [
+        rng.standard_normal((20, 30)),
+        rng.standard_normal(30),
+        np.array(1.5, dtype=np.float32),
+    ]
+
+
+@pytest.mark.parametrize("codec", ["none", "float16"])
+def test_dense_codecs(codec: str) -> None:
+    """Test that dense codecs keep every entry."""
+    # Prepare
+    gradients = _gradients()
+
+    # Execute
+    actual = decode_gradients(encode_gradients(gradients, codec))
+
+    # Assert
+    for expected, layer in zip(gradients, actual):
+        assert layer.shape == np.shape(expected)
+        np.testing.assert_allclose(layer, expected, rtol=1e-3)
+
+
+def test_topk() -> None:
+    """Test that top-k keeps the largest entries and zeroes the others."""
+    # Prepare
+    gradients = [np.array([[0.1, -5.0], [0.2, 3.0]]), np.array([-0.3, 4.0])]
+
+    # Execute
+    data = encode_gradients(gradients, "topk", ratio=0.5)
+    actual = decode_gradients(data)
+
+    # Assert
+    np.testing.assert_allclose(actual[0], [[0.0, -5.0], [0.0, 3.0]])
+    np.testing.assert_allclose(actual[1], [0.0, 4.0])
+
+
+def test_projection_preserves_distances() -> None:
+    """Test that sketches with a shared seed approximate distances."""
+    # Prepare
+    rng = np.random.default_rng(1)
+    first = [rng.standard_normal((100, 100))]
+    second = [first[0] + rng.standard_normal((100, 100))]
+
+    # Execute
+    data = [
+        encode_gradients(g, "projection", ratio=0.1, seed=7) for g in [first, second]
+    ]
+    sketches = [decode_gradients(d, sketch=True)[0] for d in data]
+    estimate = decode_gradients(data[0])
+
+    # Assert
+    assert len(data[0]) < first[0].nbytes / 10
+    assert estimate[0].shape == (100, 100)
+    expected = np.linalg.norm(first[0] - second[0]) ** 2
+    actual = np.linalg.norm(sketches[0] - sketches[1]) ** 2
+    assert actual == pytest.approx(expected, rel=0.2)
+
+
+def test_iter_chunks() -> None:
+    """Test that chunks cover the data and empty data gives one chunk."""
+    assert list(iter_chunks(b"abcdefg", 3)) == [b"abc", b"def", b"g"]
+    assert list(iter_chunks(b"", 3)) == [b""]
@@ -15,6 +15,7 @@
 """Parameter conversion."""
 
 
+import struct
 from io import BytesIO
 from typing import cast
 
@@ -22,15 +23,49 @@ import numpy as np
 
 from .typing import NDArray, NDArrays, Parameters
 
+# Tensors serialized with `np.save` (.npy format)
+TENSOR_TYPE_NUMPY = "numpy.ndarray"
+# Tensors serialized as a fixed header followed by the raw array buffer
+TENSOR_TYPE_NUMPY_RAW = "numpy.ndarray.raw"
 
-def ndarrays_to_parameters(ndarrays: NDArrays) -> Parameters:
-    """Convert NumPy ndarrays to parameters object."""
+# Raw header: dtype string (e.g., "<f4", padded with NUL bytes) and ndim,
+# followed by one uint64 per dimension. The header is padded to a multiple of
+# `_RAW_ALIGNMENT` bytes so that the buffer following it stays aligned.
+_RAW_HEADER = struct.Struct("<8sI")
+_RAW_DIM = struct.Struct("<Q")
+_RAW_ALIGNMENT = 16
+
+
+def ndarrays_to_parameters(
+    ndarrays: NDArrays, tensor_type: str = TENSOR_TYPE_NUMPY
+) -> Parameters:
+    """Convert NumPy ndarrays to parameters object.
+
+    Parameters
+    ----------
+    ndarrays : NDArrays
+        The NumPy ndarrays to convert.
+    tensor_type : str (default: "numpy.ndarray")
+        The wire format of the tensors. `TENSOR_TYPE_NUMPY` uses the .npy
+        format, `TENSOR_TYPE_NUMPY_RAW` a compact header followed by the raw
+        array buffer, which can be decoded without copying. Any other value
+        falls back to the .npy format.
+    """
+    if tensor_type == TENSOR_TYPE_NUMPY_RAW:
+        tensors = [ndarray_to_raw_bytes(ndarray) for ndarray in ndarrays]
+        return Parameters(tensors=tensors, tensor_type=TENSOR_TYPE_NUMPY_RAW)
     tensors = [ndarray_to_bytes(ndarray) for ndarray in ndarrays]
-    return Parameters(tensors=tensors, tensor_type="numpy.ndarray")
+    return Parameters(tensors=tensors, tensor_type=TENSOR_TYPE_NUMPY)
 
 
 def parameters_to_ndarrays(parameters: Parameters) -> NDArrays:
-    """Convert parameters object to NumPy ndarrays."""
+    """Convert parameters object to NumPy ndarrays.
+
+    The wire format is selected by `parameters.tensor_type`. Tensors in the raw
+    format are returned as read-only views on `parameters.tensors`.
+    """
+    if parameters.tensor_type == TENSOR_TYPE_NUMPY_RAW:
+        return [raw_bytes_to_ndarray(tensor) for tensor in parameters.tensors]
     return [bytes_to_ndarray(tensor) for tensor in parameters.tensors]
 
 
@@ -52,3 +87,40 @@ def bytes_to_ndarray(tensor: bytes) -> NDArray:
     # Source: https://numpy.org/doc/stable/reference/generated/numpy.load.html
     ndarray_deserialized = np.load(bytes_io, allow_pickle=False)
     return cast(NDArray, ndarray_deserialized)
+
+
+def ndarray_to_raw_bytes(ndarray: NDArray) -> bytes:
+    """Serialize NumPy ndarray to a fixed header followed by its raw buffer."""
+    if ndarray.dtype.hasobject:
+        raise ValueError("Arrays containing Python objects cannot be serialized")
+    dtype = ndarray.dtype.str.encode("ascii")
+    if len(dtype) > 8:
+        raise ValueError(f"Unsupported dtype: {ndarray.dtype}")
+    header = _RAW_HEADER.pack(dtype, ndarray.ndim) + b"".join(
+        _RAW_DIM.pack(dim) for dim in ndarray.shape
+    )
+    header += b"\0" * (-len(header) % _RAW_ALIGNMENT)
+    # Flat byte view on the (contiguous) array, only copies non-contiguous arrays
+    buffer = np.ascontiguousarray(ndarray).reshape(-1).view(np.uint8)
+    return b"".join((header, buffer.data))
+
+
+def raw_bytes_to_ndarray(tensor: bytes) -> NDArray:
+    """Deserialize NumPy ndarray from raw bytes without copying the buffer.
+
+    The returned array is a read-only view on `tensor`.
+    """
+    dtype, ndim = _RAW_HEADER.unpack_from(tensor)
+    shape = tuple(
+        _RAW_DIM.unpack_from(tensor, _RAW_HEADER.size + i * _RAW_DIM.size)[0]
+        for i in range(ndim)
+    )
+    offset = _RAW_HEADER.size + ndim * _RAW_DIM.size
+    offset += -offset % _RAW_ALIGNMENT
+    ndarray = np.frombuffer(
+        tensor,
+        dtype=np.dtype(dtype.rstrip(b"\0").decode("ascii")),
+        count=int(np.prod(shape)),
+        offset=offset,
+    )
+    return cast(NDArray, ndarray.reshape(shape))
@@ -21,7 +21,16 @@ tests.
 import numpy as np
 import pytest
 
-from .parameter import bytes_to_ndarray, ndarray_to_bytes
+from .parameter import (
+    TENSOR_TYPE_NUMPY_RAW,
+    bytes_to_ndarray,
+    ndarray_to_bytes,
+    ndarray_to_raw_bytes,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+    raw_bytes_to_ndarray,
+)
+from .typing import NDArray
 
 
 def test_serialisation_deserialisation() -> None:
@@ -37,3 +46,50 @@ def test_serialisation_deserialisation() -> None:
     # Test false positive
     with pytest.raises(AssertionError, match="Arrays are not equal"):
         np.testing.assert_equal(arr_deserialized, np.ones((3, 2)))
+
+
+@pytest.mark.parametrize(
+    "arr",
+    [
+        np.array([[1, 2], [3, 4], [5, 6]], dtype=np.float32),
+        np.array(3.14),
+        np.zeros((0, 3)),
+        np.arange(6).reshape(2, 3).T,
+        np.array([1, 2], dtype=">i2"),
+    ],
+)
+def test_raw_serialisation_deserialisation(arr: NDArray) -> None:
+    """Test if the np.ndarray is identical after raw (de-)serialization."""
+    # Execute
+    arr_serialized = ndarray_to_raw_bytes(arr)
+    arr_deserialized = raw_bytes_to_ndarray(arr_serialized)
+
+    # Assert
+    assert arr_deserialized.dtype == arr.dtype
+    assert arr_deserialized.shape == arr.shape
+    np.testing.assert_equal(arr_deserialized, arr)
+
+
+def test_raw_deserialisation_is_a_view() -> None:
+    """Test that raw deserialization does not copy the buffer."""
+    # Prepare
+    arr = np.arange(1024, dtype=np.float64)
+    parameters = ndarrays_to_parameters([arr], tensor_type=TENSOR_TYPE_NUMPY_RAW)
+
+    # Execute
+    (arr_deserialized,) = parameters_to_ndarrays(parameters)
+
+    # Assert
+    assert parameters.tensor_type == TENSOR_TYPE_NUMPY_RAW
+    assert not arr_deserialized.flags.owndata
+    assert not arr_deserialized.flags.writeable
+    assert np.shares_memory(
+        arr_deserialized, np.frombuffer(parameters.tensors[0], np.uint8)
+    )
+    np.testing.assert_equal(arr_deserialized, arr)
+
+
+def test_raw_rejects_object_arrays() -> None:
+    """Test that arrays holding Python objects cannot be serialized."""
+    with pytest.raises(ValueError):
+        ndarray_to_raw_bytes(np.array([{}, None], dtype=object))
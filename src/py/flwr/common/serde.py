@@ -15,7 +15,7 @@
 """ProtoBuf serialization and deserialization."""
 
 
-from typing import Any, Dict, List, MutableMapping, cast, Tuple
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, cast, Tuple
 
 from flwr.proto.task_pb2 import Value
 from flwr.proto.transport_pb2 import (
@@ -35,6 +35,7 @@ from flwr.common import (
     parameters_to_ndarrays,
 )
 from . import typing
+from .context_registry import ContextRegistry
 
 import sys
 sys.path.append('../../../../../TenSEAL')
@@ -307,16 +308,26 @@ def get_parameters_res_from_proto(
 
 
 def get_contributions_ins_to_proto(
-    ins
+    ins, server_round: int = 0
 ) -> ServerMessage.GetContributionsIns:
     """Serialize `GetContributionsIns` to ProtoBuf."""
-    return ServerMessage.GetContributionsIns(gradients=ins)
+    return ServerMessage.GetContributionsIns(
+        gradients=ins, server_round=server_round
+    )
+
+def get_contributions_chunk_to_proto(
+    index: int, chunk: bytes, final: bool, server_round: int = 0
+) -> ServerMessage.GetContributionsIns:
+    """Serialize one chunk of a streamed `GetContributionsIns` to ProtoBuf."""
+    return ServerMessage.GetContributionsIns(
+        index=index, chunk=chunk, final=final, server_round=server_round
+    )
 
 def get_contributions_ins_from_proto(
     msg: ServerMessage.GetContributionsIns
-):
+) -> Iterator[bytes]:
     """Deserialize `GetContributionsIns` from ProtoBuf."""
-    return msg.gradients
+    return iter(msg.gradients)
 
 def get_contributions_res_to_proto(
     res
@@ -334,11 +345,25 @@ def get_contributions_res_from_proto(
 # === GetGradients messages ===
 
 
-def get_gradients_ins_to_proto():
-    return ServerMessage.GetGradientsIns()
+def get_gradients_ins_to_proto(
+    codec: Optional[str] = None, ratio: float = 0.01, seed: int = 0
+) -> ServerMessage.GetGradientsIns:
+    """Serialize `GetGradientsIns` to ProtoBuf."""
+    if codec is None:
+        return ServerMessage.GetGradientsIns()
+    return ServerMessage.GetGradientsIns(codec=codec, ratio=ratio, seed=seed)
 
-def get_gradients_ins_from_proto(msg:ServerMessage.GetGradientsIns):    
-    return 
+def get_gradients_ins_from_proto(
+    msg: ServerMessage.GetGradientsIns,
+) -> Optional[Dict[str, Any]]:
+    """Deserialize `GetGradientsIns` from ProtoBuf.
+
+    Returns the keyword arguments of `encode_gradients`, or None if the
+    gradients are sent as they are.
+    """
+    if not msg.codec:
+        return None
+    return {"codec": msg.codec, "ratio": msg.ratio, "seed": msg.seed}
 
 def get_gradients_res_to_proto(
     res,
@@ -396,6 +421,23 @@ def fit_res_from_proto(msg: ClientMessage.FitRes) -> typing.FitRes:
         metrics=metrics,
     )
 
+# === TenSEAL contexts ===
+
+def _context_from_proto(msg, contexts: Optional[ContextRegistry] = None):
+    """Resolve the TenSEAL context of an MK-CKKS message.
+
+    Messages sent after the `get_pk`/`send_pk` handshake only carry a `ctx_id`
+    which is resolved from the per-run `contexts` registry. Messages carrying a
+    full serialized context are still supported.
+    """
+    if msg.ctx_id:
+        if contexts is None:
+            raise ValueError(
+                f"Received ctx_id={msg.ctx_id} but no context registry is available"
+            )
+        return contexts.get(msg.ctx_id)
+    return ts.context_from(msg.ctx)
+
 # === GetPK/SendPK messages ===
 
 #send server's pk
@@ -413,8 +455,6 @@ def get_pk_ins_from_proto(msg: ServerMessage.GetPKIns) -> typing.GetPKIns:
 def get_pk_res_to_proto(ctx) -> ClientMessage.GetPKRes:
     """Serialize `GetPKRes` to ProtoBuf."""
     ctx_proto = ctx.serialize()
-    pk = ctx.public_key()
-    pk_ckks_proto = ts.ckks_vector(ctx,pk).serialize()
     return ClientMessage.GetPKRes(ctx=ctx_proto)
 
 
@@ -425,12 +465,10 @@ def get_pk_res_from_proto(msg: ClientMessage.GetPKRes) :
     return pk
 
 #send aggregated pk
-def send_pk_ins_to_proto(ctx) -> ServerMessage.SendPKIns:
+def send_pk_ins_to_proto(ctx, ctx_id: str = "") -> ServerMessage.SendPKIns:
     """Serialize `SendPKIns` to ProtoBuf."""
     ctx_proto = ctx.serialize()
-    pk = ctx.public_key()
-    pk_ckks_proto = ts.ckks_vector(ctx,pk).serialize()
-    return ServerMessage.SendPKIns(ctx=ctx_proto)
+    return ServerMessage.SendPKIns(ctx=ctx_proto, ctx_id=ctx_id)
 
 
 def send_pk_ins_from_proto(msg: ServerMessage.SendPKIns) -> typing.SendPKIns:
@@ -459,43 +497,55 @@ def get_parms_ins_from_proto(msg: ServerMessage.GetParmsIns):
     return 
 
 #send initial parameters
-def get_parms_res_to_proto(ctx,parms) -> ClientMessage.GetParmsRes:
+def get_parms_res_to_proto(ctx, parms, ctx_id: str = "") -> ClientMessage.GetParmsRes:
     """Serialize `GetParmsRes` to ProtoBuf."""
-    ctx_proto = ctx.serialize()
     parms_proto = parms.serialize()
+    if ctx_id:
+        return ClientMessage.GetParmsRes(ctx_id=ctx_id, parms=parms_proto)
+    ctx_proto = ctx.serialize()
     return ClientMessage.GetParmsRes(ctx=ctx_proto, parms=parms_proto)
 
-def get_parms_res_from_proto(msg: ClientMessage.GetParmsRes) :        
+def get_parms_res_from_proto(
+    msg: ClientMessage.GetParmsRes, contexts: Optional[ContextRegistry] = None
+):
     """Deserialize `GetParmsRes` from ProtoBuf."""
-    ctx = ts.context_from(msg.ctx)
+    ctx = _context_from_proto(msg, contexts)
     parms = ts.ckks_vector_from(ctx, msg.parms)
     return parms
 
 
 # === SendEnc messages ===
 #send encrypted vector
-def send_enc_ins_to_proto(ctx,enc):
+def send_enc_ins_to_proto(ctx, enc, ctx_id: str = ""):
     """Serialize `SendEncIns` to ProtoBuf."""
-    ctx_proto = ctx.serialize()
     enc_proto = enc.serialize()
+    if ctx_id:
+        return ServerMessage.SendEncIns(ctx_id=ctx_id, enc=enc_proto)
+    ctx_proto = ctx.serialize()
     return ServerMessage.SendEncIns(ctx=ctx_proto, enc = enc_proto)
 
-def send_enc_ins_from_proto(msg : ServerMessage.SendEncIns):
+def send_enc_ins_from_proto(
+    msg: ServerMessage.SendEncIns, contexts: Optional[ContextRegistry] = None
+):
     """Deserialize `SendEncIns` from ProtoBuf."""
-    ctx = ts.context_from(msg.ctx)
+    ctx = _context_from_proto(msg, contexts)
     enc = ts.ckks_vector_from(ctx, msg.enc)
     return enc
 
 #send each individual decryption share
-def send_enc_res_to_proto(ctx,ds):
+def send_enc_res_to_proto(ctx, ds, ctx_id: str = ""):
     """Serialize `SendEncRes` to ProtoBuf."""
-    ctx_proto = ctx.serialize()
     ds_proto = ts.PlaintextVector(ds).serialize()
+    if ctx_id:
+        return ClientMessage.SendEncRes(ctx_id=ctx_id, ds=ds_proto)
+    ctx_proto = ctx.serialize()
     return ClientMessage.SendEncRes(ctx=ctx_proto, ds = ds_proto)
 
-def send_enc_res_from_proto(msg: ClientMessage.SendEncRes):
+def send_enc_res_from_proto(
+    msg: ClientMessage.SendEncRes, contexts: Optional[ContextRegistry] = None
+):
     """Deserialize `SendEncRes` from ProtoBuf."""
-    ctx = ts.context_from(msg.ctx)
+    ctx = _context_from_proto(msg, contexts)
     ds = ts.plaintext_vector_from(ctx,msg.ds)
     return ds.data.plaintext()
 
@@ -521,16 +571,20 @@ def send_ds_ins_from_proto(msg:ServerMessage.SendDSIns):
     return typing.FitIns(parameters=parameters, config=config)
 
 #send new parameters
-def send_ds_res_to_proto(ctx, enc, loss=0, num_example=0, metrics={}):
+def send_ds_res_to_proto(ctx, enc, loss=0, num_example=0, metrics={}, ctx_id: str = ""):
     """Serialize `SendDSRes` to ProtoBuf."""
-    ctx_proto = ctx.serialize()
     enc_proto = enc.serialize()
     metrics_msg = None if metrics is None else metrics_to_proto(metrics)
+    if ctx_id:
+        return ClientMessage.SendDSRes(ctx_id=ctx_id, enc=enc_proto, loss=loss, num_examples=num_example, metrics=metrics_msg)
+    ctx_proto = ctx.serialize()
     return ClientMessage.SendDSRes(ctx = ctx_proto, enc = enc_proto, loss=loss, num_examples=num_example, metrics = metrics_msg)
 
-def send_ds_res_from_proto(msg:ClientMessage.SendDSRes):
+def send_ds_res_from_proto(
+    msg: ClientMessage.SendDSRes, contexts: Optional[ContextRegistry] = None
+):
     """Deserialize `SendDSRes` from ProtoBuf."""
-    ctx = ts.context_from(msg.ctx)
+    ctx = _context_from_proto(msg, contexts)
     enc = ts.ckks_vector_from(ctx, msg.enc)
     metrics = None if msg.metrics is None else metrics_from_proto(msg.metrics)
     return enc, typing.EvaluateRes(
@@ -17,10 +17,16 @@
 
 from typing import Dict, Union, cast
 
+import pytest
+import tenseal as ts
+
 from flwr.common import typing
 from flwr.proto import transport_pb2 as pb2
 
+from .context_registry import ContextRegistry
 from .serde import (
+    get_parms_res_from_proto,
+    get_parms_res_to_proto,
     named_values_from_proto,
     named_values_to_proto,
     scalar_from_proto,
@@ -157,3 +163,55 @@ def test_named_values_serialization_deserialization() -> None:
                 assert elm1 == elm2
         else:
             assert expected == actual
+
+
+def _ckks_context() -> ts.Context:
+    ctx = ts.context(ts.SCHEME_TYPE.CKKS, 8192, coeff_mod_bit_sizes=[60, 40, 40, 60])
+    ctx.global_scale = 2**40
+    return ctx
+
+
+def test_get_parms_res_with_ctx_id() -> None:
+    """Test that a registered context is referenced by id instead of serialized."""
+    # Prepare
+    ctx = _ckks_context()
+    contexts = ContextRegistry()
+    ctx_id = contexts.register(ctx)
+    parms = ts.ckks_vector(ctx, [1.0, 2.0, 3.0])
+
+    # Execute
+    msg = get_parms_res_to_proto(ctx, parms, ctx_id=ctx_id)
+    deserialized = get_parms_res_from_proto(msg, contexts)
+
+    # Assert
+    assert msg.ctx_id == ctx_id
+    assert msg.ctx == b""
+    assert deserialized.decrypt() == pytest.approx([1.0, 2.0, 3.0], abs=1e-3)
+
+
+def test_get_parms_res_without_ctx_id() -> None:
+    """Test that the full context is still sent when no id was negotiated."""
+    # Prepare
+    ctx = _ckks_context()
+    parms = ts.ckks_vector(ctx, [1.0, 2.0, 3.0])
+
+    # Execute
+    msg = get_parms_res_to_proto(ctx, parms)
+    deserialized = get_parms_res_from_proto(msg)
+
+    # Assert
+    assert msg.ctx_id == ""
+    assert len(msg.ctx) > 0
+    assert deserialized.decrypt(ctx.secret_key()) == pytest.approx(
+        [1.0, 2.0, 3.0], abs=1e-3
+    )
+
+
+def test_get_parms_res_unknown_ctx_id() -> None:
+    """Test that an unknown context id is rejected."""
+    # Prepare
+    msg = pb2.ClientMessage.GetParmsRes(ctx_id="unknown", parms=b"")
+
+    # Execute & Assert
+    with pytest.raises(KeyError):
+        get_parms_res_from_proto(msg, ContextRegistry())
@@ -0,0 +1,234 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Sampled Shapley value estimation for contribution evaluation."""
+
+
+import concurrent.futures
+import itertools
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from .typing import NDArray
+
+Coalition = FrozenSet[Hashable]
+UtilityFn = Callable[[Coalition], float]
+
+
+class ShapleyEstimator:
+    """Truncated Monte-Carlo estimate of the Shapley values of participants.
+
+    Small games (at most `exact_max_participants` participants) are solved
+    exactly from the utilities of all coalitions. Larger games sample random
+    permutations of the participants and average the marginal contribution of
+    each participant in every permutation. A permutation is truncated once the
+    utility of its prefix is within `truncation_tolerance` (relative) of the
+    utility of the grand coalition, and sampling stops early once the estimates
+    change by less than `convergence_tolerance` (relative) between two batches.
+
+    Coalition utilities are cached in a bounded LRU cache. The utility of a
+    coalition depends on the model of the round, so the cache is only kept
+    across calls to `estimate` for the same `server_round`. Utilities are
+    evaluated on a thread pool, one permutation per task.
+
+    Parameters
+    ----------
+    utility_fn : Callable[[FrozenSet[Hashable]], float]
+        Utility of a coalition, e.g., the accuracy of the model aggregated from
+        the updates of the coalition members. Must accept the empty coalition
+        and be safe to call from several threads.
+    max_permutations : Optional[int] (default: None)
+        Maximum number of sampled permutations. Defaults to
+        `20 * len(participants)`.
+    min_permutations : int (default: 10)
+        Number of permutations sampled before checking for convergence.
+    truncation_tolerance : float (default: 0.01)
+        Relative distance to the grand coalition utility below which the
+        remaining marginal contributions of a permutation are taken as zero.
+    convergence_tolerance : float (default: 0.05)
+        Relative change of the estimates below which sampling stops.
+    exact_max_participants : int (default: 6)
+        Games with at most this many participants are solved exactly.
+    max_workers : Optional[int] (default: None)
+        Number of threads evaluating coalitions.
+    cache_size : int (default: 65536)
+        Maximum number of cached coalition utilities.
+    seed : Optional[int] (default: None)
+        Seed of the permutation sampler.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(
+        self,
+        utility_fn: UtilityFn,
+        *,
+        max_permutations: Optional[int] = None,
+        min_permutations: int = 10,
+        truncation_tolerance: float = 0.01,
+        convergence_tolerance: float = 0.05,
+        exact_max_participants: int = 6,
+        max_workers: Optional[int] = None,
+        cache_size: int = 65536,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.utility_fn = utility_fn
+        self.max_permutations = max_permutations
+        self.min_permutations = min_permutations
+        self.truncation_tolerance = truncation_tolerance
+        self.convergence_tolerance = convergence_tolerance
+        self.exact_max_participants = exact_max_participants
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.evaluations = 0
+        self.num_permutations = 0
+        self._rng = np.random.default_rng(seed)
+        self._cache: "OrderedDict[Coalition, float]" = OrderedDict()
+        self._cache_round: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Return the state of the estimator without its lock for pickling."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the state of the estimator and create a new lock."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def utility(self, coalition: Coalition) -> float:
+        """Return the (cached) utility of `coalition`."""
+        with self._lock:
+            if coalition in self._cache:
+                self._cache.move_to_end(coalition)
+                return self._cache[coalition]
+        value = float(self.utility_fn(coalition))
+        with self._lock:
+            self.evaluations += 1
+            self._cache[coalition] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    def clear_cache(self) -> None:
+        """Forget all cached coalition utilities."""
+        with self._lock:
+            self._cache.clear()
+
+    def estimate(
+        self, participants: Sequence[Hashable], server_round: Optional[int] = None
+    ) -> Dict[Hashable, float]:
+        """Estimate the Shapley value of every participant.
+
+        Cached utilities are reused if `server_round` is the round of the
+        previous call, and forgotten otherwise, e.g., if it is `None`.
+        """
+        with self._lock:
+            if server_round is None or server_round != self._cache_round:
+                self._cache.clear()
+            self._cache_round = server_round
+        players = list(participants)
+        if not players:
+            return {}
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as executor:
+            if len(players) <= self.exact_max_participants:
+                values = self._exact(players, executor)
+            else:
+                values = self._sampled(players, executor)
+        return dict(zip(players, values.tolist()))
+
+    def _exact(
+        self,
+        players: List[Hashable],
+        executor: concurrent.futures.Executor,
+    ) -> NDArray:
+        num_players = len(players)
+        coalitions = [
+            frozenset(subset)
+            for size in range(num_players + 1)
+            for subset in itertools.combinations(players, size)
+        ]
+        utilities = dict(zip(coalitions, executor.map(self.utility, coalitions)))
+        weights = [
+            math.factorial(size)
+            * math.factorial(num_players - size - 1)
+            / math.factorial(num_players)
+            for size in range(num_players)
+        ]
+        values = np.zeros(num_players)
+        for i, player in enumerate(players):
+            for coalition in coalitions:
+                if player not in coalition:
+                    marginal = utilities[coalition | {player}] - utilities[coalition]
+                    values[i] += weights[len(coalition)] * marginal
+        self.num_permutations = math.factorial(num_players)
+        return values
+
+    def _sampled(
+        self,
+        players: List[Hashable],
+        executor: concurrent.futures.Executor,
+    ) -> NDArray:
+        num_players = len(players)
+        max_permutations = self.max_permutations or 20 * num_players
+        empty_utility = self.utility(frozenset())
+        full_utility = self.utility(frozenset(players))
+        threshold = self.truncation_tolerance * abs(full_utility)
+
+        def _marginals(permutation: NDArray) -> NDArray:
+            marginals = np.zeros(num_players)
+            prefix: Coalition = frozenset()
+            previous = empty_utility
+            for index in permutation:
+                if abs(full_utility - previous) < threshold:
+                    break
+                prefix = prefix | {players[index]}
+                current = self.utility(prefix)
+                marginals[index] = current - previous
+                previous = current
+            return marginals
+
+        # Same default as ThreadPoolExecutor
+        batch_size = self.max_workers or min(32, (os.cpu_count() or 1) + 4)
+        totals = np.zeros(num_players)
+        count = 0
+        previous_estimate: Optional[NDArray] = None
+        while count < max_permutations:
+            batch = [
+                self._rng.permutation(num_players)
+                for _ in range(min(batch_size, max_permutations - count))
+            ]
+            for marginals in executor.map(_marginals, batch):
+                totals += marginals
+            count += len(batch)
+            estimate = totals / count
+            if count >= self.min_permutations:
+                if previous_estimate is not None and self._converged(
+                    previous_estimate, estimate
+                ):
+                    break
+                previous_estimate = estimate
+        self.num_permutations = count
+        return totals / count
+
+    def _converged(self, previous: NDArray, current: NDArray) -> bool:
+        scale = max(float(np.max(np.abs(current))), 1e-12)
+        change = float(np.max(np.abs(current - previous)))
+        return change / scale < self.convergence_tolerance
@@ -0,0 +1,99 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Shapley value estimation tests."""
+
+
+from typing import FrozenSet, Hashable
+
+import pytest
+
+from .shapley import ShapleyEstimator
+
+WEIGHTS = {f"client_{i}": float(i) for i in range(12)}
+
+
+def _additive(coalition: FrozenSet[Hashable]) -> float:
+    return sum(WEIGHTS[str(c)] for c in coalition)
+
+
+def test_exact_glove_game() -> None:
+    """Test the exact solution of a game with known Shapley values."""
+
+    # Prepare: one left glove, two right gloves
+    def utility(coalition: FrozenSet[Hashable]) -> float:
+        return float("left" in coalition and bool({"right1", "right2"} & coalition))
+
+    estimator = ShapleyEstimator(utility)
+
+    # Execute
+    values = estimator.estimate(["left", "right1", "right2"])
+
+    # Assert
+    assert values["left"] == pytest.approx(2 / 3)
+    assert values["right1"] == pytest.approx(1 / 6)
+    assert values["right2"] == pytest.approx(1 / 6)
+
+
+def test_sampled_additive_game() -> None:
+    """Test that sampling recovers the values of an additive game."""
+    # Prepare
+    estimator = ShapleyEstimator(
+        _additive, truncation_tolerance=0.0, max_workers=4, seed=0
+    )
+
+    # Execute
+    values = estimator.estimate(list(WEIGHTS))
+
+    # Assert
+    assert values == pytest.approx(WEIGHTS)
+    assert estimator.num_permutations < 20 * len(WEIGHTS)
+
+
+def test_truncation_skips_evaluations() -> None:
+    """Test that permutations stop once the prefix reaches the full utility."""
+
+    # Prepare: only the first two clients matter
+    def utility(coalition: FrozenSet[Hashable]) -> float:
+        return float(len({"client_0", "client_1"} & coalition))
+
+    truncated = ShapleyEstimator(utility, max_permutations=50, seed=0)
+    full = ShapleyEstimator(
+        utility, max_permutations=50, truncation_tolerance=0.0, seed=0
+    )
+
+    # Execute
+    truncated.estimate(list(WEIGHTS))
+    full.estimate(list(WEIGHTS))
+
+    # Assert
+    assert truncated.evaluations < full.evaluations
+
+
+def test_cache_is_kept_within_a_round() -> None:
+    """Test that coalition utilities are only reused in the same round."""
+    # Prepare
+    estimator = ShapleyEstimator(_additive)
+    participants = ["client_1", "client_2", "client_3"]
+    estimator.estimate(participants, server_round=1)
+    evaluations = estimator.evaluations
+
+    # Execute
+    estimator.estimate(participants, server_round=1)
+    evaluations_same_round = estimator.evaluations
+    estimator.estimate(participants, server_round=2)
+
+    # Assert
+    assert evaluations_same_round == evaluations
+    assert estimator.evaluations == 2 * evaluations
@@ -34,9 +34,13 @@ from flwr.server.strategy import Strategy
 
 from .driver_client_proxy import DriverClientProxy
 from .grpc_driver import GrpcDriver
+from .task_multiplexer import TaskMultiplexer
 
 DEFAULT_SERVER_ADDRESS_DRIVER = "[::]:9091"
 
+# Seconds the Driver API holds a GetNodes request until nodes join or leave
+GET_NODES_TIMEOUT = 3.0
+
 ERROR_MESSAGE_DRIVER_NOT_CONNECTED = """
 [Driver] Error: Not connected.
 
@@ -115,6 +119,9 @@ def start_driver(  # pylint: disable=too-many-arguments, too-many-locals
     driver.connect()
     lock = threading.Lock()
 
+    # Push and pull the tasks of all client proxies together
+    multiplexer = TaskMultiplexer(driver)
+
     # Initialize the Driver API server and config
     initialized_server, initialized_config = init_defaults(
         server=server,
@@ -135,6 +142,7 @@ def start_driver(  # pylint: disable=too-many-arguments, too-many-locals
             driver,
             initialized_server.client_manager(),
             lock,
+            multiplexer,
         ),
     )
     thread.start()
@@ -146,6 +154,7 @@ def start_driver(  # pylint: disable=too-many-arguments, too-many-locals
     )
 
     # Stop the Driver API server and the thread
+    multiplexer.close()
     with lock:
         driver.disconnect()
     thread.join()
@@ -159,12 +168,17 @@ def update_client_manager(
     driver: GrpcDriver,
     client_manager: ClientManager,
     lock: threading.Lock,
+    multiplexer: Optional[TaskMultiplexer] = None,
 ) -> None:
     """Update the nodes list in the client manager.
 
-    This function periodically communicates with the associated driver to get all
-    node_ids. Each node_id is then converted into a `DriverClientProxy` instance
-    and stored in the `registered_nodes` dictionary with node_id as key.
+    This function asks the associated driver for the nodes which joined or left
+    since the last membership version it has seen, waiting for up to
+    `GET_NODES_TIMEOUT` seconds for a change, and gets all node_ids from Driver
+    APIs without membership versions every 3 seconds. Each node_id is converted
+    into a `DriverClientProxy` instance and stored in the `registered_nodes`
+    dictionary with node_id as key. All proxies share `multiplexer`, if given,
+    to push and pull their tasks.
 
     New nodes will be added to the ClientManager via `client_manager.register()`,
     and dead nodes will be removed from the ClientManager via
@@ -175,36 +189,46 @@ def update_client_manager(
 
     # Loop until the driver is disconnected
     registered_nodes: Dict[int, DriverClientProxy] = {}
+    version = 0
     while True:
         with lock:
             # End the while loop if the driver is disconnected
             if driver.stub is None:
                 break
             get_nodes_res = driver.get_nodes(
-                req=driver_pb2.GetNodesRequest(run_id=run_id)
+                req=driver_pb2.GetNodesRequest(
+                    run_id=run_id, since_version=version, timeout=GET_NODES_TIMEOUT
+                )
             )
-        all_node_ids = {node.node_id for node in get_nodes_res.nodes}
-        dead_nodes = set(registered_nodes).difference(all_node_ids)
-        new_nodes = all_node_ids.difference(registered_nodes)
+        if get_nodes_res.incremental:
+            new_nodes = {node.node_id for node in get_nodes_res.joined_nodes}
+            dead_nodes = {node.node_id for node in get_nodes_res.left_nodes}
+        else:
+            all_node_ids = {node.node_id for node in get_nodes_res.nodes}
+            dead_nodes = set(registered_nodes).difference(all_node_ids)
+            new_nodes = all_node_ids.difference(registered_nodes)
+        version = get_nodes_res.version
 
         # Unregister dead nodes
-        for node_id in dead_nodes:
+        for node_id in dead_nodes.intersection(registered_nodes):
             client_proxy = registered_nodes[node_id]
             client_manager.unregister(client_proxy)
             del registered_nodes[node_id]
 
         # Register new nodes
-        for node_id in new_nodes:
+        for node_id in new_nodes.difference(registered_nodes):
             client_proxy = DriverClientProxy(
                 node_id=node_id,
                 driver=driver,
                 anonymous=False,
                 run_id=run_id,
+                multiplexer=multiplexer,
             )
             if client_manager.register(client_proxy):
                 registered_nodes[node_id] = client_proxy
             else:
                 raise RuntimeError("Could not register node.")
 
-        # Sleep for 3 seconds
-        time.sleep(3)
+        # Without membership versions, sleep for 3 seconds
+        if version == 0:
+            time.sleep(3)
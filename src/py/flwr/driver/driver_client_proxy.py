@@ -15,6 +15,7 @@
 """Flower ClientProxy implementation for Driver API."""
 
 
+import concurrent.futures
 import time
 from typing import List, Optional, cast
 
@@ -24,19 +25,34 @@ from flwr.proto import driver_pb2, node_pb2, task_pb2, transport_pb2
 from flwr.server.client_proxy import ClientProxy
 
 from .grpc_driver import GrpcDriver
+from .task_multiplexer import TaskMultiplexer
 
 SLEEP_TIME = 1
 
 
 class DriverClientProxy(ClientProxy):
-    """Flower client proxy which delegates work using the Driver API."""
-
-    def __init__(self, node_id: int, driver: GrpcDriver, anonymous: bool, run_id: int):
+    """Flower client proxy which delegates work using the Driver API.
+
+    If a `TaskMultiplexer` is given, the TaskIns of all proxies sharing it are
+    pushed and their TaskRes pulled together. Otherwise, each proxy pushes its
+    own TaskIns and polls for its TaskRes every `SLEEP_TIME` seconds.
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        node_id: int,
+        driver: GrpcDriver,
+        anonymous: bool,
+        run_id: int,
+        multiplexer: Optional[TaskMultiplexer] = None,
+    ):
         super().__init__(str(node_id))
         self.node_id = node_id
         self.driver = driver
         self.run_id = run_id
         self.anonymous = anonymous
+        self.multiplexer = multiplexer
 
     def get_properties(
         self, ins: common.GetPropertiesIns, timeout: Optional[float]
@@ -117,6 +133,17 @@ class DriverClientProxy(ClientProxy):
                 legacy_server_message=server_message,
             ),
         )
+        if self.multiplexer is not None:
+            future = self.multiplexer.submit(task_ins)
+            try:
+                task_res = future.result(timeout=timeout or None)
+            except concurrent.futures.TimeoutError as err:
+                future.cancel()
+                raise RuntimeError("Timeout reached") from err
+            return serde.client_message_from_proto(  # type: ignore
+                task_res.task.legacy_client_message
+            )
+
         push_task_ins_req = driver_pb2.PushTaskInsRequest(task_ins_list=[task_ins])
 
         # Send TaskIns to Driver API
@@ -0,0 +1,213 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Multiplexing of the tasks of many client proxies over the Driver API."""
+
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from logging import WARNING
+from typing import Dict, List, Optional, Tuple
+
+from flwr.common.logger import log
+from flwr.proto import driver_pb2, node_pb2, task_pb2
+
+from .grpc_driver import GrpcDriver
+
+# Minimum time between two PullTaskRes requests which returned no TaskRes
+MIN_PULL_INTERVAL = 1.0
+
+# A TaskIns waiting to be pushed and the future of its TaskRes
+_QueuedTaskIns = Tuple[task_pb2.TaskIns, "Future[task_pb2.TaskRes]"]
+
+
+class TaskMultiplexer:
+    """Send the TaskIns of many client proxies in a few Driver API requests.
+
+    `submit` queues a TaskIns and returns a future of its TaskRes. A push thread
+    sends all TaskIns queued in the meantime in one `PushTaskInsRequest`, and a
+    pull thread asks for the TaskRes of all outstanding TaskIns in one
+    `PullTaskResRequest`, which the Driver API holds for up to `pull_timeout`
+    seconds until a TaskRes is available (long-poll).
+
+    Parameters
+    ----------
+    driver : GrpcDriver
+        A connected `GrpcDriver`.
+    pull_timeout : float (default: 1.0)
+        Maximum number of seconds the Driver API holds a PullTaskRes request.
+        This also bounds the delay until the TaskRes of TaskIns pushed while
+        a request is pending are noticed.
+    """
+
+    def __init__(self, driver: GrpcDriver, pull_timeout: float = 1.0) -> None:
+        self.driver = driver
+        self.pull_timeout = pull_timeout
+        self._queue: "queue.Queue[Optional[_QueuedTaskIns]]" = queue.Queue()
+        # Futures of pushed TaskIns, by task_id, until their TaskRes is pulled
+        self._pending: Dict[str, "Future[task_pb2.TaskRes]"] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._push_loop, daemon=True),
+            threading.Thread(target=self._pull_loop, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, task_ins: task_pb2.TaskIns) -> "Future[task_pb2.TaskRes]":
+        """Schedule a TaskIns and return a future of its TaskRes.
+
+        Cancel the future to stop waiting for the TaskRes.
+        """
+        future: "Future[task_pb2.TaskRes]" = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("TaskMultiplexer is closed")
+            self._queue.put((task_ins, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the threads and fail the futures without TaskRes."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            futures = list(self._pending.values())
+            self._pending.clear()
+        self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=self.pull_timeout + 1.0)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                futures.append(item[1])
+        for future in futures:
+            _set_exception(future, RuntimeError("TaskMultiplexer is closed"))
+
+    def _push_loop(self) -> None:
+        """Push the TaskIns queued since the last push in one request."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            batch = [(ins, future) for ins, future in batch if not future.cancelled()]
+            if batch:
+                self._push(batch)
+
+    def _push(self, batch: List[_QueuedTaskIns]) -> None:
+        try:
+            res = self.driver.push_task_ins(
+                req=driver_pb2.PushTaskInsRequest(
+                    task_ins_list=[task_ins for task_ins, _ in batch]
+                )
+            )
+            if len(res.task_ids) != len(batch):
+                raise ValueError("Unexpected number of task_ids")
+        except Exception as err:  # pylint: disable=broad-except
+            for _, future in batch:
+                _set_exception(future, err)
+            return
+
+        with self._condition:
+            for task_id, (task_ins, future) in zip(res.task_ids, batch):
+                if task_id == "":
+                    node_id = task_ins.task.consumer.node_id
+                    _set_exception(
+                        future,
+                        ValueError(f"Failed to schedule task for node {node_id}"),
+                    )
+                else:
+                    self._pending[task_id] = future
+            self._condition.notify_all()
+
+    def _pull_loop(self) -> None:
+        """Pull the TaskRes of all outstanding TaskIns in one request."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                # Forget the TaskIns whose proxies stopped waiting
+                for task_id, future in list(self._pending.items()):
+                    if future.cancelled():
+                        del self._pending[task_id]
+                task_ids = list(self._pending)
+            if not task_ids:
+                continue
+
+            start = time.monotonic()
+            try:
+                res = self.driver.pull_task_res(
+                    req=driver_pb2.PullTaskResRequest(
+                        node=node_pb2.Node(node_id=0, anonymous=True),
+                        task_ids=task_ids,
+                        timeout=self.pull_timeout,
+                    )
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                if self._closed:
+                    return
+                log(WARNING, "PullTaskRes failed: %s", err)
+                res = driver_pb2.PullTaskResResponse()
+
+            with self._condition:
+                for task_res in res.task_res_list:
+                    if not task_res.task.ancestry:
+                        continue
+                    pending = self._pending.pop(task_res.task.ancestry[0], None)
+                    if pending is not None:
+                        _set_result(pending, task_res)
+
+            # Do not hammer Driver APIs which answer at once without TaskRes
+            if not res.task_res_list:
+                interval = min(MIN_PULL_INTERVAL, self.pull_timeout)
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self._closed,
+                        timeout=max(0.0, interval - (time.monotonic() - start)),
+                    )
+
+
+def _set_result(future: "Future[task_pb2.TaskRes]", result: task_pb2.TaskRes) -> None:
+    try:
+        future.set_result(result)
+    except InvalidStateError:
+        # Cancelled in the meantime
+        pass
+
+
+def _set_exception(
+    future: "Future[task_pb2.TaskRes]", exception: BaseException
+) -> None:
+    try:
+        future.set_exception(exception)
+    except InvalidStateError:
+        # Cancelled in the meantime
+        pass
@@ -0,0 +1,163 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""TaskMultiplexer tests."""
+
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+
+from flwr import common
+from flwr.proto import driver_pb2, node_pb2, task_pb2
+from flwr.proto.transport_pb2 import ClientMessage, Scalar
+from flwr.server.driver.driver_servicer import DriverServicer
+from flwr.server.state import StateFactory
+
+from .driver_client_proxy import DriverClientProxy
+from .task_multiplexer import TaskMultiplexer
+
+
+class _Driver:
+    """GrpcDriver calling a DriverServicer in-process."""
+
+    def __init__(self, state_factory: StateFactory) -> None:
+        self.servicer = DriverServicer(state_factory)
+        self.pushed: List[int] = []
+
+    def push_task_ins(
+        self, req: driver_pb2.PushTaskInsRequest
+    ) -> driver_pb2.PushTaskInsResponse:
+        self.pushed.append(len(req.task_ins_list))
+        return self.servicer.PushTaskIns(req, MagicMock())
+
+    def pull_task_res(
+        self, req: driver_pb2.PullTaskResRequest
+    ) -> driver_pb2.PullTaskResResponse:
+        return self.servicer.PullTaskRes(req, MagicMock())
+
+
+def _run_nodes(
+    state_factory: StateFactory, node_ids: List[int], stop: threading.Event
+) -> None:
+    """Reply to each GetPropertiesIns with the node_id of the consumer."""
+    state = state_factory.state()
+    while not stop.is_set():
+        for node_id in node_ids:
+            for task_ins in state.get_task_ins(node_id=node_id, limit=None):
+                state.store_task_res(
+                    task_pb2.TaskRes(
+                        task_id="",
+                        group_id="",
+                        run_id=task_ins.run_id,
+                        task=task_pb2.Task(
+                            producer=node_pb2.Node(node_id=node_id, anonymous=False),
+                            consumer=node_pb2.Node(node_id=0, anonymous=True),
+                            ancestry=[task_ins.task_id],
+                            legacy_client_message=ClientMessage(
+                                get_properties_res=ClientMessage.GetPropertiesRes(
+                                    properties={"node_id": Scalar(sint64=node_id)}
+                                )
+                            ),
+                        ),
+                    )
+                )
+        stop.wait(0.01)
+
+
+def test_proxies_share_multiplexer() -> None:
+    """Test that each proxy receives the TaskRes of its own node."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    state = state_factory.state()
+    run_id = state.create_run()
+    node_ids = [state.create_node() for _ in range(20)]
+    driver = _Driver(state_factory)
+    multiplexer = TaskMultiplexer(driver, pull_timeout=5.0)  # type: ignore
+    proxies = [
+        DriverClientProxy(
+            node_id=node_id,
+            driver=driver,  # type: ignore
+            anonymous=False,
+            run_id=run_id,
+            multiplexer=multiplexer,
+        )
+        for node_id in node_ids
+    ]
+    stop = threading.Event()
+    nodes = threading.Thread(target=_run_nodes, args=(state_factory, node_ids, stop))
+    nodes.start()
+
+    # Execute
+    with ThreadPoolExecutor(max_workers=len(proxies)) as executor:
+        results = list(
+            executor.map(
+                lambda proxy: proxy.get_properties(
+                    common.GetPropertiesIns(config={}), timeout=10.0
+                ),
+                proxies,
+            )
+        )
+    stop.set()
+    nodes.join()
+    multiplexer.close()
+
+    # Assert
+    assert [res.properties["node_id"] for res in results] == node_ids
+    assert sum(driver.pushed) == len(proxies)
+
+
+def test_proxy_timeout() -> None:
+    """Test that a proxy stops waiting for a TaskRes after its timeout."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    state = state_factory.state()
+    run_id = state.create_run()
+    driver = _Driver(state_factory)
+    multiplexer = TaskMultiplexer(driver, pull_timeout=0.1)  # type: ignore
+    proxy = DriverClientProxy(
+        node_id=state.create_node(),
+        driver=driver,  # type: ignore
+        anonymous=False,
+        run_id=run_id,
+        multiplexer=multiplexer,
+    )
+
+    # Execute & Assert
+    with pytest.raises(RuntimeError, match="Timeout reached"):
+        proxy.get_properties(common.GetPropertiesIns(config={}), timeout=0.3)
+    multiplexer.close()
+
+
+def test_schedule_failure() -> None:
+    """Test that TaskIns the Driver API cannot store fail their future."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    driver = _Driver(state_factory)
+    multiplexer = TaskMultiplexer(driver)  # type: ignore
+    proxy = DriverClientProxy(
+        node_id=1,
+        driver=driver,  # type: ignore
+        anonymous=False,
+        run_id=12345,  # Unknown run_id
+        multiplexer=multiplexer,
+    )
+
+    # Execute & Assert
+    with pytest.raises(ValueError, match="Failed to schedule task for node 1"):
+        proxy.get_properties(common.GetPropertiesIns(config={}), timeout=5.0)
+    multiplexer.close()
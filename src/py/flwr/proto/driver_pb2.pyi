@@ -66,13 +66,21 @@ class GetNodesRequest(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
     RUN_ID_FIELD_NUMBER: builtins.int
+    SINCE_VERSION_FIELD_NUMBER: builtins.int
+    TIMEOUT_FIELD_NUMBER: builtins.int
     run_id: builtins.int
+    since_version: builtins.int
+    """Only return the nodes which joined or left after this membership version"""
+    timeout: builtins.float
+    """Seconds to wait for node changes if there is none yet (0 means no waiting)"""
     def __init__(
         self,
         *,
         run_id: builtins.int = ...,
+        since_version: builtins.int = ...,
+        timeout: builtins.float = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal["run_id", b"run_id"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["run_id", b"run_id", "since_version", b"since_version", "timeout", b"timeout"]) -> None: ...
 
 global___GetNodesRequest = GetNodesRequest
 
@@ -81,14 +89,31 @@ class GetNodesResponse(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
     NODES_FIELD_NUMBER: builtins.int
+    VERSION_FIELD_NUMBER: builtins.int
+    INCREMENTAL_FIELD_NUMBER: builtins.int
+    JOINED_NODES_FIELD_NUMBER: builtins.int
+    LEFT_NODES_FIELD_NUMBER: builtins.int
+    @property
+    def nodes(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[flwr.proto.node_pb2.Node]:
+        """All nodes, unless `incremental` is set"""
+    version: builtins.int
+    """Membership version the response is up to date with"""
+    incremental: builtins.bool
+    """Whether only the nodes which joined or left after `since_version` are set"""
+    @property
+    def joined_nodes(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[flwr.proto.node_pb2.Node]: ...
     @property
-    def nodes(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[flwr.proto.node_pb2.Node]: ...
+    def left_nodes(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[flwr.proto.node_pb2.Node]: ...
     def __init__(
         self,
         *,
         nodes: collections.abc.Iterable[flwr.proto.node_pb2.Node] | None = ...,
+        version: builtins.int = ...,
+        incremental: builtins.bool = ...,
+        joined_nodes: collections.abc.Iterable[flwr.proto.node_pb2.Node] | None = ...,
+        left_nodes: collections.abc.Iterable[flwr.proto.node_pb2.Node] | None = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal["nodes", b"nodes"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["incremental", b"incremental", "joined_nodes", b"joined_nodes", "left_nodes", b"left_nodes", "nodes", b"nodes", "version", b"version"]) -> None: ...
 
 global___GetNodesResponse = GetNodesResponse
 
@@ -134,18 +159,22 @@ class PullTaskResRequest(google.protobuf.message.Message):
 
     NODE_FIELD_NUMBER: builtins.int
     TASK_IDS_FIELD_NUMBER: builtins.int
+    TIMEOUT_FIELD_NUMBER: builtins.int
     @property
     def node(self) -> flwr.proto.node_pb2.Node: ...
     @property
     def task_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    timeout: builtins.float
+    """Seconds to wait for TaskRes if none is available yet (0 means no waiting)"""
     def __init__(
         self,
         *,
         node: flwr.proto.node_pb2.Node | None = ...,
         task_ids: collections.abc.Iterable[builtins.str] | None = ...,
+        timeout: builtins.float = ...,
     ) -> None: ...
     def HasField(self, field_name: typing_extensions.Literal["node", b"node"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["node", b"node", "task_ids", b"task_ids"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["node", b"node", "task_ids", b"task_ids", "timeout", b"timeout"]) -> None: ...
 
 global___PullTaskResRequest = PullTaskResRequest
 
@@ -98,18 +98,26 @@ class PullTaskInsRequest(google.protobuf.message.Message):
 
     NODE_FIELD_NUMBER: builtins.int
     TASK_IDS_FIELD_NUMBER: builtins.int
+    MAX_TASK_INS_FIELD_NUMBER: builtins.int
+    TIMEOUT_FIELD_NUMBER: builtins.int
     @property
     def node(self) -> flwr.proto.node_pb2.Node: ...
     @property
     def task_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    max_task_ins: builtins.int
+    """Maximum number of TaskIns the node accepts in one response (0 means 1)"""
+    timeout: builtins.float
+    """Seconds to wait for TaskIns if none is available yet (0 means no waiting)"""
     def __init__(
         self,
         *,
         node: flwr.proto.node_pb2.Node | None = ...,
         task_ids: collections.abc.Iterable[builtins.str] | None = ...,
+        max_task_ins: builtins.int = ...,
+        timeout: builtins.float = ...,
     ) -> None: ...
     def HasField(self, field_name: typing_extensions.Literal["node", b"node"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["node", b"node", "task_ids", b"task_ids"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["max_task_ins", b"max_task_ins", "node", b"node", "task_ids", b"task_ids", "timeout", b"timeout"]) -> None: ...
 
 global___PullTaskInsRequest = PullTaskInsRequest
 
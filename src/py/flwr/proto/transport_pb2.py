@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1a\x66lwr/proto/transport.proto\x12\nflwr.proto\"9\n\x06Status\x12\x1e\n\x04\x63ode\x18\x01 \x01(\x0e\x32\x10.flwr.proto.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\"2\n\nParameters\x12\x0f\n\x07tensors\x18\x01 \x03(\x0c\x12\x13\n\x0btensor_type\x18\x02 \x01(\t\"\xef\x11\n\rServerMessage\x12?\n\rreconnect_ins\x18\x01 \x01(\x0b\x32&.flwr.proto.ServerMessage.ReconnectInsH\x00\x12H\n\x12get_properties_ins\x18\x02 \x01(\x0b\x32*.flwr.proto.ServerMessage.GetPropertiesInsH\x00\x12H\n\x12get_parameters_ins\x18\x03 \x01(\x0b\x32*.flwr.proto.ServerMessage.GetParametersInsH\x00\x12\x33\n\x07\x66it_ins\x18\x04 \x01(\x0b\x32 .flwr.proto.ServerMessage.FitInsH\x00\x12=\n\x0c\x65valuate_ins\x18\x05 \x01(\x0b\x32%.flwr.proto.ServerMessage.EvaluateInsH\x00\x12<\n\x0csend_sum_ins\x18\x06 \x01(\x0b\x32$.flwr.proto.ServerMessage.SendSumInsH\x00\x12\x38\n\nget_pk_ins\x18\x07 \x01(\x0b\x32\".flwr.proto.ServerMessage.GetPKInsH\x00\x12:\n\x0bsend_pk_ins\x18\x08 \x01(\x0b\x32#.flwr.proto.ServerMessage.SendPKInsH\x00\x12>\n\rget_parms_ins\x18\t \x01(\x0b\x32%.flwr.proto.ServerMessage.GetParmsInsH\x00\x12<\n\x0csend_enc_ins\x18\n \x01(\x0b\x32$.flwr.proto.ServerMessage.SendEncInsH\x00\x12:\n\x0bsend_ds_ins\x18\x0b \x01(\x0b\x32#.flwr.proto.ServerMessage.SendDSInsH\x00\x12>\n\rsend_eval_ins\x18\x0c \x01(\x0b\x32%.flwr.proto.ServerMessage.SendEvalInsH\x00\x12\x46\n\x11get_gradients_ins\x18\r \x01(\x0b\x32).flwr.proto.ServerMessage.GetGradientsInsH\x00\x12=\n\x0cidentify_ins\x18\x0e \x01(\x0b\x32%.flwr.proto.ServerMessage.IdentifyInsH\x00\x12N\n\x15get_contributions_ins\x18\x0f \x01(\x0b\x32-.flwr.proto.ServerMessage.GetContributionsInsH\x00\x12I\n\x13send_public_key_ins\x18\x10 \x01(\x0b\x32*.flwr.proto.ServerMessage.SendPublicKeyInsH\x00\x1a\x1f\n\x0cReconnectIns\x12\x0f\n\x07seconds\x18\x01 \x01(\x03\x1a\x9d\x01\n\x10GetPropertiesIns\x12\x46\n\x06\x63onfig\x18\x01 \x03(\x0b\x32\x36.flwr.proto.ServerMessage.GetPropertiesIns.ConfigEntry\x1a\x41\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\x9d\x01\n\x10GetParametersIns\x12\x46\n\x06\x63onfig\x18\x01 \x03(\x0b\x32\x36.flwr.proto.ServerMessage.GetParametersIns.ConfigEntry\x1a\x41\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\xb5\x01\n\x06\x46itIns\x12*\n\nparameters\x18\x01 \x01(\x0b\x32\x16.flwr.proto.Parameters\x12<\n\x06\x63onfig\x18\x02 \x03(\x0b\x32,.flwr.proto.ServerMessage.FitIns.ConfigEntry\x1a\x41\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\xbf\x01\n\x0b\x45valuateIns\x12*\n\nparameters\x18\x01 \x01(\x0b\x32\x16.flwr.proto.Parameters\x12\x41\n\x06\x63onfig\x18\x02 \x03(\x0b\x32\x31.flwr.proto.ServerMessage.EvaluateIns.ConfigEntry\x1a\x41\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\x17\n\x08GetPKIns\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x1a\x18\n\tSendPKIns\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x1a\r\n\x0bGetParmsIns\x1a&\n\nSendEncIns\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x12\x0b\n\x03\x65nc\x18\x02 \x01(\x0c\x1a\xbb\x01\n\tSendDSIns\x12*\n\nparameters\x18\x01 \x01(\x0b\x32\x16.flwr.proto.Parameters\x12?\n\x06\x63onfig\x18\x02 \x03(\x0b\x32/.flwr.proto.ServerMessage.SendDSIns.ConfigEntry\x1a\x41\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\r\n\x0bSendEvalIns\x1a\x11\n\x0fGetGradientsIns\x1a\r\n\x0bIdentifyIns\x1a(\n\x13GetContributionsIns\x12\x11\n\tgradients\x18\x01 \x03(\x0c\x1a\x39\n\nSendSumIns\x12\x13\n\x06status\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x0b\n\x03sum\x18\x02 \x03(\x03\x42\t\n\x07_status\x1a%\n\x10SendPublicKeyIns\x12\x11\n\tpublickey\x18\x01 \x03(\tB\x05\n\x03msg\"\xed\x16\n\rClientMessage\x12\x41\n\x0e\x64isconnect_res\x18\x01 \x01(\x0b\x32\'.flwr.proto.ClientMessage.DisconnectResH\x00\x12H\n\x12get_properties_res\x18\x02 \x01(\x0b\x32*.flwr.proto.ClientMessage.GetPropertiesResH\x00\x12H\n\x12get_parameters_res\x18\x03 \x01(\x0b\x32*.flwr.proto.ClientMessage.GetParametersResH\x00\x12\x33\n\x07\x66it_res\x18\x04 \x01(\x0b\x32 .flwr.proto.ClientMessage.FitResH\x00\x12=\n\x0c\x65valuate_res\x18\x05 \x01(\x0b\x32%.flwr.proto.ClientMessage.EvaluateResH\x00\x12<\n\x0csend_val_res\x18\x06 \x01(\x0b\x32$.flwr.proto.ClientMessage.SendValResH\x00\x12>\n\rget_share_res\x18\x07 \x01(\x0b\x32%.flwr.proto.ClientMessage.GetShareResH\x00\x12\x38\n\nget_pk_res\x18\x08 \x01(\x0b\x32\".flwr.proto.ClientMessage.GetPKResH\x00\x12:\n\x0bsend_pk_res\x18\t \x01(\x0b\x32#.flwr.proto.ClientMessage.SendPKResH\x00\x12>\n\rget_parms_res\x18\n \x01(\x0b\x32%.flwr.proto.ClientMessage.GetParmsResH\x00\x12<\n\x0csend_enc_res\x18\x0b \x01(\x0b\x32$.flwr.proto.ClientMessage.SendEncResH\x00\x12:\n\x0bsend_ds_res\x18\x0c \x01(\x0b\x32#.flwr.proto.ClientMessage.SendDSResH\x00\x12>\n\rsend_eval_res\x18\r \x01(\x0b\x32%.flwr.proto.ClientMessage.SendEvalResH\x00\x12\x46\n\x11get_gradients_res\x18\x0e \x01(\x0b\x32).flwr.proto.ClientMessage.GetGradientsResH\x00\x12=\n\x0cidentify_res\x18\x0f \x01(\x0b\x32%.flwr.proto.ClientMessage.IdentifyResH\x00\x12N\n\x15get_contributions_res\x18\x10 \x01(\x0b\x32-.flwr.proto.ClientMessage.GetContributionsResH\x00\x12I\n\x13send_public_key_res\x18\x11 \x01(\x0b\x32*.flwr.proto.ClientMessage.SendPublicKeyResH\x00\x1a\x33\n\rDisconnectRes\x12\"\n\x06reason\x18\x01 \x01(\x0e\x32\x12.flwr.proto.Reason\x1a\xcd\x01\n\x10GetPropertiesRes\x12\"\n\x06status\x18\x01 \x01(\x0b\x32\x12.flwr.proto.Status\x12N\n\nproperties\x18\x02 \x03(\x0b\x32:.flwr.proto.ClientMessage.GetPropertiesRes.PropertiesEntry\x1a\x45\n\x0fPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\x62\n\x10GetParametersRes\x12\"\n\x06status\x18\x01 \x01(\x0b\x32\x12.flwr.proto.Status\x12*\n\nparameters\x18\x02 \x01(\x0b\x32\x16.flwr.proto.Parameters\x1a\xf2\x01\n\x06\x46itRes\x12\"\n\x06status\x18\x01 \x01(\x0b\x32\x12.flwr.proto.Status\x12*\n\nparameters\x18\x02 \x01(\x0b\x32\x16.flwr.proto.Parameters\x12\x14\n\x0cnum_examples\x18\x03 \x01(\x03\x12>\n\x07metrics\x18\x04 \x03(\x0b\x32-.flwr.proto.ClientMessage.FitRes.MetricsEntry\x1a\x42\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\xde\x01\n\x0b\x45valuateRes\x12\"\n\x06status\x18\x01 \x01(\x0b\x32\x12.flwr.proto.Status\x12\x0c\n\x04loss\x18\x02 \x01(\x02\x12\x14\n\x0cnum_examples\x18\x03 \x01(\x03\x12\x43\n\x07metrics\x18\x04 \x03(\x0b\x32\x32.flwr.proto.ClientMessage.EvaluateRes.MetricsEntry\x1a\x42\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\x39\n\nSendValRes\x12\x13\n\x06status\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x0b\n\x03val\x18\x02 \x01(\x03\x42\t\n\x07_status\x1a\x1c\n\x0bGetShareRes\x12\r\n\x05share\x18\x01 \x03(\x03\x1a\x17\n\x08GetPKRes\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x1a\x1b\n\tSendPKRes\x12\x0e\n\x06status\x18\x01 \x01(\t\x1a)\n\x0bGetParmsRes\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x12\r\n\x05parms\x18\x02 \x01(\x0c\x1a%\n\nSendEncRes\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x12\n\n\x02\x64s\x18\x02 \x01(\x0c\x1a\xd0\x01\n\tSendDSRes\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x12\x0b\n\x03\x65nc\x18\x02 \x01(\x0c\x12\x0c\n\x04loss\x18\x03 \x01(\x02\x12\x14\n\x0cnum_examples\x18\x04 \x01(\x03\x12\x41\n\x07metrics\x18\x05 \x03(\x0b\x32\x30.flwr.proto.ClientMessage.SendDSRes.MetricsEntry\x1a\x42\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\xba\x01\n\x0bSendEvalRes\x12\x0c\n\x04loss\x18\x01 \x01(\x02\x12\x14\n\x0cnum_examples\x18\x02 \x01(\x03\x12\x43\n\x07metrics\x18\x03 \x03(\x0b\x32\x32.flwr.proto.ClientMessage.SendEvalRes.MetricsEntry\x1a\x42\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\xc2\x01\n\x0fSendEvalLastRes\x12\x0c\n\x04loss\x18\x01 \x01(\x02\x12\x14\n\x0cnum_examples\x18\x02 \x01(\x03\x12G\n\x07metrics\x18\x03 \x03(\x0b\x32\x36.flwr.proto.ClientMessage.SendEvalLastRes.MetricsEntry\x1a\x42\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a$\n\x0fGetGradientsRes\x12\x11\n\tgradients\x18\x01 \x01(\x0c\x1a\x1d\n\x0bIdentifyRes\x12\x0e\n\x06status\x18\x01 \x03(\t\x1a,\n\x13GetContributionsRes\x12\x15\n\rcontributions\x18\x01 \x03(\x02\x1a\x12\n\x10SendPublicKeyResB\x05\n\x03msg\"i\n\x06Scalar\x12\x10\n\x06\x64ouble\x18\x01 \x01(\x01H\x00\x12\x10\n\x06sint64\x18\x08 \x01(\x12H\x00\x12\x0e\n\x04\x62ool\x18\r \x01(\x08H\x00\x12\x10\n\x06string\x18\x0e \x01(\tH\x00\x12\x0f\n\x05\x62ytes\x18\x0f \x01(\x0cH\x00\x42\x08\n\x06scalar*\x8d\x01\n\x04\x43ode\x12\x06\n\x02OK\x10\x00\x12\"\n\x1eGET_PROPERTIES_NOT_IMPLEMENTED\x10\x01\x12\"\n\x1eGET_PARAMETERS_NOT_IMPLEMENTED\x10\x02\x12\x17\n\x13\x46IT_NOT_IMPLEMENTED\x10\x03\x12\x1c\n\x18\x45VALUATE_NOT_IMPLEMENTED\x10\x04*[\n\x06Reason\x12\x0b\n\x07UNKNOWN\x10\x00\x12\r\n\tRECONNECT\x10\x01\x12\x16\n\x12POWER_DISCONNECTED\x10\x02\x12\x14\n\x10WIFI_UNAVAILABLE\x10\x03\x12\x07\n\x03\x41\x43K\x10\x04\x32S\n\rFlowerService\x12\x42\n\x04Join\x12\x19.flwr.proto.ClientMessage\x1a\x19.flwr.proto.ServerMessage\"\x00(\x01\x30\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1a\x66lwr/proto/transport.proto\x12\nflwr.proto\"9\n\x06Status\x12\x1e\n\x04\x63ode\x18\x01 \x01(\x0e\x32\x10.flwr.proto.Code\x12\x0f\n\x07message\x18\x02 \x01(\t\"2\n\nParameters\x12\x0f\n\x07tensors\x18\x01 \x03(\x0c\x12\x13\n\x0btensor_type\x18\x02 \x01(\t\"\xfe\x12\n\rServerMessage\x12?\n\rreconnect_ins\x18\x01 \x01(\x0b\x32&.flwr.proto.ServerMessage.ReconnectInsH\x00\x12H\n\x12get_properties_ins\x18\x02 \x01(\x0b\x32*.flwr.proto.ServerMessage.GetPropertiesInsH\x00\x12H\n\x12get_parameters_ins\x18\x03 \x01(\x0b\x32*.flwr.proto.ServerMessage.GetParametersInsH\x00\x12\x33\n\x07\x66it_ins\x18\x04 \x01(\x0b\x32 .flwr.proto.ServerMessage.FitInsH\x00\x12=\n\x0c\x65valuate_ins\x18\x05 \x01(\x0b\x32%.flwr.proto.ServerMessage.EvaluateInsH\x00\x12<\n\x0csend_sum_ins\x18\x06 \x01(\x0b\x32$.flwr.proto.ServerMessage.SendSumInsH\x00\x12\x38\n\nget_pk_ins\x18\x07 \x01(\x0b\x32\".flwr.proto.ServerMessage.GetPKInsH\x00\x12:\n\x0bsend_pk_ins\x18\x08 \x01(\x0b\x32#.flwr.proto.ServerMessage.SendPKInsH\x00\x12>\n\rget_parms_ins\x18\t \x01(\x0b\x32%.flwr.proto.ServerMessage.GetParmsInsH\x00\x12<\n\x0csend_enc_ins\x18\n \x01(\x0b\x32$.flwr.proto.ServerMessage.SendEncInsH\x00\x12:\n\x0bsend_ds_ins\x18\x0b \x01(\x0b\x32#.flwr.proto.ServerMessage.SendDSInsH\x00\x12>\n\rsend_eval_ins\x18\x0c \x01(\x0b\x32%.flwr.proto.ServerMessage.SendEvalInsH\x00\x12\x46\n\x11get_gradients_ins\x18\r \x01(\x0b\x32).flwr.proto.ServerMessage.GetGradientsInsH\x00\x12=\n\x0cidentify_ins\x18\x0e \x01(\x0b\x32%.flwr.proto.ServerMessage.IdentifyInsH\x00\x12N\n\x15get_contributions_ins\x18\x0f \x01(\x0b\x32-.flwr.proto.ServerMessage.GetContributionsInsH\x00\x12I\n\x13send_public_key_ins\x18\x10 \x01(\x0b\x32*.flwr.proto.ServerMessage.SendPublicKeyInsH\x00\x1a\x1f\n\x0cReconnectIns\x12\x0f\n\x07seconds\x18\x01 \x01(\x03\x1a\x9d\x01\n\x10GetPropertiesIns\x12\x46\n\x06\x63onfig\x18\x01 \x03(\x0b\x32\x36.flwr.proto.ServerMessage.GetPropertiesIns.ConfigEntry\x1a\x41\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\x9d\x01\n\x10GetParametersIns\x12\x46\n\x06\x63onfig\x18\x01 \x03(\x0b\x32\x36.flwr.proto.ServerMessage.GetParametersIns.ConfigEntry\x1a\x41\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\xb5\x01\n\x06\x46itIns\x12*\n\nparameters\x18\x01 \x01(\x0b\x32\x16.flwr.proto.Parameters\x12<\n\x06\x63onfig\x18\x02 \x03(\x0b\x32,.flwr.proto.ServerMessage.FitIns.ConfigEntry\x1a\x41\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\xbf\x01\n\x0b\x45valuateIns\x12*\n\nparameters\x18\x01 \x01(\x0b\x32\x16.flwr.proto.Parameters\x12\x41\n\x06\x63onfig\x18\x02 \x03(\x0b\x32\x31.flwr.proto.ServerMessage.EvaluateIns.ConfigEntry\x1a\x41\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\x17\n\x08GetPKIns\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x1a(\n\tSendPKIns\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x12\x0e\n\x06\x63tx_id\x18\x02 \x01(\t\x1a\r\n\x0bGetParmsIns\x1a\x36\n\nSendEncIns\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x12\x0b\n\x03\x65nc\x18\x02 \x01(\x0c\x12\x0e\n\x06\x63tx_id\x18\x03 \x01(\t\x1a\xbb\x01\n\tSendDSIns\x12*\n\nparameters\x18\x01 \x01(\x0b\x32\x16.flwr.proto.Parameters\x12?\n\x06\x63onfig\x18\x02 \x03(\x0b\x32/.flwr.proto.ServerMessage.SendDSIns.ConfigEntry\x1a\x41\n\x0b\x43onfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\r\n\x0bSendEvalIns\x1a=\n\x0fGetGradientsIns\x12\r\n\x05\x63odec\x18\x01 \x01(\t\x12\r\n\x05ratio\x18\x02 \x01(\x01\x12\x0c\n\x04seed\x18\x03 \x01(\x03\x1a\r\n\x0bIdentifyIns\x1ak\n\x13GetContributionsIns\x12\x11\n\tgradients\x18\x01 \x03(\x0c\x12\r\n\x05index\x18\x02 \x01(\x03\x12\r\n\x05\x63hunk\x18\x03 \x01(\x0c\x12\r\n\x05\x66inal\x18\x04 \x01(\x08\x12\x14\n\x0cserver_round\x18\x05 \x01(\x03\x1a\x39\n\nSendSumIns\x12\x13\n\x06status\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x0b\n\x03sum\x18\x02 \x03(\x03\x42\t\n\x07_status\x1a%\n\x10SendPublicKeyIns\x12\x11\n\tpublickey\x18\x01 \x03(\tB\x05\n\x03msg\"\x9d\x17\n\rClientMessage\x12\x41\n\x0e\x64isconnect_res\x18\x01 \x01(\x0b\x32\'.flwr.proto.ClientMessage.DisconnectResH\x00\x12H\n\x12get_properties_res\x18\x02 \x01(\x0b\x32*.flwr.proto.ClientMessage.GetPropertiesResH\x00\x12H\n\x12get_parameters_res\x18\x03 \x01(\x0b\x32*.flwr.proto.ClientMessage.GetParametersResH\x00\x12\x33\n\x07\x66it_res\x18\x04 \x01(\x0b\x32 .flwr.proto.ClientMessage.FitResH\x00\x12=\n\x0c\x65valuate_res\x18\x05 \x01(\x0b\x32%.flwr.proto.ClientMessage.EvaluateResH\x00\x12<\n\x0csend_val_res\x18\x06 \x01(\x0b\x32$.flwr.proto.ClientMessage.SendValResH\x00\x12>\n\rget_share_res\x18\x07 \x01(\x0b\x32%.flwr.proto.ClientMessage.GetShareResH\x00\x12\x38\n\nget_pk_res\x18\x08 \x01(\x0b\x32\".flwr.proto.ClientMessage.GetPKResH\x00\x12:\n\x0bsend_pk_res\x18\t \x01(\x0b\x32#.flwr.proto.ClientMessage.SendPKResH\x00\x12>\n\rget_parms_res\x18\n \x01(\x0b\x32%.flwr.proto.ClientMessage.GetParmsResH\x00\x12<\n\x0csend_enc_res\x18\x0b \x01(\x0b\x32$.flwr.proto.ClientMessage.SendEncResH\x00\x12:\n\x0bsend_ds_res\x18\x0c \x01(\x0b\x32#.flwr.proto.ClientMessage.SendDSResH\x00\x12>\n\rsend_eval_res\x18\r \x01(\x0b\x32%.flwr.proto.ClientMessage.SendEvalResH\x00\x12\x46\n\x11get_gradients_res\x18\x0e \x01(\x0b\x32).flwr.proto.ClientMessage.GetGradientsResH\x00\x12=\n\x0cidentify_res\x18\x0f \x01(\x0b\x32%.flwr.proto.ClientMessage.IdentifyResH\x00\x12N\n\x15get_contributions_res\x18\x10 \x01(\x0b\x32-.flwr.proto.ClientMessage.GetContributionsResH\x00\x12I\n\x13send_public_key_res\x18\x11 \x01(\x0b\x32*.flwr.proto.ClientMessage.SendPublicKeyResH\x00\x1a\x33\n\rDisconnectRes\x12\"\n\x06reason\x18\x01 \x01(\x0e\x32\x12.flwr.proto.Reason\x1a\xcd\x01\n\x10GetPropertiesRes\x12\"\n\x06status\x18\x01 \x01(\x0b\x32\x12.flwr.proto.Status\x12N\n\nproperties\x18\x02 \x03(\x0b\x32:.flwr.proto.ClientMessage.GetPropertiesRes.PropertiesEntry\x1a\x45\n\x0fPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\x62\n\x10GetParametersRes\x12\"\n\x06status\x18\x01 \x01(\x0b\x32\x12.flwr.proto.Status\x12*\n\nparameters\x18\x02 \x01(\x0b\x32\x16.flwr.proto.Parameters\x1a\xf2\x01\n\x06\x46itRes\x12\"\n\x06status\x18\x01 \x01(\x0b\x32\x12.flwr.proto.Status\x12*\n\nparameters\x18\x02 \x01(\x0b\x32\x16.flwr.proto.Parameters\x12\x14\n\x0cnum_examples\x18\x03 \x01(\x03\x12>\n\x07metrics\x18\x04 \x03(\x0b\x32-.flwr.proto.ClientMessage.FitRes.MetricsEntry\x1a\x42\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\xde\x01\n\x0b\x45valuateRes\x12\"\n\x06status\x18\x01 \x01(\x0b\x32\x12.flwr.proto.Status\x12\x0c\n\x04loss\x18\x02 \x01(\x02\x12\x14\n\x0cnum_examples\x18\x03 \x01(\x03\x12\x43\n\x07metrics\x18\x04 \x03(\x0b\x32\x32.flwr.proto.ClientMessage.EvaluateRes.MetricsEntry\x1a\x42\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\x39\n\nSendValRes\x12\x13\n\x06status\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x0b\n\x03val\x18\x02 \x01(\x03\x42\t\n\x07_status\x1a\x1c\n\x0bGetShareRes\x12\r\n\x05share\x18\x01 \x03(\x03\x1a\x17\n\x08GetPKRes\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x1a\x1b\n\tSendPKRes\x12\x0e\n\x06status\x18\x01 \x01(\t\x1a\x39\n\x0bGetParmsRes\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x12\r\n\x05parms\x18\x02 \x01(\x0c\x12\x0e\n\x06\x63tx_id\x18\x03 \x01(\t\x1a\x35\n\nSendEncRes\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x12\n\n\x02\x64s\x18\x02 \x01(\x0c\x12\x0e\n\x06\x63tx_id\x18\x03 \x01(\t\x1a\xe0\x01\n\tSendDSRes\x12\x0b\n\x03\x63tx\x18\x01 \x01(\x0c\x12\x0b\n\x03\x65nc\x18\x02 \x01(\x0c\x12\x0c\n\x04loss\x18\x03 \x01(\x02\x12\x14\n\x0cnum_examples\x18\x04 \x01(\x03\x12\x41\n\x07metrics\x18\x05 \x03(\x0b\x32\x30.flwr.proto.ClientMessage.SendDSRes.MetricsEntry\x12\x0e\n\x06\x63tx_id\x18\x06 \x01(\t\x1a\x42\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\xba\x01\n\x0bSendEvalRes\x12\x0c\n\x04loss\x18\x01 \x01(\x02\x12\x14\n\x0cnum_examples\x18\x02 \x01(\x03\x12\x43\n\x07metrics\x18\x03 \x03(\x0b\x32\x32.flwr.proto.ClientMessage.SendEvalRes.MetricsEntry\x1a\x42\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a\xc2\x01\n\x0fSendEvalLastRes\x12\x0c\n\x04loss\x18\x01 \x01(\x02\x12\x14\n\x0cnum_examples\x18\x02 \x01(\x03\x12G\n\x07metrics\x18\x03 \x03(\x0b\x32\x36.flwr.proto.ClientMessage.SendEvalLastRes.MetricsEntry\x1a\x42\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.flwr.proto.Scalar:\x02\x38\x01\x1a$\n\x0fGetGradientsRes\x12\x11\n\tgradients\x18\x01 \x01(\x0c\x1a\x1d\n\x0bIdentifyRes\x12\x0e\n\x06status\x18\x01 \x03(\t\x1a,\n\x13GetContributionsRes\x12\x15\n\rcontributions\x18\x01 \x03(\x02\x1a\x12\n\x10SendPublicKeyResB\x05\n\x03msg\"i\n\x06Scalar\x12\x10\n\x06\x64ouble\x18\x01 \x01(\x01H\x00\x12\x10\n\x06sint64\x18\x08 \x01(\x12H\x00\x12\x0e\n\x04\x62ool\x18\r \x01(\x08H\x00\x12\x10\n\x06string\x18\x0e \x01(\tH\x00\x12\x0f\n\x05\x62ytes\x18\x0f \x01(\x0cH\x00\x42\x08\n\x06scalar*\x8d\x01\n\x04\x43ode\x12\x06\n\x02OK\x10\x00\x12\"\n\x1eGET_PROPERTIES_NOT_IMPLEMENTED\x10\x01\x12\"\n\x1eGET_PARAMETERS_NOT_IMPLEMENTED\x10\x02\x12\x17\n\x13\x46IT_NOT_IMPLEMENTED\x10\x03\x12\x1c\n\x18\x45VALUATE_NOT_IMPLEMENTED\x10\x04*[\n\x06Reason\x12\x0b\n\x07UNKNOWN\x10\x00\x12\r\n\tRECONNECT\x10\x01\x12\x16\n\x12POWER_DISCONNECTED\x10\x02\x12\x14\n\x10WIFI_UNAVAILABLE\x10\x03\x12\x07\n\x03\x41\x43K\x10\x04\x32S\n\rFlowerService\x12\x42\n\x04Join\x12\x19.flwr.proto.ClientMessage\x1a\x19.flwr.proto.ServerMessage\"\x00(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -43,16 +43,16 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_CLIENTMESSAGE_SENDEVALRES_METRICSENTRY']._serialized_options = b'8\001'
   _globals['_CLIENTMESSAGE_SENDEVALLASTRES_METRICSENTRY']._options = None
   _globals['_CLIENTMESSAGE_SENDEVALLASTRES_METRICSENTRY']._serialized_options = b'8\001'
-  _globals['_CODE']._serialized_start=5479
-  _globals['_CODE']._serialized_end=5620
-  _globals['_REASON']._serialized_start=5622
-  _globals['_REASON']._serialized_end=5713
+  _globals['_CODE']._serialized_start=5670
+  _globals['_CODE']._serialized_end=5811
+  _globals['_REASON']._serialized_start=5813
+  _globals['_REASON']._serialized_end=5904
   _globals['_STATUS']._serialized_start=42
   _globals['_STATUS']._serialized_end=99
   _globals['_PARAMETERS']._serialized_start=101
   _globals['_PARAMETERS']._serialized_end=151
   _globals['_SERVERMESSAGE']._serialized_start=154
-  _globals['_SERVERMESSAGE']._serialized_end=2441
+  _globals['_SERVERMESSAGE']._serialized_end=2584
   _globals['_SERVERMESSAGE_RECONNECTINS']._serialized_start=1220
   _globals['_SERVERMESSAGE_RECONNECTINS']._serialized_end=1251
   _globals['_SERVERMESSAGE_GETPROPERTIESINS']._serialized_start=1254
@@ -74,79 +74,79 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_SERVERMESSAGE_GETPKINS']._serialized_start=1951
   _globals['_SERVERMESSAGE_GETPKINS']._serialized_end=1974
   _globals['_SERVERMESSAGE_SENDPKINS']._serialized_start=1976
-  _globals['_SERVERMESSAGE_SENDPKINS']._serialized_end=2000
-  _globals['_SERVERMESSAGE_GETPARMSINS']._serialized_start=2002
-  _globals['_SERVERMESSAGE_GETPARMSINS']._serialized_end=2015
-  _globals['_SERVERMESSAGE_SENDENCINS']._serialized_start=2017
-  _globals['_SERVERMESSAGE_SENDENCINS']._serialized_end=2055
-  _globals['_SERVERMESSAGE_SENDDSINS']._serialized_start=2058
-  _globals['_SERVERMESSAGE_SENDDSINS']._serialized_end=2245
+  _globals['_SERVERMESSAGE_SENDPKINS']._serialized_end=2016
+  _globals['_SERVERMESSAGE_GETPARMSINS']._serialized_start=2018
+  _globals['_SERVERMESSAGE_GETPARMSINS']._serialized_end=2031
+  _globals['_SERVERMESSAGE_SENDENCINS']._serialized_start=2033
+  _globals['_SERVERMESSAGE_SENDENCINS']._serialized_end=2087
+  _globals['_SERVERMESSAGE_SENDDSINS']._serialized_start=2090
+  _globals['_SERVERMESSAGE_SENDDSINS']._serialized_end=2277
   _globals['_SERVERMESSAGE_SENDDSINS_CONFIGENTRY']._serialized_start=1346
   _globals['_SERVERMESSAGE_SENDDSINS_CONFIGENTRY']._serialized_end=1411
-  _globals['_SERVERMESSAGE_SENDEVALINS']._serialized_start=2247
-  _globals['_SERVERMESSAGE_SENDEVALINS']._serialized_end=2260
-  _globals['_SERVERMESSAGE_GETGRADIENTSINS']._serialized_start=2262
-  _globals['_SERVERMESSAGE_GETGRADIENTSINS']._serialized_end=2279
-  _globals['_SERVERMESSAGE_IDENTIFYINS']._serialized_start=2281
-  _globals['_SERVERMESSAGE_IDENTIFYINS']._serialized_end=2294
-  _globals['_SERVERMESSAGE_GETCONTRIBUTIONSINS']._serialized_start=2296
-  _globals['_SERVERMESSAGE_GETCONTRIBUTIONSINS']._serialized_end=2336
-  _globals['_SERVERMESSAGE_SENDSUMINS']._serialized_start=2338
-  _globals['_SERVERMESSAGE_SENDSUMINS']._serialized_end=2395
-  _globals['_SERVERMESSAGE_SENDPUBLICKEYINS']._serialized_start=2397
-  _globals['_SERVERMESSAGE_SENDPUBLICKEYINS']._serialized_end=2434
-  _globals['_CLIENTMESSAGE']._serialized_start=2444
-  _globals['_CLIENTMESSAGE']._serialized_end=5369
-  _globals['_CLIENTMESSAGE_DISCONNECTRES']._serialized_start=3576
-  _globals['_CLIENTMESSAGE_DISCONNECTRES']._serialized_end=3627
-  _globals['_CLIENTMESSAGE_GETPROPERTIESRES']._serialized_start=3630
-  _globals['_CLIENTMESSAGE_GETPROPERTIESRES']._serialized_end=3835
-  _globals['_CLIENTMESSAGE_GETPROPERTIESRES_PROPERTIESENTRY']._serialized_start=3766
-  _globals['_CLIENTMESSAGE_GETPROPERTIESRES_PROPERTIESENTRY']._serialized_end=3835
-  _globals['_CLIENTMESSAGE_GETPARAMETERSRES']._serialized_start=3837
-  _globals['_CLIENTMESSAGE_GETPARAMETERSRES']._serialized_end=3935
-  _globals['_CLIENTMESSAGE_FITRES']._serialized_start=3938
-  _globals['_CLIENTMESSAGE_FITRES']._serialized_end=4180
-  _globals['_CLIENTMESSAGE_FITRES_METRICSENTRY']._serialized_start=4114
-  _globals['_CLIENTMESSAGE_FITRES_METRICSENTRY']._serialized_end=4180
-  _globals['_CLIENTMESSAGE_EVALUATERES']._serialized_start=4183
-  _globals['_CLIENTMESSAGE_EVALUATERES']._serialized_end=4405
-  _globals['_CLIENTMESSAGE_EVALUATERES_METRICSENTRY']._serialized_start=4114
-  _globals['_CLIENTMESSAGE_EVALUATERES_METRICSENTRY']._serialized_end=4180
-  _globals['_CLIENTMESSAGE_SENDVALRES']._serialized_start=4407
-  _globals['_CLIENTMESSAGE_SENDVALRES']._serialized_end=4464
-  _globals['_CLIENTMESSAGE_GETSHARERES']._serialized_start=4466
-  _globals['_CLIENTMESSAGE_GETSHARERES']._serialized_end=4494
-  _globals['_CLIENTMESSAGE_GETPKRES']._serialized_start=4496
-  _globals['_CLIENTMESSAGE_GETPKRES']._serialized_end=4519
-  _globals['_CLIENTMESSAGE_SENDPKRES']._serialized_start=4521
-  _globals['_CLIENTMESSAGE_SENDPKRES']._serialized_end=4548
-  _globals['_CLIENTMESSAGE_GETPARMSRES']._serialized_start=4550
-  _globals['_CLIENTMESSAGE_GETPARMSRES']._serialized_end=4591
-  _globals['_CLIENTMESSAGE_SENDENCRES']._serialized_start=4593
-  _globals['_CLIENTMESSAGE_SENDENCRES']._serialized_end=4630
-  _globals['_CLIENTMESSAGE_SENDDSRES']._serialized_start=4633
-  _globals['_CLIENTMESSAGE_SENDDSRES']._serialized_end=4841
-  _globals['_CLIENTMESSAGE_SENDDSRES_METRICSENTRY']._serialized_start=4114
-  _globals['_CLIENTMESSAGE_SENDDSRES_METRICSENTRY']._serialized_end=4180
-  _globals['_CLIENTMESSAGE_SENDEVALRES']._serialized_start=4844
-  _globals['_CLIENTMESSAGE_SENDEVALRES']._serialized_end=5030
-  _globals['_CLIENTMESSAGE_SENDEVALRES_METRICSENTRY']._serialized_start=4114
-  _globals['_CLIENTMESSAGE_SENDEVALRES_METRICSENTRY']._serialized_end=4180
-  _globals['_CLIENTMESSAGE_SENDEVALLASTRES']._serialized_start=5033
-  _globals['_CLIENTMESSAGE_SENDEVALLASTRES']._serialized_end=5227
-  _globals['_CLIENTMESSAGE_SENDEVALLASTRES_METRICSENTRY']._serialized_start=4114
-  _globals['_CLIENTMESSAGE_SENDEVALLASTRES_METRICSENTRY']._serialized_end=4180
-  _globals['_CLIENTMESSAGE_GETGRADIENTSRES']._serialized_start=5229
-  _globals['_CLIENTMESSAGE_GETGRADIENTSRES']._serialized_end=5265
-  _globals['_CLIENTMESSAGE_IDENTIFYRES']._serialized_start=5267
-  _globals['_CLIENTMESSAGE_IDENTIFYRES']._serialized_end=5296
-  _globals['_CLIENTMESSAGE_GETCONTRIBUTIONSRES']._serialized_start=5298
-  _globals['_CLIENTMESSAGE_GETCONTRIBUTIONSRES']._serialized_end=5342
-  _globals['_CLIENTMESSAGE_SENDPUBLICKEYRES']._serialized_start=5344
-  _globals['_CLIENTMESSAGE_SENDPUBLICKEYRES']._serialized_end=5362
-  _globals['_SCALAR']._serialized_start=5371
-  _globals['_SCALAR']._serialized_end=5476
-  _globals['_FLOWERSERVICE']._serialized_start=5715
-  _globals['_FLOWERSERVICE']._serialized_end=5798
+  _globals['_SERVERMESSAGE_SENDEVALINS']._serialized_start=2279
+  _globals['_SERVERMESSAGE_SENDEVALINS']._serialized_end=2292
+  _globals['_SERVERMESSAGE_GETGRADIENTSINS']._serialized_start=2294
+  _globals['_SERVERMESSAGE_GETGRADIENTSINS']._serialized_end=2355
+  _globals['_SERVERMESSAGE_IDENTIFYINS']._serialized_start=2357
+  _globals['_SERVERMESSAGE_IDENTIFYINS']._serialized_end=2370
+  _globals['_SERVERMESSAGE_GETCONTRIBUTIONSINS']._serialized_start=2372
+  _globals['_SERVERMESSAGE_GETCONTRIBUTIONSINS']._serialized_end=2479
+  _globals['_SERVERMESSAGE_SENDSUMINS']._serialized_start=2481
+  _globals['_SERVERMESSAGE_SENDSUMINS']._serialized_end=2538
+  _globals['_SERVERMESSAGE_SENDPUBLICKEYINS']._serialized_start=2540
+  _globals['_SERVERMESSAGE_SENDPUBLICKEYINS']._serialized_end=2577
+  _globals['_CLIENTMESSAGE']._serialized_start=2587
+  _globals['_CLIENTMESSAGE']._serialized_end=5560
+  _globals['_CLIENTMESSAGE_DISCONNECTRES']._serialized_start=3719
+  _globals['_CLIENTMESSAGE_DISCONNECTRES']._serialized_end=3770
+  _globals['_CLIENTMESSAGE_GETPROPERTIESRES']._serialized_start=3773
+  _globals['_CLIENTMESSAGE_GETPROPERTIESRES']._serialized_end=3978
+  _globals['_CLIENTMESSAGE_GETPROPERTIESRES_PROPERTIESENTRY']._serialized_start=3909
+  _globals['_CLIENTMESSAGE_GETPROPERTIESRES_PROPERTIESENTRY']._serialized_end=3978
+  _globals['_CLIENTMESSAGE_GETPARAMETERSRES']._serialized_start=3980
+  _globals['_CLIENTMESSAGE_GETPARAMETERSRES']._serialized_end=4078
+  _globals['_CLIENTMESSAGE_FITRES']._serialized_start=4081
+  _globals['_CLIENTMESSAGE_FITRES']._serialized_end=4323
+  _globals['_CLIENTMESSAGE_FITRES_METRICSENTRY']._serialized_start=4257
+  _globals['_CLIENTMESSAGE_FITRES_METRICSENTRY']._serialized_end=4323
+  _globals['_CLIENTMESSAGE_EVALUATERES']._serialized_start=4326
+  _globals['_CLIENTMESSAGE_EVALUATERES']._serialized_end=4548
+  _globals['_CLIENTMESSAGE_EVALUATERES_METRICSENTRY']._serialized_start=4257
+  _globals['_CLIENTMESSAGE_EVALUATERES_METRICSENTRY']._serialized_end=4323
+  _globals['_CLIENTMESSAGE_SENDVALRES']._serialized_start=4550
+  _globals['_CLIENTMESSAGE_SENDVALRES']._serialized_end=4607
+  _globals['_CLIENTMESSAGE_GETSHARERES']._serialized_start=4609
+  _globals['_CLIENTMESSAGE_GETSHARERES']._serialized_end=4637
+  _globals['_CLIENTMESSAGE_GETPKRES']._serialized_start=4639
+  _globals['_CLIENTMESSAGE_GETPKRES']._serialized_end=4662
+  _globals['_CLIENTMESSAGE_SENDPKRES']._serialized_start=4664
+  _globals['_CLIENTMESSAGE_SENDPKRES']._serialized_end=4691
+  _globals['_CLIENTMESSAGE_GETPARMSRES']._serialized_start=4693
+  _globals['_CLIENTMESSAGE_GETPARMSRES']._serialized_end=4750
+  _globals['_CLIENTMESSAGE_SENDENCRES']._serialized_start=4752
+  _globals['_CLIENTMESSAGE_SENDENCRES']._serialized_end=4805
+  _globals['_CLIENTMESSAGE_SENDDSRES']._serialized_start=4808
+  _globals['_CLIENTMESSAGE_SENDDSRES']._serialized_end=5032
+  _globals['_CLIENTMESSAGE_SENDDSRES_METRICSENTRY']._serialized_start=4257
+  _globals['_CLIENTMESSAGE_SENDDSRES_METRICSENTRY']._serialized_end=4323
+  _globals['_CLIENTMESSAGE_SENDEVALRES']._serialized_start=5035
+  _globals['_CLIENTMESSAGE_SENDEVALRES']._serialized_end=5221
+  _globals['_CLIENTMESSAGE_SENDEVALRES_METRICSENTRY']._serialized_start=4257
+  _globals['_CLIENTMESSAGE_SENDEVALRES_METRICSENTRY']._serialized_end=4323
+  _globals['_CLIENTMESSAGE_SENDEVALLASTRES']._serialized_start=5224
+  _globals['_CLIENTMESSAGE_SENDEVALLASTRES']._serialized_end=5418
+  _globals['_CLIENTMESSAGE_SENDEVALLASTRES_METRICSENTRY']._serialized_start=4257
+  _globals['_CLIENTMESSAGE_SENDEVALLASTRES_METRICSENTRY']._serialized_end=4323
+  _globals['_CLIENTMESSAGE_GETGRADIENTSRES']._serialized_start=5420
+  _globals['_CLIENTMESSAGE_GETGRADIENTSRES']._serialized_end=5456
+  _globals['_CLIENTMESSAGE_IDENTIFYRES']._serialized_start=5458
+  _globals['_CLIENTMESSAGE_IDENTIFYRES']._serialized_end=5487
+  _globals['_CLIENTMESSAGE_GETCONTRIBUTIONSRES']._serialized_start=5489
+  _globals['_CLIENTMESSAGE_GETCONTRIBUTIONSRES']._serialized_end=5533
+  _globals['_CLIENTMESSAGE_SENDPUBLICKEYRES']._serialized_start=5535
+  _globals['_CLIENTMESSAGE_SENDPUBLICKEYRES']._serialized_end=5553
+  _globals['_SCALAR']._serialized_start=5562
+  _globals['_SCALAR']._serialized_end=5667
+  _globals['_FLOWERSERVICE']._serialized_start=5906
+  _globals['_FLOWERSERVICE']._serialized_end=5989
 # @@protoc_insertion_point(module_scope)
@@ -284,13 +284,16 @@ class ServerMessage(google.protobuf.message.Message):
         DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
         CTX_FIELD_NUMBER: builtins.int
+        CTX_ID_FIELD_NUMBER: builtins.int
         ctx: builtins.bytes
+        ctx_id: builtins.str
         def __init__(
             self,
             *,
             ctx: builtins.bytes = ...,
+            ctx_id: builtins.str = ...,
         ) -> None: ...
-        def ClearField(self, field_name: typing_extensions.Literal["ctx", b"ctx"]) -> None: ...
+        def ClearField(self, field_name: typing_extensions.Literal["ctx", b"ctx", "ctx_id", b"ctx_id"]) -> None: ...
 
     @typing_extensions.final
     class GetParmsIns(google.protobuf.message.Message):
@@ -306,15 +309,18 @@ class ServerMessage(google.protobuf.message.Message):
 
         CTX_FIELD_NUMBER: builtins.int
         ENC_FIELD_NUMBER: builtins.int
+        CTX_ID_FIELD_NUMBER: builtins.int
         ctx: builtins.bytes
         enc: builtins.bytes
+        ctx_id: builtins.str
         def __init__(
             self,
             *,
             ctx: builtins.bytes = ...,
             enc: builtins.bytes = ...,
+            ctx_id: builtins.str = ...,
         ) -> None: ...
-        def ClearField(self, field_name: typing_extensions.Literal["ctx", b"ctx", "enc", b"enc"]) -> None: ...
+        def ClearField(self, field_name: typing_extensions.Literal["ctx", b"ctx", "ctx_id", b"ctx_id", "enc", b"enc"]) -> None: ...
 
     @typing_extensions.final
     class SendDSIns(google.protobuf.message.Message):
@@ -371,9 +377,24 @@ class ServerMessage(google.protobuf.message.Message):
     class GetGradientsIns(google.protobuf.message.Message):
         DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
+        CODEC_FIELD_NUMBER: builtins.int
+        RATIO_FIELD_NUMBER: builtins.int
+        SEED_FIELD_NUMBER: builtins.int
+        codec: builtins.str
+        """Codec of `flwr.common.gradient_codec` compressing the gradients the
+        client returns as NDArrays (empty to send them as they are), and the
+        ratio and shared seed of the codec
+        """
+        ratio: builtins.float
+        seed: builtins.int
         def __init__(
             self,
+            *,
+            codec: builtins.str = ...,
+            ratio: builtins.float = ...,
+            seed: builtins.int = ...,
         ) -> None: ...
+        def ClearField(self, field_name: typing_extensions.Literal["codec", b"codec", "ratio", b"ratio", "seed", b"seed"]) -> None: ...
 
     @typing_extensions.final
     class IdentifyIns(google.protobuf.message.Message):
@@ -388,14 +409,32 @@ class ServerMessage(google.protobuf.message.Message):
         DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
         GRADIENTS_FIELD_NUMBER: builtins.int
+        INDEX_FIELD_NUMBER: builtins.int
+        CHUNK_FIELD_NUMBER: builtins.int
+        FINAL_FIELD_NUMBER: builtins.int
+        SERVER_ROUND_FIELD_NUMBER: builtins.int
         @property
         def gradients(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.bytes]: ...
+        index: builtins.int
+        """Chunked upload: `chunk` is the next part of the gradients of the
+        `index`-th client; the contributions are returned once `final` is set
+        """
+        chunk: builtins.bytes
+        final: builtins.bool
+        server_round: builtins.int
+        """Round of the gradients, cached coalition utilities are only reused
+        within the same round (0 if unknown)
+        """
         def __init__(
             self,
             *,
             gradients: collections.abc.Iterable[builtins.bytes] | None = ...,
+            index: builtins.int = ...,
+            chunk: builtins.bytes = ...,
+            final: builtins.bool = ...,
+            server_round: builtins.int = ...,
         ) -> None: ...
-        def ClearField(self, field_name: typing_extensions.Literal["gradients", b"gradients"]) -> None: ...
+        def ClearField(self, field_name: typing_extensions.Literal["chunk", b"chunk", "final", b"final", "gradients", b"gradients", "index", b"index", "server_round", b"server_round"]) -> None: ...
 
     @typing_extensions.final
     class SendSumIns(google.protobuf.message.Message):
@@ -728,15 +767,18 @@ class ClientMessage(google.protobuf.message.Message):
 
         CTX_FIELD_NUMBER: builtins.int
         PARMS_FIELD_NUMBER: builtins.int
+        CTX_ID_FIELD_NUMBER: builtins.int
         ctx: builtins.bytes
         parms: builtins.bytes
+        ctx_id: builtins.str
         def __init__(
             self,
             *,
             ctx: builtins.bytes = ...,
             parms: builtins.bytes = ...,
+            ctx_id: builtins.str = ...,
         ) -> None: ...
-        def ClearField(self, field_name: typing_extensions.Literal["ctx", b"ctx", "parms", b"parms"]) -> None: ...
+        def ClearField(self, field_name: typing_extensions.Literal["ctx", b"ctx", "ctx_id", b"ctx_id", "parms", b"parms"]) -> None: ...
 
     @typing_extensions.final
     class SendEncRes(google.protobuf.message.Message):
@@ -744,15 +786,18 @@ class ClientMessage(google.protobuf.message.Message):
 
         CTX_FIELD_NUMBER: builtins.int
         DS_FIELD_NUMBER: builtins.int
+        CTX_ID_FIELD_NUMBER: builtins.int
         ctx: builtins.bytes
         ds: builtins.bytes
+        ctx_id: builtins.str
         def __init__(
             self,
             *,
             ctx: builtins.bytes = ...,
             ds: builtins.bytes = ...,
+            ctx_id: builtins.str = ...,
         ) -> None: ...
-        def ClearField(self, field_name: typing_extensions.Literal["ctx", b"ctx", "ds", b"ds"]) -> None: ...
+        def ClearField(self, field_name: typing_extensions.Literal["ctx", b"ctx", "ctx_id", b"ctx_id", "ds", b"ds"]) -> None: ...
 
     @typing_extensions.final
     class SendDSRes(google.protobuf.message.Message):
@@ -781,12 +826,14 @@ class ClientMessage(google.protobuf.message.Message):
         LOSS_FIELD_NUMBER: builtins.int
         NUM_EXAMPLES_FIELD_NUMBER: builtins.int
         METRICS_FIELD_NUMBER: builtins.int
+        CTX_ID_FIELD_NUMBER: builtins.int
         ctx: builtins.bytes
         enc: builtins.bytes
         loss: builtins.float
         num_examples: builtins.int
         @property
         def metrics(self) -> google.protobuf.internal.containers.MessageMap[builtins.str, global___Scalar]: ...
+        ctx_id: builtins.str
         def __init__(
             self,
             *,
@@ -795,8 +842,9 @@ class ClientMessage(google.protobuf.message.Message):
             loss: builtins.float = ...,
             num_examples: builtins.int = ...,
             metrics: collections.abc.Mapping[builtins.str, global___Scalar] | None = ...,
+            ctx_id: builtins.str = ...,
         ) -> None: ...
-        def ClearField(self, field_name: typing_extensions.Literal["ctx", b"ctx", "enc", b"enc", "loss", b"loss", "metrics", b"metrics", "num_examples", b"num_examples"]) -> None: ...
+        def ClearField(self, field_name: typing_extensions.Literal["ctx", b"ctx", "ctx_id", b"ctx_id", "enc", b"enc", "loss", b"loss", "metrics", b"metrics", "num_examples", b"num_examples"]) -> None: ...
 
     @typing_extensions.final
     class SendEvalRes(google.protobuf.message.Message):
@@ -17,6 +17,7 @@
 
 import argparse
 import importlib.util
+import os
 import sys
 import threading
 from dataclasses import dataclass
@@ -42,19 +43,20 @@ from flwr.proto.driver_pb2_grpc import add_DriverServicer_to_server
 from flwr.proto.fleet_pb2_grpc import add_FleetServicer_to_server
 from flwr.proto.transport_pb2_grpc import add_FlowerServiceServicer_to_server
 from flwr.server.client_manager import ClientManager, SimpleClientManager
-from flwr.server.driver.driver_servicer import DriverServicer
+from flwr.server.driver.driver_servicer import AsyncDriverServicer, DriverServicer
 from flwr.server.fleet.grpc_bidi.driver_client_manager import DriverClientManager
 from flwr.server.fleet.grpc_bidi.flower_service_servicer import FlowerServiceServicer
 from flwr.server.fleet.grpc_bidi.grpc_server import (
+    generic_create_grpc_aio_server,
     generic_create_grpc_server,
     start_grpc_server,
 )
-from flwr.server.fleet.grpc_rere.fleet_servicer import FleetServicer
+from flwr.server.fleet.grpc_rere.fleet_servicer import AsyncFleetServicer, FleetServicer
 from flwr.server.history import History
 from flwr.server.server import Server
 from flwr.server.server2 import Server as ServerEnc
-from flwr.server.state import StateFactory
-from flwr.server.strategy import FedAvg, Strategy
+from flwr.server.state import AsyncState, StateFactory, TaskReaper
+from flwr.server.strategy import FedAvg, MKFedAvg, Strategy
 
 ADDRESS_DRIVER_API = "0.0.0.0:9091"
 ADDRESS_FLEET_API_GRPC_RERE = "0.0.0.0:9092"
@@ -63,6 +65,10 @@ ADDRESS_FLEET_API_REST = "0.0.0.0:9093"
 
 DATABASE = ":flwr-in-memory-state:"
 
+# Seconds between two checks of the database for changes by other processes,
+# if the Fleet API (REST server) runs several workers sharing it
+DATABASE_POLL_INTERVAL = 0.1
+
 
 @dataclass
 class ServerConfig:
@@ -91,6 +97,7 @@ def start_server(  # pylint: disable=too-many-arguments,too-many-locals
     methodo = "",
     threshold = -1.0,
     shape=None,
+    contribution_probability: float = 0.2,
 ) -> History:
     """Start a Flower server using the gRPC transport layer.
 
@@ -129,6 +136,9 @@ def start_server(  # pylint: disable=too-many-arguments,too-many-locals
             * CA certificate.
             * server certificate.
             * server private key.
+    contribution_probability : float (default: 0.2)
+        Probability with which the contributions of the clients are evaluated
+        after a round. Set it to 1.0 to evaluate them every round.
 
     Returns
     -------
@@ -171,6 +181,7 @@ def start_server(  # pylint: disable=too-many-arguments,too-many-locals
         shape=shape,
         methodo = methodo,
         threshold = threshold,
+        contribution_probability=contribution_probability,
     )
     log(
         INFO,
@@ -217,17 +228,18 @@ def init_defaults(
     shape,
     methodo,
     threshold,
+    contribution_probability: float = 0.2,
 ) -> Tuple[Server, ServerConfig]:
     """Create server instance if none was given."""
     if server is None:
         if client_manager is None:
             client_manager = SimpleClientManager()
         if strategy is None:
-            strategy = FedAvg()
+            strategy = MKFedAvg() if enc else FedAvg()
         if enc:
-            server = ServerEnc(client_manager=client_manager, strategy=strategy,contribution=contribution,shapes=shape,methodo=methodo,threshold=threshold)
+            server = ServerEnc(client_manager=client_manager, strategy=strategy,contribution=contribution,shapes=shape,methodo=methodo,threshold=threshold,contribution_probability=contribution_probability)
         else:
-            server = Server(client_manager=client_manager, strategy=strategy,contribution=contribution,methodo=methodo,threshold=threshold)
+            server = Server(client_manager=client_manager, strategy=strategy,contribution=contribution,methodo=methodo,threshold=threshold,contribution_probability=contribution_probability)
     elif strategy is not None:
         log(WARN, "Both server and strategy were provided, ignoring strategy")
 
@@ -275,13 +287,17 @@ def run_driver_api() -> None:
     certificates = _try_obtain_certificates(args)
 
     # Initialize StateFactory
-    state_factory = StateFactory(args.database)
+    state_factory = StateFactory(
+        args.database, poll_interval=_database_poll_interval(args)
+    )
+    _start_task_reaper(state_factory, args.task_reaper_interval)
 
     # Start server
     grpc_server: grpc.Server = _run_driver_api_grpc(
         address=address,
         state_factory=state_factory,
         certificates=certificates,
+        use_aio=args.grpc_aio,
     )
 
     # Graceful shutdown
@@ -305,7 +321,10 @@ def run_fleet_api() -> None:
     certificates = _try_obtain_certificates(args)
 
     # Initialize StateFactory
-    state_factory = StateFactory(args.database)
+    state_factory = StateFactory(
+        args.database, poll_interval=_database_poll_interval(args)
+    )
+    _start_task_reaper(state_factory, args.task_reaper_interval)
 
     grpc_servers = []
     bckg_threads = []
@@ -360,6 +379,7 @@ def run_fleet_api() -> None:
             address=address,
             state_factory=state_factory,
             certificates=certificates,
+            use_aio=args.grpc_aio,
         )
         grpc_servers.append(fleet_server)
     else:
@@ -397,13 +417,17 @@ def run_server() -> None:
     certificates = _try_obtain_certificates(args)
 
     # Initialize StateFactory
-    state_factory = StateFactory(args.database)
+    state_factory = StateFactory(
+        args.database, poll_interval=_database_poll_interval(args)
+    )
+    _start_task_reaper(state_factory, args.task_reaper_interval)
 
     # Start Driver API
     driver_server: grpc.Server = _run_driver_api_grpc(
         address=address,
         state_factory=state_factory,
         certificates=certificates,
+        use_aio=args.grpc_aio,
     )
 
     grpc_servers = [driver_server]
@@ -459,6 +483,7 @@ def run_server() -> None:
             address=address,
             state_factory=state_factory,
             certificates=certificates,
+            use_aio=args.grpc_aio,
         )
         grpc_servers.append(fleet_server)
     else:
@@ -480,6 +505,17 @@ def run_server() -> None:
         driver_server.wait_for_termination(timeout=1)
 
 
+def _start_task_reaper(
+    state_factory: StateFactory, interval: float
+) -> Optional[TaskReaper]:
+    """Delete expired tasks in the background, unless `interval` is 0."""
+    if interval <= 0:
+        return None
+    reaper = TaskReaper(state_factory.state(), interval=interval)
+    reaper.start()
+    return reaper
+
+
 def _try_obtain_certificates(
     args: argparse.Namespace,
 ) -> Optional[Tuple[bytes, bytes, bytes]]:
@@ -553,19 +589,32 @@ def _run_driver_api_grpc(
     address: str,
     state_factory: StateFactory,
     certificates: Optional[Tuple[bytes, bytes, bytes]],
+    use_aio: bool = False,
 ) -> grpc.Server:
     """Run Driver API (gRPC, request-response)."""
     # Create Driver API gRPC server
-    driver_servicer: grpc.Server = DriverServicer(
-        state_factory=state_factory,
-    )
     driver_add_servicer_to_server_fn = add_DriverServicer_to_server
-    driver_grpc_server = generic_create_grpc_server(
-        servicer_and_add_fn=(driver_servicer, driver_add_servicer_to_server_fn),
-        server_address=address,
-        max_message_length=GRPC_MAX_MESSAGE_LENGTH,
-        certificates=certificates,
-    )
+    driver_grpc_server: grpc.Server
+    if use_aio:
+        driver_grpc_server = generic_create_grpc_aio_server(
+            servicer_and_add_fn=(
+                AsyncDriverServicer(state=AsyncState(state_factory.state())),
+                driver_add_servicer_to_server_fn,
+            ),
+            server_address=address,
+            max_message_length=GRPC_MAX_MESSAGE_LENGTH,
+            certificates=certificates,
+        )
+    else:
+        driver_servicer = DriverServicer(
+            state_factory=state_factory,
+        )
+        driver_grpc_server = generic_create_grpc_server(
+            servicer_and_add_fn=(driver_servicer, driver_add_servicer_to_server_fn),
+            server_address=address,
+            max_message_length=GRPC_MAX_MESSAGE_LENGTH,
+            certificates=certificates,
+        )
 
     log(INFO, "Flower ECE: Starting Driver API (gRPC-rere) on %s", address)
     driver_grpc_server.start()
@@ -606,19 +655,32 @@ def _run_fleet_api_grpc_rere(
     address: str,
     state_factory: StateFactory,
     certificates: Optional[Tuple[bytes, bytes, bytes]],
+    use_aio: bool = False,
 ) -> grpc.Server:
     """Run Fleet API (gRPC, request-response)."""
     # Create Fleet API gRPC server
-    fleet_servicer = FleetServicer(
-        state=state_factory.state(),
-    )
     fleet_add_servicer_to_server_fn = add_FleetServicer_to_server
-    fleet_grpc_server = generic_create_grpc_server(
-        servicer_and_add_fn=(fleet_servicer, fleet_add_servicer_to_server_fn),
-        server_address=address,
-        max_message_length=GRPC_MAX_MESSAGE_LENGTH,
-        certificates=certificates,
-    )
+    fleet_grpc_server: grpc.Server
+    if use_aio:
+        fleet_grpc_server = generic_create_grpc_aio_server(
+            servicer_and_add_fn=(
+                AsyncFleetServicer(state=AsyncState(state_factory.state())),
+                fleet_add_servicer_to_server_fn,
+            ),
+            server_address=address,
+            max_message_length=GRPC_MAX_MESSAGE_LENGTH,
+            certificates=certificates,
+        )
+    else:
+        fleet_servicer = FleetServicer(
+            state=state_factory.state(),
+        )
+        fleet_grpc_server = generic_create_grpc_server(
+            servicer_and_add_fn=(fleet_servicer, fleet_add_servicer_to_server_fn),
+            server_address=address,
+            max_message_length=GRPC_MAX_MESSAGE_LENGTH,
+            certificates=certificates,
+        )
 
     log(INFO, "Flower ECE: Starting Fleet API (gRPC-rere) on %s", address)
     fleet_grpc_server.start()
@@ -639,19 +701,35 @@ def _run_fleet_api_rest(
     try:
         import uvicorn
 
-        from flwr.server.fleet.rest_rere.rest_api import app as fast_api_app
+        from flwr.server.fleet.rest_rere.rest_api import (
+            DATABASE_ENV,
+            POLL_INTERVAL_ENV,
+            app,
+        )
     except ModuleNotFoundError:
         sys.exit(MISSING_EXTRA_REST)
-    if workers != 1:
+    if workers < 1:
+        raise ValueError(f"Invalid number of workers: {workers}")
+    if workers > 1 and state_factory.database in (DATABASE, ":memory:"):
         raise ValueError(
-            f"The supported number of workers for the Fleet API (REST server) is "
-            f"1. Instead given {workers}. The functionality of >1 workers will be "
-            f"added in the future releases."
+            "Several workers for the Fleet API (REST server) need a file-based "
+            "`--database` to share the state."
+        )
+    if workers > 1 and state_factory.poll_interval <= 0:
+        log(
+            WARN,
+            "Workers of the Fleet API (REST server) only notice the tasks of "
+            "other processes once their requests time out, as "
+            "`--database-poll-interval` is 0.",
         )
     log(INFO, "Starting Flower REST server")
 
     # See: https://www.starlette.io/applications/#accessing-the-app-instance
-    fast_api_app.state.STATE_FACTORY = state_factory
+    app.state.STATE_FACTORY = state_factory
+
+    # Worker processes import the app anew and open the database themselves
+    os.environ[DATABASE_ENV] = state_factory.database
+    os.environ[POLL_INTERVAL_ENV] = str(state_factory.poll_interval)
 
     validation_exceptions = _validate_ssl_files(
         ssl_certfile=ssl_certfile, ssl_keyfile=ssl_keyfile
@@ -673,6 +751,15 @@ def _run_fleet_api_rest(
     )
 
 
+def _database_poll_interval(args: argparse.Namespace) -> float:
+    """Check the database for changes only if other processes share it."""
+    if args.database_poll_interval is not None:
+        return float(args.database_poll_interval)
+    if getattr(args, "rest_fleet_api_workers", 1) > 1:
+        return DATABASE_POLL_INTERVAL
+    return 0.0
+
+
 def _validate_ssl_files(
     ssl_keyfile: Optional[str], ssl_certfile: Optional[str]
 ) -> List[ValueError]:
@@ -774,6 +861,31 @@ def _add_args_common(parser: argparse.ArgumentParser) -> None:
         "Flower will just create a state in memory.",
         default=DATABASE,
     )
+    parser.add_argument(
+        "--grpc-aio",
+        action="store_true",
+        help="Serve the Driver API and the Fleet API (gRPC-rere) with asyncio, "
+        "so that requests waiting for tasks do not hold a thread. This lets one "
+        "process serve many more connected nodes.",
+    )
+    parser.add_argument(
+        "--database-poll-interval",
+        type=float,
+        help="Number of seconds between two checks of a file-based database for "
+        "changes by other processes (e.g., the Driver API run separately, or other "
+        "workers of the Fleet API REST server), which wake up waiting requests. "
+        "Set it when several processes share the database. Defaults to "
+        f"{DATABASE_POLL_INTERVAL} if the Fleet API REST server runs several "
+        "workers, and to 0 (no checks) otherwise.",
+        default=None,
+    )
+    parser.add_argument(
+        "--task-reaper-interval",
+        type=float,
+        help="Number of seconds between two deletions of the tasks whose TTL "
+        "expired, or 0 to keep them until the Driver deletes them.",
+        default=60.0,
+    )
 
 
 def _add_args_driver_api(parser: argparse.ArgumentParser) -> None:
@@ -841,7 +953,8 @@ def _add_args_fleet_api(parser: argparse.ArgumentParser) -> None:
     )
     rest_group.add_argument(
         "--rest-fleet-api-workers",
-        help="Set the number of concurrent workers for the Fleet API REST server.",
+        help="Set the number of concurrent workers for the Fleet API REST server. "
+        "Several workers need a file-based `--database` to share the state.",
         type=int,
         default=1,
     )
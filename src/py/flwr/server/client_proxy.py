@@ -16,7 +16,7 @@
 
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple, Union
 
 from flwr.common import (
     DisconnectRes,
@@ -81,3 +81,30 @@ class ClientProxy(ABC):
         timeout: Optional[float],
     ) -> DisconnectRes:
         """Disconnect and (optionally) reconnect later."""
+
+
+class BatchClientProxy(ClientProxy):
+    """Abstract base class for client proxies running a round in a batch.
+
+    When all the clients of a round are proxies of the same subclass, the
+    server calls `fit_batch` or `evaluate_batch` once, instead of `fit` or
+    `evaluate` of each proxy from its own thread.
+    """
+
+    @classmethod
+    @abstractmethod
+    def fit_batch(
+        cls,
+        client_instructions: List[Tuple[ClientProxy, FitIns]],
+        timeout: Optional[float],
+    ) -> Iterator[Tuple[ClientProxy, Union[FitRes, BaseException]]]:
+        """Refine parameters on all clients, yielding results as they come."""
+
+    @classmethod
+    @abstractmethod
+    def evaluate_batch(
+        cls,
+        client_instructions: List[Tuple[ClientProxy, EvaluateIns]],
+        timeout: Optional[float],
+    ) -> Iterator[Tuple[ClientProxy, Union[EvaluateRes, BaseException]]]:
+        """Evaluate parameters on all clients, yielding results as they come."""
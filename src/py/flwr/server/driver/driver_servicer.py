@@ -15,8 +15,10 @@
 """Driver API servicer."""
 
 
+import asyncio
+import threading
 from logging import INFO
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple
 from uuid import UUID
 
 import grpc
@@ -35,9 +37,13 @@ from flwr.proto.driver_pb2 import (
 )
 from flwr.proto.node_pb2 import Node
 from flwr.proto.task_pb2 import TaskRes
-from flwr.server.state import State, StateFactory
+from flwr.server.state import AsyncState, State, StateFactory
+from flwr.server.state.notifier import NODES_KEY, set_threadsafe
 from flwr.server.utils.validator import validate_task_ins_or_res
 
+# Upper bound on the time a PullTaskRes request waits for TaskRes (seconds)
+MAX_PULL_TIMEOUT = 60.0
+
 
 class DriverServicer(driver_pb2_grpc.DriverServicer):
     """Driver API servicer."""
@@ -48,14 +54,29 @@ class DriverServicer(driver_pb2_grpc.DriverServicer):
     def GetNodes(
         self, request: GetNodesRequest, context: grpc.ServicerContext
     ) -> GetNodesResponse:
-        """Get available nodes."""
+        """Get available nodes, or the nodes which joined or left since a version."""
         log(INFO, "DriverServicer.GetNodes")
         state: State = self.state_factory.state()
+
+        # Return only the changes if the requested version is still known
+        if request.since_version > 0:
+            changes = _get_node_changes(state, request, context)
+            if changes is not None:
+                joined, left, version = changes
+                return GetNodesResponse(
+                    version=version,
+                    incremental=True,
+                    joined_nodes=[Node(node_id=i, anonymous=False) for i in joined],
+                    left_nodes=[Node(node_id=i, anonymous=False) for i in left],
+                )
+
+        # Read the version first, changes in between are returned again later
+        version = state.get_nodes_version()
         all_ids: Set[int] = state.get_nodes(request.run_id)
         nodes: List[Node] = [
             Node(node_id=node_id, anonymous=False) for node_id in all_ids
         ]
-        return GetNodesResponse(nodes=nodes)
+        return GetNodesResponse(nodes=nodes, version=version)
 
     def CreateRun(
         self, request: CreateRunRequest, context: grpc.ServicerContext
@@ -117,13 +138,186 @@ class DriverServicer(driver_pb2_grpc.DriverServicer):
 
         context.add_callback(on_rpc_done)
 
-        # Read from state
-        task_res_list: List[TaskRes] = state.get_task_res(task_ids=task_ids, limit=None)
+        # Read from state, waiting for TaskRes if requested (long-poll)
+        notifier = state.task_res_notifier
+        task_res_list: List[TaskRes]
+        if request.timeout <= 0 or notifier is None or not task_ids:
+            task_res_list = state.get_task_res(task_ids=task_ids, limit=None)
+        else:
+            event = threading.Event()
+            # Stop waiting if the RPC is cancelled
+            context.add_callback(event.set)
+            with notifier.subscribe(task_ids, event.set):
+                task_res_list = state.get_task_res(task_ids=task_ids, limit=None)
+                timeout = min(request.timeout, MAX_PULL_TIMEOUT)
+                if not task_res_list and event.wait(timeout):
+                    task_res_list = state.get_task_res(task_ids=task_ids, limit=None)
+
+        context.set_code(grpc.StatusCode.OK)
+        return PullTaskResResponse(task_res_list=task_res_list)
+
+
+class AsyncDriverServicer(driver_pb2_grpc.DriverServicer):
+    """Driver API servicer for `grpc.aio` servers.
+
+    Requests waiting for TaskRes or node changes (long-poll) only hold a
+    coroutine, not a thread.
+    """
+
+    def __init__(self, state: AsyncState) -> None:
+        self.state = state
+        # Keep references to the deletions running in the background
+        self._deletions: Set["asyncio.Task[None]"] = set()
+
+    async def GetNodes(
+        self, request: GetNodesRequest, context: grpc.aio.ServicerContext
+    ) -> GetNodesResponse:
+        """Get available nodes, or the nodes which joined or left since a version."""
+        log(INFO, "AsyncDriverServicer.GetNodes")
+
+        # Return only the changes if the requested version is still known
+        if request.since_version > 0:
+            changes = await _get_node_changes_async(self.state, request)
+            if changes is not None:
+                joined, left, version = changes
+                return GetNodesResponse(
+                    version=version,
+                    incremental=True,
+                    joined_nodes=[Node(node_id=i, anonymous=False) for i in joined],
+                    left_nodes=[Node(node_id=i, anonymous=False) for i in left],
+                )
+
+        # Read the version first, changes in between are returned again later
+        version = await self.state.get_nodes_version()
+        all_ids = await self.state.get_nodes(request.run_id)
+        nodes = [Node(node_id=node_id, anonymous=False) for node_id in all_ids]
+        return GetNodesResponse(nodes=nodes, version=version)
+
+    async def CreateRun(
+        self, request: CreateRunRequest, context: grpc.aio.ServicerContext
+    ) -> CreateRunResponse:
+        """Create run ID."""
+        log(INFO, "AsyncDriverServicer.CreateRun")
+        run_id = await self.state.create_run()
+        return CreateRunResponse(run_id=run_id)
+
+    async def PushTaskIns(
+        self, request: PushTaskInsRequest, context: grpc.aio.ServicerContext
+    ) -> PushTaskInsResponse:
+        """Push a set of TaskIns."""
+        log(INFO, "AsyncDriverServicer.PushTaskIns")
+
+        # Validate request
+        _raise_if(len(request.task_ins_list) == 0, "`task_ins_list` must not be empty")
+        for task_ins in request.task_ins_list:
+            validation_errors = validate_task_ins_or_res(task_ins)
+            _raise_if(bool(validation_errors), ", ".join(validation_errors))
+
+        # Store each TaskIns
+        task_ids: List[Optional[UUID]] = []
+        for task_ins in request.task_ins_list:
+            task_ids.append(await self.state.store_task_ins(task_ins=task_ins))
+
+        return PushTaskInsResponse(
+            task_ids=[str(task_id) if task_id else "" for task_id in task_ids]
+        )
+
+    async def PullTaskRes(
+        self, request: PullTaskResRequest, context: grpc.aio.ServicerContext
+    ) -> PullTaskResResponse:
+        """Pull a set of TaskRes."""
+        log(INFO, "AsyncDriverServicer.PullTaskRes")
+
+        # Convert each task_id str to UUID
+        task_ids: Set[UUID] = {UUID(task_id) for task_id in request.task_ids}
+
+        # Register callback
+        def on_rpc_done(_: grpc.aio.ServicerContext) -> None:
+            if context.cancelled() or context.code() != grpc.StatusCode.OK:
+                return
+
+            # Delete delivered TaskIns and TaskRes
+            deletion = asyncio.ensure_future(self.state.delete_tasks(task_ids))
+            self._deletions.add(deletion)
+            deletion.add_done_callback(self._deletions.discard)
+
+        context.add_done_callback(on_rpc_done)
+
+        # Read from state, waiting for TaskRes if requested (long-poll), the
+        # wait is cancelled together with the RPC
+        notifier = self.state.task_res_notifier
+        task_res_list: List[TaskRes]
+        if request.timeout <= 0 or notifier is None or not task_ids:
+            task_res_list = await self.state.get_task_res(task_ids, limit=None)
+        else:
+            loop = asyncio.get_running_loop()
+            event = asyncio.Event()
+            with notifier.subscribe(task_ids, set_threadsafe(loop, event)):
+                task_res_list = await self.state.get_task_res(task_ids, limit=None)
+                timeout = min(request.timeout, MAX_PULL_TIMEOUT)
+                if not task_res_list and await _wait(event, timeout):
+                    task_res_list = await self.state.get_task_res(task_ids, limit=None)
 
         context.set_code(grpc.StatusCode.OK)
         return PullTaskResResponse(task_res_list=task_res_list)
 
 
+def _get_node_changes(
+    state: State, request: GetNodesRequest, context: grpc.ServicerContext
+) -> Optional[Tuple[Set[int], Set[int], int]]:
+    """Get the node changes, waiting for one if requested (long-poll)."""
+    notifier = state.node_notifier
+    if request.timeout <= 0 or notifier is None:
+        return state.get_node_changes(request.run_id, request.since_version)
+
+    event = threading.Event()
+    # Stop waiting if the RPC is cancelled
+    context.add_callback(event.set)
+    with notifier.subscribe([NODES_KEY], event.set):
+        changes = state.get_node_changes(request.run_id, request.since_version)
+        if (
+            changes is not None
+            and not changes[0]
+            and not changes[1]
+            and event.wait(min(request.timeout, MAX_PULL_TIMEOUT))
+        ):
+            changes = state.get_node_changes(request.run_id, request.since_version)
+    return changes
+
+
+async def _get_node_changes_async(
+    state: AsyncState, request: GetNodesRequest
+) -> Optional[Tuple[Set[int], Set[int], int]]:
+    """Get the node changes, waiting for one if requested (long-poll)."""
+    notifier = state.node_notifier
+    if request.timeout <= 0 or notifier is None:
+        return await state.get_node_changes(request.run_id, request.since_version)
+
+    loop = asyncio.get_running_loop()
+    event = asyncio.Event()
+    with notifier.subscribe([NODES_KEY], set_threadsafe(loop, event)):
+        changes = await state.get_node_changes(request.run_id, request.since_version)
+        if (
+            changes is not None
+            and not changes[0]
+            and not changes[1]
+            and await _wait(event, min(request.timeout, MAX_PULL_TIMEOUT))
+        ):
+            changes = await state.get_node_changes(
+                request.run_id, request.since_version
+            )
+    return changes
+
+
+async def _wait(event: asyncio.Event, timeout: float) -> bool:
+    """Wait for `event` until `timeout`, return whether it was set."""
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
 def _raise_if(validation_error: bool, detail: str) -> None:
     if validation_error:
         raise ValueError(f"Malformed PushTaskInsRequest: {detail}")
@@ -15,7 +15,11 @@
 """DriverServicer tests."""
 
 
-from flwr.server.driver.driver_servicer import _raise_if
+from unittest.mock import MagicMock
+
+from flwr.proto.driver_pb2 import GetNodesRequest
+from flwr.server.driver.driver_servicer import DriverServicer, _raise_if
+from flwr.server.state import StateFactory
 
 # pylint: disable=broad-except
 
@@ -54,3 +58,39 @@ def test_raise_if_true() -> None:
         assert str(err) == "Malformed PushTaskInsRequest: test"
     except Exception as err:
         raise AssertionError() from err
+
+
+def test_get_nodes_incremental() -> None:
+    """Test that GetNodes returns the nodes which joined or left since a version."""
+    # Prepare
+    state_factory = StateFactory(":flwr-in-memory-state:")
+    state = state_factory.state()
+    servicer = DriverServicer(state_factory)
+    run_id = state.create_run()
+    node_id_1 = state.create_node()
+    full = servicer.GetNodes(GetNodesRequest(run_id=run_id), MagicMock())
+    node_id_2 = state.create_node()
+    state.delete_node(node_id_1)
+
+    # Execute
+    res = servicer.GetNodes(
+        GetNodesRequest(run_id=run_id, since_version=full.version), MagicMock()
+    )
+    unchanged = servicer.GetNodes(
+        GetNodesRequest(run_id=run_id, since_version=res.version, timeout=0.1),
+        MagicMock(),
+    )
+    invalid_run = servicer.GetNodes(
+        GetNodesRequest(run_id=run_id + 1, since_version=full.version), MagicMock()
+    )
+
+    # Assert
+    assert not full.incremental
+    assert {node.node_id for node in full.nodes} == {node_id_1}
+    assert res.incremental
+    assert [node.node_id for node in res.joined_nodes] == [node_id_2]
+    assert [node.node_id for node in res.left_nodes] == [node_id_1]
+    assert res.version == state.get_nodes_version()
+    assert unchanged.incremental
+    assert not unchanged.joined_nodes and not unchanged.left_nodes
+    assert not invalid_run.incremental and not invalid_run.nodes
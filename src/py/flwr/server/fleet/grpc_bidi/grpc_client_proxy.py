@@ -19,6 +19,7 @@ from typing import Optional, List, Tuple
 
 from flwr import common
 from flwr.common import serde
+from flwr.common.context_registry import ContextRegistry
 from flwr.proto.transport_pb2 import ClientMessage, ServerMessage
 from flwr.server.client_proxy import ClientProxy
 from flwr.server.fleet.grpc_bidi.grpc_bridge import GrpcBridge, InsWrapper, ResWrapper
@@ -113,9 +114,10 @@ class GrpcClientProxy(ClientProxy):
         self,
         ctx,
         timeout: Optional[float],
+        ctx_id: str = "",
     ):
         """Refine the provided parameters using the locally held dataset."""
-        send_pk_ins_msg = serde.send_pk_ins_to_proto(ctx)
+        send_pk_ins_msg = serde.send_pk_ins_to_proto(ctx, ctx_id=ctx_id)
 
         res_wrapper: ResWrapper = self.bridge.request(
             ins_wrapper=InsWrapper(
@@ -130,6 +132,7 @@ class GrpcClientProxy(ClientProxy):
     def get_parms(
         self,
         timeout: Optional[float],
+        contexts: Optional[ContextRegistry] = None,
     ):
         """Refine the provided parameters using the locally held dataset."""
         get_parms_ins_msg = serde.get_parms_ins_to_proto()
@@ -141,7 +144,9 @@ class GrpcClientProxy(ClientProxy):
             )
         )
         client_msg: ClientMessage = res_wrapper.client_message
-        get_parms_res = serde.get_parms_res_from_proto(client_msg.get_parms_res)
+        get_parms_res = serde.get_parms_res_from_proto(
+            client_msg.get_parms_res, contexts
+        )
         return get_parms_res
     
     def send_enc(
@@ -149,9 +154,11 @@ class GrpcClientProxy(ClientProxy):
         ctx,
         enc,
         timeout: Optional[float],
+        contexts: Optional[ContextRegistry] = None,
     ):
         """Refine the provided parameters using the locally held dataset."""
-        send_enc_ins_msg = serde.send_enc_ins_to_proto(ctx,enc=enc)
+        ctx_id = contexts.current_id if contexts is not None else ""
+        send_enc_ins_msg = serde.send_enc_ins_to_proto(ctx, enc=enc, ctx_id=ctx_id)
 
         res_wrapper: ResWrapper = self.bridge.request(
             ins_wrapper=InsWrapper(
@@ -160,7 +167,7 @@ class GrpcClientProxy(ClientProxy):
             )
         )
         client_msg: ClientMessage = res_wrapper.client_message
-        send_enc_res = serde.send_enc_res_from_proto(client_msg.send_enc_res)
+        send_enc_res = serde.send_enc_res_from_proto(client_msg.send_enc_res, contexts)
         return send_enc_res
     
     def send_ds(
@@ -168,6 +175,7 @@ class GrpcClientProxy(ClientProxy):
         ctx,
         enc,
         timeout: Optional[float],
+        contexts: Optional[ContextRegistry] = None,
     ):
         """Refine the provided parameters using the locally held dataset."""
         send_ds_ins_msg = serde.send_ds_ins_to_proto(ctx, enc)
@@ -179,7 +187,7 @@ class GrpcClientProxy(ClientProxy):
             )
         )
         client_msg: ClientMessage = res_wrapper.client_message
-        send_ds_res = serde.send_ds_res_from_proto(client_msg.send_ds_res)
+        send_ds_res = serde.send_ds_res_from_proto(client_msg.send_ds_res, contexts)
         return send_ds_res
 
     def evaluate_enc(
@@ -248,8 +256,16 @@ class GrpcClientProxy(ClientProxy):
     def get_gradients(
         self,
         timeout: Optional[float],
+        codec: Optional[str] = None,
+        ratio: float = 0.01,
+        seed: int = 0,
     ):
-        get_gradients_ins_msg = serde.get_gradients_ins_to_proto()
+        """Return the gradients of the client.
+
+        If `codec` is set, a client returning its gradients as NDArrays
+        compresses them with `flwr.common.gradient_codec.encode_gradients`.
+        """
+        get_gradients_ins_msg = serde.get_gradients_ins_to_proto(codec, ratio, seed)
 
         res_wrapper: ResWrapper = self.bridge.request(
             ins_wrapper=InsWrapper(
@@ -281,8 +297,11 @@ class GrpcClientProxy(ClientProxy):
         self,
         ins,
         timeout: Optional[float],
+        server_round: int = 0,
     ):
-        get_contributions_ins_msg = serde.get_contributions_ins_to_proto(ins)
+        get_contributions_ins_msg = serde.get_contributions_ins_to_proto(
+            ins, server_round
+        )
         res_wrapper: ResWrapper = self.bridge.request(
             ins_wrapper=InsWrapper(
                 server_message=ServerMessage(get_contributions_ins=get_contributions_ins_msg),
@@ -292,6 +311,36 @@ class GrpcClientProxy(ClientProxy):
         client_msg: ClientMessage = res_wrapper.client_message
         get_contributions_res = serde.get_contributions_res_from_proto(client_msg.get_contributions_res)
         return get_contributions_res
+
+    def get_contributions_chunk(
+        self,
+        index: int,
+        chunk: bytes,
+        final: bool,
+        timeout: Optional[float],
+        server_round: int = 0,
+    ):
+        """Send a chunk of the gradients of the `index`-th client.
+
+        Returns the contributions once `final` is set, and an empty list for
+        intermediate chunks. `server_round` lets the CE server reuse its cached
+        coalition utilities within a round.
+        """
+        get_contributions_ins_msg = serde.get_contributions_chunk_to_proto(
+            index, chunk, final, server_round
+        )
+        res_wrapper: ResWrapper = self.bridge.request(
+            ins_wrapper=InsWrapper(
+                server_message=ServerMessage(
+                    get_contributions_ins=get_contributions_ins_msg
+                ),
+                timeout=timeout,
+            )
+        )
+        client_msg: ClientMessage = res_wrapper.client_message
+        return serde.get_contributions_res_from_proto(
+            client_msg.get_contributions_res
+        )
     
     def send_public_key(
         self,
@@ -15,10 +15,12 @@
 """Implements utility function to create a gRPC server."""
 
 
+import asyncio
 import concurrent.futures
 import sys
+import threading
 from logging import ERROR
-from typing import Any, Callable, Optional, Tuple, Union
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar, Union
 
 import grpc
 
@@ -26,9 +28,9 @@ from flwr.common import GRPC_MAX_MESSAGE_LENGTH
 from flwr.common.logger import log
 from flwr.proto.transport_pb2_grpc import add_FlowerServiceServicer_to_server
 from flwr.server.client_manager import ClientManager
-from flwr.server.driver.driver_servicer import DriverServicer
+from flwr.server.driver.driver_servicer import AsyncDriverServicer, DriverServicer
 from flwr.server.fleet.grpc_bidi.flower_service_servicer import FlowerServiceServicer
-from flwr.server.fleet.grpc_rere.fleet_servicer import FleetServicer
+from flwr.server.fleet.grpc_rere.fleet_servicer import AsyncFleetServicer, FleetServicer
 
 INVALID_CERTIFICATES_ERR_MSG = """
     When setting any of root_certificate, certificate, or private_key,
@@ -37,6 +39,8 @@ INVALID_CERTIFICATES_ERR_MSG = """
 
 AddServicerToServerFn = Callable[..., Any]
 
+T = TypeVar("T")
+
 
 def valid_certificates(certificates: Tuple[bytes, bytes, bytes]) -> bool:
     """Validate certificates tuple."""
@@ -212,9 +216,145 @@ def generic_create_grpc_server(  # pylint: disable=too-many-arguments
     # Deconstruct tuple into servicer and function
     servicer, add_servicer_to_server_fn = servicer_and_add_fn
 
+    options = _server_options(
+        max_concurrent_workers, max_message_length, keepalive_time_ms
+    )
+
+    server = grpc.server(
+        concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent_workers),
+        # Set the maximum number of concurrent RPCs this server will service before
+        # returning RESOURCE_EXHAUSTED status, or None to indicate no limit.
+        maximum_concurrent_rpcs=max_concurrent_workers,
+        options=options,
+    )
+    add_servicer_to_server_fn(servicer, server)
+
+    _add_port(server, server_address, certificates)
+
+    return server
+
+
+def generic_create_grpc_aio_server(  # pylint: disable=too-many-arguments
+    servicer_and_add_fn: Union[
+        Tuple[AsyncFleetServicer, AddServicerToServerFn],
+        Tuple[AsyncDriverServicer, AddServicerToServerFn],
+    ],
+    server_address: str,
+    max_concurrent_workers: Optional[int] = None,
+    max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
+    keepalive_time_ms: int = 210000,
+    certificates: Optional[Tuple[bytes, bytes, bytes]] = None,
+) -> "AioServer":
+    """Create a `grpc.aio` server with a single servicer.
+
+    All RPCs are served by coroutines on one event loop, so that requests
+    waiting for tasks (long-poll) do not hold a thread. The parameters are
+    those of `generic_create_grpc_server`, except that `max_concurrent_workers`
+    only bounds the number of concurrent RPCs, and is unbounded if `None`.
+
+    Returns
+    -------
+    server : AioServer
+        A non-running instance of a gRPC server.
+    """
+    servicer, add_servicer_to_server_fn = servicer_and_add_fn
+
+    def create_server() -> grpc.aio.Server:
+        server = grpc.aio.server(
+            maximum_concurrent_rpcs=max_concurrent_workers,
+            options=_server_options(
+                max_concurrent_workers or 0, max_message_length, keepalive_time_ms
+            ),
+        )
+        add_servicer_to_server_fn(servicer, server)
+        _add_port(server, server_address, certificates)
+        return server
+
+    return AioServer(create_server)
+
+
+class AioServer(grpc.Server):  # type: ignore
+    """Run a `grpc.aio` server on an event loop in a background thread.
+
+    Offers the blocking methods of `grpc.Server`, so that it can be used in
+    place of one. The `grpc.aio` server is created by `create_server` on the
+    event loop, and the methods adding handlers or ports are forwarded to it.
+    """
+
+    def __init__(self, create_server: Callable[[], grpc.aio.Server]) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._server: grpc.aio.Server = self._call(create_server)
+        self._started = False
+
+    def _run(self, coroutine: Any) -> "concurrent.futures.Future[Any]":
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def _call(self, function: Callable[[], T]) -> T:
+        """Call `function` on the event loop and return its result."""
+
+        async def call() -> T:
+            return function()
+
+        result: T = self._run(call()).result()
+        return result
+
+    def start(self) -> None:
+        """Start the server."""
+        self._run(self._server.start()).result()
+        self._started = True
+
+    def stop(self, grace: Optional[float]) -> threading.Event:
+        """Stop the server, waiting for up to `grace` seconds for pending RPCs."""
+        stopped = threading.Event()
+        if not self._started:
+            stopped.set()
+            return stopped
+        future = self._run(self._server.stop(grace))
+        future.add_done_callback(lambda _: stopped.set())
+        return stopped
+
+    def wait_for_termination(self, timeout: Optional[float] = None) -> bool:
+        """Block until the server stopped, return whether `timeout` expired."""
+        if not self._started:
+            return False
+        future = self._run(self._server.wait_for_termination())
+        try:
+            future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return True
+        return False
+
+    def add_generic_rpc_handlers(
+        self, generic_rpc_handlers: Sequence[grpc.GenericRpcHandler]
+    ) -> None:
+        """Register generic RPC handlers with the server."""
+        self._call(lambda: self._server.add_generic_rpc_handlers(generic_rpc_handlers))
+
+    def add_insecure_port(self, address: str) -> int:
+        """Open an insecure port, return the port number."""
+        port: int = self._call(lambda: self._server.add_insecure_port(address))
+        return port
+
+    def add_secure_port(
+        self, address: str, server_credentials: grpc.ServerCredentials
+    ) -> int:
+        """Open a secure port, return the port number."""
+        port: int = self._call(
+            lambda: self._server.add_secure_port(address, server_credentials)
+        )
+        return port
+
+
+def _server_options(
+    max_concurrent_workers: int, max_message_length: int, keepalive_time_ms: int
+) -> List[Tuple[str, int]]:
+    """Return the options of the gRPC servers."""
     # Possible options:
     # https://github.com/grpc/grpc/blob/v1.43.x/include/grpc/impl/codegen/grpc_types.h
-    options = [
+    return [
         # Maximum number of concurrent incoming streams to allow on a http2
         # connection. Int valued.
         ("grpc.max_concurrent_streams", max(100, max_concurrent_workers)),
@@ -239,15 +379,13 @@ def generic_create_grpc_server(  # pylint: disable=too-many-arguments
         ("grpc.keepalive_permit_without_calls", 0),
     ]
 
-    server = grpc.server(
-        concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent_workers),
-        # Set the maximum number of concurrent RPCs this server will service before
-        # returning RESOURCE_EXHAUSTED status, or None to indicate no limit.
-        maximum_concurrent_rpcs=max_concurrent_workers,
-        options=options,
-    )
-    add_servicer_to_server_fn(servicer, server)
 
+def _add_port(
+    server: Union[grpc.Server, grpc.aio.Server],
+    server_address: str,
+    certificates: Optional[Tuple[bytes, bytes, bytes]],
+) -> None:
+    """Listen on `server_address`, with SSL if `certificates` are given."""
     if certificates is not None:
         if not valid_certificates(certificates):
             sys.exit(1)
@@ -267,5 +405,3 @@ def generic_create_grpc_server(  # pylint: disable=too-many-arguments
         server.add_secure_port(server_address, server_credentials)
     else:
         server.add_insecure_port(server_address)
-
-    return server
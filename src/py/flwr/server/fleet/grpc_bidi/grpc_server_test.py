@@ -22,11 +22,22 @@ from os.path import abspath, dirname, join
 from pathlib import Path
 from typing import Tuple, cast
 
+import grpc
+
+from flwr.proto import driver_pb2, fleet_pb2, node_pb2, task_pb2
+from flwr.proto.driver_pb2_grpc import DriverStub, add_DriverServicer_to_server
+from flwr.proto.fleet_pb2_grpc import FleetStub, add_FleetServicer_to_server
+from flwr.proto.transport_pb2 import ClientMessage, ServerMessage
 from flwr.server.client_manager import SimpleClientManager
+from flwr.server.driver.driver_servicer import AsyncDriverServicer
 from flwr.server.fleet.grpc_bidi.grpc_server import (
+    AioServer,
+    generic_create_grpc_aio_server,
     start_grpc_server,
     valid_certificates,
 )
+from flwr.server.fleet.grpc_rere.fleet_servicer import AsyncFleetServicer
+from flwr.server.state import AsyncState, InMemoryState
 
 root_dir = dirname(abspath(join(__file__, "../../../../../..")))
 
@@ -116,3 +127,104 @@ def test_integration_start_and_shutdown_secure_server() -> None:
 
     # Teardown
     server.stop(1)
+
+
+def test_integration_aio_fleet_and_driver_servers() -> None:
+    """Send a TaskIns and its TaskRes through the asyncio servers."""
+    # Prepare
+    state = AsyncState(InMemoryState())
+    fleet_port = unused_tcp_port()
+    driver_port = unused_tcp_port()
+    fleet_server = generic_create_grpc_aio_server(
+        servicer_and_add_fn=(AsyncFleetServicer(state), add_FleetServicer_to_server),
+        server_address=f"localhost:{fleet_port}",
+    )
+    driver_server = generic_create_grpc_aio_server(
+        servicer_and_add_fn=(
+            AsyncDriverServicer(state),
+            add_DriverServicer_to_server,
+        ),
+        server_address=f"localhost:{driver_port}",
+    )
+    fleet_server.start()
+    driver_server.start()
+    fleet = FleetStub(grpc.insecure_channel(f"localhost:{fleet_port}"))
+    driver = DriverStub(grpc.insecure_channel(f"localhost:{driver_port}"))
+
+    # Execute
+    node = fleet.CreateNode(fleet_pb2.CreateNodeRequest()).node
+    run_id = driver.CreateRun(driver_pb2.CreateRunRequest()).run_id
+    pull_task_ins = fleet.PullTaskIns.future(
+        fleet_pb2.PullTaskInsRequest(node=node, timeout=10.0)
+    )
+    task_id = driver.PushTaskIns(
+        driver_pb2.PushTaskInsRequest(
+            task_ins_list=[
+                task_pb2.TaskIns(
+                    task_id="",
+                    group_id="",
+                    run_id=run_id,
+                    task=task_pb2.Task(
+                        producer=node_pb2.Node(node_id=0, anonymous=True),
+                        consumer=node,
+                        legacy_server_message=ServerMessage(
+                            reconnect_ins=ServerMessage.ReconnectIns()
+                        ),
+                    ),
+                )
+            ]
+        )
+    ).task_ids[0]
+    task_ins_list = pull_task_ins.result(timeout=10.0).task_ins_list
+    fleet.PushTaskRes(
+        fleet_pb2.PushTaskResRequest(
+            task_res_list=[
+                task_pb2.TaskRes(
+                    task_id="",
+                    group_id="",
+                    run_id=run_id,
+                    task=task_pb2.Task(
+                        producer=node,
+                        consumer=node_pb2.Node(node_id=0, anonymous=True),
+                        ancestry=[task_id],
+                        legacy_client_message=ClientMessage(
+                            disconnect_res=ClientMessage.DisconnectRes()
+                        ),
+                    ),
+                )
+            ]
+        )
+    )
+    task_res_list = driver.PullTaskRes(
+        driver_pb2.PullTaskResRequest(task_ids=[task_id], timeout=10.0)
+    ).task_res_list
+
+    # Assert
+    assert [task_ins.task_id for task_ins in task_ins_list] == [task_id]
+    assert [task_res.task.ancestry[0] for task_res in task_res_list] == [task_id]
+
+    # Teardown
+    fleet_server.stop(1).wait()
+    driver_server.stop(1).wait()
+    assert not driver_server.wait_for_termination(timeout=1.0)
+
+
+def test_aio_server_forwards_ports_and_handlers() -> None:
+    """Test that handlers and ports can be added after creating the server."""
+    # Prepare
+    state = AsyncState(InMemoryState())
+    server = AioServer(grpc.aio.server)
+    add_FleetServicer_to_server(AsyncFleetServicer(state), server)
+
+    # Execute
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    fleet = FleetStub(grpc.insecure_channel(f"localhost:{port}"))
+    node = fleet.CreateNode(fleet_pb2.CreateNodeRequest()).node
+
+    # Assert
+    assert port > 0
+    assert node.node_id != 0
+
+    # Teardown
+    server.stop(1).wait()
@@ -32,7 +32,7 @@ from flwr.proto.fleet_pb2 import (
     PushTaskResResponse,
 )
 from flwr.server.fleet.message_handler import message_handler
-from flwr.server.state import State
+from flwr.server.state import AsyncState, State
 
 
 class FleetServicer(fleet_pb2_grpc.FleetServicer):
@@ -80,3 +80,54 @@ class FleetServicer(fleet_pb2_grpc.FleetServicer):
             request=request,
             state=self.state,
         )
+
+
+class AsyncFleetServicer(fleet_pb2_grpc.FleetServicer):
+    """Fleet API servicer for `grpc.aio` servers.
+
+    Requests waiting for TaskIns (long-poll) only hold a coroutine, not a
+    thread, so that one process can serve many idle nodes.
+    """
+
+    def __init__(self, state: AsyncState) -> None:
+        self.state = state
+
+    async def CreateNode(
+        self, request: CreateNodeRequest, context: grpc.aio.ServicerContext
+    ) -> CreateNodeResponse:
+        """."""
+        log(INFO, "AsyncFleetServicer.CreateNode")
+        return await message_handler.create_node_async(
+            request=request,
+            state=self.state,
+        )
+
+    async def DeleteNode(
+        self, request: DeleteNodeRequest, context: grpc.aio.ServicerContext
+    ) -> DeleteNodeResponse:
+        """."""
+        log(INFO, "AsyncFleetServicer.DeleteNode")
+        return await message_handler.delete_node_async(
+            request=request,
+            state=self.state,
+        )
+
+    async def PullTaskIns(
+        self, request: PullTaskInsRequest, context: grpc.aio.ServicerContext
+    ) -> PullTaskInsResponse:
+        """Pull TaskIns."""
+        log(INFO, "AsyncFleetServicer.PullTaskIns")
+        return await message_handler.pull_task_ins_async(
+            request=request,
+            state=self.state,
+        )
+
+    async def PushTaskRes(
+        self, request: PushTaskResRequest, context: grpc.aio.ServicerContext
+    ) -> PushTaskResResponse:
+        """Push TaskRes."""
+        log(INFO, "AsyncFleetServicer.PushTaskRes")
+        return await message_handler.push_task_res_async(
+            request=request,
+            state=self.state,
+        )
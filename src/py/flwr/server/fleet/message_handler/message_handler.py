@@ -15,6 +15,9 @@
 """Fleet API message handlers."""
 
 
+import asyncio
+import threading
+import time
 from typing import List, Optional
 from uuid import UUID
 
@@ -31,7 +34,22 @@ from flwr.proto.fleet_pb2 import (
 )
 from flwr.proto.node_pb2 import Node
 from flwr.proto.task_pb2 import TaskIns, TaskRes
-from flwr.server.state import State
+from flwr.server.state import AsyncState, State
+from flwr.server.state.notifier import set_threadsafe
+
+# Upper bound on the number of TaskIns returned by one PullTaskIns request
+MAX_TASK_INS_PER_PULL = 64
+
+# Upper bound on the time a PullTaskIns request waits for TaskIns (seconds)
+MAX_PULL_TIMEOUT = 60.0
+
+# Upper bound on the number of PullTaskIns requests waiting in a thread at the
+# same time, below the default number of workers of the threaded gRPC server
+# so that the other requests are still served. Requests above it are answered
+# at once and the nodes pull again after `MIN_PULL_INTERVAL`
+MAX_BLOCKING_PULLS = 512
+
+_blocking_pulls = threading.BoundedSemaphore(MAX_BLOCKING_PULLS)
 
 
 def create_node(
@@ -56,13 +74,90 @@ def delete_node(request: DeleteNodeRequest, state: State) -> DeleteNodeResponse:
 
 
 def pull_task_ins(request: PullTaskInsRequest, state: State) -> PullTaskInsResponse:
-    """Pull TaskIns handler."""
-    # Get node_id if client node is not anonymous
+    """Pull TaskIns handler.
+
+    If `request.timeout` is set and no TaskIns is available yet, wait until
+    TaskIns are stored for the node or the timeout expires (long-poll). At most
+    `MAX_BLOCKING_PULLS` requests wait at the same time.
+    """
+    notifier = state.task_ins_notifier
+    if request.timeout <= 0 or notifier is None:
+        return _pull_task_ins(request, state)
+    if not _blocking_pulls.acquire(blocking=False):
+        return _pull_task_ins(request, state)
+    deadline = time.monotonic() + min(request.timeout, MAX_PULL_TIMEOUT)
+
+    # Wake-ups for other nodes' TaskIns (e.g., by `notify_all`) wait again
+    try:
+        while True:
+            event = threading.Event()
+            with notifier.subscribe([_node_id(request)], event.set):
+                response = _pull_task_ins(request, state)
+                remaining = deadline - time.monotonic()
+                if (
+                    response.task_ins_list
+                    or remaining <= 0
+                    or not event.wait(remaining)
+                ):
+                    return response
+    finally:
+        _blocking_pulls.release()
+
+
+async def create_node_async(
+    request: CreateNodeRequest, state: AsyncState
+) -> CreateNodeResponse:
+    """Create node handler for servers running an event loop."""
+    return await state.run(create_node, request, state.state)
+
+
+async def delete_node_async(
+    request: DeleteNodeRequest, state: AsyncState
+) -> DeleteNodeResponse:
+    """Delete node handler for servers running an event loop."""
+    return await state.run(delete_node, request, state.state)
+
+
+async def pull_task_ins_async(
+    request: PullTaskInsRequest, state: AsyncState
+) -> PullTaskInsResponse:
+    """Pull TaskIns handler, waiting on the event loop instead of a thread."""
+    notifier = state.task_ins_notifier
+    if request.timeout <= 0 or notifier is None:
+        return await state.run(_pull_task_ins, request, state.state)
+    deadline = time.monotonic() + min(request.timeout, MAX_PULL_TIMEOUT)
+
+    loop = asyncio.get_running_loop()
+    while True:
+        event = asyncio.Event()
+        with notifier.subscribe([_node_id(request)], set_threadsafe(loop, event)):
+            response = await state.run(_pull_task_ins, request, state.state)
+            remaining = deadline - time.monotonic()
+            if response.task_ins_list or remaining <= 0:
+                return response
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return response
+
+
+def _node_id(request: PullTaskInsRequest) -> Optional[int]:
+    """Get node_id if client node is not anonymous."""
     node = request.node  # pylint: disable=no-member
-    node_id: Optional[int] = None if node.anonymous else node.node_id
+    return None if node.anonymous else node.node_id
+
 
+def _limit(request: PullTaskInsRequest) -> int:
+    """Return up to as many TaskIns as the node advertised (at least one)."""
+    return min(max(request.max_task_ins, 1), MAX_TASK_INS_PER_PULL)
+
+
+def _pull_task_ins(request: PullTaskInsRequest, state: State) -> PullTaskInsResponse:
+    """Retrieve the TaskIns currently available for the node."""
     # Retrieve TaskIns from State
-    task_ins_list: List[TaskIns] = state.get_task_ins(node_id=node_id, limit=1)
+    task_ins_list: List[TaskIns] = state.get_task_ins(
+        node_id=_node_id(request), limit=_limit(request)
+    )
 
     # Build response
     response = PullTaskInsResponse(
@@ -74,15 +169,24 @@ def pull_task_ins(request: PullTaskInsRequest, state: State) -> PullTaskInsRespo
 def push_task_res(request: PushTaskResRequest, state: State) -> PushTaskResResponse:
     """Push TaskRes handler."""
     # pylint: disable=no-member
-    task_res: TaskRes = request.task_res_list[0]
+    task_res_list: List[TaskRes] = list(request.task_res_list)
     # pylint: enable=no-member
 
-    # Store TaskRes in State
-    task_id: Optional[UUID] = state.store_task_res(task_res=task_res)
+    # Store all TaskRes in State at once
+    task_ids: List[Optional[UUID]] = state.store_task_res_batch(
+        task_res_list=task_res_list
+    )
 
     # Build response
     response = PushTaskResResponse(
         reconnect=Reconnect(reconnect=5),
-        results={str(task_id): 0},
+        results={str(task_id): 0 for task_id in task_ids if task_id is not None},
     )
     return response
+
+
+async def push_task_res_async(
+    request: PushTaskResRequest, state: AsyncState
+) -> PushTaskResResponse:
+    """Push TaskRes handler for servers running an event loop."""
+    return await state.run(push_task_res, request, state.state)
@@ -15,18 +15,52 @@
 """Fleet API message handler tests."""
 
 
-from unittest.mock import MagicMock
+import asyncio
+import threading
+import time
+from typing import List
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
 
 from flwr.proto.fleet_pb2 import (
     CreateNodeRequest,
     DeleteNodeRequest,
     PullTaskInsRequest,
+    PullTaskInsResponse,
     PushTaskResRequest,
 )
 from flwr.proto.node_pb2 import Node
-from flwr.proto.task_pb2 import Task, TaskRes
+from flwr.proto.task_pb2 import Task, TaskIns, TaskRes
+from flwr.proto.transport_pb2 import ServerMessage
+from flwr.server.state import AsyncState, InMemoryState
 
-from .message_handler import create_node, delete_node, pull_task_ins, push_task_res
+from . import message_handler
+from .message_handler import (
+    MAX_TASK_INS_PER_PULL,
+    create_node,
+    delete_node,
+    pull_task_ins,
+    pull_task_ins_async,
+    push_task_res,
+)
+
+
+def _store_task_ins_later(state: InMemoryState, node_id: int, delay: float) -> None:
+    """Store a TaskIns for `node_id` from another thread after `delay` seconds."""
+    task_ins = TaskIns(
+        task_id="",
+        group_id="",
+        run_id=state.create_run(),
+        task=Task(
+            producer=Node(node_id=0, anonymous=True),
+            consumer=Node(node_id=node_id, anonymous=False),
+            legacy_server_message=ServerMessage(
+                reconnect_ins=ServerMessage.ReconnectIns()
+            ),
+        ),
+    )
+    timer = threading.Timer(delay, state.store_task_ins, args=(task_ins,))
+    timer.start()
 
 
 def test_create_node() -> None:
@@ -96,11 +130,108 @@ def test_pull_task_ins() -> None:
     state.create_node.assert_not_called()
     state.delete_node.assert_not_called()
     state.store_task_ins.assert_not_called()
-    state.get_task_ins.assert_called_once()
+    state.get_task_ins.assert_called_once_with(node_id=1, limit=1)
     state.store_task_res.assert_not_called()
     state.get_task_res.assert_not_called()
 
 
+def test_pull_task_ins_batch() -> None:
+    """Test that pull_task_ins honors the advertised batch size."""
+    # Prepare
+    node = Node(node_id=1, anonymous=False)
+    state = MagicMock()
+
+    # Execute
+    pull_task_ins(request=PullTaskInsRequest(node=node, max_task_ins=8), state=state)
+    pull_task_ins(request=PullTaskInsRequest(node=node, max_task_ins=1000), state=state)
+
+    # Assert
+    assert [call.kwargs["limit"] for call in state.get_task_ins.call_args_list] == [
+        8,
+        MAX_TASK_INS_PER_PULL,
+    ]
+
+
+def test_pull_task_ins_long_poll() -> None:
+    """Test that pull_task_ins waits until a TaskIns is stored for the node."""
+    # Prepare
+    state = InMemoryState()
+    node_id = state.create_node()
+    request = PullTaskInsRequest(
+        node=Node(node_id=node_id, anonymous=False), timeout=10.0
+    )
+    _store_task_ins_later(state, node_id, delay=0.1)
+
+    # Execute
+    start = time.monotonic()
+    response = pull_task_ins(request=request, state=state)
+
+    # Assert
+    assert len(response.task_ins_list) == 1
+    assert time.monotonic() - start < 5.0
+
+
+def test_pull_task_ins_long_poll_timeout() -> None:
+    """Test that pull_task_ins returns no TaskIns once the timeout expires."""
+    # Prepare
+    state = InMemoryState()
+    request = PullTaskInsRequest(
+        node=Node(node_id=state.create_node(), anonymous=False), timeout=0.1
+    )
+
+    # Execute
+    response = pull_task_ins(request=request, state=state)
+
+    # Assert
+    assert len(response.task_ins_list) == 0
+
+
+def test_pull_task_ins_long_poll_limit() -> None:
+    """Test that pull_task_ins answers at once when too many requests wait."""
+    # Prepare
+    state = InMemoryState()
+    request = PullTaskInsRequest(
+        node=Node(node_id=state.create_node(), anonymous=False), timeout=10.0
+    )
+
+    # Execute
+    with patch.object(message_handler, "_blocking_pulls", threading.Semaphore(0)):
+        start = time.monotonic()
+        response = pull_task_ins(request=request, state=state)
+
+    # Assert
+    assert len(response.task_ins_list) == 0
+    assert time.monotonic() - start < 5.0
+
+
+def test_pull_task_ins_async_long_poll() -> None:
+    """Test that pull_task_ins_async waits on the event loop."""
+    # Prepare
+    state = InMemoryState()
+    async_state = AsyncState(state)
+    node_id = state.create_node()
+    node = Node(node_id=node_id, anonymous=False)
+    _store_task_ins_later(state, node_id, delay=0.1)
+
+    async def pull_twice() -> List[PullTaskInsResponse]:
+        return list(
+            await asyncio.gather(
+                pull_task_ins_async(
+                    PullTaskInsRequest(node=node, timeout=10.0), async_state
+                ),
+                pull_task_ins_async(
+                    PullTaskInsRequest(node=node, timeout=0.2), async_state
+                ),
+            )
+        )
+
+    # Execute
+    responses = asyncio.run(pull_twice())
+
+    # Assert
+    assert sorted(len(r.task_ins_list) for r in responses) == [0, 1]
+
+
 def test_push_task_res() -> None:
     """Test push_task_res."""
     # Prepare
@@ -112,17 +243,22 @@ def test_push_task_res() -> None:
                 run_id=0,
                 task=Task(),
             ),
-        ],
+        ]
+        * 3,
     )
     state = MagicMock()
+    state.store_task_res_batch.return_value = [uuid4(), None, uuid4()]
 
     # Execute
-    push_task_res(request=request, state=state)
+    response = push_task_res(request=request, state=state)
 
     # Assert
     state.create_node.assert_not_called()
     state.delete_node.assert_not_called()
     state.store_task_ins.assert_not_called()
     state.get_task_ins.assert_not_called()
-    state.store_task_res.assert_called_once()
+    state.store_task_res.assert_not_called()
+    state.store_task_res_batch.assert_called_once()
     state.get_task_res.assert_not_called()
+    assert len(state.store_task_res_batch.call_args.kwargs["task_res_list"]) == 3
+    assert len(response.results) == 2
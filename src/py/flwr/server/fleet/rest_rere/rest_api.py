@@ -15,6 +15,7 @@
 """Experimental REST API server."""
 
 
+import os
 import sys
 
 from flwr.common.constant import MISSING_EXTRA_REST
@@ -25,7 +26,7 @@ from flwr.proto.fleet_pb2 import (
     PushTaskResRequest,
 )
 from flwr.server.fleet.message_handler import message_handler
-from flwr.server.state import State
+from flwr.server.state import AsyncState, StateFactory
 
 try:
     from starlette.applications import Starlette
@@ -37,6 +38,11 @@ try:
 except ModuleNotFoundError:
     sys.exit(MISSING_EXTRA_REST)
 
+# Environment variables from which each worker process creates its StateFactory,
+# unless the app is run in the process which created `app.state.STATE_FACTORY`
+DATABASE_ENV = "FLWR_FLEET_DATABASE"
+POLL_INTERVAL_ENV = "FLWR_FLEET_STATE_POLL_INTERVAL"
+
 
 async def create_node(request: Request) -> Response:
     """Create Node."""
@@ -50,10 +56,10 @@ async def create_node(request: Request) -> Response:
     create_node_request_proto.ParseFromString(create_node_request_bytes)
 
     # Get state from app
-    state: State = app.state.STATE_FACTORY.state()
+    state = _get_state()
 
     # Handle message
-    create_node_response_proto = message_handler.create_node(
+    create_node_response_proto = await message_handler.create_node_async(
         request=create_node_request_proto, state=state
     )
 
@@ -78,10 +84,10 @@ async def delete_node(request: Request) -> Response:
     delete_node_request_proto.ParseFromString(delete_node_request_bytes)
 
     # Get state from app
-    state: State = app.state.STATE_FACTORY.state()
+    state = _get_state()
 
     # Handle message
-    delete_node_response_proto = message_handler.delete_node(
+    delete_node_response_proto = await message_handler.delete_node_async(
         request=delete_node_request_proto, state=state
     )
 
@@ -106,10 +112,10 @@ async def pull_task_ins(request: Request) -> Response:
     pull_task_ins_request_proto.ParseFromString(pull_task_ins_request_bytes)
 
     # Get state from app
-    state: State = app.state.STATE_FACTORY.state()
+    state = _get_state()
 
-    # Handle message
-    pull_task_ins_response_proto = message_handler.pull_task_ins(
+    # Handle message, waiting for TaskIns without blocking the event loop
+    pull_task_ins_response_proto = await message_handler.pull_task_ins_async(
         request=pull_task_ins_request_proto,
         state=state,
     )
@@ -135,10 +141,10 @@ async def push_task_res(request: Request) -> Response:  # Check if token is need
     push_task_res_request_proto.ParseFromString(push_task_res_request_bytes)
 
     # Get state from app
-    state: State = app.state.STATE_FACTORY.state()
+    state = _get_state()
 
     # Handle message
-    push_task_res_response_proto = message_handler.push_task_res(
+    push_task_res_response_proto = await message_handler.push_task_res_async(
         request=push_task_res_request_proto,
         state=state,
     )
@@ -165,6 +171,19 @@ app: Starlette = Starlette(
 )
 
 
+def _get_state() -> AsyncState:
+    """Return the State shared by all workers, without blocking the event loop."""
+    if not hasattr(app.state, "ASYNC_STATE"):
+        if not hasattr(app.state, "STATE_FACTORY"):
+            app.state.STATE_FACTORY = StateFactory(
+                os.environ[DATABASE_ENV],
+                poll_interval=float(os.environ.get(POLL_INTERVAL_ENV, "0")),
+            )
+        app.state.ASYNC_STATE = AsyncState(app.state.STATE_FACTORY.state())
+    state: AsyncState = app.state.ASYNC_STATE
+    return state
+
+
 def _check_headers(headers: Headers) -> None:
     """Check if expected headers are set."""
     if "content-type" not in headers:
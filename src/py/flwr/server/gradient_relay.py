@@ -0,0 +1,126 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Chunked relay of client gradients to the contribution evaluation server."""
+
+
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from flwr.common.gradient_codec import iter_chunks
+from flwr.server.client_proxy import ClientProxy
+
+# Index of the message telling the CE server to drop its buffered chunks
+RESET_INDEX = -1
+
+
+class GradientRelay:
+    """Forward the gradients of the clients to the CE server as they arrive.
+
+    Each gradient is sent in chunks of at most `chunk_size` bytes as soon as
+    it has been received and is not kept afterwards, so the server never holds
+    more gradients than there are clients being queried concurrently.
+    `contributions` then asks the CE server for the contribution of every
+    relayed client. The messages carry `server_round` so the CE server only
+    reuses its cached coalition utilities within the round.
+
+    If `codec` is set, the clients compress their gradients with it before
+    sending them (see `flwr.common.gradient_codec`), keeping the `ratio`
+    fraction of the entries for the `"topk"` and `"projection"` codecs. The
+    round is the seed of the projection shared by the clients.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        ce_server: Any,
+        chunk_size: int,
+        timeout: Optional[float],
+        server_round: int = 0,
+        codec: Optional[str] = None,
+        ratio: float = 0.01,
+    ) -> None:
+        self.ce_server = ce_server
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.server_round = server_round
+        self.codec = codec
+        self.ratio = ratio
+        self._next_index = 0
+        self._started: Set[int] = set()
+        self._clients: Dict[int, ClientProxy] = {}
+        # Guards the indices and clients, not the messages being sent
+        self._lock = threading.Lock()
+        # The CE server connection handles one message at a time
+        self._send_lock = threading.Lock()
+
+    def _send(self, index: int, chunk: bytes, final: bool) -> List[float]:
+        with self._send_lock:
+            contributions: List[float] = self.ce_server.get_contributions_chunk(
+                index,
+                chunk,
+                final=final,
+                timeout=self.timeout,
+                server_round=self.server_round,
+            )
+        return contributions
+
+    def reset(self) -> None:
+        """Drop the chunks the CE server still holds from an interrupted relay."""
+        self._send(RESET_INDEX, b"", final=True)
+
+    def relay(self, client: ClientProxy, gradients: bytes) -> int:
+        """Send the gradients of `client` to the CE server and return its index."""
+        with self._lock:
+            index = self._next_index
+            self._next_index += 1
+        for chunk in iter_chunks(gradients, self.chunk_size):
+            self._send(index, chunk, final=False)
+            with self._lock:
+                self._started.add(index)
+        with self._lock:
+            self._clients[index] = client
+        return index
+
+    def contributions(self) -> Dict[ClientProxy, float]:
+        """Return the contributions computed by the CE server.
+
+        The CE server evaluates the gradients by increasing index, including
+        the partial ones of clients whose relay failed; those are left out.
+        """
+        with self._lock:
+            final_index = self._next_index
+        contributions = self._send(final_index, b"", final=True)
+        with self._lock:
+            indices = sorted(self._started)
+            return {
+                self._clients[index]: contribution
+                for index, contribution in zip(indices, contributions)
+                if index in self._clients
+            }
+
+
+def relay_gradients(
+    client: ClientProxy, relay: GradientRelay, timeout: Optional[float]
+) -> Tuple[ClientProxy, int]:
+    """Get the gradients of a client and relay them to the CE server."""
+    if relay.codec is None:
+        gradients = client.get_gradients(timeout=timeout)  # type: ignore
+    else:
+        gradients = client.get_gradients(  # type: ignore
+            timeout=timeout,
+            codec=relay.codec,
+            ratio=relay.ratio,
+            seed=relay.server_round,
+        )
+    return client, relay.relay(client, gradients)
@@ -0,0 +1,236 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Gradient relay tests."""
+
+
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pytest
+
+from flwr.client import Client, NumPyClient
+from flwr.client.message_handler.message_handler import handle_legacy_message
+from flwr.client.run_state import RunState
+from flwr.common import NDArrays, serde
+from flwr.common.gradient_codec import GRADIENT_CODEC_FLOAT16, decode_gradients
+from flwr.proto.transport_pb2 import ServerMessage
+
+from .gradient_relay import GradientRelay, relay_gradients
+
+
+class _ContributionEvaluator(NumPyClient):
+    """CE server logic: the contribution of a client is its gradient size."""
+
+    def __init__(self) -> None:
+        self.received: List[bytes] = []
+
+    def get_contributions(self, gradients: Iterator[bytes]) -> List[float]:
+        """Consume the gradients one by one."""
+        contributions = []
+        for gradient in gradients:
+            self.received.append(gradient)
+            contributions.append(float(len(gradient)))
+        return contributions
+
+
+class _CEClient(Client):
+    def __init__(self) -> None:
+        self.numpy_client = _ContributionEvaluator()
+
+
+class _CEServerProxy:
+    """Deliver the streamed messages to the client message handler."""
+
+    def __init__(self) -> None:
+        self.client = _CEClient()
+        self.state = RunState(state={})
+        self.messages = 0
+
+    def get_contributions_chunk(
+        self,
+        index: int,
+        chunk: bytes,
+        final: bool,
+        timeout: Optional[float],
+        server_round: int = 0,
+    ) -> List[float]:
+        msg = serde.get_contributions_chunk_to_proto(index, chunk, final, server_round)
+        client_msg, _ = handle_legacy_message(
+            lambda _: self.client,
+            self.state,
+            ServerMessage(get_contributions_ins=msg),
+        )
+        self.messages += 1
+        return list(client_msg.get_contributions_res.contributions)
+
+
+class _GradientClient:
+    def __init__(self, gradients: bytes) -> None:
+        self.gradients = gradients
+
+    def get_gradients(self, timeout: Optional[float]) -> bytes:
+        return self.gradients
+
+
+class _NDArrayClient(NumPyClient):
+    def __init__(self, gradients: NDArrays) -> None:
+        self.gradients = gradients
+
+    def get_gradients(self) -> NDArrays:
+        """Return the gradients uncompressed."""
+        return self.gradients
+
+
+class _NDArrayClientProxy:
+    """Deliver `GetGradientsIns` to the client message handler."""
+
+    def __init__(self, gradients: NDArrays) -> None:
+        self.client = _CEClient()
+        self.client.numpy_client = _NDArrayClient(gradients)  # type: ignore
+        self.seeds: List[int] = []
+
+    def get_gradients(
+        self,
+        timeout: Optional[float],
+        codec: Optional[str] = None,
+        ratio: float = 0.01,
+        seed: int = 0,
+    ) -> bytes:
+        self.seeds.append(seed)
+        msg = serde.get_gradients_ins_to_proto(codec, ratio, seed)
+        client_msg, _ = handle_legacy_message(
+            lambda _: self.client,
+            RunState(state={}),
+            ServerMessage(get_gradients_ins=msg),
+        )
+        return client_msg.get_gradients_res.gradients
+
+
+def test_relay_gradients() -> None:
+    """Test that chunked gradients are reassembled by the CE server."""
+    # Prepare
+    ce_server = _CEServerProxy()
+    relay = GradientRelay(ce_server, chunk_size=4, timeout=None)
+    clients = [_GradientClient(b"x" * size) for size in [10, 0, 4]]
+
+    # Execute
+    for client in clients:
+        relay_gradients(client, relay, None)  # type: ignore
+    contributions: Dict[Any, float] = relay.contributions()
+
+    # Assert
+    assert ce_server.messages == 3 + 1 + 1 + 1
+    assert ce_server.client.numpy_client.received == [c.gradients for c in clients]
+    assert contributions == {c: float(len(c.gradients)) for c in clients}
+    assert not ce_server.state.gradient_chunks
+
+
+def test_relay_compressed_gradients() -> None:
+    """Test that the clients compress the gradients with the relay codec."""
+    # Prepare
+    ce_server = _CEServerProxy()
+    relay = GradientRelay(
+        ce_server,
+        chunk_size=4,
+        timeout=None,
+        server_round=3,
+        codec=GRADIENT_CODEC_FLOAT16,
+    )
+    gradients = [np.arange(6, dtype=np.float32).reshape(2, 3)]
+    client = _NDArrayClientProxy(gradients)
+
+    # Execute
+    relay_gradients(client, relay, None)  # type: ignore
+    relay.contributions()
+
+    # Assert
+    assert client.seeds == [3]
+    (received,) = ce_server.client.numpy_client.received
+    (decoded,) = decode_gradients(received)
+    assert decoded.dtype == np.float16
+    np.testing.assert_array_equal(decoded, gradients[0])
+
+
+def test_reset_drops_interrupted_relay() -> None:
+    """Test that the chunks of an interrupted round are not evaluated."""
+    # Prepare
+    ce_server = _CEServerProxy()
+    interrupted = GradientRelay(ce_server, chunk_size=4, timeout=None)
+    relay_gradients(_GradientClient(b"stale"), interrupted, None)  # type: ignore
+    relay = GradientRelay(ce_server, chunk_size=4, timeout=None)
+    client = _GradientClient(b"fresh")
+
+    # Execute
+    relay.reset()
+    relay_gradients(client, relay, None)  # type: ignore
+    contributions: Dict[Any, float] = relay.contributions()
+
+    # Assert
+    assert ce_server.client.numpy_client.received == [b"fresh"]
+    assert contributions == {client: 5.0}
+
+
+def test_failed_relay_is_left_out() -> None:
+    """Test that a client whose relay failed gets no contribution."""
+    # Prepare
+    ce_server = _CEServerProxy()
+    send = ce_server.get_contributions_chunk
+
+    def _fail_on_chunk(
+        index: int,
+        chunk: bytes,
+        final: bool,
+        timeout: Optional[float],
+        server_round: int = 0,
+    ) -> List[float]:
+        if chunk == b"fail":
+            raise ConnectionError()
+        return send(index, chunk, final, timeout, server_round)
+
+    ce_server.get_contributions_chunk = _fail_on_chunk  # type: ignore
+    relay = GradientRelay(ce_server, chunk_size=4, timeout=None)
+    failed, client = _GradientClient(b"yyyyfail"), _GradientClient(b"zz")
+
+    # Execute
+    with pytest.raises(ConnectionError):
+        relay_gradients(failed, relay, None)  # type: ignore
+    relay_gradients(client, relay, None)  # type: ignore
+    contributions: Dict[Any, float] = relay.contributions()
+
+    # Assert
+    assert ce_server.client.numpy_client.received == [b"yyyy", b"zz"]
+    assert contributions == {client: 2.0}
+
+
+def test_failed_evaluation_clears_chunks() -> None:
+    """Test that the buffered chunks are dropped when the evaluation fails."""
+    # Prepare
+    ce_server = _CEServerProxy()
+
+    def _fail(gradients: Iterator[bytes]) -> List[float]:
+        next(gradients)
+        raise ValueError()
+
+    ce_server.client.numpy_client.get_contributions = _fail  # type: ignore
+    relay = GradientRelay(ce_server, chunk_size=4, timeout=None)
+    for size in [10, 4]:
+        relay_gradients(_GradientClient(b"x" * size), relay, None)  # type: ignore
+
+    # Execute
+    with pytest.raises(ValueError):
+        relay.contributions()
+
+    # Assert
+    assert not ce_server.state.gradient_chunks
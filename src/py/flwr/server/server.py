@@ -17,8 +17,9 @@
 
 import concurrent.futures
 import timeit
+from functools import partial
 from logging import DEBUG, INFO
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
 import random
 
 from flwr.common import (
@@ -37,7 +38,8 @@ from flwr.common import (
 from flwr.common.logger import log
 from flwr.common.typing import GetParametersIns
 from flwr.server.client_manager import ClientManager
-from flwr.server.client_proxy import ClientProxy
+from flwr.server.client_proxy import BatchClientProxy, ClientProxy
+from flwr.server.gradient_relay import GradientRelay, relay_gradients
 from flwr.server.history import History
 from flwr.server.strategy import FedAvg, Strategy
 import time
@@ -67,6 +69,10 @@ class Server:
         strategy: Optional[Strategy] = None,
         methodo, 
         threshold,
+        contribution_probability: float = 0.2,
+        gradient_chunk_size: Optional[int] = None,
+        gradient_codec: Optional[str] = None,
+        gradient_codec_ratio: float = 0.01,
     ) -> None:
         self._client_manager: ClientManager = client_manager
         self.parameters: Parameters = Parameters(
@@ -81,6 +87,14 @@ class Server:
         self.ce=contribution
         self.methodo = methodo
         self.threshold = threshold
+        self.contribution_probability = contribution_probability
+        # Gradients are relayed to the CE server in chunks of this many bytes,
+        # or all at once in a single message if None
+        self.gradient_chunk_size = gradient_chunk_size
+        # Codec of `flwr.common.gradient_codec` the clients compress the relayed
+        # gradients with, and the fraction of the entries it keeps
+        self.gradient_codec = gradient_codec
+        self.gradient_codec_ratio = gradient_codec_ratio
         self.waiting = []
         self.check = True
 
@@ -284,6 +298,10 @@ class Server:
 
     def compute_reputation(self, server_round, timeout):
         clients = self.clients + self.waiting
+        if self.gradient_chunk_size is not None:
+            return self._relay_reputation(
+                clients, server_round, timeout, self.gradient_chunk_size
+            )
         client_instructions= [(client, None) for client in clients]
         results, failures = fn_clients(
             client_fn=get_gradients,
@@ -303,7 +321,7 @@ class Server:
         ce_server = self._client_manager.ce_server
         client_instructions= [(ce_server, gradients)]
         results, failures = fn_clients(
-            client_fn=get_contributions,
+            client_fn=partial(get_contributions, server_round=server_round),
             client_instructions=client_instructions,
             max_workers=self.max_workers,
             timeout=timeout,
@@ -317,6 +335,38 @@ class Server:
         )
         sv = results[0][1]
         return {clients_order[i]:sv[i] for i in range(len(sv))}
+
+    def _relay_reputation(
+        self,
+        clients: List[ClientProxy],
+        server_round: int,
+        timeout: Optional[float],
+        chunk_size: int,
+    ) -> Dict[ClientProxy, float]:
+        """Stream the gradients to the CE server without holding all of them."""
+        relay = GradientRelay(
+            self._client_manager.ce_server,  # type: ignore
+            chunk_size,
+            timeout,
+            server_round=server_round,
+            codec=self.gradient_codec,
+            ratio=self.gradient_codec_ratio,
+        )
+        relay.reset()
+        results, failures = fn_clients(
+            client_fn=relay_gradients,
+            client_instructions=[(client, relay) for client in clients],
+            max_workers=self.max_workers,
+            timeout=timeout,
+        )
+        log(
+            DEBUG,
+            "gradients %s relayed %s results and %s failures",
+            server_round,
+            len(results),
+            len(failures),
+        )
+        return relay.contributions()
         
     def update_n(self):
         self.n = len(self.clients)
@@ -377,7 +427,7 @@ class Server:
             evaluate_client(self._client_manager.ce_server, instruction, timeout)
             self.check = False
         # compute the reputation of each client
-        self.check = not random.randrange(5)
+        self.check = random.random() < self.contribution_probability
         changed = False
         if self.check:
             shapley_values = self.compute_reputation(server_round, timeout)
@@ -421,22 +471,38 @@ class Server:
             client_instructions += [(client, fit_ins) for client in self.waiting]
             log(INFO, "set_aside2: " + str(len(self.clients)) + " active clients and " + str(len(self.waiting)) + " waiting clients")
         
-        # Collect `fit` results from all clients participating in this round
+        # Collect `fit` results from all clients participating in this round.
+        # Without contribution evaluation, the strategy adds up each result as
+        # soon as it arrives instead of after the last client finished, and
+        # only the clients which returned a result are kept.
+        accumulated: List[ClientProxy] = []
+
+        def _accumulate(result: Tuple[ClientProxy, FitRes]) -> None:
+            self.strategy.accumulate2(server_round, result)
+            accumulated.append(result[0])
+
         results, failures = fit_clients(
             client_instructions=client_instructions,
             max_workers=self.max_workers,
             timeout=timeout,
+            on_result=None if self.ce else _accumulate,
         )
         log(
             DEBUG,
             "fit_round %s received %s results and %s failures",
             server_round,
-            len(results),
+            len(results) + len(accumulated),
             len(failures),
         )
-        if self.ce:
-            changed = self.shapley_round(server_round, timeout)
-            results = [x for x in results if x[0] in self.clients]
+        if not self.ce:
+            # Aggregate training results
+            parameters_aggregated, metrics_aggregated = self.strategy.finalize2(
+                self.n, server_round, failures
+            )
+            return parameters_aggregated, metrics_aggregated, (results, failures)
+
+        changed = self.shapley_round(server_round, timeout)
+        results = [x for x in results if x[0] in self.clients]
         # Aggregate training results
         print("################### AGGREGATE FIT ##########################")
         aggregated_result: Tuple[
@@ -529,28 +595,58 @@ def fit_clients(
     client_instructions: List[Tuple[ClientProxy, FitIns]],
     max_workers: Optional[int],
     timeout: Optional[float],
+    on_result: Optional[Callable[[Tuple[ClientProxy, FitRes]], None]] = None,
 ) -> FitResultsAndFailures:
-    """Refine parameters concurrently on all selected clients."""
+    """Refine parameters concurrently on all selected clients.
+
+    Results are handled in the order in which the clients finish. If `on_result`
+    is provided, it is called with each successful result as soon as it arrives,
+    so that the caller can aggregate it while waiting for the remaining clients.
+    The result is then handed over to `on_result` instead of being kept, i.e.,
+    only failures are returned. Proxies of a `BatchClientProxy` subclass run the
+    round in a batch instead.
+    """
+    results: List[Tuple[ClientProxy, FitRes]] = []
+    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+    batch_type = _batch_type(client_instructions)
+    if batch_type is not None:
+        for client_proxy, res in batch_type.fit_batch(client_instructions, timeout):
+            if isinstance(res, BaseException):
+                failures.append(res)
+            elif res.status.code != Code.OK:
+                failures.append((client_proxy, res))
+            elif on_result is not None:
+                on_result((client_proxy, res))
+            else:
+                results.append((client_proxy, res))
+        return results, failures
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         submitted_fs = {
             executor.submit(fit_client, client_proxy, ins, timeout)
             for client_proxy, ins in client_instructions
         }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
-
-    # Gather results
-    results: List[Tuple[ClientProxy, FitRes]] = []
-    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
-    for future in finished_fs:
-        _handle_finished_future_after_fit(
-            future=future, results=results, failures=failures
-        )
+        # Gather results, timeout is handled in the respective communication stack
+        for future in concurrent.futures.as_completed(submitted_fs):
+            _handle_finished_future_after_fit(
+                future=future, results=results, failures=failures
+            )
+            if on_result is not None and results:
+                # Hand the result over instead of keeping it for the whole round
+                on_result(results.pop())
     return results, failures
 
 
+def _batch_type(
+    client_instructions: Sequence[Tuple[ClientProxy, object]],
+) -> Optional[Type[BatchClientProxy]]:
+    """Return the type of the proxies if they all run rounds in batches."""
+    types = {type(client_proxy) for client_proxy, _ in client_instructions}
+    if len(types) != 1:
+        return None
+    (proxy_type,) = types
+    return proxy_type if issubclass(proxy_type, BatchClientProxy) else None
+
+
 def fit_client(
     client: ClientProxy, ins: FitIns, timeout: Optional[float]
 ) -> Tuple[ClientProxy, FitRes]:
@@ -589,7 +685,26 @@ def evaluate_clients(
     max_workers: Optional[int],
     timeout: Optional[float],
 ) -> EvaluateResultsAndFailures:
-    """Evaluate parameters concurrently on all selected clients."""
+    """Evaluate parameters concurrently on all selected clients.
+
+    Proxies of a `BatchClientProxy` subclass run the round in a batch instead.
+    """
+    batch_type = _batch_type(client_instructions)
+    if batch_type is not None:
+        batch_results: List[Tuple[ClientProxy, EvaluateRes]] = []
+        batch_failures: List[
+            Union[Tuple[ClientProxy, EvaluateRes], BaseException]
+        ] = []
+        for client_proxy, res in batch_type.evaluate_batch(
+            client_instructions, timeout
+        ):
+            if isinstance(res, BaseException):
+                batch_failures.append(res)
+            elif res.status.code == Code.OK:
+                batch_results.append((client_proxy, res))
+            else:
+                batch_failures.append((client_proxy, res))
+        return batch_results, batch_failures
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         submitted_fs = {
             executor.submit(evaluate_client, client_proxy, ins, timeout)
@@ -645,7 +760,7 @@ def _handle_finished_future_after_evaluate(
     failures.append(result)
     
 def fn_clients(
-    client_instructions: List[Tuple[ClientProxy, FitIns]],
+    client_instructions: List[Tuple[ClientProxy, Any]],
     client_fn,
     max_workers: Optional[int],
     timeout: Optional[float],
@@ -696,9 +811,11 @@ def get_gradients(
     return client, get_gradients_res
     
 def get_contributions(
-    client: ClientProxy, ins, timeout: Optional[float]
+    client: ClientProxy, ins, timeout: Optional[float], server_round: int = 0
 ) :
-    get_contribution_res = client.get_contributions(ins,timeout=timeout)
+    get_contribution_res = client.get_contributions(
+        ins, timeout=timeout, server_round=server_round
+    )
     return client, get_contribution_res
     
 def identify(
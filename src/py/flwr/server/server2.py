@@ -18,7 +18,7 @@
 import concurrent.futures
 import timeit
 from logging import DEBUG, INFO
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import time
 from flwr.common import (
     Code,
@@ -34,18 +34,21 @@ from flwr.common import (
     parameters_to_ndarrays,
     ndarrays_to_parameters,
 )
+from flwr.common.ckks_packing import CKKSPacking
+from flwr.common.context_registry import ContextRegistry
 from flwr.common.logger import log
 from flwr.common.typing import GetParametersIns
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
+from flwr.server.gradient_relay import GradientRelay, relay_gradients
 from flwr.server.history import History
-from flwr.server.strategy import FedAvg, Strategy
+from flwr.server.strategy import MKFedAvg, Strategy
 
 import sys
 sys.path.append('../../../../../TenSEAL')
 import tenseal as ts
 import numpy as np
-from functools import reduce
+from functools import partial, reduce
 import random
 
 FitResultsAndFailures = Tuple[
@@ -61,18 +64,6 @@ ReconnectResultsAndFailures = Tuple[
     List[Union[Tuple[ClientProxy, DisconnectRes], BaseException]],
 ]
 
-def reshape_parameters(parameters,shapes):
-    p=[]
-    offset=0
-    for _,s in enumerate(shapes):
-        n = int(np.prod(s))
-        if not s:
-            p.append(parameters[offset])#np.array(parameters[offset]))#,dtype=object))
-        else:
-            p.append(list(np.array(parameters[offset:(offset+n)]).reshape(s)))
-        offset+=n
-    return p#np.array(p,dtype=object)
-
 class Server:
     """Flower server."""
 
@@ -85,15 +76,22 @@ class Server:
         methodo, 
         threshold,
         shapes=None,
+        contribution_probability: float = 0.2,
+        gradient_chunk_size: Optional[int] = None,
+        gradient_codec: Optional[str] = None,
+        gradient_codec_ratio: float = 0.01,
     ) -> None:
         self._client_manager: ClientManager = client_manager
         self.parameters: Parameters = Parameters(
             tensors=[], tensor_type="numpy.ndarray"
         )
-        self.strategy: Strategy = strategy if strategy is not None else FedAvg()
+        self.strategy: MKFedAvg = _check_strategy(
+            strategy if strategy is not None else MKFedAvg()
+        )
         self.max_workers: Optional[int] = None
         self.context = ts.context(ts.SCHEME_TYPE.MK_CKKS, 8192, coeff_mod_bit_sizes=[60, 40, 40, 60])
         self.context.global_scale = 2**40
+        self.contexts = ContextRegistry()
         self.pk = None
         self.n = 0
         self.n_tot = 1
@@ -102,8 +100,20 @@ class Server:
         self.client_mapping = None
         self.ce = contribution
         self.shape = shapes
+        if shapes is None:
+            # The aggregated model is decoded into layers of these shapes
+            raise ValueError("The encrypted server requires the model `shapes`")
+        self.packing = CKKSPacking(shapes)
         self.methodo = methodo
         self.threshold = threshold
+        self.contribution_probability = contribution_probability
+        # Gradients are relayed to the CE server in chunks of this many bytes,
+        # or all at once in a single message if None
+        self.gradient_chunk_size = gradient_chunk_size
+        # Codec of `flwr.common.gradient_codec` the clients compress the relayed
+        # gradients with, and the fraction of the entries it keeps
+        self.gradient_codec = gradient_codec
+        self.gradient_codec_ratio = gradient_codec_ratio
         self.waiting = []
         self.check = True
 
@@ -113,7 +123,7 @@ class Server:
 
     def set_strategy(self, strategy: Strategy) -> None:
         """Replace server strategy."""
-        self.strategy = strategy
+        self.strategy = _check_strategy(strategy)
 
     def client_manager(self) -> ClientManager:
         """Return ClientManager."""
@@ -127,20 +137,22 @@ class Server:
             clients = self._client_manager.sample(min_num_clients,min_num_clients)
         get_pk_ins = self.context
         client_instructions= [(client, get_pk_ins) for client in clients]
-        # Get public keys from all clients
-        results, failures = fn_clients(
-            client_instructions=client_instructions,
-            client_fn=get_pk_client,
-            max_workers=self.max_workers,
-            timeout=timeout,
-        )
-        if len(failures)!=0 :
-            raise RuntimeError("Error while getting the public keys")
-        #Aggregate public keys
-        aggregated_result: Tuple[
-            Optional[Parameters],
-            Dict[str, Scalar],
-        ] = self.strategy.aggregate(0, results[1:], lambda x,y : x.add_pk(y[1]),results[0][1], failures)
+        # Get public keys from all clients and aggregate them as they arrive
+        with self.strategy.ciphertext_aggregator(lambda x, y: x.add_pk(y)) as aggregator:
+            results, failures = fn_clients(
+                client_instructions=client_instructions,
+                client_fn=get_pk_client,
+                max_workers=self.max_workers,
+                timeout=timeout,
+                on_result=lambda result: aggregator.add(result[1]),
+            )
+            if len(failures)!=0 :
+                raise RuntimeError("Error while getting the public keys")
+            #Aggregate public keys
+            aggregated_result: Tuple[
+                Optional[Parameters],
+                Dict[str, Scalar],
+            ] = self.strategy.aggregate_enc(0, results, aggregator, failures)
         parameters_aggregated, metrics_aggregated = aggregated_result
         if parameters_aggregated is None :
             raise RuntimeError("Error while aggregating public keys")
@@ -149,6 +161,10 @@ class Server:
     def set_pk(self, pk):
         self.context.data.set_publickey(ts._ts_cpp.PublicKey(pk.data.ciphertext()[0]))
         self.pk = self.context.public_key()
+        # The context is sent in full during `send_pk` only, later messages
+        # refer to it by id
+        self.contexts.clear()
+        self.contexts.register(self.context)
     
     def send_pk(self, ctx, timeout : Optional[float]):
         clients = self.clients
@@ -160,7 +176,7 @@ class Server:
         client_instructions= [(client, send_pk_ins) for client in clients]
         results, failures = fn_clients(
             client_instructions=client_instructions,
-            client_fn=send_pk_client,
+            client_fn=partial(send_pk_client, ctx_id=self.contexts.current_id),
             max_workers=self.max_workers,
             timeout=timeout,
         )
@@ -179,19 +195,21 @@ class Server:
             clients = self._client_manager.sample(min_num_clients,min_num_clients)
         # Get initial parameters from all clients
         client_instructions= [(client, None) for client in clients]
-        results, failures = fn_clients(
-            client_instructions=client_instructions,
-            client_fn=get_parms_client,
-            max_workers=self.max_workers,
-            timeout=timeout,
-        )
-        if len(failures)!=0 or len(results)!=self.n:
-            raise RuntimeError("Error while getting initial parameters")
-        # Aggregate initial parameters
-        aggregated_result: Tuple[
-            Optional[Parameters],
-            Dict[str, Scalar],
-        ] = self.strategy.aggregate(0, results[1:], lambda x,y : x.add(y[1]),results[0][1], failures)
+        with self.strategy.ciphertext_aggregator(lambda x, y: x.add(y)) as aggregator:
+            results, failures = fn_clients(
+                client_instructions=client_instructions,
+                client_fn=partial(get_parms_client, contexts=self.contexts),
+                max_workers=self.max_workers,
+                timeout=timeout,
+                on_result=lambda result: aggregator.add(result[1]),
+            )
+            if len(failures)!=0 or len(results)!=self.n:
+                raise RuntimeError("Error while getting initial parameters")
+            # Aggregate initial parameters
+            aggregated_result: Tuple[
+                Optional[Parameters],
+                Dict[str, Scalar],
+            ] = self.strategy.aggregate_enc(0, results, aggregator, failures)
         parameters_aggregated, metrics_aggregated = aggregated_result
         if parameters_aggregated is None or len(failures)!=0:
             raise RuntimeError("Error while getting initial parameters")
@@ -200,6 +218,10 @@ class Server:
 
     def compute_reputation(self, server_round, timeout):
         clients = self.clients + self.waiting
+        if self.gradient_chunk_size is not None:
+            return self._relay_reputation(
+                clients, server_round, timeout, self.gradient_chunk_size
+            )
         client_instructions= [(client, None) for client in clients]
         results, failures = fn_clients(
             client_fn=get_gradients,
@@ -219,7 +241,7 @@ class Server:
         ce_server = self._client_manager.ce_server
         client_instructions= [(ce_server, gradients)]
         results, failures = fn_clients(
-            client_fn=get_contributions,
+            client_fn=partial(get_contributions, server_round=server_round),
             client_instructions=client_instructions,
             max_workers=self.max_workers,
             timeout=timeout,
@@ -233,6 +255,38 @@ class Server:
         )
         sv = results[0][1]
         return {clients_order[i]:sv[i] for i in range(len(sv))}
+
+    def _relay_reputation(
+        self,
+        clients: List[ClientProxy],
+        server_round: int,
+        timeout: Optional[float],
+        chunk_size: int,
+    ) -> Dict[ClientProxy, float]:
+        """Stream the gradients to the CE server without holding all of them."""
+        relay = GradientRelay(
+            self._client_manager.ce_server,  # type: ignore
+            chunk_size,
+            timeout,
+            server_round=server_round,
+            codec=self.gradient_codec,
+            ratio=self.gradient_codec_ratio,
+        )
+        relay.reset()
+        results, failures = fn_clients(
+            client_fn=relay_gradients,
+            client_instructions=[(client, relay) for client in clients],
+            max_workers=self.max_workers,
+            timeout=timeout,
+        )
+        log(
+            DEBUG,
+            "gradients %s relayed %s results and %s failures",
+            server_round,
+            len(results),
+            len(failures),
+        )
+        return relay.contributions()
         
     def update_n(self):
         self.n = len(self.clients)
@@ -316,29 +370,34 @@ class Server:
         )
 
         # Send Encrypted parameters to all clients participating in this round
-        # Collect `decryption shares` from all clients participating in this round
-        results, failures = fn_clients(
-            client_fn=send_enc,
-            client_instructions=client_instructions,
-            max_workers=self.max_workers,
-            timeout=timeout,
-        )
-        log(
-            DEBUG,
-            "fit_round %s received %s results and %s failures",
-            server_round,
-            len(results),
-            len(failures),
-        )
-        if len(failures) != 0 or len(results) != self.n:
-            raise RuntimeError("Error while getting the decryption shares")
-        
-        # Aggregate decryption shares
-        aggregated_ds: Tuple[
-            Optional[Parameters],
-            Dict[str, Scalar],
-        ] = self.strategy.aggregate(server_round, results, lambda x,y : x.add_share(y[1]),self.parameters,failures)
-        
+        # Collect `decryption shares` from all clients participating in this round,
+        # and add them to the encrypted parameters as they arrive
+        with self.strategy.share_aggregator(self.parameters) as aggregator:
+            results, failures = fn_clients(
+                client_fn=partial(send_enc, contexts=self.contexts),
+                client_instructions=client_instructions,
+                max_workers=self.max_workers,
+                timeout=timeout,
+                on_result=lambda result: aggregator.add(result[1]),
+            )
+            log(
+                DEBUG,
+                "fit_round %s received %s results and %s failures",
+                server_round,
+                len(results),
+                len(failures),
+            )
+            if len(failures) != 0 or len(results) != self.n:
+                raise RuntimeError("Error while getting the decryption shares")
+
+            # Aggregate decryption shares
+            aggregated_ds: Tuple[
+                Optional[Parameters],
+                Dict[str, Scalar],
+            ] = self.strategy.aggregate_enc(server_round, results, aggregator, failures)
+        if aggregated_ds[0] is None:
+            raise RuntimeError("Error while aggregating the decryption shares")
+
         parameters_aggregated, metrics_aggregated = aggregated_ds[0]*(1/self.n), aggregated_ds[1]#*(1/self.n)
         # Evaluate model using strategy implementation
         self.evaluate_enc(parameters_aggregated,server_round-1,start_time,history)
@@ -350,7 +409,7 @@ class Server:
         #    client_manager=self._client_manager,
         #    clients = clients
         #)
-        p2=ndarrays_to_parameters(reshape_parameters(parameters_aggregated.mk_decode(),self.shape))
+        p2=self.packing.to_parameters(parameters_aggregated.mk_decode())
         client_instructions2 = self.strategy.configure_fit(
             server_round=server_round,
             parameters=p2 ,
@@ -377,12 +436,19 @@ class Server:
             client_instructions2 += [(client, fit_ins) for client in self.waiting]
             log(INFO, "set_aside2: " + str(len(self.clients)) + " active clients and " + str(len(self.waiting)) + " waiting clients")
 
-        # Collect `fit` results from all clients participating in this round
+        # Collect `fit` results from all clients participating in this round and
+        # feed the encrypted parameters of the active clients to the strategy
+        # as they arrive
+        def _accumulate(result):
+            if result[0] in self.clients:
+                self.strategy.accumulate(server_round, result)
+
         results2, failures2 = fn_clients(
-            client_fn=send_ds,
+            client_fn=partial(send_ds, contexts=self.contexts),
             client_instructions=client_instructions2,
             max_workers=self.max_workers,
             timeout=timeout,
+            on_result=_accumulate,
         )
         log(
             DEBUG,
@@ -403,7 +469,8 @@ class Server:
             self.check = False
             
         # compute the reputation of each client
-        self.check = not random.randrange(5) #evaluate contribution with a probability of 20%
+        # evaluate contributions with probability `contribution_probability`
+        self.check = random.random() < self.contribution_probability
         if self.ce and self.check:
             log(INFO, "#################CONTRIBUTION EVALUATION#################")
             shapley_values = self.compute_reputation(server_round, timeout)
@@ -417,8 +484,9 @@ class Server:
         aggregated_result: Tuple[
             Optional[Parameters],
             Dict[str, Scalar],
-        ] = self.strategy.aggregate_fit_enc(server_round, results2[1:], lambda x,y : x.add(y[1][0]),results2[0][1], failures2) #**y[1][1].num_examples
-        parameters_aggregated, metrics_aggregated, self.n_tot = aggregated_result
+        ] = self.strategy.finalize(server_round, failures2)
+        parameters_aggregated, metrics_aggregated = aggregated_result
+        self.n_tot = sum(res[1].num_examples for _, res in results2)
         return parameters_aggregated, metrics_aggregated, (results, failures)
 
 
@@ -575,29 +643,33 @@ class Server:
         )
 
         # Send Encrypted parameters to all clients participating in this round
-        # Collect `decryption shares` from all clients participating in this round
-        results, failures = fn_clients(
-            client_fn=send_enc,
-            client_instructions=client_instructions,
-            max_workers=self.max_workers,
-            timeout=timeout,
-        )
-        log(
-            DEBUG,
-            "eval_enc_last %s received %s results and %s failures",
-            server_round,
-            len(results),
-            len(failures),
-        )
-
-        if len(failures) != 0 or len(results) != self.n:
-            raise RuntimeError("Error while getting the decryption shares")
-        
-        # Aggregate decryption shares
-        aggregated_ds: Tuple[
-            Optional[Parameters],
-            Dict[str, Scalar],
-        ] = self.strategy.aggregate(server_round, results, lambda x,y : x.add_share(y[1]),self.parameters,failures)
+        # Collect `decryption shares` from all clients participating in this round,
+        # and add them to the encrypted parameters as they arrive
+        with self.strategy.share_aggregator(self.parameters) as aggregator:
+            results, failures = fn_clients(
+                client_fn=partial(send_enc, contexts=self.contexts),
+                client_instructions=client_instructions,
+                max_workers=self.max_workers,
+                timeout=timeout,
+                on_result=lambda result: aggregator.add(result[1]),
+            )
+            log(
+                DEBUG,
+                "eval_enc_last %s received %s results and %s failures",
+                server_round,
+                len(results),
+                len(failures),
+            )
+            if len(failures) != 0 or len(results) != self.n:
+                raise RuntimeError("Error while getting the decryption shares")
+
+            # Aggregate decryption shares
+            aggregated_ds: Tuple[
+                Optional[Parameters],
+                Dict[str, Scalar],
+            ] = self.strategy.aggregate_enc(server_round, results, aggregator, failures)
+        if aggregated_ds[0] is None:
+            raise RuntimeError("Error while aggregating the decryption shares")
         
         parameters_aggregated, metrics_aggregated = aggregated_ds[0]*(1/self.n), aggregated_ds[1] #*(1/self.n)
         # Evaluate model using strategy implementation
@@ -891,29 +963,32 @@ def fit_client(
     return client, fit_res
 
 def fn_clients(
-    client_instructions: List[Tuple[ClientProxy, FitIns]],
+    client_instructions: List[Tuple[ClientProxy, Any]],
     client_fn,
     max_workers: Optional[int],
     timeout: Optional[float],
+    on_result: Optional[Callable[[Tuple[ClientProxy, Any]], None]] = None,
 ) -> FitResultsAndFailures:
-    """Refine parameters concurrently on all selected clients."""
+    """Refine parameters concurrently on all selected clients.
+
+    If provided, `on_result` is called with each successful result as soon as
+    it arrives, which allows aggregating while waiting for the other clients.
+    """
+    results: List[Tuple[ClientProxy, FitRes]] = []
+    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         submitted_fs = {
             executor.submit(client_fn, client_proxy, ins, timeout)
             for client_proxy, ins in client_instructions
         }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
-
-    # Gather results
-    results: List[Tuple[ClientProxy, FitRes]] = []
-    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
-    for future in finished_fs:
-        _handle_finished_future_after_fn(
-            future=future, results=results, failures=failures
-        )
+        # Gather results, timeout is handled in the respective communication stack
+        for future in concurrent.futures.as_completed(submitted_fs):
+            num_results = len(results)
+            _handle_finished_future_after_fn(
+                future=future, results=results, failures=failures
+            )
+            if on_result is not None and len(results) > num_results:
+                on_result(results[-1])
     return results, failures
 
 
@@ -933,35 +1008,54 @@ def send_client(
     return client, fit_res
 
 def send_pk_client(
-    client: ClientProxy, ctx, timeout: Optional[float]
+    client: ClientProxy, ctx, timeout: Optional[float], ctx_id: str = ""
 ): #TODO -> Tuple[ClientProxy, SendPKRes]:
     """Refine parameters on a single client."""
-    send_pk_res = client.send_pk(ctx, timeout=timeout)
+    send_pk_res = client.send_pk(ctx, timeout=timeout, ctx_id=ctx_id)
     return client, send_pk_res
 
 def get_parms_client(
-    client: ClientProxy, ins, timeout: Optional[float]
+    client: ClientProxy,
+    ins,
+    timeout: Optional[float],
+    contexts: Optional[ContextRegistry] = None,
 ) :# TODO-> Tuple[ClientProxy, ]:
     """Refine parameters on a single client."""
-    get_parms_res = client.get_parms(timeout=timeout)
+    get_parms_res = client.get_parms(timeout=timeout, contexts=contexts)
     return client, get_parms_res
 
+def _check_strategy(strategy: Strategy) -> MKFedAvg:
+    """Check that the strategy implements the multi-key CKKS aggregation."""
+    if not isinstance(strategy, MKFedAvg):
+        raise TypeError(
+            "The encrypted server requires the multi-key CKKS strategy "
+            f"`{MKFedAvg.__name__}`, got `{type(strategy).__name__}`"
+        )
+    return strategy
+
+
 def send_enc(
-        client: ClientProxy, ins, timeout: Optional[float]
+    client: ClientProxy,
+    ins,
+    timeout: Optional[float],
+    contexts: Optional[ContextRegistry] = None,
 ) -> Tuple[ClientProxy, FitRes]:
     """Refine parameters on a single client."""
     
     context,enc = ins
-    fit_res = client.send_enc(context,enc, timeout=timeout)
+    fit_res = client.send_enc(context, enc, timeout=timeout, contexts=contexts)
     return client, fit_res
 
 def send_ds(
-    client: ClientProxy, ins, timeout: Optional[float]
+    client: ClientProxy,
+    ins,
+    timeout: Optional[float],
+    contexts: Optional[ContextRegistry] = None,
 ) -> Tuple[ClientProxy, FitRes]:
     """Refine parameters on a single client."""
     #context,enc = ins
     #fit_res = client.send_ds(context,enc, timeout=timeout)
-    fit_res = client.send_ds(None,ins, timeout=timeout)
+    fit_res = client.send_ds(None, ins, timeout=timeout, contexts=contexts)
     return client, fit_res
 
 def _handle_finished_future_after_fit(
@@ -1094,9 +1188,11 @@ def get_gradients(
     return client, get_gradients_res
     
 def get_contributions(
-    client: ClientProxy, ins, timeout: Optional[float]
+    client: ClientProxy, ins, timeout: Optional[float], server_round: int = 0
 ) :
-    get_contribution_res = client.get_contributions(ins,timeout=timeout)
+    get_contribution_res = client.get_contributions(
+        ins, timeout=timeout, server_round=server_round
+    )
     return client, get_contribution_res
     
 def identify(
@@ -34,8 +34,10 @@ from flwr.common import (
     ReconnectIns,
     Status,
     ndarray_to_bytes,
+    parameters_to_ndarrays,
 )
 from flwr.server.client_manager import SimpleClientManager
+from flwr.server.strategy import FedAvg, FedAvgAndroid
 
 from .client_proxy import ClientProxy
 from .server import Server, evaluate_clients, fit_clients
@@ -130,6 +132,87 @@ def test_fit_clients() -> None:
     assert results[0][1].num_examples == 1
 
 
+def test_fit_clients_on_result() -> None:
+    """Test that fit_clients passes results to on_result as they arrive."""
+    # Prepare
+    clients: List[ClientProxy] = [
+        FailingClient("0"),
+        SuccessClient("1"),
+        SuccessClient("2"),
+    ]
+    arr = np.array([[1, 2], [3, 4], [5, 6]])
+    arr_serialized = ndarray_to_bytes(arr)
+    ins: FitIns = FitIns(Parameters(tensors=[arr_serialized], tensor_type=""), {})
+    client_instructions = [(c, ins) for c in clients]
+    streamed: List[ClientProxy] = []
+
+    # Execute
+    results, failures = fit_clients(
+        client_instructions, None, None, on_result=lambda res: streamed.append(res[0])
+    )
+
+    # Assert
+    assert not results
+    assert len(failures) == 1
+    assert sorted(client.cid for client in streamed) == ["1", "2"]
+
+
+def test_fit_round_without_contribution() -> None:
+    """Test that fit_round adds up the results and divides them by n."""
+    # Prepare
+    client_manager = SimpleClientManager()
+    for cid in ["1", "2"]:
+        client_manager.register(SuccessClient(cid))
+    strategy = FedAvg(min_fit_clients=2, min_available_clients=2)
+    server = Server(
+        client_manager=client_manager,
+        contribution=False,
+        strategy=strategy,
+        methodo=None,
+        threshold=0.0,
+    )
+    server.n = 4
+
+    # Execute
+    res_fit = server.fit_round(server_round=1, timeout=None)
+
+    # Assert
+    assert res_fit is not None
+    parameters, _, (results, failures) = res_fit
+    assert parameters is not None
+    [aggregated] = parameters_to_ndarrays(parameters)
+    np.testing.assert_allclose(aggregated, np.array([[1, 2], [3, 4], [5, 6]]) / 2)
+    # The results were consumed by the strategy as they arrived
+    assert not results
+    assert not failures
+
+
+def test_fit_round_buffers_for_other_strategies() -> None:
+    """Test that fit_round works with strategies not streaming the results."""
+    # Prepare
+    client_manager = SimpleClientManager()
+    for cid in ["1", "2"]:
+        client_manager.register(SuccessClient(cid))
+    strategy = FedAvgAndroid(min_fit_clients=2, min_available_clients=2)
+    server = Server(
+        client_manager=client_manager,
+        contribution=False,
+        strategy=strategy,
+        methodo=None,
+        threshold=0.0,
+    )
+    server.n = 2
+
+    # Execute
+    res_fit = server.fit_round(server_round=1, timeout=None)
+
+    # Assert
+    assert res_fit is not None
+    parameters, _, (_, failures) = res_fit
+    assert parameters is not None
+    assert not failures
+
+
 def test_eval_clients() -> None:
     """Test eval_clients."""
     # Prepare
@@ -15,14 +15,18 @@
 """Flower server state."""
 
 
+from .async_state import AsyncState as AsyncState
 from .in_memory_state import InMemoryState as InMemoryState
 from .sqlite_state import SqliteState as SqliteState
 from .state import State as State
 from .state_factory import StateFactory as StateFactory
+from .task_reaper import TaskReaper as TaskReaper
 
 __all__ = [
+    "AsyncState",
     "InMemoryState",
     "SqliteState",
     "State",
     "StateFactory",
+    "TaskReaper",
 ]
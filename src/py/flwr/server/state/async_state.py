@@ -0,0 +1,121 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Asynchronous interface to a State."""
+
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Optional, Sequence, Set, Tuple, TypeVar
+from uuid import UUID
+
+from flwr.proto.task_pb2 import TaskIns, TaskRes
+
+from .in_memory_state import InMemoryState
+from .state import State
+
+T = TypeVar("T")
+
+
+class AsyncState:
+    """Asynchronous interface to a State, for servers running an event loop.
+
+    Operations of a State which may block, like the queries of `SqliteState`,
+    run on a bounded thread pool, so that the event loop keeps serving other
+    requests. Operations of `InMemoryState` only take an in-process lock and
+    run on the event loop.
+
+    Parameters
+    ----------
+    state : State
+        The State to access.
+    max_workers : int (default: 8)
+        Maximum number of threads running State operations at the same time.
+    """
+
+    def __init__(self, state: State, max_workers: int = 8) -> None:
+        self.state = state
+        self.task_ins_notifier = state.task_ins_notifier
+        self.task_res_notifier = state.task_res_notifier
+        self.node_notifier = state.node_notifier
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if not isinstance(state, InMemoryState):
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="flwr-state"
+            )
+
+    async def run(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call `function`, on the thread pool if operations of the State may block.
+
+        Use it to run code which calls the wrapped `state` several times.
+        """
+        if self._executor is None:
+            return function(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(function, *args, **kwargs)
+        )
+
+    async def store_task_ins(self, task_ins: TaskIns) -> Optional[UUID]:
+        """Store one TaskIns."""
+        return await self.run(self.state.store_task_ins, task_ins)
+
+    async def get_task_ins(
+        self, node_id: Optional[int], limit: Optional[int]
+    ) -> List[TaskIns]:
+        """Get undelivered TaskIns for one node."""
+        return await self.run(self.state.get_task_ins, node_id, limit)
+
+    async def store_task_res_batch(
+        self, task_res_list: Sequence[TaskRes]
+    ) -> List[Optional[UUID]]:
+        """Store several TaskRes at once."""
+        return await self.run(self.state.store_task_res_batch, task_res_list)
+
+    async def get_task_res(
+        self, task_ids: Set[UUID], limit: Optional[int]
+    ) -> List[TaskRes]:
+        """Get undelivered TaskRes for task_ids."""
+        return await self.run(self.state.get_task_res, task_ids, limit)
+
+    async def delete_tasks(self, task_ids: Set[UUID]) -> None:
+        """Delete all delivered TaskIns/TaskRes pairs."""
+        await self.run(self.state.delete_tasks, task_ids)
+
+    async def create_node(self) -> int:
+        """Create, store in state, and return `node_id`."""
+        return await self.run(self.state.create_node)
+
+    async def delete_node(self, node_id: int) -> None:
+        """Remove `node_id` from state."""
+        await self.run(self.state.delete_node, node_id)
+
+    async def get_nodes(self, run_id: int) -> Set[int]:
+        """Retrieve all currently stored node IDs as a set."""
+        return await self.run(self.state.get_nodes, run_id)
+
+    async def get_nodes_version(self) -> int:
+        """Return the membership version."""
+        return await self.run(self.state.get_nodes_version)
+
+    async def get_node_changes(
+        self, run_id: int, since_version: int
+    ) -> Optional[Tuple[Set[int], Set[int], int]]:
+        """Return the nodes which joined and left after `since_version`."""
+        return await self.run(self.state.get_node_changes, run_id, since_version)
+
+    async def create_run(self) -> int:
+        """Create one run."""
+        return await self.run(self.state.create_run)
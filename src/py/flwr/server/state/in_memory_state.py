@@ -15,26 +15,55 @@
 """In-memory State implementation."""
 
 
+import itertools
 import os
+import threading
+from collections import deque
 from datetime import datetime, timedelta
 from logging import ERROR
-from typing import Dict, List, Optional, Set
+from typing import Deque, Dict, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
 from flwr.common import log, now
 from flwr.proto.task_pb2 import TaskIns, TaskRes
-from flwr.server.state.state import State
+from flwr.server.state.notifier import NODES_KEY, Notifier, task_ins_key, task_res_key
+from flwr.server.state.state import NODE_CHANGES_HISTORY, State, merge_node_changes
 from flwr.server.utils import validate_task_ins_or_res
 
 
 class InMemoryState(State):
-    """In-memory State implementation."""
+    """In-memory State implementation.
+
+    Besides the task stores, the state keeps indexes so that no operation
+    scans all tasks:
+
+    * `_pending_task_ins` maps each consumer (`node_id`, or `None` for
+      anonymous consumers) to its undelivered TaskIns in insertion order.
+    * `_task_res_ids` maps the id of a TaskIns to the ids of the TaskRes
+      replying to it (the first entry of their `ancestry`).
+    * `_pending_task_res` maps the id of a TaskIns to its undelivered TaskRes.
+
+    All of them are updated under `lock` together with the task stores.
+    """
 
     def __init__(self) -> None:
         self.node_ids: Set[int] = set()
         self.run_ids: Set[int] = set()
         self.task_ins_store: Dict[UUID, TaskIns] = {}
         self.task_res_store: Dict[UUID, TaskRes] = {}
+        # Dicts with `None` values are used as insertion-ordered sets
+        self._pending_task_ins: Dict[Optional[int], Dict[UUID, None]] = {}
+        self._task_res_ids: Dict[UUID, Set[UUID]] = {}
+        self._pending_task_res: Dict[UUID, Dict[UUID, None]] = {}
+        self.lock = threading.Lock()
+        self.task_ins_notifier: Notifier = Notifier()
+        self.task_res_notifier: Notifier = Notifier()
+        self.node_notifier: Notifier = Notifier()
+        # Last `(version, node_id, joined)` changes, the last one being current
+        self.nodes_version = 0
+        self._node_changes: Deque[Tuple[int, int, bool]] = deque(
+            maxlen=NODE_CHANGES_HISTORY
+        )
 
     def store_task_ins(self, task_ins: TaskIns) -> Optional[UUID]:
         """Store one TaskIns."""
@@ -57,7 +86,12 @@ class InMemoryState(State):
         task_ins.task_id = str(task_id)
         task_ins.task.created_at = created_at.isoformat()
         task_ins.task.ttl = ttl.isoformat()
-        self.task_ins_store[task_id] = task_ins
+        with self.lock:
+            self.task_ins_store[task_id] = task_ins
+            if task_ins.task.delivered_at == "":
+                consumer = task_ins_key(task_ins)
+                self._pending_task_ins.setdefault(consumer, {})[task_id] = None
+        self.task_ins_notifier.notify(task_ins_key(task_ins))
 
         # Return the new task_id
         return task_id
@@ -69,29 +103,22 @@ class InMemoryState(State):
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
-        # Find TaskIns for node_id that were not delivered yet
-        task_ins_list: List[TaskIns] = []
-        for _, task_ins in self.task_ins_store.items():
-            # pylint: disable=too-many-boolean-expressions
-            if (
-                node_id is not None  # Not anonymous
-                and task_ins.task.consumer.anonymous is False
-                and task_ins.task.consumer.node_id == node_id
-                and task_ins.task.delivered_at == ""
-            ) or (
-                node_id is None  # Anonymous
-                and task_ins.task.consumer.anonymous is True
-                and task_ins.task.consumer.node_id == 0
-                and task_ins.task.delivered_at == ""
-            ):
-                task_ins_list.append(task_ins)
-            if limit and len(task_ins_list) == limit:
-                break
-
-        # Mark all of them as delivered
-        delivered_at = now().isoformat()
-        for task_ins in task_ins_list:
-            task_ins.task.delivered_at = delivered_at
+        with self.lock:
+            # Take the TaskIns for node_id that were not delivered yet
+            pending = self._pending_task_ins.get(node_id)
+            if not pending:
+                return []
+            task_ids = list(itertools.islice(pending, limit))
+            for task_id in task_ids:
+                del pending[task_id]
+            if not pending:
+                del self._pending_task_ins[node_id]
+
+            # Mark all of them as delivered
+            delivered_at = now().isoformat()
+            task_ins_list = [self.task_ins_store[task_id] for task_id in task_ids]
+            for task_ins in task_ins_list:
+                task_ins.task.delivered_at = delivered_at
 
         # Return TaskIns
         return task_ins_list
@@ -118,7 +145,16 @@ class InMemoryState(State):
         task_res.task_id = str(task_id)
         task_res.task.created_at = created_at.isoformat()
         task_res.task.ttl = ttl.isoformat()
-        self.task_res_store[task_id] = task_res
+        task_ins_id = task_res_key(task_res)
+        with self.lock:
+            self.task_res_store[task_id] = task_res
+            if task_ins_id is None:
+                # Not a reply to any TaskIns, can never be retrieved
+                return task_id
+            self._task_res_ids.setdefault(task_ins_id, set()).add(task_id)
+            if task_res.task.delivered_at == "":
+                self._pending_task_res.setdefault(task_ins_id, {})[task_id] = None
+        self.task_res_notifier.notify(task_ins_id)
 
         # Return the new task_id
         return task_id
@@ -128,45 +164,104 @@ class InMemoryState(State):
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
-        # Find TaskRes that were not delivered yet
-        task_res_list: List[TaskRes] = []
-        for _, task_res in self.task_res_store.items():
-            if (
-                UUID(task_res.task.ancestry[0]) in task_ids
-                and task_res.task.delivered_at == ""
-            ):
-                task_res_list.append(task_res)
-            if limit and len(task_res_list) == limit:
-                break
-
-        # Mark all of them as delivered
-        delivered_at = now().isoformat()
-        for task_res in task_res_list:
-            task_res.task.delivered_at = delivered_at
+        with self.lock:
+            # Take the TaskRes replying to task_ids that were not delivered yet
+            task_res_ids: List[UUID] = []
+            for task_ins_id in task_ids:
+                pending = self._pending_task_res.get(task_ins_id)
+                if not pending:
+                    continue
+                if limit is not None:
+                    pending_ids = list(
+                        itertools.islice(pending, limit - len(task_res_ids))
+                    )
+                else:
+                    pending_ids = list(pending)
+                for task_res_id in pending_ids:
+                    del pending[task_res_id]
+                if not pending:
+                    del self._pending_task_res[task_ins_id]
+                task_res_ids.extend(pending_ids)
+                if limit is not None and len(task_res_ids) == limit:
+                    break
+
+            # Mark all of them as delivered
+            delivered_at = now().isoformat()
+            task_res_list = [self.task_res_store[task_id] for task_id in task_res_ids]
+            for task_res in task_res_list:
+                task_res.task.delivered_at = delivered_at
 
         # Return TaskRes
         return task_res_list
 
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
-        task_ins_to_be_deleted: Set[UUID] = set()
-        task_res_to_be_deleted: Set[UUID] = set()
-
-        for task_ins_id in task_ids:
-            # Find the task_id of the matching task_res
-            for task_res_id, task_res in self.task_res_store.items():
-                if UUID(task_res.task.ancestry[0]) != task_ins_id:
-                    continue
-                if task_res.task.delivered_at == "":
+        with self.lock:
+            for task_ins_id in task_ids:
+                # Find the delivered TaskRes replying to this TaskIns
+                pending = self._pending_task_res.get(task_ins_id, {})
+                task_res_ids = self._task_res_ids.get(task_ins_id, set())
+                delivered = [
+                    task_res_id
+                    for task_res_id in task_res_ids
+                    if task_res_id not in pending
+                ]
+                if not delivered:
                     continue
 
-                task_ins_to_be_deleted.add(task_ins_id)
-                task_res_to_be_deleted.add(task_res_id)
-
-        for task_id in task_ins_to_be_deleted:
-            del self.task_ins_store[task_id]
-        for task_id in task_res_to_be_deleted:
-            del self.task_res_store[task_id]
+                for task_res_id in delivered:
+                    task_res_ids.discard(task_res_id)
+                    del self.task_res_store[task_res_id]
+                if not task_res_ids:
+                    self._task_res_ids.pop(task_ins_id, None)
+                task_ins = self.task_ins_store.pop(task_ins_id, None)
+                if task_ins is not None:
+                    consumer = task_ins_key(task_ins)
+                    self._pending_task_ins.get(consumer, {}).pop(task_ins_id, None)
+
+    def delete_expired_tasks(self, expired_before: datetime) -> Tuple[int, int]:
+        """Delete expired and orphaned tasks."""
+        # `ttl` is an ISO 8601 string in UTC, which compares in time order
+        cutoff = expired_before.isoformat()
+        num_tasks = 0
+        num_bytes = 0
+        with self.lock:
+            for task_id, task_ins in list(self.task_ins_store.items()):
+                if task_ins.task.ttl < cutoff:
+                    del self.task_ins_store[task_id]
+                    consumer = task_ins_key(task_ins)
+                    pending = self._pending_task_ins.get(consumer, {})
+                    pending.pop(task_id, None)
+                    if not pending:
+                        self._pending_task_ins.pop(consumer, None)
+                    num_tasks += 1
+                    num_bytes += task_ins.task.legacy_server_message.ByteSize()
+
+            for task_id, task_res in list(self.task_res_store.items()):
+                task_ins_id = task_res_key(task_res)
+                if (
+                    task_res.task.ttl >= cutoff
+                    and task_ins_id is not None
+                    and task_ins_id in self.task_ins_store
+                ):
+                    continue
+                del self.task_res_store[task_id]
+                if task_ins_id is not None:
+                    self._discard_task_res(task_ins_id, task_id)
+                num_tasks += 1
+                num_bytes += task_res.task.legacy_client_message.ByteSize()
+        return num_tasks, num_bytes
+
+    def _discard_task_res(self, task_ins_id: UUID, task_id: UUID) -> None:
+        """Remove a TaskRes from the indexes."""
+        task_res_ids = self._task_res_ids.get(task_ins_id, set())
+        task_res_ids.discard(task_id)
+        if not task_res_ids:
+            self._task_res_ids.pop(task_ins_id, None)
+        pending = self._pending_task_res.get(task_ins_id, {})
+        pending.pop(task_id, None)
+        if not pending:
+            self._pending_task_res.pop(task_ins_id, None)
 
     def num_task_ins(self) -> int:
         """Calculate the number of task_ins in store.
@@ -187,17 +282,27 @@ class InMemoryState(State):
         # Sample a random int64 as node_id
         node_id: int = int.from_bytes(os.urandom(8), "little", signed=True)
 
-        if node_id not in self.node_ids:
+        with self.lock:
+            if node_id in self.node_ids:
+                log(ERROR, "Unexpected node registration failure.")
+                return 0
             self.node_ids.add(node_id)
-            return node_id
-        log(ERROR, "Unexpected node registration failure.")
-        return 0
+            self._record_node_change(node_id, joined=True)
+        self.node_notifier.notify(NODES_KEY)
+        return node_id
 
     def delete_node(self, node_id: int) -> None:
         """Delete a client node."""
-        if node_id not in self.node_ids:
-            raise ValueError(f"Node {node_id} not found")
-        self.node_ids.remove(node_id)
+        with self.lock:
+            if node_id not in self.node_ids:
+                raise ValueError(f"Node {node_id} not found")
+            self.node_ids.remove(node_id)
+            self._record_node_change(node_id, joined=False)
+        self.node_notifier.notify(NODES_KEY)
+
+    def _record_node_change(self, node_id: int, joined: bool) -> None:
+        self.nodes_version += 1
+        self._node_changes.append((self.nodes_version, node_id, joined))
 
     def get_nodes(self, run_id: int) -> Set[int]:
         """Return all available client nodes.
@@ -211,6 +316,29 @@ class InMemoryState(State):
             return set()
         return self.node_ids
 
+    def get_nodes_version(self) -> int:
+        """Return the membership version."""
+        return self.nodes_version
+
+    def get_node_changes(
+        self, run_id: int, since_version: int
+    ) -> Optional[Tuple[Set[int], Set[int], int]]:
+        """Return the nodes which joined and left after `since_version`."""
+        if run_id not in self.run_ids:
+            return None
+        with self.lock:
+            version = self.nodes_version
+            oldest = self._node_changes[0][0] if self._node_changes else version + 1
+            if since_version > version or since_version < oldest - 1:
+                return None
+            changes = [
+                (node_id, joined)
+                for change_version, node_id, joined in self._node_changes
+                if change_version > since_version
+            ]
+        joined_nodes, left_nodes = merge_node_changes(changes)
+        return joined_nodes, left_nodes, version
+
     def create_run(self) -> int:
         """Create one run."""
         # Sample a random int64 as run_id
@@ -0,0 +1,115 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Notification of requests waiting for tasks."""
+
+
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+from flwr.proto.task_pb2 import TaskIns, TaskRes
+
+# Key under which waiting requests are notified of node changes
+NODES_KEY = "nodes"
+
+
+class Notifier:
+    """Wake up the API requests waiting for tasks with given keys.
+
+    States notify the consumer node_id (`None` for anonymous nodes) of each
+    stored TaskIns to the Fleet API, and the ancestor TaskIns id of each stored
+    TaskRes as well as `NODES_KEY` for node changes to the Driver API.
+    Callbacks are called at most once, from the thread storing the task, so
+    they must not block: set a `threading.Event`, or schedule the wake-up of a
+    coroutine with `loop.call_soon_threadsafe`.
+    """
+
+    def __init__(self) -> None:
+        self._callbacks: Dict[Hashable, List[Callable[[], None]]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def subscribe(
+        self, keys: Iterable[Hashable], callback: Callable[[], None]
+    ) -> Iterator[None]:
+        """Call `callback` once a task is stored for any of `keys`.
+
+        Subscribe before checking the State for tasks, so that tasks stored in
+        between are not missed.
+        """
+        keys = list(keys)
+        with self._lock:
+            for key in keys:
+                self._callbacks.setdefault(key, []).append(callback)
+        try:
+            yield
+        finally:
+            with self._lock:
+                for key in keys:
+                    callbacks = self._callbacks.get(key, [])
+                    if callback in callbacks:
+                        callbacks.remove(callback)
+                    if not callbacks:
+                        self._callbacks.pop(key, None)
+
+    def notify(self, key: Hashable) -> None:
+        """Wake up the requests waiting for a task with this key."""
+        with self._lock:
+            callbacks = self._callbacks.pop(key, [])
+        for callback in callbacks:
+            callback()
+
+    def notify_all(self) -> None:
+        """Wake up all waiting requests, so that they check the State again.
+
+        States call this when another process may have changed the State.
+        """
+        with self._lock:
+            callbacks = [
+                callback
+                for key_callbacks in self._callbacks.values()
+                for callback in key_callbacks
+            ]
+            self._callbacks.clear()
+        # Call callbacks subscribed to several keys once
+        for callback in dict.fromkeys(callbacks):
+            callback()
+
+
+def set_threadsafe(
+    loop: asyncio.AbstractEventLoop, event: asyncio.Event
+) -> Callable[[], None]:
+    """Return a callback which sets `event` on `loop` from any thread."""
+
+    def callback() -> None:
+        loop.call_soon_threadsafe(event.set)
+
+    return callback
+
+
+def task_ins_key(task_ins: TaskIns) -> Optional[int]:
+    """Return the key under which waiting requests are notified of a TaskIns."""
+    consumer = task_ins.task.consumer
+    return None if consumer.anonymous else int(consumer.node_id)
+
+
+def task_res_key(task_res: TaskRes) -> Optional[UUID]:
+    """Return the key under which waiting requests are notified of a TaskRes."""
+    try:
+        return UUID(task_res.task.ancestry[0])
+    except (IndexError, ValueError):
+        return None
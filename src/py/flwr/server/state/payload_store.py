@@ -0,0 +1,106 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Content-addressed storage of large task payloads on local disk."""
+
+
+import hashlib
+import mmap
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, Set, Tuple
+
+
+class PayloadStore:
+    """Store payloads in files named after the SHA-256 digest of their content.
+
+    Identical payloads, e.g., the parameters broadcast to many nodes, are
+    stored once. Payloads are memory-mapped to be read, so that they are not
+    copied before being parsed. Files are only deleted by `sweep`, which keeps
+    those referenced by stored tasks.
+
+    Parameters
+    ----------
+    directory : str
+        The directory holding the payload files, created if necessary.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def put(self, data: bytes) -> str:
+        """Store a payload, unless already stored, and return its digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        try:
+            # Protect the existing file from concurrent sweeps
+            os.utime(path)
+            return digest
+        except FileNotFoundError:
+            pass
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            # Atomic, so that readers never see partial payloads
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return digest
+
+    @contextmanager
+    def open(self, digest: str) -> Iterator[memoryview]:
+        """Memory-map a payload, which is only valid in the `with` block."""
+        with open(self._path(digest), "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    yield view
+
+    def sweep(self, keep: Set[str], min_age: float = 3600.0) -> Tuple[int, int]:
+        """Delete the payloads not in `keep` and not stored in the meantime.
+
+        Payloads stored or re-stored less than `min_age` seconds ago are kept,
+        as tasks referencing them may not be committed yet. Returns the number
+        of deleted files and of freed bytes.
+        """
+        if not os.path.isdir(self.directory):
+            return 0, 0
+        num_files = 0
+        num_bytes = 0
+        deadline = time.time() - min_age
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            for file_entry in os.scandir(entry.path):
+                name = file_entry.name
+                if name in keep:
+                    continue
+                try:
+                    stat = file_entry.stat()
+                    if stat.st_mtime > deadline:
+                        continue
+                    os.unlink(file_entry.path)
+                except FileNotFoundError:
+                    continue
+                num_files += 1
+                num_bytes += stat.st_size
+        return num_files, num_bytes
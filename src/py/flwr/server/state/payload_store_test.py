@@ -0,0 +1,56 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""PayloadStore tests."""
+
+
+import tempfile
+
+from .payload_store import PayloadStore
+
+
+def test_put_open() -> None:
+    """Test that identical payloads get the same digest and can be read."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Prepare
+        store = PayloadStore(tmp_dir)
+
+        # Execute
+        digest = store.put(b"payload")
+        same_digest = store.put(b"payload")
+        with store.open(digest) as payload:
+            actual = bytes(payload)
+
+        # Assert
+        assert digest == same_digest
+        assert actual == b"payload"
+
+
+def test_sweep() -> None:
+    """Test that sweep deletes the payloads which are not kept."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Prepare
+        store = PayloadStore(tmp_dir)
+        kept = store.put(b"kept")
+        store.put(b"deleted")
+
+        # Execute
+        recent = store.sweep(keep={kept})
+        deleted = store.sweep(keep={kept}, min_age=0.0)
+
+        # Assert
+        assert recent == (0, 0)
+        assert deleted == (1, len(b"deleted"))
+        with store.open(kept) as payload:
+            assert bytes(payload) == b"kept"
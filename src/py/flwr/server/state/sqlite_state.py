@@ -16,11 +16,27 @@
 
 
 import os
-import re
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from logging import DEBUG, ERROR
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 from uuid import UUID, uuid4
 
 from flwr.common import log, now
@@ -29,7 +45,9 @@ from flwr.proto.task_pb2 import Task, TaskIns, TaskRes
 from flwr.proto.transport_pb2 import ClientMessage, ServerMessage
 from flwr.server.utils.validator import validate_task_ins_or_res
 
-from .state import State
+from .notifier import NODES_KEY, Notifier, task_ins_key, task_res_key
+from .payload_store import PayloadStore
+from .state import NODE_CHANGES_HISTORY, State, merge_node_changes
 
 SQL_CREATE_TABLE_NODE = """
 CREATE TABLE IF NOT EXISTS node(
@@ -37,15 +55,27 @@ CREATE TABLE IF NOT EXISTS node(
 );
 """
 
+# Membership log, `version` increases with each node which joins or leaves
+SQL_CREATE_TABLE_NODE_CHANGE = """
+CREATE TABLE IF NOT EXISTS node_change(
+    version INTEGER PRIMARY KEY,
+    node_id INTEGER,
+    joined BOOLEAN
+);
+"""
+
 SQL_CREATE_TABLE_RUN = """
 CREATE TABLE IF NOT EXISTS run(
     run_id INTEGER UNIQUE
 );
 """
 
+# `task_id` and `ancestor_id` (the first entry of `ancestry`) are UUIDs stored
+# as 16-byte BLOBs. Large legacy messages are kept in the PayloadStore instead,
+# and referenced by their `payload_digest`
 SQL_CREATE_TABLE_TASK_INS = """
 CREATE TABLE IF NOT EXISTS task_ins(
-    task_id                 TEXT UNIQUE,
+    task_id                 BLOB UNIQUE,
     group_id                TEXT,
     run_id             INTEGER,
     producer_anonymous      BOOLEAN,
@@ -56,8 +86,10 @@ CREATE TABLE IF NOT EXISTS task_ins(
     delivered_at            TEXT,
     ttl                     TEXT,
     ancestry                TEXT,
+    ancestor_id             BLOB,
     legacy_server_message   BLOB,
     legacy_client_message   BLOB,
+    payload_digest          TEXT,
     FOREIGN KEY(run_id) REFERENCES run(run_id)
 );
 """
@@ -65,7 +97,7 @@ CREATE TABLE IF NOT EXISTS task_ins(
 
 SQL_CREATE_TABLE_TASK_RES = """
 CREATE TABLE IF NOT EXISTS task_res(
-    task_id                 TEXT UNIQUE,
+    task_id                 BLOB UNIQUE,
     group_id                TEXT,
     run_id             INTEGER,
     producer_anonymous      BOOLEAN,
@@ -76,21 +108,148 @@ CREATE TABLE IF NOT EXISTS task_res(
     delivered_at            TEXT,
     ttl                     TEXT,
     ancestry                TEXT,
+    ancestor_id             BLOB,
     legacy_server_message   BLOB,
     legacy_client_message   BLOB,
+    payload_digest          TEXT,
     FOREIGN KEY(run_id) REFERENCES run(run_id)
 );
 """
 
+# Covering indexes for pulling undelivered TaskIns by consumer and TaskRes by
+# the TaskIns they reply to
+SQL_CREATE_INDEX_TASK_INS = """
+CREATE INDEX IF NOT EXISTS idx_task_ins_consumer
+ON task_ins(consumer_anonymous, consumer_node_id, delivered_at, task_id);
+"""
+
+SQL_CREATE_INDEX_TASK_RES = """
+CREATE INDEX IF NOT EXISTS idx_task_res_ancestor
+ON task_res(ancestor_id, delivered_at, task_id);
+"""
+
+# Version of the layout of the tables, kept in `PRAGMA user_version`. Version
+# 0 databases predate it: they store `task_id` as TEXT, or lack `ancestor_id`
+# or `payload_digest`
+SCHEMA_VERSION = 1
+
+SQL_INSERT_NODE_CHANGE = """
+INSERT INTO node_change(node_id, joined) VALUES(:node_id, :joined);
+"""
+
+SQL_PRUNE_NODE_CHANGE = """
+DELETE FROM node_change
+WHERE version <= (SELECT MAX(version) FROM node_change) - :history;
+"""
+
+SQL_INSERT_TASK_INS = """
+INSERT INTO task_ins VALUES(:task_id, :group_id, :run_id, :producer_anonymous,
+:producer_node_id, :consumer_anonymous, :consumer_node_id, :created_at,
+:delivered_at, :ttl, :ancestry, :ancestor_id, :legacy_server_message,
+:legacy_client_message, :payload_digest);
+"""
+
+SQL_INSERT_TASK_RES = SQL_INSERT_TASK_INS.replace("task_ins", "task_res")
+
+# SQLite treats a negative LIMIT as no limit
+SQL_PULL_TASK_INS = """
+UPDATE task_ins
+SET delivered_at = :delivered_at
+WHERE task_id IN (
+    SELECT task_id
+    FROM task_ins
+    WHERE consumer_anonymous = :anonymous
+    AND   consumer_node_id = :node_id
+    AND   delivered_at = ''
+    LIMIT :limit
+)
+RETURNING *;
+"""
+
+SQL_PULL_TASK_RES = """
+UPDATE task_res
+SET delivered_at = :delivered_at
+WHERE task_id IN (
+    SELECT task_id
+    FROM task_res
+    WHERE ancestor_id = :ancestor_id
+    AND   delivered_at = ''
+    LIMIT :limit
+)
+RETURNING *;
+"""
+
+# Delete a delivered TaskIns that has a delivered TaskRes ...
+SQL_DELETE_TASK_INS = """
+DELETE FROM task_ins
+WHERE task_id = :task_id
+AND   delivered_at != ''
+AND   EXISTS (
+    SELECT 1
+    FROM task_res
+    WHERE ancestor_id = :task_id
+    AND   delivered_at != ''
+);
+"""
+
+# ... and, afterwards, its delivered TaskRes
+SQL_DELETE_TASK_RES = """
+DELETE FROM task_res
+WHERE ancestor_id = :task_id
+AND   delivered_at != '';
+"""
+
+# Delete the TaskIns whose `ttl` (an ISO 8601 string in UTC, which compares
+# in time order) has passed ...
+SQL_DELETE_EXPIRED_TASK_INS = """
+DELETE FROM task_ins
+WHERE ttl < :expired_before
+RETURNING COALESCE(LENGTH(legacy_server_message), 0) AS size;
+"""
+
+# ... and, afterwards, the expired TaskRes and those which do not reply to a
+# stored TaskIns
+SQL_DELETE_EXPIRED_TASK_RES = """
+DELETE FROM task_res
+WHERE ttl < :expired_before
+OR    ancestor_id IS NULL
+OR    NOT EXISTS (
+    SELECT 1
+    FROM task_ins
+    WHERE task_ins.task_id = task_res.ancestor_id
+)
+RETURNING COALESCE(LENGTH(legacy_client_message), 0) AS size;
+"""
+
+SQL_SELECT_PAYLOAD_DIGESTS = """
+SELECT payload_digest FROM task_ins WHERE payload_digest IS NOT NULL
+UNION
+SELECT payload_digest FROM task_res WHERE payload_digest IS NOT NULL;
+"""
+
 DictOrTuple = Union[Tuple[Any], Dict[str, Any]]
+T = TypeVar("T", TaskIns, TaskRes)
 
 
 class SqliteState(State):
-    """SQLite-based state implementation."""
+    """SQLite-based state implementation.
+
+    The state is meant to be long-lived and shared between threads. Queries run
+    on a pool of connections, each with its own cache of prepared statements.
+    File-based databases use the WAL journal, so that pulls by many nodes can
+    read concurrently with a single writer, and can be shared by several
+    processes, e.g., the workers of the Fleet API (REST server). They keep
+    large legacy messages in a `PayloadStore` next to the database file, so
+    that parameters broadcast to many nodes are stored once and do not fill
+    the page cache.
+    """
 
     def __init__(
         self,
         database_path: str,
+        pool_size: int = 8,
+        poll_interval: float = 0.0,
+        payload_threshold: int = 1 << 20,
     ) -> None:
         """Initialize an SqliteState.
 
@@ -99,33 +258,150 @@ class SqliteState(State):
         database : (path-like object)
             The path to the database file to be opened. Pass ":memory:" to open
             a connection to a database that is in RAM, instead of on disk.
+        pool_size : int (default: 8)
+            Maximum number of connections to the database. An in-memory database
+            is private to its connection and always uses a single one.
+        poll_interval : float (default: 0.0)
+            Number of seconds between two checks of a file-based database for
+            changes by other processes, which wake up all waiting requests. Set
+            it when several processes share the database, 0 disables the checks.
+        payload_threshold : int (default: 1 MiB)
+            Size in bytes from which the legacy messages of a file-based database
+            are kept in the files of a `PayloadStore` in `<database>-payloads`.
+            Files no longer referenced by any task are deleted by
+            `delete_expired_tasks`.
         """
         self.database_path = database_path
-        self.conn: Optional[sqlite3.Connection] = None
+        self.pool_size = 1 if database_path == ":memory:" else pool_size
+        self.log_queries = False
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self.task_ins_notifier: Notifier = Notifier()
+        self.task_res_notifier: Notifier = Notifier()
+        self.node_notifier: Notifier = Notifier()
+        self.poll_interval = 0.0 if database_path == ":memory:" else poll_interval
+        self._watcher: Optional[threading.Thread] = None
+        self.payload_threshold = payload_threshold
+        self.payload_store: Optional[PayloadStore] = None
+        if database_path != ":memory:":
+            self.payload_store = PayloadStore(f"{database_path}-payloads")
 
     def initialize(self, log_queries: bool = False) -> List[Tuple[str]]:
-        """Create tables if they don't exist yet.
+        """Create tables and indexes if they don't exist yet.
 
         Parameters
         ----------
         log_queries : bool
             Log each query which is executed.
         """
-        self.conn = sqlite3.connect(self.database_path)
-        self.conn.execute("PRAGMA foreign_keys = ON;")
-        self.conn.row_factory = dict_factory
-        if log_queries:
-            self.conn.set_trace_callback(lambda query: log(DEBUG, query))
-        cur = self.conn.cursor()
-
-        # Create each table if not exists queries
-        cur.execute(SQL_CREATE_TABLE_RUN)
-        cur.execute(SQL_CREATE_TABLE_TASK_INS)
-        cur.execute(SQL_CREATE_TABLE_TASK_RES)
-        cur.execute(SQL_CREATE_TABLE_NODE)
-        res = cur.execute("SELECT name FROM sqlite_schema;")
-
-        return res.fetchall()
+        self.log_queries = log_queries
+        with self._connection() as conn:
+            # Let `delete_expired_tasks` return free pages to the file system,
+            # only takes effect on databases without tables
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+            if self.database_path != ":memory:":
+                conn.execute("PRAGMA journal_mode = WAL;")
+            self._migrate(conn)
+            cur = conn.cursor()
+
+            # Create each table and index if not exists queries
+            cur.execute(SQL_CREATE_TABLE_RUN)
+            cur.execute(SQL_CREATE_TABLE_TASK_INS)
+            cur.execute(SQL_CREATE_TABLE_TASK_RES)
+            cur.execute(SQL_CREATE_TABLE_NODE)
+            cur.execute(SQL_CREATE_TABLE_NODE_CHANGE)
+            cur.execute(SQL_CREATE_INDEX_TASK_INS)
+            cur.execute(SQL_CREATE_INDEX_TASK_RES)
+            res = cur.execute("SELECT name FROM sqlite_schema;")
+            schema = res.fetchall()
+
+        if self.poll_interval > 0 and self._watcher is None:
+            # Read the first version before returning, so that no change is missed
+            conn = self._connect()
+            conn.set_trace_callback(None)
+            data_version = conn.execute("PRAGMA data_version;").fetchone()
+            self._watcher = threading.Thread(
+                target=self._watch,
+                args=(conn, data_version["data_version"]),
+                daemon=True,
+            )
+            self._watcher.start()
+        return schema
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Bring the tables of an existing database to `SCHEMA_VERSION`.
+
+        The task tables of older databases are rebuilt with the current layout,
+        converting their UUIDs to BLOBs. Databases written by a newer version
+        of Flower are rejected instead of being misread.
+        """
+        conn.create_function("uuid_to_blob", 1, uuid_to_blob, deterministic=True)
+        # The write lock keeps other processes from migrating at the same time
+        with conn:
+            conn.execute("BEGIN IMMEDIATE;")
+            version = conn.execute("PRAGMA user_version;").fetchone()["user_version"]
+            if version > SCHEMA_VERSION:
+                raise Exception(
+                    f"Database schema version {version} is newer than the "
+                    f"supported version {SCHEMA_VERSION}, please upgrade Flower."
+                )
+            if version < SCHEMA_VERSION:
+                rebuild_task_table(conn, "task_ins", SQL_CREATE_TABLE_TASK_INS)
+                rebuild_task_table(conn, "task_res", SQL_CREATE_TABLE_TASK_RES)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+
+    def _watch(self, conn: sqlite3.Connection, data_version: int) -> None:
+        """Wake up all waiting requests after each change by another connection.
+
+        `PRAGMA data_version` changes with each commit of another connection,
+        including those of other processes.
+        """
+        query = "PRAGMA data_version;"
+        while True:
+            time.sleep(self.poll_interval)
+            current = conn.execute(query).fetchone()["data_version"]
+            if current != data_version:
+                data_version = current
+                self.task_ins_notifier.notify_all()
+                self.task_res_notifier.notify_all()
+                self.node_notifier.notify_all()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection to the database."""
+        conn = sqlite3.connect(
+            self.database_path, check_same_thread=False, cached_statements=256
+        )
+        conn.execute("PRAGMA foreign_keys = ON;")
+        conn.execute("PRAGMA busy_timeout = 5000;")
+        if self.database_path != ":memory:":
+            conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.row_factory = dict_factory
+        if self.log_queries:
+            conn.set_trace_callback(lambda query: log(DEBUG, query))
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection from the pool, opening one if there is room."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                has_room = len(self._connections) < self.pool_size
+                if has_room:
+                    conn = self._connect()
+                    self._connections.append(conn)
+            if not has_room:
+                conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _check_initialized(self) -> None:
+        if not self._connections:
+            raise Exception("State is not initialized.")
 
     def query(
         self,
@@ -133,25 +409,22 @@ class SqliteState(State):
         data: Optional[Union[List[DictOrTuple], DictOrTuple]] = None,
     ) -> List[Dict[str, Any]]:
         """Execute a SQL query."""
-        if self.conn is None:
-            raise Exception("State is not initialized.")
+        self._check_initialized()
 
         if data is None:
             data = []
 
-        # Clean up whitespace to make the logs nicer
-        query = re.sub(r"\s+", " ", query)
-
+        result: List[Dict[str, Any]] = []
         try:
-            with self.conn:
+            with self._connection() as conn, conn:
                 if (
                     len(data) > 0
                     and isinstance(data, (tuple, list))
                     and isinstance(data[0], (tuple, dict))
                 ):
-                    rows = self.conn.executemany(query, data)
+                    rows = conn.executemany(query, data)
                 else:
-                    rows = self.conn.execute(query, data)
+                    rows = conn.execute(query, data)
 
                 # Extract results before committing to support
                 #   INSERT/UPDATE ... RETURNING
@@ -194,17 +467,18 @@ class SqliteState(State):
         task_ins.task_id = str(task_id)
         task_ins.task.created_at = created_at.isoformat()
         task_ins.task.ttl = ttl.isoformat()
-        data = (task_ins_to_dict(task_ins),)
-        columns = ", ".join([f":{key}" for key in data[0]])
-        query = f"INSERT INTO task_ins VALUES({columns});"
 
         # Only invalid run_id can trigger IntegrityError.
         # This may need to be changed in the future version with more integrity checks.
         try:
-            self.query(query, data)
+            self.query(
+                SQL_INSERT_TASK_INS,
+                self._spool(task_ins_to_dict(task_ins), "legacy_server_message"),
+            )
         except sqlite3.IntegrityError:
             log(ERROR, "`run` is invalid")
             return None
+        self.task_ins_notifier.notify(task_ins_key(task_ins))
 
         return task_id
 
@@ -234,68 +508,40 @@ class SqliteState(State):
         If `limit` is not `None`, return, at most, `limit` number of `task_ins`. If
         `limit` is set, it has to be greater than zero.
         """
+        return self.get_task_ins_batch([node_id], limit)[node_id]
+
+    def get_task_ins_batch(
+        self, node_ids: Sequence[Optional[int]], limit: Optional[int]
+    ) -> Dict[Optional[int], List[TaskIns]]:
+        """Get undelivered TaskIns for several nodes in a single transaction."""
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
-        if node_id == 0:
+        if 0 in node_ids:
             msg = (
                 "`node_id` must be >= 1"
                 "\n\n For requesting anonymous tasks use `node_id` equal `None`"
             )
             raise AssertionError(msg)
 
-        data: Dict[str, Union[str, int]] = {}
-
-        if node_id is None:
-            # Retrieve all anonymous Tasks
-            query = """
-                SELECT task_id
-                FROM task_ins
-                WHERE consumer_anonymous == 1
-                AND   consumer_node_id == 0
-                AND   delivered_at = ""
-            """
-        else:
-            # Retrieve all TaskIns for node_id
-            query = """
-                SELECT task_id
-                FROM task_ins
-                WHERE consumer_anonymous == 0
-                AND   consumer_node_id == :node_id
-                AND   delivered_at = ""
-            """
-            data["node_id"] = node_id
-
-        if limit is not None:
-            query += " LIMIT :limit"
-            data["limit"] = limit
-
-        query += ";"
-
-        rows = self.query(query, data)
-
-        if rows:
-            # Prepare query
-            task_ids = [row["task_id"] for row in rows]
-            placeholders: str = ",".join([f":id_{i}" for i in range(len(task_ids))])
-            query = f"""
-                UPDATE task_ins
-                SET delivered_at = :delivered_at
-                WHERE task_id IN ({placeholders})
-                RETURNING *;
-            """
-
-            # Prepare data for query
-            delivered_at = now().isoformat()
-            data = {"delivered_at": delivered_at}
-            for index, task_id in enumerate(task_ids):
-                data[f"id_{index}"] = str(task_id)
-
-            # Run query
-            rows = self.query(query, data)
-
-        result = [dict_to_task_ins(row) for row in rows]
-
+        self._check_initialized()
+        delivered_at = now().isoformat()
+        result: Dict[Optional[int], List[TaskIns]] = {}
+        with self._connection() as conn, conn:
+            for node_id in node_ids:
+                rows = conn.execute(
+                    SQL_PULL_TASK_INS,
+                    {
+                        "delivered_at": delivered_at,
+                        "anonymous": node_id is None,
+                        "node_id": 0 if node_id is None else node_id,
+                        "limit": -1 if limit is None else limit,
+                    },
+                ).fetchall()
+                result[node_id] = [
+                    self._load(dict_to_task_ins, row, "legacy_server_message")
+                    for row in rows
+                ]
         return result
 
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
@@ -314,34 +560,61 @@ class SqliteState(State):
         If `task_res.task.consumer.anonymous` is `False`, then
         `task_res.task.consumer.node_id` MUST be set (not 0)
         """
-        # Validate task
-        errors = validate_task_ins_or_res(task_res)
-        if any(errors):
-            log(ERROR, errors)
-            return None
-
-        # Create task_id, created_at and ttl
-        task_id = uuid4()
-        created_at: datetime = now()
-        ttl: datetime = created_at + timedelta(hours=24)
-
-        # Store TaskIns
-        task_res.task_id = str(task_id)
-        task_res.task.created_at = created_at.isoformat()
-        task_res.task.ttl = ttl.isoformat()
-        data = (task_res_to_dict(task_res),)
-        columns = ", ".join([f":{key}" for key in data[0]])
-        query = f"INSERT INTO task_res VALUES({columns});"
-
-        # Only invalid run_id can trigger IntegrityError.
-        # This may need to be changed in the future version with more integrity checks.
-        try:
-            self.query(query, data)
-        except sqlite3.IntegrityError:
-            log(ERROR, "`run` is invalid")
-            return None
+        return self.store_task_res_batch([task_res])[0]
+
+    def store_task_res_batch(
+        self, task_res_list: Sequence[TaskRes]
+    ) -> List[Optional[UUID]]:
+        """Store several TaskRes in a single transaction."""
+        task_ids: List[Optional[UUID]] = []
+        data: List[Dict[str, Any]] = []
+        for task_res in task_res_list:
+            # Validate task
+            errors = validate_task_ins_or_res(task_res)
+            if any(errors):
+                log(ERROR, errors)
+                task_ids.append(None)
+                continue
+
+            # Create task_id, created_at and ttl
+            task_id = uuid4()
+            created_at: datetime = now()
+            ttl: datetime = created_at + timedelta(hours=24)
+
+            # Store TaskRes
+            task_res.task_id = str(task_id)
+            task_res.task.created_at = created_at.isoformat()
+            task_res.task.ttl = ttl.isoformat()
+            task_ids.append(task_id)
+            data.append(
+                self._spool(task_res_to_dict(task_res), "legacy_client_message")
+            )
 
-        return task_id
+        if not data:
+            return task_ids
+
+        self._check_initialized()
+        with self._connection() as conn:
+            try:
+                with conn:
+                    conn.executemany(SQL_INSERT_TASK_RES, data)
+            except sqlite3.IntegrityError:
+                # Only invalid run_ids can trigger IntegrityError, store the
+                # TaskRes one by one to find them
+                for index, stored_id in enumerate(task_ids):
+                    if stored_id is None:
+                        continue
+                    try:
+                        with conn:
+                            conn.execute(SQL_INSERT_TASK_RES, data.pop(0))
+                    except sqlite3.IntegrityError:
+                        log(ERROR, "`run` is invalid")
+                        task_ids[index] = None
+
+        for task_res, stored_id in zip(task_res_list, task_ids):
+            if stored_id is not None:
+                self.task_res_notifier.notify(task_res_key(task_res))
+        return task_ids
 
     def get_task_res(self, task_ids: Set[UUID], limit: Optional[int]) -> List[TaskRes]:
         """Get TaskRes for task_ids.
@@ -365,48 +638,26 @@ class SqliteState(State):
         if len(task_ids) == 0:
             return []
 
-        placeholders = ",".join([f":id_{i}" for i in range(len(task_ids))])
-        query = f"""
-            SELECT *
-            FROM task_res
-            WHERE ancestry IN ({placeholders})
-            AND delivered_at = ""
-        """
-
-        data: Dict[str, Union[str, int]] = {}
-
-        if limit is not None:
-            query += " LIMIT :limit"
-            data["limit"] = limit
-
-        query += ";"
-
-        for index, task_id in enumerate(task_ids):
-            data[f"id_{index}"] = str(task_id)
-
-        rows = self.query(query, data)
-
-        if rows:
-            # Prepare query
-            found_task_ids = [row["task_id"] for row in rows]
-            placeholders = ",".join([f":id_{i}" for i in range(len(found_task_ids))])
-            query = f"""
-                UPDATE task_res
-                SET delivered_at = :delivered_at
-                WHERE task_id IN ({placeholders})
-                RETURNING *;
-            """
-
-            # Prepare data for query
-            delivered_at = now().isoformat()
-            data = {"delivered_at": delivered_at}
-            for index, task_id in enumerate(found_task_ids):
-                data[f"id_{index}"] = str(task_id)
-
-            # Run query
-            rows = self.query(query, data)
-
-        result = [dict_to_task_res(row) for row in rows]
+        self._check_initialized()
+        delivered_at = now().isoformat()
+        result: List[TaskRes] = []
+        with self._connection() as conn, conn:
+            for task_id in task_ids:
+                remaining = -1 if limit is None else limit - len(result)
+                rows = conn.execute(
+                    SQL_PULL_TASK_RES,
+                    {
+                        "delivered_at": delivered_at,
+                        "ancestor_id": task_id.bytes,
+                        "limit": remaining,
+                    },
+                ).fetchall()
+                result.extend(
+                    self._load(dict_to_task_res, row, "legacy_client_message")
+                    for row in rows
+                )
+                if limit is not None and len(result) == limit:
+                    break
         return result
 
     def num_task_ins(self) -> int:
@@ -432,58 +683,109 @@ class SqliteState(State):
 
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
-        ids = list(task_ids)
-        if len(ids) == 0:
+        if len(task_ids) == 0:
             return None
 
-        placeholders = ",".join([f":id_{index}" for index in range(len(task_ids))])
-        data = {f"id_{index}": str(task_id) for index, task_id in enumerate(task_ids)}
-
-        # 1. Query: Delete task_ins which have a delivered task_res
-        query_1 = f"""
-            DELETE FROM task_ins
-            WHERE delivered_at != ''
-            AND task_id IN (
-                SELECT ancestry
-                FROM task_res
-                WHERE ancestry IN ({placeholders})
-                AND delivered_at != ''
-            );
-        """
-
-        # 2. Query: Delete delivered task_res to be run after 1. Query
-        query_2 = f"""
-            DELETE FROM task_res
-            WHERE ancestry IN ({placeholders})
-            AND delivered_at != '';
-        """
-
-        if self.conn is None:
-            raise Exception("State not intitialized")
-
-        with self.conn:
-            self.conn.execute(query_1, data)
-            self.conn.execute(query_2, data)
+        self._check_initialized()
+        data = [{"task_id": task_id.bytes} for task_id in task_ids]
+        with self._connection() as conn, conn:
+            conn.executemany(SQL_DELETE_TASK_INS, data)
+            conn.executemany(SQL_DELETE_TASK_RES, data)
 
         return None
 
+    def delete_expired_tasks(self, expired_before: datetime) -> Tuple[int, int]:
+        """Delete expired and orphaned tasks, and compact the database."""
+        self._check_initialized()
+        data = {"expired_before": expired_before.isoformat()}
+        with self._connection() as conn:
+            with conn:
+                rows = conn.execute(SQL_DELETE_EXPIRED_TASK_INS, data).fetchall()
+                rows += conn.execute(SQL_DELETE_EXPIRED_TASK_RES, data).fetchall()
+            if rows:
+                # Each step of the vacuum is one result row
+                conn.execute("PRAGMA incremental_vacuum;").fetchall()
+                if self.database_path != ":memory:":
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchall()
+        num_tasks = len(rows)
+        num_bytes = sum(row["size"] for row in rows)
+
+        # Delete the payloads of deleted tasks, also those deleted by the Driver
+        if self.payload_store is not None:
+            digests = {
+                row["payload_digest"] for row in self.query(SQL_SELECT_PAYLOAD_DIGESTS)
+            }
+            _, num_payload_bytes = self.payload_store.sweep(keep=digests)
+            num_bytes += num_payload_bytes
+        return num_tasks, num_bytes
+
+    def _spool(self, task_dict: Dict[str, Any], column: str) -> Dict[str, Any]:
+        """Move a large legacy message of a task into the PayloadStore."""
+        payload = task_dict[column]
+        if (
+            self.payload_store is not None
+            and payload is not None
+            and len(payload) >= self.payload_threshold
+        ):
+            task_dict["payload_digest"] = self.payload_store.put(payload)
+            task_dict[column] = None
+        return task_dict
+
+    def _load(
+        self,
+        from_dict: Callable[[Dict[str, Any]], T],
+        task_dict: Dict[str, Any],
+        column: str,
+    ) -> T:
+        """Turn task_dict into a task, with its legacy message from the store."""
+        digest = task_dict["payload_digest"]
+        if digest is None or self.payload_store is None:
+            return from_dict(task_dict)
+        task_dict[column] = b""
+        task = from_dict(task_dict)
+        with self.payload_store.open(digest) as payload:
+            getattr(task.task, column).ParseFromString(payload)
+        return task
+
     def create_node(self) -> int:
         """Create, store in state, and return `node_id`."""
         # Sample a random int64 as node_id
         node_id: int = int.from_bytes(os.urandom(8), "little", signed=True)
 
-        query = "INSERT INTO node VALUES(:node_id);"
-        try:
-            self.query(query, {"node_id": node_id})
-        except sqlite3.IntegrityError:
-            log(ERROR, "Unexpected node registration failure.")
-            return 0
+        self._check_initialized()
+        with self._connection() as conn:
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO node VALUES(:node_id);", {"node_id": node_id}
+                    )
+                    self._record_node_change(conn, node_id, joined=True)
+            except sqlite3.IntegrityError:
+                log(ERROR, "Unexpected node registration failure.")
+                return 0
+        self.node_notifier.notify(NODES_KEY)
         return node_id
 
     def delete_node(self, node_id: int) -> None:
         """Delete a client node."""
-        query = "DELETE FROM node WHERE node_id = :node_id;"
-        self.query(query, {"node_id": node_id})
+        self._check_initialized()
+        with self._connection() as conn:
+            with conn:
+                cur = conn.execute(
+                    "DELETE FROM node WHERE node_id = :node_id;", {"node_id": node_id}
+                )
+                if cur.rowcount == 0:
+                    return
+                self._record_node_change(conn, node_id, joined=False)
+        self.node_notifier.notify(NODES_KEY)
+
+    @staticmethod
+    def _record_node_change(
+        conn: sqlite3.Connection, node_id: int, joined: bool
+    ) -> None:
+        """Log a node change, in the transaction changing the node."""
+        conn.execute(SQL_INSERT_NODE_CHANGE, {"node_id": node_id, "joined": joined})
+        conn.execute(SQL_PRUNE_NODE_CHANGE, {"history": NODE_CHANGES_HISTORY})
 
     def get_nodes(self, run_id: int) -> Set[int]:
         """Retrieve all currently stored node IDs as a set.
@@ -504,6 +806,40 @@ class SqliteState(State):
         result: Set[int] = {row["node_id"] for row in rows}
         return result
 
+    def get_nodes_version(self) -> int:
+        """Return the membership version."""
+        query = "SELECT MAX(version) AS version FROM node_change;"
+        return int(self.query(query)[0]["version"] or 0)
+
+    def get_node_changes(
+        self, run_id: int, since_version: int
+    ) -> Optional[Tuple[Set[int], Set[int], int]]:
+        """Return the nodes which joined and left after `since_version`."""
+        # Validate run ID
+        query = "SELECT COUNT(*) FROM run WHERE run_id = ?;"
+        if self.query(query, (run_id,))[0]["COUNT(*)"] == 0:
+            return None
+
+        with self._connection() as conn:
+            with conn:
+                bounds = conn.execute(
+                    "SELECT MIN(version) AS oldest, MAX(version) AS version "
+                    "FROM node_change;"
+                ).fetchone()
+                version = bounds["version"] or 0
+                rows = conn.execute(
+                    "SELECT node_id, joined FROM node_change "
+                    "WHERE version > ? AND version <= ? ORDER BY version;",
+                    (since_version, version),
+                ).fetchall()
+        oldest = bounds["oldest"] or version + 1
+        if since_version > version or since_version < oldest - 1:
+            return None
+        joined_nodes, left_nodes = merge_node_changes(
+            (row["node_id"], bool(row["joined"])) for row in rows
+        )
+        return joined_nodes, left_nodes, version
+
     def create_run(self) -> int:
         """Create one run and store it in state."""
         # Sample a random int64 as run_id
@@ -520,6 +856,39 @@ class SqliteState(State):
         return 0
 
 
+def rebuild_task_table(conn: sqlite3.Connection, table: str, create: str) -> None:
+    """Copy the rows of an older task table into a table created by `create`.
+
+    UUIDs stored as TEXT are converted to BLOBs, a missing `ancestor_id` is
+    taken from the first entry of `ancestry`, and other missing columns are
+    left NULL.
+    """
+    info = f"PRAGMA table_info({table});"
+    old_columns = {row["name"] for row in conn.execute(info)}
+    if not old_columns:
+        return
+    conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old;")
+    conn.execute(create)
+    columns = [row["name"] for row in conn.execute(info)]
+    values = []
+    for column in columns:
+        if column == "ancestor_id" and column not in old_columns:
+            values.append(
+                "uuid_to_blob(substr(ancestry, 1, instr(ancestry || ',', ',') - 1))"
+            )
+        elif column in ("task_id", "ancestor_id"):
+            values.append(f"uuid_to_blob({column})")
+        elif column in old_columns:
+            values.append(column)
+        else:
+            values.append("NULL")
+    conn.execute(
+        f"INSERT INTO {table}({', '.join(columns)}) "
+        f"SELECT {', '.join(values)} FROM {table}_old;"
+    )
+    conn.execute(f"DROP TABLE {table}_old;")
+
+
 def dict_factory(
     cursor: sqlite3.Cursor,
     row: sqlite3.Row,
@@ -535,7 +904,7 @@ def dict_factory(
 def task_ins_to_dict(task_msg: TaskIns) -> Dict[str, Any]:
     """Transform TaskIns to dict."""
     result = {
-        "task_id": task_msg.task_id,
+        "task_id": uuid_to_bytes(task_msg.task_id),
         "group_id": task_msg.group_id,
         "run_id": task_msg.run_id,
         "producer_anonymous": task_msg.task.producer.anonymous,
@@ -546,10 +915,14 @@ def task_ins_to_dict(task_msg: TaskIns) -> Dict[str, Any]:
         "delivered_at": task_msg.task.delivered_at,
         "ttl": task_msg.task.ttl,
         "ancestry": ",".join(task_msg.task.ancestry),
+        "ancestor_id": (
+            uuid_to_bytes(task_msg.task.ancestry[0]) if task_msg.task.ancestry else None
+        ),
         "legacy_server_message": (
             task_msg.task.legacy_server_message.SerializeToString()
         ),
         "legacy_client_message": None,
+        "payload_digest": None,
     }
     return result
 
@@ -557,7 +930,7 @@ def task_ins_to_dict(task_msg: TaskIns) -> Dict[str, Any]:
 def task_res_to_dict(task_msg: TaskRes) -> Dict[str, Any]:
     """Transform TaskRes to dict."""
     result = {
-        "task_id": task_msg.task_id,
+        "task_id": uuid_to_bytes(task_msg.task_id),
         "group_id": task_msg.group_id,
         "run_id": task_msg.run_id,
         "producer_anonymous": task_msg.task.producer.anonymous,
@@ -568,10 +941,14 @@ def task_res_to_dict(task_msg: TaskRes) -> Dict[str, Any]:
         "delivered_at": task_msg.task.delivered_at,
         "ttl": task_msg.task.ttl,
         "ancestry": ",".join(task_msg.task.ancestry),
+        "ancestor_id": (
+            uuid_to_bytes(task_msg.task.ancestry[0]) if task_msg.task.ancestry else None
+        ),
         "legacy_server_message": None,
         "legacy_client_message": (
             task_msg.task.legacy_client_message.SerializeToString()
         ),
+        "payload_digest": None,
     }
     return result
 
@@ -582,7 +959,7 @@ def dict_to_task_ins(task_dict: Dict[str, Any]) -> TaskIns:
     server_message.ParseFromString(task_dict["legacy_server_message"])
 
     result = TaskIns(
-        task_id=task_dict["task_id"],
+        task_id=bytes_to_uuid(task_dict["task_id"]),
         group_id=task_dict["group_id"],
         run_id=task_dict["run_id"],
         task=Task(
@@ -610,7 +987,7 @@ def dict_to_task_res(task_dict: Dict[str, Any]) -> TaskRes:
     client_message.ParseFromString(task_dict["legacy_client_message"])
 
     result = TaskRes(
-        task_id=task_dict["task_id"],
+        task_id=bytes_to_uuid(task_dict["task_id"]),
         group_id=task_dict["group_id"],
         run_id=task_dict["run_id"],
         task=Task(
@@ -630,3 +1007,25 @@ def dict_to_task_res(task_dict: Dict[str, Any]) -> TaskRes:
         ),
     )
     return result
+
+
+def uuid_to_bytes(value: str) -> Optional[bytes]:
+    """Return the 16-byte representation of a UUID string, if it is valid."""
+    try:
+        return UUID(value).bytes
+    except ValueError:
+        return None
+
+
+def bytes_to_uuid(value: Optional[bytes]) -> str:
+    """Return the string representation of a UUID stored as BLOB."""
+    if value is None:
+        return ""
+    return str(UUID(bytes=value))
+
+
+def uuid_to_blob(value: Union[str, bytes, None]) -> Optional[bytes]:
+    """Return a UUID stored as TEXT or BLOB as a 16-byte BLOB."""
+    if value is None or isinstance(value, bytes):
+        return value
+    return uuid_to_bytes(value)
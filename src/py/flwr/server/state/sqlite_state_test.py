@@ -15,9 +15,12 @@
 """Test for utility functions."""
 # pylint: disable=no-self-use, invalid-name, disable=R0904
 
+import tempfile
+import threading
 import unittest
 
-from flwr.server.state.sqlite_state import task_ins_to_dict
+from flwr.proto.transport_pb2 import Parameters, ServerMessage
+from flwr.server.state.sqlite_state import SqliteState, task_ins_to_dict
 from flwr.server.state.state_test import create_task_ins
 
 
@@ -42,6 +45,7 @@ class SqliteStateTest(unittest.TestCase):
             "ancestry",
             "legacy_server_message",
             "legacy_client_message",
+            "payload_digest",
         ]
 
         # Execute
@@ -51,6 +55,59 @@ class SqliteStateTest(unittest.TestCase):
         for key in expected_keys:
             assert key in result
 
+    def test_poll_interval_notifies_other_process(self) -> None:
+        """Check that changes by another connection wake up waiting requests."""
+        with tempfile.NamedTemporaryFile() as tmp_file:
+            # Prepare
+            state = SqliteState(tmp_file.name, poll_interval=0.01)
+            state.initialize()
+            other = SqliteState(tmp_file.name)
+            other.initialize()
+            run_id = other.create_run()
+            event = threading.Event()
+
+            # Execute
+            with state.task_ins_notifier.subscribe([1], event.set):
+                other.store_task_ins(
+                    create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+                )
+                notified = event.wait(5.0)
+
+            # Assert
+            assert notified
+            assert len(state.get_task_ins(node_id=1, limit=None)) == 1
+
+    def test_large_payloads_stored_once(self) -> None:
+        """Check that identical large messages are stored once, outside the DB."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Prepare
+            state = SqliteState(f"{tmp_dir}/state.db", payload_threshold=100)
+            state.initialize()
+            run_id = state.create_run()
+            message = ServerMessage(
+                fit_ins=ServerMessage.FitIns(
+                    parameters=Parameters(tensors=[b"x" * 1000], tensor_type="")
+                )
+            )
+            for node_id in [1, 2]:
+                task_ins = create_task_ins(
+                    consumer_node_id=node_id, anonymous=False, run_id=run_id
+                )
+                task_ins.task.legacy_server_message.CopyFrom(message)
+                state.store_task_ins(task_ins)
+
+            # Execute
+            task_ins_list = state.get_task_ins_batch([1, 2], limit=None)
+            rows = state.query(
+                "SELECT legacy_server_message, payload_digest FROM task_ins;"
+            )
+
+            # Assert
+            for node_id in [1, 2]:
+                assert task_ins_list[node_id][0].task.legacy_server_message == message
+            assert all(row["legacy_server_message"] is None for row in rows)
+            assert len({row["payload_digest"] for row in rows}) == 1
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
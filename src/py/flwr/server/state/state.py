@@ -16,15 +16,28 @@
 
 
 import abc
-from typing import List, Optional, Set
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from uuid import UUID
 
 from flwr.proto.task_pb2 import TaskIns, TaskRes
 
+from .notifier import Notifier
+
+# Number of node changes kept to answer `get_node_changes`
+NODE_CHANGES_HISTORY = 10000
+
 
 class State(abc.ABC):
     """Abstract State."""
 
+    # Wake up the requests waiting for TaskIns of a node (Fleet API), for
+    # TaskRes of a TaskIns and for node changes (Driver API), `None` if not
+    # supported
+    task_ins_notifier: Optional[Notifier] = None
+    task_res_notifier: Optional[Notifier] = None
+    node_notifier: Optional[Notifier] = None
+
     @abc.abstractmethod
     def store_task_ins(self, task_ins: TaskIns) -> Optional[UUID]:
         """Store one TaskIns.
@@ -75,6 +88,17 @@ class State(abc.ABC):
         `limit` is set, it has to be greater zero.
         """
 
+    def get_task_ins_batch(
+        self, node_ids: Sequence[Optional[int]], limit: Optional[int]
+    ) -> Dict[Optional[int], List[TaskIns]]:
+        """Get undelivered TaskIns for several nodes at once.
+
+        Returns, for each entry of `node_ids`, the result of `get_task_ins` with
+        the same `limit`. Implementations may override this to retrieve all of
+        them in a single transaction.
+        """
+        return {node_id: self.get_task_ins(node_id, limit) for node_id in node_ids}
+
     @abc.abstractmethod
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
         """Store one TaskRes.
@@ -96,6 +120,17 @@ class State(abc.ABC):
         storing the `task_res` MUST fail.
         """
 
+    def store_task_res_batch(
+        self, task_res_list: Sequence[TaskRes]
+    ) -> List[Optional[UUID]]:
+        """Store several TaskRes at once.
+
+        Returns the `task_id` of each TaskRes, or `None` where storing it failed,
+        in the order of `task_res_list`. Implementations may override this to
+        store all of them in a single transaction.
+        """
+        return [self.store_task_res(task_res) for task_res in task_res_list]
+
     @abc.abstractmethod
     def get_task_res(self, task_ids: Set[UUID], limit: Optional[int]) -> List[TaskRes]:
         """Get TaskRes for task_ids.
@@ -131,6 +166,18 @@ class State(abc.ABC):
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
 
+    @abc.abstractmethod
+    def delete_expired_tasks(self, expired_before: datetime) -> Tuple[int, int]:
+        """Delete expired and orphaned tasks.
+
+        Deletes, whether delivered or not, all TaskIns and TaskRes whose `ttl`
+        is before `expired_before`, together with the TaskRes replying to the
+        deleted TaskIns, and all TaskRes which do not reply to a stored TaskIns.
+
+        Returns the number of deleted tasks and the number of bytes of their
+        legacy messages.
+        """
+
     @abc.abstractmethod
     def create_node(self) -> int:
         """Create, store in state, and return `node_id`."""
@@ -149,6 +196,44 @@ class State(abc.ABC):
         an empty `Set` MUST be returned.
         """
 
+    @abc.abstractmethod
+    def get_nodes_version(self) -> int:
+        """Return the membership version, which increases with each node change."""
+
+    @abc.abstractmethod
+    def get_node_changes(
+        self, run_id: int, since_version: int
+    ) -> Optional[Tuple[Set[int], Set[int], int]]:
+        """Return the nodes which joined and left after `since_version`.
+
+        Returns `(joined, left, version)`, where `version` is the current
+        membership version, or `None` if the changes since `since_version` are
+        not known (anymore), in which case callers fall back to `get_nodes`.
+        A node which joined and left after `since_version` is in neither set.
+
+        Constraints
+        -----------
+        If the provided `run_id` does not exist, `None` MUST be returned.
+        """
+
     @abc.abstractmethod
     def create_run(self) -> int:
         """Create one run."""
+
+
+def merge_node_changes(
+    changes: Iterable[Tuple[int, bool]]
+) -> Tuple[Set[int], Set[int]]:
+    """Merge `(node_id, joined)` changes, in order, into joined and left nodes."""
+    joined: Set[int] = set()
+    left: Set[int] = set()
+    for node_id, has_joined in changes:
+        if has_joined and node_id in left:
+            left.remove(node_id)
+        elif has_joined:
+            joined.add(node_id)
+        elif node_id in joined:
+            joined.remove(node_id)
+        else:
+            left.add(node_id)
+    return joined, left
@@ -15,6 +15,7 @@
 """Factory class that creates State instances."""
 
 
+import threading
 from logging import DEBUG
 from typing import Optional
 
@@ -26,23 +27,32 @@ from .state import State
 
 
 class StateFactory:
-    """Factory class that creates State instances."""
+    """Factory class that creates State instances.
 
-    def __init__(self, database: str) -> None:
+    `poll_interval` is passed on to `SqliteState`, to share a file-based
+    database with other processes.
+    """
+
+    def __init__(self, database: str, poll_interval: float = 0.0) -> None:
         self.database = database
+        self.poll_interval = poll_interval
         self.state_instance: Optional[State] = None
+        self._lock = threading.Lock()
 
     def state(self) -> State:
         """Return a State instance and create it, if necessary."""
-        # InMemoryState
-        if self.database == ":flwr-in-memory-state:":
+        with self._lock:
+            # InMemoryState
+            if self.database == ":flwr-in-memory-state:":
+                if self.state_instance is None:
+                    self.state_instance = InMemoryState()
+                log(DEBUG, "Using InMemoryState")
+                return self.state_instance
+
+            # SqliteState, created once and shared by all requests
             if self.state_instance is None:
-                self.state_instance = InMemoryState()
-            log(DEBUG, "Using InMemoryState")
+                state = SqliteState(self.database, poll_interval=self.poll_interval)
+                state.initialize()
+                self.state_instance = state
+            log(DEBUG, "Using SqliteState")
             return self.state_instance
-
-        # SqliteState
-        state = SqliteState(self.database)
-        state.initialize()
-        log(DEBUG, "Using SqliteState")
-        return state
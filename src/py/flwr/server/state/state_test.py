@@ -15,10 +15,12 @@
 """Tests all state implemenations have to conform to."""
 # pylint: disable=no-self-use, invalid-name, disable=R0904
 
+import sqlite3
 import tempfile
 import unittest
 from abc import abstractmethod
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import List
 from uuid import uuid4
 
@@ -238,6 +240,176 @@ class StateTest(unittest.TestCase):
         retrieved_task_ins = task_ins_list[0]
         assert retrieved_task_ins.task_id == str(task_ins_uuid)
 
+    def test_get_task_ins_limit_keeps_remaining_for_node(self) -> None:
+        """Retrieve TaskIns in batches without touching other nodes."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ids = [
+            state.store_task_ins(
+                create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+            )
+            for _ in range(3)
+        ]
+        state.store_task_ins(
+            create_task_ins(consumer_node_id=2, anonymous=False, run_id=run_id)
+        )
+
+        # Execute
+        first = state.get_task_ins(node_id=1, limit=2)
+        second = state.get_task_ins(node_id=1, limit=2)
+        third = state.get_task_ins(node_id=1, limit=2)
+        other = state.get_task_ins(node_id=2, limit=None)
+
+        # Assert
+        retrieved = [task_ins.task_id for task_ins in first + second]
+        assert sorted(retrieved) == sorted(str(task_id) for task_id in task_ids)
+        assert len(first) == 2
+        assert len(second) == 1
+        assert not third
+        assert len(other) == 1
+
+    def test_delete_tasks_keeps_undelivered_task_res(self) -> None:
+        """Delete only TaskIns whose TaskRes were delivered."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins_ids = [
+            state.store_task_ins(
+                create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+            )
+            for _ in range(2)
+        ]
+        state.get_task_ins(node_id=1, limit=None)
+        for task_ins_id in task_ins_ids:
+            state.store_task_res(
+                create_task_res(
+                    producer_node_id=1,
+                    anonymous=False,
+                    ancestry=[str(task_ins_id)],
+                    run_id=run_id,
+                )
+            )
+        state.get_task_res(task_ids={task_ins_ids[0]}, limit=None)  # type: ignore
+
+        # Execute
+        state.delete_tasks(set(task_ins_ids))  # type: ignore
+
+        # Assert
+        assert state.num_task_ins() == 1
+        assert state.num_task_res() == 1
+        remaining = state.get_task_res(
+            task_ids={task_ins_ids[1]}, limit=None  # type: ignore
+        )
+        assert len(remaining) == 1
+
+    def test_get_task_ins_batch(self) -> None:
+        """Retrieve the TaskIns of several nodes at once."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        for node_id in [1, 1, 2]:
+            state.store_task_ins(
+                create_task_ins(
+                    consumer_node_id=node_id, anonymous=False, run_id=run_id
+                )
+            )
+
+        # Execute
+        result = state.get_task_ins_batch([1, 2, 3], limit=None)
+
+        # Assert
+        assert [len(result[node_id]) for node_id in [1, 2, 3]] == [2, 1, 0]
+        assert not state.get_task_ins(node_id=1, limit=None)
+
+    def test_store_task_ins_notifies_waiting_node(self) -> None:
+        """Wake up the requests waiting for TaskIns of the consumer only."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        notified: List[str] = []
+        assert state.task_ins_notifier is not None
+
+        # Execute
+        with state.task_ins_notifier.subscribe([1], lambda: notified.append("1")):
+            with state.task_ins_notifier.subscribe(
+                [None], lambda: notified.append("-")
+            ):
+                for node_id in [2, 1, 1]:
+                    state.store_task_ins(
+                        create_task_ins(
+                            consumer_node_id=node_id, anonymous=False, run_id=run_id
+                        )
+                    )
+
+        # Assert
+        assert notified == ["1"]
+
+    def test_store_task_res_notifies_waiting_driver(self) -> None:
+        """Wake up the requests waiting for TaskRes of a given TaskIns."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins_ids = [
+            state.store_task_ins(
+                create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+            )
+            for _ in range(2)
+        ]
+        notified: List[int] = []
+        assert state.task_res_notifier is not None
+
+        # Execute
+        with state.task_res_notifier.subscribe(
+            task_ins_ids[1:], lambda: notified.append(1)
+        ):
+            for task_ins_id in task_ins_ids:
+                state.store_task_res_batch(
+                    [
+                        create_task_res(
+                            producer_node_id=1,
+                            anonymous=False,
+                            ancestry=[str(task_ins_id)],
+                            run_id=run_id,
+                        )
+                    ]
+                )
+
+        # Assert
+        assert notified == [1]
+
+    def test_store_task_res_batch(self) -> None:
+        """Store several TaskRes at once, rejecting invalid ones."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        task_ins_id = state.store_task_ins(
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        )
+        task_res_list = [
+            create_task_res(
+                producer_node_id=1,
+                anonymous=False,
+                ancestry=[str(task_ins_id)],
+                run_id=run_id,
+            )
+            for _ in range(2)
+        ]
+        invalid = create_task_res(
+            producer_node_id=1, anonymous=True, ancestry=[], run_id=run_id
+        )
+
+        # Execute
+        task_ids = state.store_task_res_batch(task_res_list + [invalid])
+
+        # Assert
+        assert task_ids[0] is not None and task_ids[1] is not None
+        assert task_ids[2] is None
+        retrieved = state.get_task_res(
+            task_ids={task_ins_id}, limit=None  # type: ignore
+        )
+        assert len(retrieved) == 2
+
     def test_task_ins_store_delivered_and_fail_retrieving(self) -> None:
         """Fail retrieving delivered task."""
         # Prepare
@@ -344,6 +516,72 @@ class StateTest(unittest.TestCase):
         # Assert
         assert len(retrieved_node_ids) == 0
 
+    def test_delete_expired_tasks(self) -> None:
+        """Test that expired and orphaned tasks are deleted."""
+        # Prepare
+        state = self.state_factory()
+        run_id = state.create_run()
+        task_id_0 = state.store_task_ins(
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        )
+        assert task_id_0 is not None
+        state.store_task_ins(
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+        )
+        for ancestor_id in [task_id_0, uuid4()]:
+            state.store_task_res(
+                create_task_res(
+                    producer_node_id=1,
+                    anonymous=False,
+                    ancestry=[str(ancestor_id)],
+                    run_id=run_id,
+                )
+            )
+        current = datetime.now(tz=timezone.utc)
+
+        # Execute
+        orphaned, _ = state.delete_expired_tasks(expired_before=current)
+        num_task_res = state.num_task_res()
+        task_res_list = state.get_task_res(task_ids={task_id_0}, limit=None)
+        expired, num_bytes = state.delete_expired_tasks(
+            expired_before=current + timedelta(days=2)
+        )
+
+        # Assert
+        assert orphaned == 1
+        assert num_task_res == 1
+        assert len(task_res_list) == 1
+        assert expired == 3
+        assert num_bytes > 0
+        assert state.num_task_ins() == 0
+        assert state.num_task_res() == 0
+        assert not state.get_task_ins(node_id=1, limit=None)
+
+    def test_get_node_changes(self) -> None:
+        """Return the nodes which joined and left after a membership version."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run()
+        start = state.get_nodes_version()
+        first, second = state.create_node(), state.create_node()
+        middle = state.get_nodes_version()
+        state.delete_node(first)
+        third = state.create_node()
+        state.delete_node(third)
+
+        # Execute
+        since_start = state.get_node_changes(run_id, start)
+        since_middle = state.get_node_changes(run_id, middle)
+        since_future = state.get_node_changes(run_id, state.get_nodes_version() + 1)
+        invalid_run = state.get_node_changes(run_id + 1, start)
+
+        # Assert
+        assert middle == start + 2
+        assert since_start == ({second}, set(), start + 5)
+        assert since_middle == (set(), {first}, start + 5)
+        assert since_future is None
+        assert invalid_run is None
+
     def test_get_nodes_invalid_run_id(self) -> None:
         """Test retrieving all node_ids with invalid run_id."""
         # Prepare
@@ -479,7 +717,7 @@ class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
         result = state.query("SELECT name FROM sqlite_schema;")
 
         # Assert
-        assert len(result) == 8
+        assert len(result) == 11
 
 
 class SqliteFileBasedTest(StateTest, unittest.TestCase):
@@ -504,7 +742,153 @@ class SqliteFileBasedTest(StateTest, unittest.TestCase):
         result = state.query("SELECT name FROM sqlite_schema;")
 
         # Assert
-        assert len(result) == 8
+        assert len(result) == 11
+
+    def test_concurrent_pulls_deliver_once(self) -> None:
+        """Test that concurrent pulls never deliver a TaskIns twice."""
+        # Prepare
+        state = self.state_factory()
+        run_id = state.create_run()
+        for _ in range(200):
+            state.store_task_ins(
+                create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+            )
+
+        # Execute
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            pulled = list(
+                executor.map(lambda _: state.get_task_ins(1, limit=3), range(100))
+            )
+
+        # Assert
+        task_ids = [task_ins.task_id for batch in pulled for task_ins in batch]
+        assert len(task_ids) == 200
+        assert len(set(task_ids)) == 200
+
+    def test_migrate_legacy_database(self) -> None:
+        """Test that the tasks of a database with TEXT ids are migrated."""
+        # Prepare
+        # pylint: disable-next=consider-using-with,attribute-defined-outside-init
+        self.tmp_file = tempfile.NamedTemporaryFile()
+        task_ins_id, task_res_id = uuid4(), uuid4()
+        conn = sqlite3.connect(self.tmp_file.name)
+        with conn:
+            conn.execute("CREATE TABLE run(run_id INTEGER UNIQUE);")
+            conn.execute("INSERT INTO run VALUES(1);")
+            for table in ["task_ins", "task_res"]:
+                conn.execute(LEGACY_CREATE_TABLE_TASK.format(table=table))
+            conn.execute(
+                "INSERT INTO task_res VALUES(?, '', 1, 1, 0, 1, 0, '', '', ?, ?, "
+                "NULL, ?);",
+                (
+                    str(task_res_id),
+                    (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+                    str(task_ins_id),
+                    ClientMessage().SerializeToString(),
+                ),
+            )
+        conn.close()
+        state = SqliteState(database_path=self.tmp_file.name)
+
+        # Execute
+        state.initialize()
+        task_res_list = state.get_task_res(task_ids={task_ins_id}, limit=None)
+
+        # Assert
+        assert [task_res.task_id for task_res in task_res_list] == [str(task_res_id)]
+        assert state.query("PRAGMA user_version;")[0]["user_version"] == 1
+
+    def test_migrate_database_without_payload_digest(self) -> None:
+        """Test that a database without `payload_digest` can spool payloads."""
+        # Prepare
+        # pylint: disable-next=consider-using-with,attribute-defined-outside-init
+        self.tmp_file = tempfile.NamedTemporaryFile()
+        task_ins_id, task_res_id = uuid4(), uuid4()
+        conn = sqlite3.connect(self.tmp_file.name)
+        with conn:
+            conn.execute("CREATE TABLE run(run_id INTEGER UNIQUE);")
+            conn.execute("INSERT INTO run VALUES(1);")
+            for table in ["task_ins", "task_res"]:
+                conn.execute(PRE_PAYLOAD_CREATE_TABLE_TASK.format(table=table))
+            conn.execute(
+                "INSERT INTO task_res VALUES(?, '', 1, 1, 0, 1, 0, '', '', ?, ?, ?, "
+                "NULL, ?);",
+                (
+                    task_res_id.bytes,
+                    (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+                    str(task_ins_id),
+                    task_ins_id.bytes,
+                    ClientMessage().SerializeToString(),
+                ),
+            )
+        conn.close()
+        state = SqliteState(database_path=self.tmp_file.name, payload_threshold=1)
+
+        # Execute
+        state.initialize()
+        state.store_task_ins(
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=1)
+        )
+        task_ins_list = state.get_task_ins(node_id=1, limit=None)
+        task_res_list = state.get_task_res(task_ids={task_ins_id}, limit=None)
+
+        # Assert
+        assert len(task_ins_list) == 1
+        assert task_ins_list[0].task.legacy_server_message.HasField("reconnect_ins")
+        assert [task_res.task_id for task_res in task_res_list] == [str(task_res_id)]
+
+    def test_initialize_rejects_newer_schema(self) -> None:
+        """Test that a database written by a newer version is not opened."""
+        # Prepare
+        state = self.state_factory()
+        state.query("PRAGMA user_version = 1000;")
+        newer = SqliteState(database_path=self.tmp_file.name)
+
+        # Execute & Assert
+        with self.assertRaises(Exception):
+            newer.initialize()
+
+
+# Layout of the task tables before `user_version` was set
+LEGACY_CREATE_TABLE_TASK = """
+CREATE TABLE {table}(
+    task_id                 TEXT UNIQUE,
+    group_id                TEXT,
+    run_id                  INTEGER,
+    producer_anonymous      BOOLEAN,
+    producer_node_id        INTEGER,
+    consumer_anonymous      BOOLEAN,
+    consumer_node_id        INTEGER,
+    created_at              TEXT,
+    delivered_at            TEXT,
+    ttl                     TEXT,
+    ancestry                TEXT,
+    legacy_server_message   BLOB,
+    legacy_client_message   BLOB,
+    FOREIGN KEY(run_id) REFERENCES run(run_id)
+);
+"""
+
+# Layout of the task tables with BLOB ids, before `payload_digest` was added
+PRE_PAYLOAD_CREATE_TABLE_TASK = """
+CREATE TABLE {table}(
+    task_id                 BLOB UNIQUE,
+    group_id                TEXT,
+    run_id                  INTEGER,
+    producer_anonymous      BOOLEAN,
+    producer_node_id        INTEGER,
+    consumer_anonymous      BOOLEAN,
+    consumer_node_id        INTEGER,
+    created_at              TEXT,
+    delivered_at            TEXT,
+    ttl                     TEXT,
+    ancestry                TEXT,
+    ancestor_id             BLOB,
+    legacy_server_message   BLOB,
+    legacy_client_message   BLOB,
+    FOREIGN KEY(run_id) REFERENCES run(run_id)
+);
+"""
 
 
 if __name__ == "__main__":
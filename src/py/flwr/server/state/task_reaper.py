@@ -0,0 +1,90 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Background deletion of expired tasks."""
+
+
+import threading
+from logging import DEBUG, ERROR
+from typing import Optional, Tuple
+
+from flwr.common import log, now
+
+from .state import State
+
+
+class TaskReaper:
+    """Delete expired and orphaned tasks from a State in a background thread.
+
+    Tasks are only deleted by the Driver API once their results were pulled, so
+    the TaskIns and TaskRes of crashed drivers and dead nodes would otherwise
+    stay in the state forever.
+
+    Parameters
+    ----------
+    state : State
+        The State to delete tasks from.
+    interval : float (default: 60.0)
+        Number of seconds between two deletions.
+
+    Attributes
+    ----------
+    tasks_expired : int
+        Number of tasks deleted so far.
+    bytes_freed : int
+        Number of bytes of the legacy messages of the tasks deleted so far.
+    """
+
+    def __init__(self, state: State, interval: float = 60.0) -> None:
+        self.state = state
+        self.interval = interval
+        self.tasks_expired = 0
+        self.bytes_freed = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def reap(self) -> Tuple[int, int]:
+        """Delete the tasks which expired by now.
+
+        Returns the number of deleted tasks and of freed bytes.
+        """
+        num_tasks, num_bytes = self.state.delete_expired_tasks(expired_before=now())
+        self.tasks_expired += num_tasks
+        self.bytes_freed += num_bytes
+        if num_tasks > 0:
+            log(DEBUG, "Deleted %s expired tasks (%s bytes)", num_tasks, num_bytes)
+        return num_tasks, num_bytes
+
+    def start(self) -> None:
+        """Start deleting expired tasks every `interval` seconds."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.reap()
+            except Exception as err:  # pylint: disable=broad-except
+                log(ERROR, "Failed to delete expired tasks: %s", err)
@@ -0,0 +1,56 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""TaskReaper tests."""
+
+
+import time
+from unittest.mock import MagicMock
+
+from .task_reaper import TaskReaper
+
+
+def test_reap_counts() -> None:
+    """Test that the counters add up the deleted tasks of each pass."""
+    # Prepare
+    state = MagicMock()
+    state.delete_expired_tasks.side_effect = [(2, 100), (0, 0), (1, 50)]
+    reaper = TaskReaper(state)
+
+    # Execute
+    for _ in range(3):
+        reaper.reap()
+
+    # Assert
+    assert reaper.tasks_expired == 3
+    assert reaper.bytes_freed == 150
+
+
+def test_start_stop() -> None:
+    """Test that the background thread deletes expired tasks until stopped."""
+    # Prepare
+    state = MagicMock()
+    state.delete_expired_tasks.return_value = (1, 10)
+    reaper = TaskReaper(state, interval=0.01)
+
+    # Execute
+    reaper.start()
+    while state.delete_expired_tasks.call_count < 2:
+        time.sleep(0.01)
+    reaper.stop()
+    calls = state.delete_expired_tasks.call_count
+
+    # Assert
+    assert reaper.tasks_expired >= 2
+    assert state.delete_expired_tasks.call_count == calls
@@ -15,117 +15,329 @@
 """Aggregation functions for strategy implementations."""
 # mypy: disallow_untyped_calls=False
 
+import concurrent.futures
+import threading
 from functools import reduce
-from typing import Any, Callable, List, Tuple
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
 
 import numpy as np
 
 from flwr.common import FitRes, NDArray, NDArrays, parameters_to_ndarrays
 from flwr.server.client_proxy import ClientProxy
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 def aggregate(results: List[Tuple[NDArrays, int]]) -> NDArrays:
     """Compute weighted average."""
-    # Calculate the total number of examples used during training
-    num_examples_total = sum([num_examples for _, num_examples in results])
-
-    # Create a list of weights, each multiplied by the related number of examples
-    weighted_weights = [
-        [layer * num_examples for layer in weights] for weights, num_examples in results
-    ]
-
-    # Compute average weights of each layer
-    weights_prime: NDArrays = [
-        reduce(np.add, layer_updates) / num_examples_total
-        for layer_updates in zip(*weighted_weights)
-    ]
-    return weights_prime
-
-def aggregate2(results: List[Tuple[NDArrays, int]],nclients) -> NDArrays:
-    """Compute weighted average."""
-    # Calculate the total number of examples used during training
-    num_examples_total = sum([num_examples for _, num_examples in results])
-
-    # Create a list of weights, each multiplied by the related number of examples
-    weighted_weights = [
-        [layer for layer in weights] for weights, num_examples  in results
-        #[layer * num_examples for layer in weights] for weights, num_examples in results
-    ]
-
-    # Compute average weights of each layer
-    weights_prime: NDArrays = [
-        reduce(np.add, layer_updates) /nclients#/ num_examples_total
-        for layer_updates in zip(*weighted_weights)
-    ]
-    return weights_prime
-
-def mean(results: List[Tuple[NDArrays, int]], aggregate_fn,init) -> NDArrays:
+    average = WeightedAverage()
+    for weights, num_examples in results:
+        average.add(weights, num_examples)
+    return average.result() or []
+
+def aggregate2(results: List[Tuple[NDArrays, int]], nclients: int) -> NDArrays:
+    """Compute the sum of the parameters divided by `nclients`."""
+    average = WeightedAverage()
+    for weights, _ in results:
+        average.add(weights, 1)
+    return average.result(nclients) or []
+
+def mean(results: List[T], aggregate_fn: Callable[[R, T], R], init: R) -> R:
     """Applies aggregate_fn to the results beginning with init."""
     sum = reduce(aggregate_fn, results,init)    
     return sum
 
 
-def aggregate_inplace(results: List[Tuple[ClientProxy, FitRes]]) -> NDArrays:
-    """Compute in-place weighted average."""
-    # Count total examples
-    num_examples_total = sum([fit_res.num_examples for _, fit_res in results])
-
-    # Compute scaling factors for each result
-    scaling_factors = [
-        fit_res.num_examples / num_examples_total for _, fit_res in results
-    ]
-
-    # Let's do in-place aggregation
-    # Get first result, then add up each other
-    params = [
-        scaling_factors[0] * x for x in parameters_to_ndarrays(results[0][1].parameters)
-    ]
-    for i, (_, fit_res) in enumerate(results[1:]):
-        res = (
-            scaling_factors[i + 1] * x
-            for x in parameters_to_ndarrays(fit_res.parameters)
-        )
-        params = [reduce(np.add, layer_updates) for layer_updates in zip(params, res)]
+class TreeAggregator:
+    """Fold values pairwise in a balanced tree on a thread pool.
+
+    Values can be added as soon as they are available (e.g., while other
+    clients are still computing their results). Whenever two values are ready,
+    `combine_fn` is applied to them on the pool and the partial sum is fed back
+    into the tree. With `N` values, the critical path is `O(log N)` applications
+    of `combine_fn` instead of `N - 1` for a serial `reduce`. TenSEAL releases
+    the GIL while operating on ciphertexts, so threads run the additions in
+    parallel without having to serialize ciphertexts between processes.
+
+    `combine_fn` must be associative and commutative.
+    """
+
+    def __init__(
+        self, combine_fn: Callable[[Any, Any], Any], max_workers: Optional[int] = None
+    ) -> None:
+        self._combine_fn = combine_fn
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._cond = threading.Condition(threading.RLock())
+        self._ready: List[Any] = []
+        self._in_flight = 0
+        self._error: Optional[BaseException] = None
+
+    def __enter__(self) -> "TreeAggregator":
+        """Enter context manager."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Shut down the thread pool."""
+        self.close()
+
+    def add(self, value: Any) -> None:
+        """Add a value to the tree and combine it as soon as it has a partner."""
+        with self._cond:
+            self._ready.append(value)
+            self._schedule()
+
+    def result(self) -> Any:
+        """Wait for all pending combinations and return the aggregate.
+
+        Returns `None` if no value was added.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_flight == 0)
+            if self._error is not None:
+                raise self._error
+            if not self._ready:
+                return None
+            return self._ready[0]
+
+    def close(self) -> None:
+        """Shut down the thread pool after pending combinations finished."""
+        self._executor.shutdown(wait=True)
+
+    def _schedule(self) -> None:
+        # Must be called while holding `self._cond`
+        while len(self._ready) >= 2 and self._error is None:
+            left = self._ready.pop()
+            right = self._ready.pop()
+            self._in_flight += 1
+            future = self._executor.submit(self._combine_fn, left, right)
+            future.add_done_callback(self._on_combined)
+
+    def _on_combined(self, future: concurrent.futures.Future) -> None:  # type: ignore
+        with self._cond:
+            self._in_flight -= 1
+            failure = future.exception()
+            if failure is not None:
+                self._error = failure
+            else:
+                self._ready.append(future.result())
+                self._schedule()
+            self._cond.notify_all()
+
+
+class FoldAggregator:
+    """Fold values onto an initial value in the background as they arrive.
+
+    For operations which are not associative between the values themselves
+    (e.g., MK-CKKS decryption shares can only be added to a ciphertext, not to
+    each other), the values can't be combined in a tree. Instead, `fold_fn` is
+    applied to the running aggregate and each value on a worker thread as soon
+    as the value is added, so the fold overlaps with waiting for the remaining
+    values and `result` only waits for the last application.
+    """
+
+    def __init__(self, fold_fn: Callable[[Any, Any], Any], init: Any) -> None:
+        self._fold_fn = fold_fn
+        self._value = init
+        # A single worker applies `fold_fn` in the order the values were added
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._pending: List[concurrent.futures.Future] = []  # type: ignore
+
+    def __enter__(self) -> "FoldAggregator":
+        """Enter context manager."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Shut down the worker thread."""
+        self.close()
+
+    def add(self, value: Any) -> None:
+        """Fold a value onto the aggregate on the worker thread."""
+        self._pending.append(self._executor.submit(self._fold, value))
+
+    def result(self) -> Any:
+        """Wait for all pending applications of `fold_fn` and return the aggregate."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            # Re-raise the first failure
+            future.result()
+        return self._value
+
+    def close(self) -> None:
+        """Shut down the worker thread after pending applications finished."""
+        self._executor.shutdown(wait=True)
+
+    def _fold(self, value: Any) -> None:
+        self._value = self._fold_fn(self._value, value)
+
+
+def tree_reduce(
+    values: List[Any],
+    combine_fn: Callable[[Any, Any], Any],
+    max_workers: Optional[int] = None,
+) -> Any:
+    """Reduce `values` with `combine_fn` in a balanced tree on a thread pool."""
+    with TreeAggregator(combine_fn, max_workers=max_workers) as aggregator:
+        for value in values:
+            aggregator.add(value)
+        return aggregator.result()
+
+
+class WeightedAverage:
+    """Running weighted average of model parameters.
+
+    All layers are accumulated in one contiguous buffer, together with a table
+    of layer offsets. Each result is scaled chunk by chunk into a small scratch
+    buffer which stays in the CPU cache, and added to the buffer in place. Adding
+    a result therefore does not allocate any arrays, and aggregating `N` results
+    needs `O(model)` memory instead of `O(N * model)`.
+
+    The buffer uses the floating point type of the model (at least float32), so
+    float32 models do not pay for twice the memory traffic of float64.
+    """
+
+    chunk_size = 1 << 16
+
+    def __init__(self) -> None:
+        self._weighted_sum: Optional[NDArray] = None
+        self._scratch: Optional[NDArray] = None
+        # (start, end, shape, dtype) of each layer in the flat buffer
+        self._layers: List[Tuple[int, int, Tuple[int, ...], np.dtype[Any]]] = []
+        self.num_examples_total = 0
+        self.num_results = 0
+
+    def add(self, ndarrays: NDArrays, num_examples: int) -> None:
+        """Add the parameters of a single result."""
+        if self._weighted_sum is None:
+            self._allocate(ndarrays)
+        assert self._weighted_sum is not None and self._scratch is not None
+        if len(ndarrays) != len(self._layers):
+            raise ValueError(
+                f"Expected {len(self._layers)} layers, received {len(ndarrays)}"
+            )
+        for (start, end, shape, _), layer in zip(self._layers, ndarrays):
+            if layer.shape != shape:
+                raise ValueError(f"Expected layer of shape {shape}, got {layer.shape}")
+            flat_layer = layer.reshape(-1)
+            for offset in range(0, end - start, self.chunk_size):
+                chunk = flat_layer[offset : offset + self.chunk_size]
+                scratch = self._scratch[: len(chunk)]
+                weighted_sum = self._weighted_sum[
+                    start + offset : start + offset + len(chunk)
+                ]
+                np.multiply(chunk, num_examples, out=scratch)
+                np.add(weighted_sum, scratch, out=weighted_sum)
+        self.num_examples_total += num_examples
+        self.num_results += 1
+
+    def result(self, total: Optional[float] = None) -> Optional[NDArrays]:
+        """Return the weighted average, or `None` if no result was added.
+
+        The weighted sum is divided by `total` if given, else by the total
+        number of examples. Layers are views on a single flat array. Floating
+        point layers are converted back to their original dtype.
+        """
+        if self._weighted_sum is None:
+            return None
+        if total is None:
+            total = self.num_examples_total
+        average = self._weighted_sum / total
+        layers: NDArrays = []
+        for start, end, shape, dtype in self._layers:
+            layer = average[start:end].reshape(shape)
+            if np.issubdtype(dtype, np.inexact) and dtype != average.dtype:
+                layer = layer.astype(dtype)
+            layers.append(layer)
+        return layers
+
+    def _allocate(self, ndarrays: NDArrays) -> None:
+        offset = 0
+        for layer in ndarrays:
+            self._layers.append((offset, offset + layer.size, layer.shape, layer.dtype))
+            offset += layer.size
+        dtype = np.result_type(np.float32, *(layer.dtype for layer in ndarrays))
+        self._weighted_sum = np.zeros(offset, dtype=dtype)
+        self._scratch = np.empty(min(offset, self.chunk_size), dtype=dtype)
 
-    return params
 
-def aggregate_inplace2(results: List[Tuple[ClientProxy, FitRes]],nclients) -> NDArrays:
+def aggregate_inplace(results: List[Tuple[ClientProxy, FitRes]]) -> NDArrays:
     """Compute in-place weighted average."""
-    # Count total examples
-    num_examples_total = sum([fit_res.num_examples for _, fit_res in results])
-
-    # Compute scaling factors for each result
-    #scaling_factors = [
-    #    fit_res.num_examples / num_examples_total for _, fit_res in results
-    #    #fit_res.num_examples / num_examples_total for _, fit_res in results
-    #]
-
-    # Let's do in-place aggregation
-    # Get first result, then add up each other
-    params = [
-        x/nclients for x in parameters_to_ndarrays(results[0][1].parameters)
-        #scaling_factors[0] * x for x in parameters_to_ndarrays(results[0][1].parameters)
-    ]
-    for i, (_, fit_res) in enumerate(results[1:]):
-        res = (
-            #scaling_factors[i + 1] * x
-            x/nclients
-            for x in parameters_to_ndarrays(fit_res.parameters)
-        )
-        params = [reduce(np.add, layer_updates) for layer_updates in zip(params, res)]
+    average = WeightedAverage()
+    for _, fit_res in results:
+        average.add(parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
+    return average.result() or []
 
-    return params
+def aggregate_inplace2(
+    results: List[Tuple[ClientProxy, FitRes]], nclients: int
+) -> NDArrays:
+    """Compute the sum of the parameters divided by `nclients` in place."""
+    average = WeightedAverage()
+    for _, fit_res in results:
+        average.add(parameters_to_ndarrays(fit_res.parameters), 1)
+    return average.result(nclients) or []
+
+def aggregate_median(
+    results: List[Tuple[NDArrays, int]], max_chunk_bytes: int = 1 << 26
+) -> NDArrays:
+    """Compute median.
 
-def aggregate_median(results: List[Tuple[NDArrays, int]]) -> NDArrays:
-    """Compute median."""
+    Each layer is processed in column chunks of at most `max_chunk_bytes`, see
+    `_aggregate_coordinate_wise`.
+    """
     # Create a list of weights and ignore the number of examples
     weights = [weights for weights, _ in results]
+    return _aggregate_coordinate_wise(weights, _median_of_chunk, max_chunk_bytes)
+
 
-    # Compute median weight of each layer
-    median_w: NDArrays = [
-        np.median(np.asarray(layer), axis=0) for layer in zip(*weights)
-    ]
-    return median_w
+def _median_of_chunk(stacked: NDArray, out: NDArray) -> None:
+    """Write the median of each column of `stacked` to `out`."""
+    half = len(stacked) // 2
+    if len(stacked) % 2:
+        stacked.partition(half, axis=0)
+        out[...] = stacked[half]
+    else:
+        stacked.partition((half - 1, half), axis=0)
+        np.add(stacked[half - 1], stacked[half], out=out)
+        out /= 2
+
+
+def _aggregate_coordinate_wise(
+    weights: List[NDArrays],
+    reduce_chunk: Callable[[NDArray, NDArray], None],
+    max_chunk_bytes: int,
+) -> NDArrays:
+    """Apply a coordinate-wise statistic to each layer in memory-bounded chunks.
+
+    For every layer, the values of a chunk of coordinates are copied from all
+    clients into a `(num_clients, chunk)` scratch array of at most
+    `max_chunk_bytes`. `reduce_chunk(scratch, out)` may reorder the scratch array
+    in place (e.g., with `np.partition`) and writes its result into the
+    corresponding slice of the preallocated output layer. The scratch memory
+    of the statistic is therefore bounded by `max_chunk_bytes` instead of a full
+    `num_clients x layer` stack plus sort scratch. The parameters of all clients
+    are still needed, as a median or trimmed mean cannot be updated one result
+    at a time.
+    """
+    num_clients = len(weights)
+    aggregated: NDArrays = []
+    for layers in zip(*weights):
+        flat_layers = [np.asarray(layer).reshape(-1) for layer in layers]
+        dtype = np.result_type(*flat_layers)
+        out_dtype = dtype if np.issubdtype(dtype, np.inexact) else np.dtype(np.float64)
+        size = flat_layers[0].size
+        out = np.empty(size, dtype=out_dtype)
+        chunk_size = max(
+            1, min(size, max_chunk_bytes // (num_clients * dtype.itemsize))
+        )
+        scratch = np.empty((num_clients, chunk_size), dtype=dtype)
+        for start in range(0, size, chunk_size):
+            end = min(start + chunk_size, size)
+            stacked = scratch[:, : end - start]
+            for i, flat_layer in enumerate(flat_layers):
+                stacked[i] = flat_layer[start:end]
+            reduce_chunk(stacked, out[start:end])
+        aggregated.append(out.reshape(np.shape(layers[0])))
+    return aggregated
 
 
 def aggregate_krum(
@@ -137,33 +349,60 @@ def aggregate_krum(
     """
     # Create a list of weights and ignore the number of examples
     weights = [weights for weights, _ in results]
+    best_indices = krum_indices(weights, num_malicious, to_keep)
 
-    # Compute distances between vectors
-    distance_matrix = _compute_distances(weights)
+    if to_keep > 0:
+        # Return the average of the to_keep best clients (MultiKrum)
+        return aggregate([results[i] for i in best_indices])
+
+    # Return the model parameters that minimize the score (Krum)
+    return weights[best_indices[0]]
 
-    # For each client, take the n-f-2 closest parameters vectors
-    num_closest = max(1, len(weights) - num_malicious - 2)
-    closest_indices = []
-    for i, _ in enumerate(distance_matrix):
-        closest_indices.append(
-            np.argsort(distance_matrix[i])[1 : num_closest + 1].tolist()  # noqa: E203
-        )
 
-    # Compute the score for each client, that is the sum of the distances
-    # of the n-f-2 closest parameters vectors
-    scores = [
-        np.sum(distance_matrix[i, closest_indices[i]])
-        for i in range(len(distance_matrix))
-    ]
+def krum_indices(
+    weights: List[NDArrays], num_malicious: int, to_keep: int = 0
+) -> List[int]:
+    """Return the indices of the vectors chosen by Krum (or MultiKrum).
 
+    The result contains the index minimizing the Krum score if `to_keep` is 0,
+    and otherwise the indices of the `to_keep` vectors with the lowest scores.
+    """
+    scores = _KrumScores(_compute_distances(weights), num_malicious).scores()
     if to_keep > 0:
-        # Choose to_keep clients and return their average (MultiKrum)
-        best_indices = np.argsort(scores)[::-1][len(scores) - to_keep :]  # noqa: E203
-        best_results = [results[i] for i in best_indices]
-        return aggregate(best_results)
+        return [int(i) for i in np.argsort(scores, kind="stable")[:to_keep]]
+    return [int(np.argmin(scores))]
 
-    # Return the model parameters that minimize the score (Krum)
-    return weights[np.argmin(scores)]
+
+class _KrumScores:
+    """Krum scores of a set of vectors from which vectors can be removed.
+
+    The score of a vector is the sum of the squared distances to its `n - f - 2`
+    closest neighbours among the remaining vectors. Distances and neighbour
+    orders are computed once; removing a vector only updates a mask.
+    """
+
+    def __init__(self, distance_matrix: NDArray, num_malicious: int) -> None:
+        num_vectors = len(distance_matrix)
+        self._order = np.argsort(distance_matrix, axis=1, kind="stable")
+        self._sorted_distances = np.take_along_axis(
+            distance_matrix, self._order, axis=1
+        )
+        self._not_self = self._order != np.arange(num_vectors)[:, np.newaxis]
+        self._num_malicious = num_malicious
+        self.remaining = np.ones(num_vectors, dtype=bool)
+
+    def scores(self) -> NDArray:
+        """Return the score of each remaining vector (`inf` for removed ones)."""
+        num_closest = max(1, int(self.remaining.sum()) - self._num_malicious - 2)
+        candidates = self.remaining[self._order] & self._not_self
+        closest = candidates & (np.cumsum(candidates, axis=1) <= num_closest)
+        scores: NDArray = np.sum(self._sorted_distances, axis=1, where=closest)
+        scores[~self.remaining] = np.inf
+        return scores
+
+    def remove(self, index: int) -> None:
+        """Remove a vector from the set."""
+        self.remaining[index] = False
 
 
 # pylint: disable=too-many-locals
@@ -209,34 +448,47 @@ def aggregate_bulyan(
     theta = len(results) - 2 * num_malicious
     beta = theta - 2 * num_malicious
 
-    for _ in range(theta):
-        best_model = aggregation_rule(
-            results=results, num_malicious=num_malicious, **aggregation_rule_kwargs
+    if aggregation_rule is aggregate_krum and not aggregation_rule_kwargs.get(
+        "to_keep"
+    ):
+        # Compute the distances once and update the Krum scores as models are
+        # selected, instead of running Krum from scratch `theta` times
+        krum_scores = _KrumScores(
+            _compute_distances([weights for weights, _ in results]), num_malicious
         )
-        list_of_weights = [weights for weights, num_samples in results]
-        # This group gives exact result
-        if aggregation_rule in byzantine_resilient_single_ret_model_aggregation:
-            best_idx = _find_reference_weights(best_model, list_of_weights)
-        # This group requires finding the closest model to the returned one
-        # (weights distance wise)
-        elif aggregation_rule in byzantine_resilient_many_return_models_aggregation:
-            # when different aggregation strategies available
-            # write a function to find the closest model
-            raise NotImplementedError(
-                "aggregate_bulyan currently does not support the aggregation rules that"
-                " return many models as results. "
-                "Such aggregation rules are currently not available in Flower."
-            )
-        else:
-            raise ValueError(
-                "The given aggregation rule is not added as Byzantine resilient. "
-                "Please choose from Byzantine resilient rules."
+        for _ in range(theta):
+            best_idx = int(np.argmin(krum_scores.scores()))
+            selected_models_set.append(results[best_idx])
+            krum_scores.remove(best_idx)
+    else:
+        for _ in range(theta):
+            best_model = aggregation_rule(
+                results=results, num_malicious=num_malicious, **aggregation_rule_kwargs
             )
-
-        selected_models_set.append(results[best_idx])
-
-        # remove idx from tracker and weights_results
-        results.pop(best_idx)
+            list_of_weights = [weights for weights, num_samples in results]
+            # This group gives exact result
+            if aggregation_rule in byzantine_resilient_single_ret_model_aggregation:
+                best_idx = _find_reference_weights(best_model, list_of_weights)
+            # This group requires finding the closest model to the returned one
+            # (weights distance wise)
+            elif aggregation_rule in byzantine_resilient_many_return_models_aggregation:
+                # when different aggregation strategies available
+                # write a function to find the closest model
+                raise NotImplementedError(
+                    "aggregate_bulyan currently does not support the aggregation rules "
+                    "that return many models as results. "
+                    "Such aggregation rules are currently not available in Flower."
+                )
+            else:
+                raise ValueError(
+                    "The given aggregation rule is not added as Byzantine resilient. "
+                    "Please choose from Byzantine resilient rules."
+                )
+
+            selected_models_set.append(results[best_idx])
+
+            # remove idx from tracker and weights_results
+            results.pop(best_idx)
 
     # Compute median parameter vector across selected_models_set
     median_vect = aggregate_median(selected_models_set)
@@ -274,58 +526,71 @@ def aggregate_qffl(
     return new_parameters
 
 
-def _compute_distances(weights: List[NDArrays]) -> NDArray:
+def _compute_distances(
+    weights: List[NDArrays], max_block_bytes: int = 1 << 26
+) -> NDArray:
     """Compute distances between vectors.
 
     Input: weights - list of weights vectors
     Output: distances - matrix distance_matrix of squared distances between the vectors
+
+    The distances are derived from the Gram matrix, ||a - b||^2 = ||a||^2 +
+    ||b||^2 - 2 a.b, which is accumulated with one matrix product (BLAS) per
+    block of coordinates. Only one block of at most `max_block_bytes` is held in
+    memory at a time, and each block is centered on the first vector to avoid
+    cancellation between the large norms of nearby vectors.
     """
-    flat_w = np.array([np.concatenate(p, axis=None).ravel() for p in weights])
-    distance_matrix = np.zeros((len(weights), len(weights)))
-    for i, _ in enumerate(flat_w):
-        for j, _ in enumerate(flat_w):
-            delta = flat_w[i] - flat_w[j]
-            norm = np.linalg.norm(delta)
-            distance_matrix[i, j] = norm**2
+    num_vectors = len(weights)
+    largest_layer = max((np.size(layer) for layer in weights[0]), default=1)
+    block_size = max(1, min(max_block_bytes // (8 * num_vectors), largest_layer))
+    gram = np.zeros((num_vectors, num_vectors))
+    block = np.empty((num_vectors, block_size))
+    for layers in zip(*weights):
+        flat_layers = [np.asarray(layer).reshape(-1) for layer in layers]
+        for start in range(0, flat_layers[0].size, block_size):
+            end = min(start + block_size, flat_layers[0].size)
+            view = block[:, : end - start]
+            for i, flat_layer in enumerate(flat_layers):
+                view[i] = flat_layer[start:end]
+            view -= view[0]
+            gram += view @ view.T
+    squared_norms = np.diag(gram)
+    distance_matrix: NDArray = (
+        squared_norms[:, np.newaxis] + squared_norms[np.newaxis, :] - 2 * gram
+    )
+    np.maximum(distance_matrix, 0, out=distance_matrix)
+    np.fill_diagonal(distance_matrix, 0)
     return distance_matrix
 
 
-def _trim_mean(array: NDArray, proportiontocut: float) -> NDArray:
-    """Compute trimmed mean along axis=0.
+def aggregate_trimmed_avg(
+    results: List[Tuple[NDArrays, int]],
+    proportiontocut: float,
+    max_chunk_bytes: int = 1 << 26,
+) -> NDArrays:
+    """Compute trimmed average.
 
-    It is based on the scipy implementation.
+    It is based on the scipy implementation of `trim_mean` along axis=0, and
+    processes each layer in column chunks of at most `max_chunk_bytes`, see
+    `_aggregate_coordinate_wise`.
 
     https://docs.scipy.org/doc/scipy/reference/generated/
     scipy.stats.trim_mean.html.
     """
-    axis = 0
-    nobs = array.shape[axis]
+    # Create a list of weights and ignore the number of examples
+    weights = [weights for weights, _ in results]
+
+    nobs = len(weights)
     lowercut = int(proportiontocut * nobs)
     uppercut = nobs - lowercut
     if lowercut > uppercut:
         raise ValueError("Proportion too big.")
 
-    atmp = np.partition(array, (lowercut, uppercut - 1), axis)
-
-    slice_list = [slice(None)] * atmp.ndim
-    slice_list[axis] = slice(lowercut, uppercut)
-    result: NDArray = np.mean(atmp[tuple(slice_list)], axis=axis)
-    return result
-
-
-def aggregate_trimmed_avg(
-    results: List[Tuple[NDArrays, int]], proportiontocut: float
-) -> NDArrays:
-    """Compute trimmed average."""
-    # Create a list of weights and ignore the number of examples
-    weights = [weights for weights, _ in results]
-
-    trimmed_w: NDArrays = [
-        _trim_mean(np.asarray(layer), proportiontocut=proportiontocut)
-        for layer in zip(*weights)
-    ]
+    def _trimmed_mean_of_chunk(stacked: NDArray, out: NDArray) -> None:
+        stacked.partition((lowercut, uppercut - 1), axis=0)
+        np.mean(stacked[lowercut:uppercut], axis=0, out=out)
 
-    return trimmed_w
+    return _aggregate_coordinate_wise(weights, _trimmed_mean_of_chunk, max_chunk_bytes)
 
 
 def _check_weights_equality(weights1: NDArrays, weights2: NDArrays) -> bool:
@@ -18,12 +18,24 @@
 from typing import List, Tuple
 
 import numpy as np
+import pytest
+
+from flwr.common import NDArrays
 
 from .aggregate import (
+    FoldAggregator,
+    TreeAggregator,
+    WeightedAverage,
     _aggregate_n_closest_weights,
     _check_weights_equality,
+    _compute_distances,
     _find_reference_weights,
     aggregate,
+    aggregate2,
+    aggregate_median,
+    aggregate_trimmed_avg,
+    krum_indices,
+    tree_reduce,
     weighted_loss_avg,
 )
 
@@ -46,6 +58,59 @@ def test_aggregate() -> None:
     np.testing.assert_equal(expected, actual)
 
 
+def test_aggregate2() -> None:
+    """Test that aggregate2 divides the sum of the parameters by nclients."""
+    # Prepare
+    results = [
+        ([np.array([[1.0, 2.0], [3.0, 4.0]]), np.array([1.0])], 1),
+        ([np.array([[3.0, 2.0], [1.0, 0.0]]), np.array([3.0])], 5),
+    ]
+    expected = [np.array([[1.0, 1.0], [1.0, 1.0]]), np.array([1.0])]
+
+    # Execute
+    actual = aggregate2(results, nclients=4)
+
+    # Assert
+    np.testing.assert_allclose(actual[0], expected[0])
+    np.testing.assert_allclose(actual[1], expected[1])
+
+
+def test_weighted_average_chunks() -> None:
+    """Test that layers larger than a chunk are averaged correctly."""
+    # Prepare
+    rng = np.random.default_rng(0)
+    results = [
+        ([rng.standard_normal((3, 7), dtype=np.float32), np.arange(4)], num_examples)
+        for num_examples in [1, 2, 3]
+    ]
+    expected = [
+        sum(weights[0] * num_examples for weights, num_examples in results) / 6,
+        np.arange(4, dtype=np.float64),
+    ]
+    average = WeightedAverage()
+    average.chunk_size = 5
+
+    # Execute
+    for weights, num_examples in results:
+        average.add(weights, num_examples)
+    actual = average.result()
+
+    # Assert
+    assert actual is not None
+    assert actual[0].dtype == np.float32
+    assert actual[1].dtype == np.float64
+    np.testing.assert_allclose(actual[0], expected[0], rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(actual[1], expected[1])
+
+
+def test_weighted_average_shape_mismatch() -> None:
+    """Test that results with a different model architecture are rejected."""
+    average = WeightedAverage()
+    average.add([np.ones((2, 2))], 1)
+    with pytest.raises(ValueError):
+        average.add([np.ones((4,))], 1)
+
+
 def test_weighted_loss_avg_single_value() -> None:
     """Test weighted loss averaging."""
     # Prepare
@@ -139,3 +204,139 @@ def test_aggregate_n_closest_weights_mean() -> None:
             for expected, result in zip(expected_averaged, beta_closest_weights)
         )
     )
+
+
+def test_tree_reduce() -> None:
+    """Test that tree_reduce adds up all values."""
+    # Prepare
+    values = [np.full(3, i, dtype=np.float64) for i in range(17)]
+    expected = np.full(3, sum(range(17)), dtype=np.float64)
+
+    # Execute
+    actual = tree_reduce(values, lambda x, y: x + y, max_workers=4)
+
+    # Assert
+    np.testing.assert_equal(actual, expected)
+
+
+def test_tree_reduce_empty() -> None:
+    """Test that tree_reduce returns None without values."""
+    assert tree_reduce([], lambda x, y: x + y) is None
+
+
+def test_tree_aggregator_streaming() -> None:
+    """Test that values added one by one are combined into a single result."""
+    # Prepare
+    calls: List[Tuple[int, int]] = []
+
+    def combine(left: int, right: int) -> int:
+        calls.append((left, right))
+        return left + right
+
+    # Execute
+    with TreeAggregator(combine, max_workers=2) as aggregator:
+        for value in range(1, 9):
+            aggregator.add(value)
+        actual = aggregator.result()
+
+    # Assert
+    assert actual == 36
+    assert len(calls) == 7
+
+
+def test_tree_aggregator_error() -> None:
+    """Test that errors raised by combine_fn are re-raised by result."""
+
+    def combine(left: int, right: int) -> int:
+        raise ValueError("cannot combine")
+
+    with TreeAggregator(combine) as aggregator:
+        aggregator.add(1)
+        aggregator.add(2)
+        with pytest.raises(ValueError):
+            aggregator.result()
+
+
+def test_fold_aggregator_keeps_order() -> None:
+    """Test that values are folded onto the initial value in arrival order."""
+    # Execute
+    with FoldAggregator(lambda acc, value: acc + [value], []) as aggregator:
+        for value in range(5):
+            aggregator.add(value)
+        actual = aggregator.result()
+
+    # Assert
+    assert actual == [0, 1, 2, 3, 4]
+
+
+def test_fold_aggregator_error() -> None:
+    """Test that errors raised by fold_fn are re-raised by result."""
+
+    def fold(acc: int, value: int) -> int:
+        raise ValueError("cannot fold")
+
+    with FoldAggregator(fold, 0) as aggregator:
+        aggregator.add(1)
+        with pytest.raises(ValueError):
+            aggregator.result()
+
+
+def test_compute_distances() -> None:
+    """Test that the blocked Gram matrix gives pairwise squared distances."""
+    # Prepare
+    rng = np.random.default_rng(42)
+    weights: List[NDArrays] = [
+        [rng.standard_normal((4, 5)) + 100.0, rng.standard_normal(3)] for _ in range(6)
+    ]
+    flat = [np.concatenate([layer.ravel() for layer in w]) for w in weights]
+    expected = np.array([[np.sum((a - b) ** 2) for b in flat] for a in flat])
+
+    # Execute
+    actual = _compute_distances(weights, max_block_bytes=8 * 6 * 4)
+
+    # Assert
+    np.testing.assert_allclose(actual, expected, atol=1e-8)
+
+
+def test_krum_indices() -> None:
+    """Test that Krum selects the vector in the middle of the cluster."""
+    # Prepare
+    weights = [[np.array([value])] for value in [0.0, 1.0, 1.1, 1.2, 10.0]]
+
+    # Execute
+    best = krum_indices(weights, num_malicious=1)
+    best_three = krum_indices(weights, num_malicious=1, to_keep=3)
+
+    # Assert
+    assert best == [2]
+    assert sorted(best_three) == [1, 2, 3]
+
+
+def test_aggregate_median_chunked() -> None:
+    """Test that the chunked median matches np.median."""
+    # Prepare
+    results = [([np.random.randn(6, 7), np.random.randn(3)], 1) for _ in range(6)]
+    expected = [
+        np.median(np.asarray(layer), axis=0) for layer in zip(*[w for w, _ in results])
+    ]
+
+    # Execute
+    actual = aggregate_median(results, max_chunk_bytes=100)
+
+    # Assert
+    for exp, act in zip(expected, actual):
+        np.testing.assert_allclose(act, exp)
+
+
+def test_aggregate_trimmed_avg_chunked() -> None:
+    """Test that the chunked trimmed mean drops the extreme values."""
+    # Prepare
+    results = [
+        ([np.full((4, 5), value)], 1) for value in [-100.0, 1.0, 2.0, 3.0, 100.0]
+    ]
+
+    # Execute
+    actual = aggregate_trimmed_avg(results, 0.2, max_chunk_bytes=50)
+
+    # Assert
+    np.testing.assert_allclose(actual[0], np.full((4, 5), 2.0))
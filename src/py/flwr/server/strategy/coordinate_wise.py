@@ -0,0 +1,176 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Base class of strategies aggregating each coordinate independently."""
+
+
+from abc import ABC, abstractmethod
+from logging import WARNING
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from flwr.common import (
+    FitRes,
+    MetricsAggregationFn,
+    NDArrays,
+    Parameters,
+    Scalar,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.common.logger import log
+from flwr.server.client_proxy import ClientProxy
+
+from .fedavg import FedAvg
+
+
+# pylint: disable=line-too-long
+class CoordinateWiseFedAvg(FedAvg, ABC):
+    """FedAvg with a coordinate-wise statistic instead of the weighted average.
+
+    Subclasses implement `_aggregate_weights`, which is given the deserialized
+    parameters of all clients. Results streamed with `accumulate` are
+    deserialized as soon as they arrive, so the serialized results can be
+    released while waiting for the remaining clients. The deserialized
+    parameters of all clients are kept until `finalize`, since the statistic
+    needs all of them; only its scratch memory is bounded by `max_chunk_bytes`.
+
+    Parameters
+    ----------
+    inplace : bool (default: True)
+        Accepted for compatibility with `FedAvg`, the coordinate-wise
+        statistics do not use it.
+    max_chunk_bytes : int (default: 1 << 26)
+        Coordinate-wise statistics are computed in column chunks of at most
+        `max_chunk_bytes`, independently of the number of clients. See `FedAvg`
+        for the other parameters.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
+    def __init__(
+        self,
+        *,
+        fraction_fit: float = 1.0,
+        fraction_evaluate: float = 1.0,
+        min_fit_clients: int = 2,
+        min_evaluate_clients: int = 2,
+        min_available_clients: int = 2,
+        evaluate_fn: Optional[
+            Callable[
+                [int, NDArrays, Dict[str, Scalar]],
+                Optional[Tuple[float, Dict[str, Scalar]]],
+            ]
+        ] = None,
+        on_fit_config_fn: Optional[Callable[[int], Dict[str, Scalar]]] = None,
+        on_evaluate_config_fn: Optional[Callable[[int], Dict[str, Scalar]]] = None,
+        accept_failures: bool = True,
+        initial_parameters: Optional[Parameters] = None,
+        fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        inplace: bool = True,
+        max_chunk_bytes: int = 1 << 26,
+    ) -> None:
+        super().__init__(
+            fraction_fit=fraction_fit,
+            fraction_evaluate=fraction_evaluate,
+            min_fit_clients=min_fit_clients,
+            min_evaluate_clients=min_evaluate_clients,
+            min_available_clients=min_available_clients,
+            evaluate_fn=evaluate_fn,
+            on_fit_config_fn=on_fit_config_fn,
+            on_evaluate_config_fn=on_evaluate_config_fn,
+            accept_failures=accept_failures,
+            initial_parameters=initial_parameters,
+            fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
+            evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            inplace=inplace,
+        )
+        self.max_chunk_bytes = max_chunk_bytes
+        # Round, deserialized parameters and metrics added with `accumulate`
+        self._decoded_fit_results: Optional[
+            Tuple[int, List[Tuple[NDArrays, int]], List[Tuple[int, Dict[str, Scalar]]]]
+        ] = None
+
+    @abstractmethod
+    def _aggregate_weights(
+        self, weights_results: List[Tuple[NDArrays, int]]
+    ) -> NDArrays:
+        """Aggregate the parameters of all clients."""
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: List[Tuple[ClientProxy, FitRes]],
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate fit results using `_aggregate_weights`."""
+        if not results:
+            return None, {}
+        # Do not aggregate if there are failures and failures are not accepted
+        if not self.accept_failures and failures:
+            return None, {}
+
+        # Convert results
+        weights_results = [
+            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
+            for _, fit_res in results
+        ]
+        fit_metrics = [(res.num_examples, res.metrics) for _, res in results]
+        return self._aggregate_decoded(server_round, weights_results, fit_metrics)
+
+    def accumulate(self, server_round: int, result: Tuple[ClientProxy, FitRes]) -> None:
+        """Deserialize a single fit result as soon as it arrives."""
+        if self._decoded_fit_results is None or (
+            self._decoded_fit_results[0] != server_round
+        ):
+            self._decoded_fit_results = (server_round, [], [])
+        _, weights_results, fit_metrics = self._decoded_fit_results
+        _, fit_res = result
+        weights_results.append(
+            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
+        )
+        fit_metrics.append((fit_res.num_examples, fit_res.metrics))
+
+    def finalize(
+        self,
+        server_round: int,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate all fit results of this round using `_aggregate_weights`."""
+        decoded, self._decoded_fit_results = self._decoded_fit_results, None
+        if decoded is None or decoded[0] != server_round:
+            return None, {}
+        _, weights_results, fit_metrics = decoded
+        # Do not aggregate if there are failures and failures are not accepted
+        if not self.accept_failures and failures:
+            return None, {}
+        return self._aggregate_decoded(server_round, weights_results, fit_metrics)
+
+    def _aggregate_decoded(
+        self,
+        server_round: int,
+        weights_results: List[Tuple[NDArrays, int]],
+        fit_metrics: List[Tuple[int, Dict[str, Scalar]]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        parameters_aggregated = ndarrays_to_parameters(
+            self._aggregate_weights(weights_results)
+        )
+
+        # Aggregate custom metrics if aggregation fn was provided
+        metrics_aggregated = {}
+        if self.fit_metrics_aggregation_fn:
+            metrics_aggregated = self.fit_metrics_aggregation_fn(fit_metrics)
+        elif server_round == 1:  # Only log this warning once
+            log(WARNING, "No fit_metrics_aggregation_fn provided")
+
+        return parameters_aggregated, metrics_aggregated
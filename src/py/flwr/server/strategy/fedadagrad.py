@@ -20,20 +20,11 @@ Paper: arxiv.org/abs/2003.00295
 """
 
 
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, Optional, Tuple
 
 import numpy as np
 
-from flwr.common import (
-    FitRes,
-    MetricsAggregationFn,
-    NDArrays,
-    Parameters,
-    Scalar,
-    ndarrays_to_parameters,
-    parameters_to_ndarrays,
-)
-from flwr.server.client_proxy import ClientProxy
+from flwr.common import MetricsAggregationFn, NDArrays, Parameters, Scalar
 
 from .fedopt import FedOpt
 
@@ -128,21 +119,8 @@ class FedAdagrad(FedOpt):
         rep = f"FedAdagrad(accept_failures={self.accept_failures})"
         return rep
 
-    def aggregate_fit(
-        self,
-        server_round: int,
-        results: List[Tuple[ClientProxy, FitRes]],
-        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
-    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
-        """Aggregate fit results using weighted average."""
-        fedavg_parameters_aggregated, metrics_aggregated = super().aggregate_fit(
-            server_round=server_round, results=results, failures=failures
-        )
-        if fedavg_parameters_aggregated is None:
-            return None, {}
-
-        fedavg_weights_aggregate = parameters_to_ndarrays(fedavg_parameters_aggregated)
-
+    def _optimizer_step(self, fedavg_weights_aggregate: NDArrays) -> NDArrays:
+        """Update the current weights from the weighted average of this round."""
         # Adagrad
         delta_t: NDArrays = [
             x - y for x, y in zip(fedavg_weights_aggregate, self.current_weights)
@@ -168,4 +146,4 @@ class FedAdagrad(FedOpt):
 
         self.current_weights = new_weights
 
-        return ndarrays_to_parameters(self.current_weights), metrics_aggregated
+        return self.current_weights
@@ -37,7 +37,14 @@ from flwr.common.logger import log
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 
-from .aggregate import aggregate, aggregate_inplace, weighted_loss_avg, aggregate2, aggregate_inplace2
+from .aggregate import (
+    WeightedAverage,
+    aggregate,
+    aggregate2,
+    aggregate_inplace,
+    aggregate_inplace2,
+    weighted_loss_avg,
+)
 from .strategy import Strategy
 
 WARNING_MIN_AVAILABLE_CLIENTS_TOO_LOW = """
@@ -130,6 +137,9 @@ class FedAvg(Strategy):
         self.fit_metrics_aggregation_fn = fit_metrics_aggregation_fn
         self.evaluate_metrics_aggregation_fn = evaluate_metrics_aggregation_fn
         self.inplace = inplace
+        self._fit_stream: Optional[
+            Tuple[int, str, WeightedAverage, List[Tuple[int, Dict[str, Scalar]]]]
+        ] = None
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
@@ -239,7 +249,10 @@ class FedAvg(Strategy):
             ]
             aggregated_ndarrays = aggregate(weights_results)
 
-        parameters_aggregated = ndarrays_to_parameters(aggregated_ndarrays)
+        # Keep the wire format selected by the clients
+        parameters_aggregated = ndarrays_to_parameters(
+            aggregated_ndarrays, tensor_type=results[0][1].parameters.tensor_type
+        )
 
         # Aggregate custom metrics if aggregation fn was provided
         metrics_aggregated = {}
@@ -253,7 +266,7 @@ class FedAvg(Strategy):
     
     def aggregate_fit2(
         self,
-        nclients,
+        nclients: int,
         server_round: int,
         results: List[Tuple[ClientProxy, FitRes]],
         failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
@@ -276,7 +289,10 @@ class FedAvg(Strategy):
             ]
             aggregated_ndarrays = aggregate2(weights_results,nclients)
 
-        parameters_aggregated = ndarrays_to_parameters(aggregated_ndarrays)
+        # Keep the wire format selected by the clients
+        parameters_aggregated = ndarrays_to_parameters(
+            aggregated_ndarrays, tensor_type=results[0][1].parameters.tensor_type
+        )
 
         # Aggregate custom metrics if aggregation fn was provided
         metrics_aggregated = {}
@@ -288,6 +304,102 @@ class FedAvg(Strategy):
 
         return parameters_aggregated, metrics_aggregated
 
+    def _streams_fit(self) -> bool:
+        """Check if fit results can be averaged while they arrive.
+
+        Subclasses that replace the weighted average in `aggregate_fit` fall
+        back to the buffering implementation of `Strategy`.
+        """
+        return type(self).aggregate_fit is FedAvg.aggregate_fit
+
+    def _streams_fit2(self) -> bool:
+        """Check if fit results can be added up while they arrive.
+
+        Subclasses that replace `aggregate_fit2` fall back to buffering.
+        """
+        return type(self).aggregate_fit2 is FedAvg.aggregate_fit2
+
+    def accumulate(self, server_round: int, result: Tuple[ClientProxy, FitRes]) -> None:
+        """Add a single fit result to the running weighted average."""
+        if not self._streams_fit():
+            super().accumulate(server_round, result)
+            return
+        self._add_to_fit_stream(server_round, result, result[1].num_examples)
+
+    def finalize(
+        self,
+        server_round: int,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Return the weighted average of all fit results of this round."""
+        if not self._streams_fit():
+            return super().finalize(server_round, failures)
+        return self._finalize_fit_stream(server_round, failures, None)
+
+    def accumulate2(
+        self, server_round: int, result: Tuple[ClientProxy, FitRes]
+    ) -> None:
+        """Add a single fit result to the running sum of `finalize2`."""
+        if not self._streams_fit2():
+            super().accumulate2(server_round, result)
+            return
+        self._add_to_fit_stream(server_round, result, 1)
+
+    def finalize2(
+        self,
+        nclients: int,
+        server_round: int,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate the results added with `accumulate2` like `aggregate_fit2`.
+
+        The parameters of all results are added up and divided by `nclients`.
+        """
+        if not self._streams_fit2():
+            return super().finalize2(nclients, server_round, failures)
+        return self._finalize_fit_stream(server_round, failures, nclients)
+
+    def _add_to_fit_stream(
+        self, server_round: int, result: Tuple[ClientProxy, FitRes], weight: int
+    ) -> None:
+        _, fit_res = result
+        if self._fit_stream is None or self._fit_stream[0] != server_round:
+            tensor_type = fit_res.parameters.tensor_type
+            self._fit_stream = (server_round, tensor_type, WeightedAverage(), [])
+        _, _, average, fit_metrics = self._fit_stream
+        average.add(parameters_to_ndarrays(fit_res.parameters), weight)
+        fit_metrics.append((fit_res.num_examples, fit_res.metrics))
+
+    def _finalize_fit_stream(
+        self,
+        server_round: int,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+        total_weight: Optional[float],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        stream, self._fit_stream = self._fit_stream, None
+        if stream is None or stream[0] != server_round:
+            return None, {}
+        _, tensor_type, average, fit_metrics = stream
+        # Do not aggregate if there are failures and failures are not accepted
+        if not self.accept_failures and failures:
+            return None, {}
+
+        aggregated_ndarrays = average.result(total_weight)
+        if aggregated_ndarrays is None:
+            return None, {}
+        parameters_aggregated = ndarrays_to_parameters(
+            aggregated_ndarrays, tensor_type=tensor_type
+        )
+
+        # Aggregate custom metrics if aggregation fn was provided
+        metrics_aggregated = {}
+        if self.fit_metrics_aggregation_fn:
+            metrics_aggregated = self.fit_metrics_aggregation_fn(fit_metrics)
+        elif server_round == 1:  # Only log this warning once
+            log(WARNING, "No fit_metrics_aggregation_fn provided")
+
+        return parameters_aggregated, metrics_aggregated
+
     def aggregate_evaluate(
         self,
         server_round: int,
@@ -22,7 +22,7 @@ import numpy as np
 from numpy.testing import assert_allclose
 
 from flwr.common import Code, FitRes, Status, parameters_to_ndarrays
-from flwr.common.parameter import ndarrays_to_parameters
+from flwr.common.parameter import TENSOR_TYPE_NUMPY_RAW, ndarrays_to_parameters
 from flwr.server.client_proxy import ClientProxy
 
 from .fedavg import FedAvg
@@ -178,3 +178,115 @@ def test_inplace_aggregate_fit_equivalence() -> None:
     # Assert
     for ref, inp in zip(reference_np, inplace_np):
         assert_allclose(ref, inp)
+
+
+def test_accumulate_finalize_equivalence() -> None:
+    """Test that streaming aggregation matches aggregate_fit."""
+    # Prepare
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(
+                    [np.random.randn(100, 64), np.random.randn(32)]
+                ),
+                num_examples=num_examples,
+                metrics={},
+            ),
+        )
+        for num_examples in [1, 5, 3]
+    ]
+    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+    strategy = FedAvg()
+
+    # Execute
+    reference, _ = strategy.aggregate_fit(1, results, failures)
+    assert reference
+    for result in results:
+        strategy.accumulate(1, result)
+    streamed, _ = strategy.finalize(1, failures)
+    assert streamed
+
+    # Assert
+    for ref, act in zip(
+        parameters_to_ndarrays(reference), parameters_to_ndarrays(streamed)
+    ):
+        assert_allclose(ref, act)
+
+
+def test_accumulate2_finalize2_equivalence() -> None:
+    """Test that streaming aggregation matches aggregate_fit2."""
+    # Prepare
+    rng = np.random.default_rng(0)
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(
+                    [rng.standard_normal((100, 64)), rng.standard_normal(32)]
+                ),
+                num_examples=num_examples,
+                metrics={},
+            ),
+        )
+        for num_examples in [1, 5, 3]
+    ]
+    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+    strategy = FedAvg()
+
+    # Execute
+    reference, _ = strategy.aggregate_fit2(4, 1, results, failures)
+    assert reference
+    for result in results:
+        strategy.accumulate2(1, result)
+    streamed, _ = strategy.finalize2(4, 1, failures)
+    assert streamed
+
+    # Assert
+    for ref, act in zip(
+        parameters_to_ndarrays(reference), parameters_to_ndarrays(streamed)
+    ):
+        assert_allclose(ref, act)
+
+
+def test_aggregate_fit2_keeps_tensor_type() -> None:
+    """Test that aggregate_fit2 answers in the wire format of the clients."""
+    # Prepare
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(
+                    [np.ones(4, dtype=np.float32)], tensor_type=TENSOR_TYPE_NUMPY_RAW
+                ),
+                num_examples=1,
+                metrics={},
+            ),
+        )
+        for _ in range(2)
+    ]
+    strategy = FedAvg(inplace=False)
+
+    # Execute
+    parameters, _ = strategy.aggregate_fit2(2, 1, results, [])
+
+    # Assert
+    assert parameters is not None
+    assert parameters.tensor_type == TENSOR_TYPE_NUMPY_RAW
+    assert_allclose(parameters_to_ndarrays(parameters)[0], np.ones(4))
+
+
+def test_finalize_without_results() -> None:
+    """Test that finalize returns no parameters if nothing was accumulated."""
+    # Prepare
+    strategy = FedAvg()
+
+    # Execute
+    parameters, metrics = strategy.finalize(1, [])
+
+    # Assert
+    assert parameters is None
+    assert not metrics
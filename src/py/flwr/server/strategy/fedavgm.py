@@ -147,7 +147,24 @@ class FedAvgM(FedAvg):
             for _, fit_res in results
         ]
 
-        fedavg_result = aggregate(weights_results)
+        fedavg_result = self._server_update(server_round, aggregate(weights_results))
+
+        parameters_aggregated = ndarrays_to_parameters(
+            fedavg_result, tensor_type=results[0][1].parameters.tensor_type
+        )
+
+        # Aggregate custom metrics if aggregation fn was provided
+        metrics_aggregated = {}
+        if self.fit_metrics_aggregation_fn:
+            fit_metrics = [(res.num_examples, res.metrics) for _, res in results]
+            metrics_aggregated = self.fit_metrics_aggregation_fn(fit_metrics)
+        elif server_round == 1:  # Only log this warning once
+            log(WARNING, "No fit_metrics_aggregation_fn provided")
+
+        return parameters_aggregated, metrics_aggregated
+
+    def _server_update(self, server_round: int, fedavg_result: NDArrays) -> NDArrays:
+        """Apply the server-side optimizer step to the averaged parameters."""
         # following convention described in
         # https://pytorch.org/docs/stable/generated/torch.optim.SGD.html
         if self.server_opt:
@@ -186,15 +203,28 @@ class FedAvgM(FedAvg):
             ]
             # Update current weights
             self.initial_parameters = ndarrays_to_parameters(fedavg_result)
+        return fedavg_result
 
-        parameters_aggregated = ndarrays_to_parameters(fedavg_result)
+    def _streams_fit(self) -> bool:
+        return type(self).aggregate_fit is FedAvgM.aggregate_fit
 
-        # Aggregate custom metrics if aggregation fn was provided
-        metrics_aggregated = {}
-        if self.fit_metrics_aggregation_fn:
-            fit_metrics = [(res.num_examples, res.metrics) for _, res in results]
-            metrics_aggregated = self.fit_metrics_aggregation_fn(fit_metrics)
-        elif server_round == 1:  # Only log this warning once
-            log(WARNING, "No fit_metrics_aggregation_fn provided")
-
-        return parameters_aggregated, metrics_aggregated
+    def finalize(
+        self,
+        server_round: int,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Apply server momentum to the streamed weighted average."""
+        parameters_aggregated, metrics_aggregated = super().finalize(
+            server_round, failures
+        )
+        if parameters_aggregated is None or not self._streams_fit():
+            return parameters_aggregated, metrics_aggregated
+        fedavg_result = self._server_update(
+            server_round, parameters_to_ndarrays(parameters_aggregated)
+        )
+        return (
+            ndarrays_to_parameters(
+                fedavg_result, tensor_type=parameters_aggregated.tensor_type
+            ),
+            metrics_aggregated,
+        )
@@ -137,3 +137,49 @@ def test_aggregate_fit_server_learning_rate_and_momentum() -> None:
     assert actual
     for w_act, w_exp in zip(parameters_to_ndarrays(actual), expected):
         assert_almost_equal(w_act, w_exp)
+
+
+def test_finalize_applies_server_momentum() -> None:
+    """Test that streaming aggregation applies the server-side update."""
+    # Prepare
+    initial_weights: NDArrays = [array([0, 0, 0, 0], dtype=float32)]
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters([weights]),
+                num_examples=num_examples,
+                metrics={},
+            ),
+        )
+        for weights, num_examples in [
+            (array([1, 2, 3, 4], dtype=float32), 1),
+            (array([4, 5, 6, 7], dtype=float32), 2),
+        ]
+    ]
+    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+    reference = FedAvgM(
+        initial_parameters=ndarrays_to_parameters(initial_weights),
+        server_learning_rate=0.5,
+        server_momentum=0.9,
+    )
+    streaming = FedAvgM(
+        initial_parameters=ndarrays_to_parameters(initial_weights),
+        server_learning_rate=0.5,
+        server_momentum=0.9,
+    )
+
+    for server_round in [1, 2]:
+        # Execute
+        expected, _ = reference.aggregate_fit(server_round, results, failures)
+        for result in results:
+            streaming.accumulate(server_round, result)
+        actual, _ = streaming.finalize(server_round, failures)
+
+        # Assert
+        assert actual and expected
+        for w_act, w_exp in zip(
+            parameters_to_ndarrays(actual), parameters_to_ndarrays(expected)
+        ):
+            assert_almost_equal(w_act, w_exp)
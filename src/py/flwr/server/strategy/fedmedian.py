@@ -18,59 +18,31 @@ Paper: arxiv.org/pdf/1803.01498v1.pdf
 """
 
 
-from logging import WARNING
-from typing import Dict, List, Optional, Tuple, Union
+from typing import List, Tuple
 
-from flwr.common import (
-    FitRes,
-    Parameters,
-    Scalar,
-    ndarrays_to_parameters,
-    parameters_to_ndarrays,
-)
-from flwr.common.logger import log
-from flwr.server.client_proxy import ClientProxy
+from flwr.common import NDArrays
 
 from .aggregate import aggregate_median
-from .fedavg import FedAvg
+from .coordinate_wise import CoordinateWiseFedAvg
 
 
-class FedMedian(FedAvg):
-    """Configurable FedAvg with Momentum strategy implementation."""
+class FedMedian(CoordinateWiseFedAvg):
+    """Configurable FedMedian strategy implementation.
+
+    Parameters
+    ----------
+    max_chunk_bytes : int (default: 1 << 26)
+        The median is computed in column chunks of at most `max_chunk_bytes`.
+        See `FedAvg` for the other parameters.
+    """
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
         rep = f"FedMedian(accept_failures={self.accept_failures})"
         return rep
 
-    def aggregate_fit(
-        self,
-        server_round: int,
-        results: List[Tuple[ClientProxy, FitRes]],
-        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
-    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
-        """Aggregate fit results using median."""
-        if not results:
-            return None, {}
-        # Do not aggregate if there are failures and failures are not accepted
-        if not self.accept_failures and failures:
-            return None, {}
-
-        # Convert results
-        weights_results = [
-            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
-            for _, fit_res in results
-        ]
-        parameters_aggregated = ndarrays_to_parameters(
-            aggregate_median(weights_results)
-        )
-
-        # Aggregate custom metrics if aggregation fn was provided
-        metrics_aggregated = {}
-        if self.fit_metrics_aggregation_fn:
-            fit_metrics = [(res.num_examples, res.metrics) for _, res in results]
-            metrics_aggregated = self.fit_metrics_aggregation_fn(fit_metrics)
-        elif server_round == 1:  # Only log this warning once
-            log(WARNING, "No fit_metrics_aggregation_fn provided")
-
-        return parameters_aggregated, metrics_aggregated
+    def _aggregate_weights(
+        self, weights_results: List[Tuple[NDArrays, int]]
+    ) -> NDArrays:
+        """Aggregate the parameters of all clients using median."""
+        return aggregate_median(weights_results, self.max_chunk_bytes)
@@ -198,3 +198,70 @@ def test_aggregate_fit() -> None:
         actual_list = parameters_to_ndarrays(actual_aggregated)
         actual = actual_list[0]
     assert (actual == expected[0]).all()
+
+
+def test_accumulate_finalize() -> None:
+    """Tests if FedMedian aggregates streamed results correctly."""
+    # Prepare
+    strategy = FedMedian(max_chunk_bytes=16)
+    values = [0.2, 1.0, 0.5, 0.7]
+    bridge = MagicMock()
+    for cid, value in enumerate(values):
+        strategy.accumulate(
+            1,
+            (
+                GrpcClientProxy(cid=str(cid), bridge=bridge),
+                FitRes(
+                    status=Status(code=Code.OK, message="Success"),
+                    parameters=ndarrays_to_parameters(
+                        [array([value] * 10, dtype=float32)]
+                    ),
+                    num_examples=5,
+                    metrics={},
+                ),
+            ),
+        )
+
+    # Execute
+    actual_aggregated, _ = strategy.finalize(1, [])
+
+    # Assert
+    assert actual_aggregated
+    (actual,) = parameters_to_ndarrays(actual_aggregated)
+    assert actual.dtype == float32
+    assert (actual == array([0.6] * 10, dtype=float32)).all()
+
+
+def test_accumulate_per_instance() -> None:
+    """Tests that streamed results are not shared between instances."""
+    # Prepare
+    strategy, other = FedMedian(), FedMedian()
+    strategy.accumulate(
+        1,
+        (
+            GrpcClientProxy(cid="0", bridge=MagicMock()),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters([array([1.0], dtype=float32)]),
+                num_examples=5,
+                metrics={},
+            ),
+        ),
+    )
+
+    # Execute
+    other_aggregated, _ = other.finalize(1, [])
+    actual_aggregated, _ = strategy.finalize(1, [])
+
+    # Assert
+    assert other_aggregated is None
+    assert actual_aggregated is not None
+
+
+def test_fedmedian_accepts_inplace() -> None:
+    """Test that FedMedian keeps accepting the `inplace` argument of FedAvg."""
+    # Execute
+    strategy = FedMedian(inplace=False)
+
+    # Assert
+    assert not strategy.inplace
@@ -18,15 +18,18 @@ Paper: arxiv.org/abs/2003.00295
 """
 
 
-from typing import Callable, Dict, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from flwr.common import (
+    FitRes,
     MetricsAggregationFn,
     NDArrays,
     Parameters,
     Scalar,
+    ndarrays_to_parameters,
     parameters_to_ndarrays,
 )
+from flwr.server.client_proxy import ClientProxy
 
 from .fedavg import FedAvg
 
@@ -129,3 +132,59 @@ class FedOpt(FedAvg):
         """Compute a string representation of the strategy."""
         rep = f"FedOpt(accept_failures={self.accept_failures})"
         return rep
+
+    def aggregate_fit(
+        self,
+        server_round: int,
+        results: List[Tuple[ClientProxy, FitRes]],
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate fit results using weighted average."""
+        fedavg_parameters_aggregated, metrics_aggregated = super().aggregate_fit(
+            server_round=server_round, results=results, failures=failures
+        )
+        if fedavg_parameters_aggregated is None:
+            return None, {}
+
+        fedavg_weights_aggregate = parameters_to_ndarrays(fedavg_parameters_aggregated)
+        new_weights = self._optimizer_step(fedavg_weights_aggregate)
+        return (
+            ndarrays_to_parameters(
+                new_weights, tensor_type=fedavg_parameters_aggregated.tensor_type
+            ),
+            metrics_aggregated,
+        )
+
+    def _streams_fit(self) -> bool:
+        return type(self).aggregate_fit is FedOpt.aggregate_fit
+
+    def finalize(
+        self,
+        server_round: int,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Apply the server-side optimizer to the streamed weighted average."""
+        fedavg_parameters_aggregated, metrics_aggregated = super().finalize(
+            server_round, failures
+        )
+        if fedavg_parameters_aggregated is None:
+            return None, {}
+        if not self._streams_fit():
+            return fedavg_parameters_aggregated, metrics_aggregated
+
+        fedavg_weights_aggregate = parameters_to_ndarrays(fedavg_parameters_aggregated)
+        new_weights = self._optimizer_step(fedavg_weights_aggregate)
+        return (
+            ndarrays_to_parameters(
+                new_weights, tensor_type=fedavg_parameters_aggregated.tensor_type
+            ),
+            metrics_aggregated,
+        )
+
+    def _optimizer_step(self, fedavg_weights_aggregate: NDArrays) -> NDArrays:
+        """Update the current weights from the weighted average of this round.
+
+        Subclasses implement the server-side optimizer (e.g., Adam, Adagrad or
+        Yogi). Without one, FedOpt keeps the weighted average like FedAvg.
+        """
+        return fedavg_weights_aggregate
@@ -16,27 +16,16 @@
 
 Paper: arxiv.org/abs/1803.01498
 """
-from logging import WARNING
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple
 
-from flwr.common import (
-    FitRes,
-    MetricsAggregationFn,
-    NDArrays,
-    Parameters,
-    Scalar,
-    ndarrays_to_parameters,
-    parameters_to_ndarrays,
-)
-from flwr.common.logger import log
-from flwr.server.client_proxy import ClientProxy
+from flwr.common import MetricsAggregationFn, NDArrays, Parameters, Scalar
 
 from .aggregate import aggregate_trimmed_avg
-from .fedavg import FedAvg
+from .coordinate_wise import CoordinateWiseFedAvg
 
 
 # pylint: disable=line-too-long
-class FedTrimmedAvg(FedAvg):
+class FedTrimmedAvg(CoordinateWiseFedAvg):
     """Federated Averaging with Trimmed Mean [Dong Yin, et al., 2021].
 
     Implemented based on: https://arxiv.org/abs/1803.01498
@@ -63,8 +52,14 @@ class FedTrimmedAvg(FedAvg):
         Whether or not accept rounds containing failures. Defaults to True.
     initial_parameters : Parameters, optional
         Initial global model parameters.
+    inplace : bool, optional
+        Accepted for compatibility with `FedAvg`, not used by the trimmed mean.
+        Defaults to True.
     beta : float, optional
         Fraction to cut off of both tails of the distribution. Defaults to 0.2.
+    max_chunk_bytes : int, optional
+        The trimmed mean is computed in column chunks of at most
+        `max_chunk_bytes`. Defaults to 1 << 26 (64 MiB).
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
@@ -88,7 +83,9 @@ class FedTrimmedAvg(FedAvg):
         initial_parameters: Optional[Parameters] = None,
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        inplace: bool = True,
         beta: float = 0.2,
+        max_chunk_bytes: int = 1 << 26,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -103,6 +100,8 @@ class FedTrimmedAvg(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            inplace=inplace,
+            max_chunk_bytes=max_chunk_bytes,
         )
         self.beta = beta
 
@@ -111,34 +110,8 @@ class FedTrimmedAvg(FedAvg):
         rep = f"FedTrimmedAvg(accept_failures={self.accept_failures})"
         return rep
 
-    def aggregate_fit(
-        self,
-        server_round: int,
-        results: List[Tuple[ClientProxy, FitRes]],
-        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
-    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
-        """Aggregate fit results using trimmed average."""
-        if not results:
-            return None, {}
-        # Do not aggregate if there are failures and failures are not accepted
-        if not self.accept_failures and failures:
-            return None, {}
-
-        # Convert results
-        weights_results = [
-            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
-            for _, fit_res in results
-        ]
-        parameters_aggregated = ndarrays_to_parameters(
-            aggregate_trimmed_avg(weights_results, self.beta)
-        )
-
-        # Aggregate custom metrics if aggregation fn was provided
-        metrics_aggregated = {}
-        if self.fit_metrics_aggregation_fn:
-            fit_metrics = [(res.num_examples, res.metrics) for _, res in results]
-            metrics_aggregated = self.fit_metrics_aggregation_fn(fit_metrics)
-        elif server_round == 1:  # Only log this warning once
-            log(WARNING, "No fit_metrics_aggregation_fn provided")
-
-        return parameters_aggregated, metrics_aggregated
+    def _aggregate_weights(
+        self, weights_results: List[Tuple[NDArrays, int]]
+    ) -> NDArrays:
+        """Aggregate the parameters of all clients using trimmed average."""
+        return aggregate_trimmed_avg(weights_results, self.beta, self.max_chunk_bytes)
@@ -26,6 +26,9 @@ from flwr.server.client_proxy import ClientProxy
 class Strategy(ABC):
     """Abstract base class for server strategy implementations."""
 
+    # Round and results added with `accumulate`, if aggregated by `finalize`
+    _buffered_fit_results: Optional[Tuple[int, List[Tuple[ClientProxy, FitRes]]]] = None
+
     @abstractmethod
     def initialize_parameters(
         self, client_manager: ClientManager
@@ -106,6 +109,142 @@ class Strategy(ABC):
             the global model parameters remain the same.
         """
 
+    def accumulate(self, server_round: int, result: Tuple[ClientProxy, FitRes]) -> None:
+        """Add a single training result to the aggregate of the current round.
+
+        The server calls this method as soon as a client returned its result,
+        which allows strategies to aggregate incrementally while waiting for the
+        remaining clients and to release each result once it was consumed. The
+        default implementation buffers all results and aggregates them with
+        `aggregate_fit` in `finalize`.
+
+        Parameters
+        ----------
+        server_round : int
+            The current round of federated learning.
+        result : Tuple[ClientProxy, FitRes]
+            A successful update from one of the previously selected clients.
+        """
+        self._buffer_fit_result(server_round, result)
+
+    def finalize(
+        self,
+        server_round: int,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate all training results added with `accumulate` in this round.
+
+        Parameters
+        ----------
+        server_round : int
+            The current round of federated learning.
+        failures : List[Union[Tuple[ClientProxy, FitRes], BaseException]]
+            Exceptions that occurred while the server was waiting for client
+            updates.
+
+        Returns
+        -------
+        parameters : Tuple[Optional[Parameters], Dict[str, Scalar]]
+            The new global model parameters and aggregated metrics, see
+            `aggregate_fit`.
+        """
+        results = self._take_buffered_fit_results(server_round)
+        return self.aggregate_fit(server_round, results, failures)
+
+    def aggregate_fit2(
+        self,
+        nclients: int,
+        server_round: int,
+        results: List[Tuple[ClientProxy, FitRes]],
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate the training results of a round with `nclients` clients.
+
+        The default implementation ignores `nclients` and uses `aggregate_fit`.
+
+        Parameters
+        ----------
+        nclients : int
+            The number of clients taking part in the round.
+        server_round : int
+            The current round of federated learning.
+        results : List[Tuple[ClientProxy, FitRes]]
+            Successful updates from the previously selected clients.
+        failures : List[Union[Tuple[ClientProxy, FitRes], BaseException]]
+            Exceptions that occurred while the server was waiting for client
+            updates.
+
+        Returns
+        -------
+        parameters : Tuple[Optional[Parameters], Dict[str, Scalar]]
+            The new global model parameters and aggregated metrics, see
+            `aggregate_fit`.
+        """
+        return self.aggregate_fit(server_round, results, failures)
+
+    def accumulate2(
+        self, server_round: int, result: Tuple[ClientProxy, FitRes]
+    ) -> None:
+        """Add a single training result to the aggregate of `finalize2`.
+
+        The default implementation buffers all results and aggregates them with
+        `aggregate_fit2` in `finalize2`.
+
+        Parameters
+        ----------
+        server_round : int
+            The current round of federated learning.
+        result : Tuple[ClientProxy, FitRes]
+            A successful update from one of the previously selected clients.
+        """
+        self._buffer_fit_result(server_round, result)
+
+    def finalize2(
+        self,
+        nclients: int,
+        server_round: int,
+        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Aggregate all training results added with `accumulate2` in this round.
+
+        Parameters
+        ----------
+        nclients : int
+            The number of clients taking part in the round.
+        server_round : int
+            The current round of federated learning.
+        failures : List[Union[Tuple[ClientProxy, FitRes], BaseException]]
+            Exceptions that occurred while the server was waiting for client
+            updates.
+
+        Returns
+        -------
+        parameters : Tuple[Optional[Parameters], Dict[str, Scalar]]
+            The new global model parameters and aggregated metrics, see
+            `aggregate_fit2`.
+        """
+        results = self._take_buffered_fit_results(server_round)
+        return self.aggregate_fit2(nclients, server_round, results, failures)
+
+    def _buffer_fit_result(
+        self, server_round: int, result: Tuple[ClientProxy, FitRes]
+    ) -> None:
+        """Keep a result for `finalize` or `finalize2` of this round."""
+        buffered = self._buffered_fit_results
+        if buffered is None or buffered[0] != server_round:
+            buffered = (server_round, [])
+            self._buffered_fit_results = buffered
+        buffered[1].append(result)
+
+    def _take_buffered_fit_results(
+        self, server_round: int
+    ) -> List[Tuple[ClientProxy, FitRes]]:
+        """Return and forget the results buffered by `accumulate` in this round."""
+        buffered, self._buffered_fit_results = self._buffered_fit_results, None
+        if buffered is None or buffered[0] != server_round:
+            return []
+        return buffered[1]
+
     @abstractmethod
     def configure_evaluate(
         self, server_round: int, parameters: Parameters, client_manager: ClientManager
@@ -19,7 +19,7 @@ Paper: arxiv.org/abs/1602.05629
 
 
 from logging import WARNING
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from flwr.common import (
     EvaluateIns,
@@ -38,7 +38,7 @@ from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 
 from .aggregate import aggregate, aggregate_inplace, weighted_loss_avg
-from .aggregate import mean
+from .aggregate import FoldAggregator, TreeAggregator
 from .strategy import Strategy
 
 WARNING_MIN_AVAILABLE_CLIENTS_TOO_LOW = """
@@ -85,6 +85,9 @@ class FedAvg(Strategy):
         Metrics aggregation function, optional.
     evaluate_metrics_aggregation_fn : Optional[MetricsAggregationFn]
         Metrics aggregation function, optional.
+    aggregation_workers : Optional[int]
+        Maximum number of threads used to add up ciphertexts. Defaults to None
+        (chosen by `concurrent.futures.ThreadPoolExecutor`).
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
@@ -109,6 +112,7 @@ class FedAvg(Strategy):
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         inplace: bool = True,
+        aggregation_workers: Optional[int] = None,
     ) -> None:
         super().__init__()
 
@@ -131,6 +135,10 @@ class FedAvg(Strategy):
         self.fit_metrics_aggregation_fn = fit_metrics_aggregation_fn
         self.evaluate_metrics_aggregation_fn = evaluate_metrics_aggregation_fn
         self.inplace = inplace
+        self.aggregation_workers = aggregation_workers
+        self._enc_stream: Optional[
+            Tuple[int, TreeAggregator, List[Tuple[int, Dict[str, Scalar]]]]
+        ] = None
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
@@ -269,69 +277,78 @@ class FedAvg(Strategy):
         # Return client/config pairs
         return [(client, evaluate_ins) for client in clients]
 
-    def aggregate(
+    def ciphertext_aggregator(
+        self, combine_fn: Callable[[Any, Any], Any]
+    ) -> TreeAggregator:
+        """Create an aggregator adding up ciphertexts in a tree as they arrive."""
+        return TreeAggregator(combine_fn, max_workers=self.aggregation_workers)
+
+    def share_aggregator(self, ciphertext: Any) -> FoldAggregator:
+        """Create an aggregator adding decryption shares to `ciphertext`.
+
+        Shares can only be added to the ciphertext, not to each other, so they
+        are added one after the other as they arrive.
+        """
+        return FoldAggregator(lambda x, y: x.add_share(y), ciphertext)
+
+    def aggregate_enc(
         self,
         server_round: int,
-        results: List[Tuple[ClientProxy, FitRes]],
-        aggregate_fn ,#TODO
-        init, #TODO
-        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
-        metrics : Optional[bool]=False
-    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
-        """Aggregate fit results using weighted average."""
-        if len(results)==0:#not results:
+        results: List[Tuple[ClientProxy, Any]],
+        aggregator: Union[TreeAggregator, FoldAggregator],
+        failures: List[Union[Tuple[ClientProxy, Any], BaseException]],
+    ) -> Tuple[Optional[Any], Dict[str, Scalar]]:
+        """Aggregate encrypted results which were added to `aggregator`."""
+        if not results:
             return None, {}
         # Do not aggregate if there are failures and failures are not accepted
-        if not self.accept_failures and len(failures)>0:#not self.accept_failures and failures:
+        if not self.accept_failures and failures:
             return None, {}
-       
-        parameters_aggregated = mean(results, aggregate_fn=aggregate_fn,init=init)
-
-        # Aggregate custom metrics if aggregation fn was provided
-        metrics_aggregated = {}
-        if metrics:
-            if self.fit_metrics_aggregation_fn:
-                fit_metrics = [(res.num_examples, res.metrics) for _, res in results]
-                metrics_aggregated = self.fit_metrics_aggregation_fn(fit_metrics)
-            elif server_round == 1:  # Only log this warning once
-                log(WARNING, "No fit_metrics_aggregation_fn provided")
 
-        return parameters_aggregated, metrics_aggregated    
-
-    def aggregate_fit_enc(
+        return aggregator.result(), {}
+
+    def accumulate(self, server_round: int, result: Tuple[ClientProxy, Any]) -> None:
+        """Add the encrypted parameters of a single fit result to the round's sum.
+
+        `result` is a `(client, (enc, fit_res))` pair as returned by `send_ds`.
+        The ciphertexts are added up in a tree while the other clients train.
+        """
+        if self._enc_stream is None or self._enc_stream[0] != server_round:
+            if self._enc_stream is not None:
+                # Round was abandoned before `finalize`, e.g., clients were eliminated
+                self._enc_stream[1].close()
+            aggregator = self.ciphertext_aggregator(lambda x, y: x.add(y))
+            self._enc_stream = (server_round, aggregator, [])
+        _, aggregator, fit_metrics = self._enc_stream
+        _, (enc, fit_res) = result
+        aggregator.add(enc)
+        fit_metrics.append((fit_res.num_examples, fit_res.metrics))
+
+    def finalize(
         self,
         server_round: int,
-        results: List[Tuple[ClientProxy, FitRes]],
-        aggregate_fn ,#TODO
-        init, #TODO
-        failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
-        metrics : Optional[bool]=False
-    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
-        """Aggregate fit results using weighted average."""
-        if len(results)==0:#not results:
-            return None, {}
-        # Do not aggregate if there are failures and failures are not accepted
-        if not self.accept_failures and len(failures)>0:#not self.accept_failures and failures:
+        failures: List[Union[Tuple[ClientProxy, Any], BaseException]],
+    ) -> Tuple[Optional[Any], Dict[str, Scalar]]:
+        """Return the sum of all encrypted parameters added in this round."""
+        stream, self._enc_stream = self._enc_stream, None
+        if stream is None or stream[0] != server_round:
             return None, {}
-        
-        init2=init[0]#*init[1].num_examples
-        parameters_aggregated = mean(results, aggregate_fn,init=init2)
-        n_tot=init[1].num_examples
-        for _,res in results:
-            n_tot+=res[1].num_examples
-        #parameters_aggregated=parameters_aggregated*(1/n_tot)
+        _, aggregator, fit_metrics = stream
+        with aggregator:
+            # Do not aggregate if there are failures and failures are not accepted
+            if not self.accept_failures and failures:
+                return None, {}
+            parameters_aggregated = aggregator.result()
+
         # Aggregate custom metrics if aggregation fn was provided
-        log(WARNING,f"{n_tot} {len(results)}")
         metrics_aggregated = {}
         if self.fit_metrics_aggregation_fn:
-            fit_metrics = [(res[1].num_examples, res[1].metrics) for _, res in results]
-            fit_metrics.append((init[1].num_examples, init[1].metrics))
             metrics_aggregated = self.fit_metrics_aggregation_fn(fit_metrics)
         elif server_round == 1:  # Only log this warning once
             log(WARNING, "No fit_metrics_aggregation_fn provided")
 
-        return parameters_aggregated, metrics_aggregated, n_tot
-    
+        return parameters_aggregated, metrics_aggregated
+
     def aggregate_fit(
         self,
         server_round: int,
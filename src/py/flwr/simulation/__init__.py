@@ -15,24 +15,7 @@
 """Flower simulation."""
 
 
-import importlib
-
-is_ray_installed = importlib.util.find_spec("ray") is not None
-
-if is_ray_installed:
-    from flwr.simulation.app import start_simulation
-else:
-    RAY_IMPORT_ERROR: str = """Unable to import module `ray`.
-
-To install the necessary dependencies, install `flwr` with the `simulation` extra:
-
-    pip install -U flwr["simulation"]
-"""
-
-    def start_simulation(*args, **kwargs):  # type: ignore
-        """Log error stating that module `ray` could not be imported."""
-        raise ImportError(RAY_IMPORT_ERROR)
-
+from flwr.simulation.app import start_simulation
 
 __all__ = [
     "start_simulation",
@@ -16,14 +16,10 @@
 
 
 import sys
-import threading
 import traceback
 import warnings
 from logging import ERROR, INFO
-from typing import Any, Dict, List, Optional, Type, Union
-
-import ray
-from ray.util.scheduling_strategies import NodeAffinitySchedulingStrategy
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, Union
 
 from flwr.client import ClientFn
 from flwr.common import EventType, event
@@ -33,13 +29,17 @@ from flwr.server.app import ServerConfig, init_defaults, run_fl
 from flwr.server.client_manager import ClientManager
 from flwr.server.history import History
 from flwr.server.strategy import Strategy
-from flwr.simulation.ray_transport.ray_actor import (
-    DefaultActor,
-    VirtualClientEngineActor,
-    VirtualClientEngineActorPool,
-    pool_size_from_resources,
+from flwr.simulation.backend import (
+    ProcessBackend,
+    RayBackend,
+    VirtualClientEngineBackend,
 )
-from flwr.simulation.ray_transport.ray_client_proxy import RayActorClientProxy
+from flwr.simulation.ray_transport.scheduler import LongestJobFirstScheduler
+
+if TYPE_CHECKING:
+    from ray.util.scheduling_strategies import NodeAffinitySchedulingStrategy
+
+    from flwr.simulation.ray_transport.ray_actor import VirtualClientEngineActor
 
 INVALID_ARGUMENTS_START_SIMULATION = """
 INVALID ARGUMENTS ERROR
@@ -82,9 +82,11 @@ def start_simulation(
     client_manager: Optional[ClientManager] = None,
     ray_init_args: Optional[Dict[str, Any]] = None,
     keep_initialised: Optional[bool] = False,
-    actor_type: Type[VirtualClientEngineActor] = DefaultActor,
+    actor_type: Optional[Type["VirtualClientEngineActor"]] = None,
     actor_kwargs: Optional[Dict[str, Any]] = None,
-    actor_scheduling: Union[str, NodeAffinitySchedulingStrategy] = "DEFAULT",
+    actor_scheduling: Union[str, "NodeAffinitySchedulingStrategy"] = "DEFAULT",
+    backend: Union[str, VirtualClientEngineBackend] = "ray",
+    scheduler: Optional[LongestJobFirstScheduler] = None,
 ) -> History:
     """Start a Ray-based Flower simulation server.
 
@@ -138,14 +140,17 @@ def start_simulation(
     keep_initialised: Optional[bool] (default: False)
         Set to True to prevent `ray.shutdown()` in case `ray.is_initialized()=True`.
 
-    actor_type: VirtualClientEngineActor (default: DefaultActor)
-        Optionally specify the type of actor to use. The actor object, which
-        persists throughout the simulation, will be the process in charge of
-        running the clients' jobs (i.e. their `fit()` method).
+    actor_type: Optional[Type[VirtualClientEngineActor]] (default: None)
+        Optionally specify the type of actor to use, by default `DefaultActor`.
+        The actor object, which persists throughout the simulation, will be the
+        process in charge of running the clients' jobs (i.e. their `fit()`
+        method).
 
     actor_kwargs: Optional[Dict[str, Any]] (default: None)
         If you want to create your own Actor classes, you might need to pass
-        some input argument. You can use this dictionary for such purpose.
+        some input argument. You can use this dictionary for such purpose. The
+        `DefaultActor` accepts `client_cache_size` and `client_cache_memory` to
+        keep clients, and the data they load, across rounds.
 
     actor_scheduling: Optional[Union[str, NodeAffinitySchedulingStrategy]]
         (default: "DEFAULT")
@@ -156,12 +161,36 @@ def start_simulation(
         is an advanced feature. For all details, please refer to the Ray documentation:
         https://docs.ray.io/en/latest/ray-core/scheduling/index.html
 
+    backend: Union[str, VirtualClientEngineBackend] (default: "ray")
+        The backend of the VCE running the clients' jobs. "ray" runs them on a
+        pool of Ray actors, which can span a cluster (see `RayBackend`).
+        "process" runs them on local worker processes, without initializing
+        Ray (see `ProcessBackend`). Other backends can be given as instances
+        of `flwr.simulation.backend.VirtualClientEngineBackend`. `ray_init_args`,
+        `keep_initialised`, `actor_type` and `actor_scheduling` are only used
+        by the "ray" backend. Only the "ray" backend requires Ray to be
+        installed (with the `simulation` extra).
+
+    scheduler: Optional[LongestJobFirstScheduler] (default: None)
+        Optionally dispatch the jobs of the clients to the actors longest first,
+        based on the runtimes of the clients in past rounds, and pack short
+        clients into single actor invocations. The makespan and the actor
+        utilization of each round are then available in `scheduler.rounds`.
+        The server submits all jobs of a round at once, before any is
+        dispatched. Only supported by the "ray" backend, other backends raise a
+        `ValueError`.
+
     Returns
     -------
     hist : flwr.server.history.History
         Object containing metrics from training.
     """  # noqa: E501
     # pylint: disable-msg=too-many-locals
+    if scheduler is not None and backend != "ray":
+        raise ValueError(
+            f'`scheduler` is only supported by the "ray" backend, not {backend}'
+        )
+
     event(
         EventType.START_SIMULATION_ENTER,
         {"num_clients": len(clients_ids) if clients_ids is not None else num_clients},
@@ -196,25 +225,21 @@ def start_simulation(
         else:
             cids = [str(x) for x in range(num_clients)]
 
-    # Default arguments for Ray initialization
-    if not ray_init_args:
-        ray_init_args = {
-            "ignore_reinit_error": True,
-            "include_dashboard": False,
-        }
-
-    # Shut down Ray if it has already been initialized (unless asked not to)
-    if ray.is_initialized() and not keep_initialised:
-        ray.shutdown()
-
-    # Initialize Ray
-    ray.init(**ray_init_args)
-    cluster_resources = ray.cluster_resources()
-    log(
-        INFO,
-        "Flower VCE: Ray initialized with resources: %s",
-        cluster_resources,
-    )
+    vce_backend: VirtualClientEngineBackend
+    if backend == "ray":
+        vce_backend = RayBackend(
+            ray_init_args=ray_init_args,
+            keep_initialised=keep_initialised,
+            actor_type=actor_type,
+            actor_scheduling=actor_scheduling,
+            scheduler=scheduler,
+        )
+    elif backend == "process":
+        vce_backend = ProcessBackend()
+    elif isinstance(backend, VirtualClientEngineBackend):
+        vce_backend = backend
+    else:
+        raise ValueError(f"Unknown VCE backend: {backend}")
 
     log(
         INFO,
@@ -246,60 +271,13 @@ def start_simulation(
     )
 
     actor_args = {} if actor_kwargs is None else actor_kwargs
+    vce_backend.start(client_fn, client_resources, actor_args)
 
-    # An actor factory. This is called N times to add N actors
-    # to the pool. If at some point the pool can accommodate more actors
-    # this will be called again.
-    def create_actor_fn() -> Type[VirtualClientEngineActor]:
-        return actor_type.options(  # type: ignore
-            **client_resources,
-            scheduling_strategy=actor_scheduling,
-        ).remote(**actor_args)
-
-    # Instantiate ActorPool
-    pool = VirtualClientEngineActorPool(
-        create_actor_fn=create_actor_fn,
-        client_resources=client_resources,
-    )
-
-    f_stop = threading.Event()
-
-    # Periodically, check if the cluster has grown (i.e. a new
-    # node has been added). If this happens, we likely want to grow
-    # the actor pool by adding more Actors to it.
-    def update_resources(f_stop: threading.Event) -> None:
-        """Periodically check if more actors can be added to the pool.
-
-        If so, extend the pool.
-        """
-        if not f_stop.is_set():
-            num_max_actors = pool_size_from_resources(client_resources)
-            if num_max_actors > pool.num_actors:
-                num_new = num_max_actors - pool.num_actors
-                log(
-                    INFO, "The cluster expanded. Adding %s actors to the pool.", num_new
-                )
-                pool.add_actors_to_pool(num_actors=num_new)
-
-            threading.Timer(10, update_resources, [f_stop]).start()
-
-    update_resources(f_stop)
-
-    log(
-        INFO,
-        "Flower VCE: Creating %s with %s actors",
-        pool.__class__.__name__,
-        pool.num_actors,
-    )
-
-    # Register one RayClientProxy object for each client with the ClientManager
+    # Register one ClientProxy object for each client
     for cid in cids:
-        client_proxy = RayActorClientProxy(
-            client_fn=client_fn,
-            cid=cid,
-            actor_pool=pool,
+        initialized_server.client_manager().register(
+            client=vce_backend.client_proxy(cid)
         )
-        initialized_server.client_manager().register(client=client_proxy)
 
     hist = History()
     # pylint: disable=broad-except
@@ -344,8 +322,8 @@ def start_simulation(
         raise RuntimeError("Simulation crashed.") from ex
 
     finally:
-        # Stop time monitoring resources in cluster
-        f_stop.set()
+        # Stop time monitoring resources in cluster, or the worker processes
+        vce_backend.shutdown()
         event(EventType.START_SIMULATION_LEAVE)
 
     return hist
@@ -0,0 +1,254 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Backends of the Virtual Client Engine."""
+
+
+import importlib.util
+import os
+import threading
+from abc import ABC, abstractmethod
+from logging import INFO
+from typing import TYPE_CHECKING, Any, Dict, Optional, Type, Union
+
+from flwr.client import ClientFn
+from flwr.common.logger import log
+from flwr.server.client_proxy import ClientProxy
+from flwr.simulation.process_transport.process_client_proxy import ProcessClientProxy
+from flwr.simulation.process_transport.process_pool import ProcessClientPool
+from flwr.simulation.ray_transport.scheduler import LongestJobFirstScheduler
+
+if TYPE_CHECKING:
+    from ray.util.scheduling_strategies import NodeAffinitySchedulingStrategy
+
+    from flwr.simulation.ray_transport.ray_actor import (
+        VirtualClientEngineActor,
+        VirtualClientEngineActorPool,
+    )
+
+RAY_IMPORT_ERROR: str = """Unable to import module `ray`.
+
+To install the necessary dependencies, install `flwr` with the `simulation` extra:
+
+    pip install -U flwr["simulation"]
+
+or run the simulation with `backend="process"`, which does not need Ray.
+"""
+
+
+class VirtualClientEngineBackend(ABC):
+    """Abstract base class for the backends running the jobs of virtual clients.
+
+    `start_simulation` starts the backend, registers the `ClientProxy` it
+    returns for each client, and shuts the backend down once the simulation
+    ends.
+    """
+
+    @abstractmethod
+    def start(
+        self,
+        client_fn: ClientFn,
+        client_resources: Dict[str, float],
+        actor_kwargs: Dict[str, Any],
+    ) -> None:
+        """Start running the clients created by `client_fn`."""
+
+    @abstractmethod
+    def client_proxy(self, cid: str) -> ClientProxy:
+        """Return a ClientProxy running the jobs of client `cid`."""
+
+    def shutdown(self) -> None:
+        """Release the resources of the backend."""
+
+
+class RayBackend(VirtualClientEngineBackend):
+    """Run the clients on a pool of Ray actors, which can span a cluster.
+
+    The pool grows when nodes join the cluster. See `start_simulation` for the
+    parameters, `actor_type` defaults to `DefaultActor`. Ray is only imported
+    by this backend, which raises an `ImportError` if it is not installed.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        ray_init_args: Optional[Dict[str, Any]] = None,
+        keep_initialised: Optional[bool] = False,
+        actor_type: Optional[Type["VirtualClientEngineActor"]] = None,
+        actor_scheduling: Union[str, "NodeAffinitySchedulingStrategy"] = "DEFAULT",
+        scheduler: Optional[LongestJobFirstScheduler] = None,
+    ) -> None:
+        if importlib.util.find_spec("ray") is None:
+            raise ImportError(RAY_IMPORT_ERROR)
+        self.ray_init_args = ray_init_args
+        self.keep_initialised = keep_initialised
+        self.actor_type = actor_type
+        self.actor_scheduling = actor_scheduling
+        self.scheduler = scheduler
+        self.client_fn: Optional[ClientFn] = None
+        self.pool: Optional["VirtualClientEngineActorPool"] = None
+        self._f_stop = threading.Event()
+
+    def start(
+        self,
+        client_fn: ClientFn,
+        client_resources: Dict[str, float],
+        actor_kwargs: Dict[str, Any],
+    ) -> None:
+        """Initialize Ray and create the actor pool."""
+        # pylint: disable=import-outside-toplevel
+        import ray
+
+        from flwr.simulation.ray_transport.ray_actor import (
+            DefaultActor,
+            VirtualClientEngineActor,
+            VirtualClientEngineActorPool,
+            pool_size_from_resources,
+        )
+
+        actor_type = DefaultActor if self.actor_type is None else self.actor_type
+
+        # Default arguments for Ray initialization
+        ray_init_args = self.ray_init_args
+        if not ray_init_args:
+            ray_init_args = {
+                "ignore_reinit_error": True,
+                "include_dashboard": False,
+            }
+
+        # Shut down Ray if it has already been initialized (unless asked not to)
+        if ray.is_initialized() and not self.keep_initialised:
+            ray.shutdown()
+
+        # Initialize Ray
+        ray.init(**ray_init_args)
+        cluster_resources = ray.cluster_resources()
+        log(
+            INFO,
+            "Flower VCE: Ray initialized with resources: %s",
+            cluster_resources,
+        )
+
+        # An actor factory. This is called N times to add N actors
+        # to the pool. If at some point the pool can accommodate more actors
+        # this will be called again.
+        def create_actor_fn() -> Type[VirtualClientEngineActor]:
+            return actor_type.options(  # type: ignore
+                **client_resources,
+                scheduling_strategy=self.actor_scheduling,
+            ).remote(**actor_kwargs)
+
+        # Instantiate ActorPool
+        pool = VirtualClientEngineActorPool(
+            create_actor_fn=create_actor_fn,
+            client_resources=client_resources,
+            scheduler=self.scheduler,
+        )
+        self.client_fn = client_fn
+        self.pool = pool
+
+        # Periodically, check if the cluster has grown (i.e. a new
+        # node has been added). If this happens, we likely want to grow
+        # the actor pool by adding more Actors to it.
+        def update_resources(f_stop: threading.Event) -> None:
+            """Periodically check if more actors can be added to the pool.
+
+            If so, extend the pool.
+            """
+            if not f_stop.is_set():
+                num_max_actors = pool_size_from_resources(client_resources)
+                if num_max_actors > pool.num_actors:
+                    num_new = num_max_actors - pool.num_actors
+                    log(
+                        INFO,
+                        "The cluster expanded. Adding %s actors to the pool.",
+                        num_new,
+                    )
+                    pool.add_actors_to_pool(num_actors=num_new)
+
+                threading.Timer(10, update_resources, [f_stop]).start()
+
+        update_resources(self._f_stop)
+
+        log(
+            INFO,
+            "Flower VCE: Creating %s with %s actors",
+            pool.__class__.__name__,
+            pool.num_actors,
+        )
+
+    def client_proxy(self, cid: str) -> ClientProxy:
+        """Return a RayActorClientProxy submitting the jobs to the actor pool."""
+        # pylint: disable=import-outside-toplevel
+        from flwr.simulation.ray_transport.ray_client_proxy import RayActorClientProxy
+
+        if self.client_fn is None or self.pool is None:
+            raise RuntimeError("The backend is not started")
+        return RayActorClientProxy(
+            client_fn=self.client_fn,
+            cid=cid,
+            actor_pool=self.pool,
+        )
+
+    def shutdown(self) -> None:
+        """Stop monitoring the resources of the cluster."""
+        self._f_stop.set()
+
+
+class ProcessBackend(VirtualClientEngineBackend):
+    """Run the clients on a `ProcessClientPool` of local worker processes.
+
+    It doesn't initialize Ray, which starts faster and has less overhead per
+    job on a single machine. `actor_kwargs` are passed to the pool.
+
+    Parameters
+    ----------
+    max_workers : Optional[int] (default: None)
+        Number of worker processes, by default the number of CPUs divided by
+        `client_resources["num_cpus"]`. GPUs are not accounted for.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers
+        self.pool: Optional[ProcessClientPool] = None
+
+    def start(
+        self,
+        client_fn: ClientFn,
+        client_resources: Dict[str, float],
+        actor_kwargs: Dict[str, Any],
+    ) -> None:
+        """Start the worker processes."""
+        max_workers = self.max_workers or max(
+            1, int((os.cpu_count() or 1) // client_resources["num_cpus"])
+        )
+        self.pool = ProcessClientPool(
+            client_fn, max_workers=max_workers, **actor_kwargs
+        )
+        log(
+            INFO,
+            "Flower VCE: Creating %s with %s workers",
+            self.pool.__class__.__name__,
+            self.pool.num_workers,
+        )
+
+    def client_proxy(self, cid: str) -> ClientProxy:
+        """Return a ProcessClientProxy submitting the jobs to the workers."""
+        if self.pool is None:
+            raise RuntimeError("The backend is not started")
+        return ProcessClientProxy(cid=cid, pool=self.pool)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self.pool is not None:
+            self.pool.shutdown()
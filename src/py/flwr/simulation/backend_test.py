@@ -0,0 +1,101 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the backends of the Virtual Client Engine."""
+
+
+import importlib.util
+import subprocess
+import sys
+
+import pytest
+
+from flwr.common import GetPropertiesIns
+from flwr.simulation.app import start_simulation
+from flwr.simulation.backend import ProcessBackend, RayBackend
+from flwr.simulation.process_transport.process_client_proxy import ProcessClientProxy
+from flwr.simulation.process_transport.process_client_proxy_test import get_dummy_client
+from flwr.simulation.ray_transport.scheduler import LongestJobFirstScheduler
+
+
+def test_process_backend_creates_client_proxies() -> None:
+    """Test that the process backend runs the clients of its proxies."""
+    # Prepare
+    backend = ProcessBackend(max_workers=1)
+
+    # Execute
+    backend.start(get_dummy_client, {"num_cpus": 1}, {"client_cache_size": 1})
+    try:
+        proxy = backend.client_proxy("0")
+        res = proxy.get_properties(GetPropertiesIns({}), timeout=None)
+    finally:
+        backend.shutdown()
+
+    # Assert
+    assert isinstance(proxy, ProcessClientProxy)
+    assert res.properties["num_runs"] == 1
+
+
+def test_client_proxy_requires_started_backend() -> None:
+    """Test that proxies can't be created before the backend is started."""
+    with pytest.raises(RuntimeError):
+        ProcessBackend().client_proxy("0")
+
+
+def test_scheduler_requires_ray_backend() -> None:
+    """Test that the scheduler is rejected by backends other than Ray."""
+    with pytest.raises(ValueError):
+        start_simulation(
+            client_fn=get_dummy_client,
+            num_clients=2,
+            backend="process",
+            scheduler=LongestJobFirstScheduler(),
+        )
+
+
+def test_process_backend_without_ray() -> None:
+    """Test that the process backend is available if Ray is not installed."""
+    # Prepare
+    code = "\n".join(
+        [
+            "import sys",
+            "sys.modules['ray'] = None",
+            "from flwr.simulation import start_simulation",
+            "from flwr.simulation.backend import ProcessBackend",
+            "from flwr.simulation.process_transport.process_client_proxy_test "
+            "import get_dummy_client",
+            "backend = ProcessBackend(max_workers=1)",
+            "backend.start(get_dummy_client, {'num_cpus': 1}, {})",
+            "backend.client_proxy('0')",
+            "backend.shutdown()",
+        ]
+    )
+
+    # Execute
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=False
+    )
+
+    # Assert
+    assert completed.returncode == 0, completed.stderr
+
+
+def test_ray_backend_requires_ray(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the Ray backend explains how to install Ray."""
+    # Prepare
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+
+    # Execute & Assert
+    with pytest.raises(ImportError, match="simulation"):
+        RayBackend()
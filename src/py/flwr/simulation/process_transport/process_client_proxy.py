@@ -0,0 +1,190 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Process-based Flower ClientProxy implementation."""
+
+
+import concurrent.futures
+import traceback
+from concurrent.futures import Future
+from dataclasses import replace
+from logging import ERROR
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union, cast
+
+from flwr import common
+from flwr.client.node_state import NodeState
+from flwr.client.run_state import RunState
+from flwr.common.logger import log
+from flwr.server.client_proxy import BatchClientProxy, ClientProxy
+from flwr.simulation.process_transport.process_pool import (
+    ClientRes,
+    ProcessClientPool,
+    SharedParameters,
+)
+
+
+class ProcessClientProxy(BatchClientProxy):
+    """Flower client proxy which delegates work to local worker processes.
+
+    The server runs the rounds of these proxies from a single thread: all jobs
+    are submitted to the pool at once, and their results collected as they
+    complete.
+    """
+
+    def __init__(self, cid: str, pool: ProcessClientPool):
+        super().__init__(cid)
+        self.pool = pool
+        self.proxy_state = NodeState()
+
+    def _submit(
+        self,
+        method: str,
+        ins: Any,
+        shared: Optional[SharedParameters] = None,
+    ) -> "Future[Tuple[ClientRes, RunState]]":
+        # As with the Ray backend, the VCE doesn't handle multiple runs
+        run_id = 0
+
+        # Register state
+        self.proxy_state.register_runstate(run_id=run_id)
+
+        # Retrieve state
+        state = self.proxy_state.retrieve_runstate(run_id=run_id)
+
+        return self.pool.submit(method, self.cid, state, ins, shared)
+
+    def _result(
+        self, future: "Future[Tuple[ClientRes, RunState]]", timeout: Optional[float]
+    ) -> ClientRes:
+        try:
+            res, updated_state = future.result(timeout)
+
+            # Update state
+            self.proxy_state.update_runstate(run_id=0, run_state=updated_state)
+
+        except Exception as ex:
+            # Don't run the job if it's still waiting for a worker
+            future.cancel()
+            log(ERROR, traceback.format_exc())
+            log(ERROR, ex)
+            raise ex
+
+        return res
+
+    def _submit_job(
+        self,
+        method: str,
+        ins: Any,
+        timeout: Optional[float],
+        shared: Optional[SharedParameters] = None,
+    ) -> ClientRes:
+        return self._result(self._submit(method, ins, shared), timeout)
+
+    def get_properties(
+        self, ins: common.GetPropertiesIns, timeout: Optional[float]
+    ) -> common.GetPropertiesRes:
+        """Return client's properties."""
+        res = self._submit_job("get_properties", ins, timeout)
+        return cast(common.GetPropertiesRes, res)
+
+    def get_parameters(
+        self, ins: common.GetParametersIns, timeout: Optional[float]
+    ) -> common.GetParametersRes:
+        """Return the current local model parameters."""
+        res = self._submit_job("get_parameters", ins, timeout)
+        return cast(common.GetParametersRes, res)
+
+    def fit(self, ins: common.FitIns, timeout: Optional[float]) -> common.FitRes:
+        """Train model parameters on the locally held dataset."""
+        shared = self.pool.put_parameters(ins.parameters)
+        res = self._submit_job("fit", _without_tensors(ins), timeout, shared)
+        return cast(common.FitRes, res)
+
+    def evaluate(
+        self, ins: common.EvaluateIns, timeout: Optional[float]
+    ) -> common.EvaluateRes:
+        """Evaluate model parameters on the locally held dataset."""
+        shared = self.pool.put_parameters(ins.parameters)
+        res = self._submit_job("evaluate", _without_tensors(ins), timeout, shared)
+        return cast(common.EvaluateRes, res)
+
+    @classmethod
+    def fit_batch(
+        cls,
+        client_instructions: List[Tuple[ClientProxy, common.FitIns]],
+        timeout: Optional[float],
+    ) -> Iterator[Tuple[ClientProxy, Union[common.FitRes, BaseException]]]:
+        """Refine parameters on all clients, yielding results as they come."""
+        futures = _submit_batch("fit", client_instructions)
+        for proxy, res in _as_completed(futures, timeout):
+            yield proxy, cast(Union[common.FitRes, BaseException], res)
+
+    @classmethod
+    def evaluate_batch(
+        cls,
+        client_instructions: List[Tuple[ClientProxy, common.EvaluateIns]],
+        timeout: Optional[float],
+    ) -> Iterator[Tuple[ClientProxy, Union[common.EvaluateRes, BaseException]]]:
+        """Evaluate parameters on all clients, yielding results as they come."""
+        futures = _submit_batch("evaluate", client_instructions)
+        for proxy, res in _as_completed(futures, timeout):
+            yield proxy, cast(Union[common.EvaluateRes, BaseException], res)
+
+    def reconnect(
+        self, ins: common.ReconnectIns, timeout: Optional[float]
+    ) -> common.DisconnectRes:
+        """Disconnect and (optionally) reconnect later."""
+        return common.DisconnectRes(reason="")  # Nothing to do here (yet)
+
+
+def _without_tensors(ins: Any) -> Any:
+    """Return a copy of `ins` without tensors, which are shared separately."""
+    parameters = common.Parameters(tensors=[], tensor_type=ins.parameters.tensor_type)
+    return replace(ins, parameters=parameters)
+
+
+def _submit_batch(
+    method: str, client_instructions: List[Tuple[ClientProxy, Any]]
+) -> Dict["Future[Tuple[ClientRes, RunState]]", ProcessClientProxy]:
+    """Submit the jobs of all clients, writing their parameters once."""
+    # pylint: disable=protected-access
+    futures: Dict["Future[Tuple[ClientRes, RunState]]", ProcessClientProxy] = {}
+    for proxy, ins in client_instructions:
+        if not isinstance(proxy, ProcessClientProxy):
+            raise TypeError(f"Expected a ProcessClientProxy, got {type(proxy)}")
+        shared = proxy.pool.put_parameters(ins.parameters)
+        futures[proxy._submit(method, _without_tensors(ins), shared)] = proxy
+    return futures
+
+
+def _as_completed(
+    futures: Dict["Future[Tuple[ClientRes, RunState]]", ProcessClientProxy],
+    timeout: Optional[float],
+) -> Iterator[Tuple[ProcessClientProxy, Union[ClientRes, BaseException]]]:
+    """Yield the results of the jobs as they complete."""
+    # pylint: disable=protected-access
+    pending = dict(futures)
+    try:
+        for future in concurrent.futures.as_completed(futures, timeout):
+            proxy = pending.pop(future)
+            try:
+                yield proxy, proxy._result(future, None)
+            except Exception as ex:  # pylint: disable=broad-except
+                yield proxy, ex
+    except concurrent.futures.TimeoutError as ex:
+        # Fail the clients without result
+        log(ERROR, ex)
+        for future, proxy in pending.items():
+            future.cancel()
+            yield proxy, ex
@@ -0,0 +1,217 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the process-based VCE backend."""
+
+
+import os
+from typing import Dict, List, Tuple
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from flwr.client import Client, NumPyClient
+from flwr.common import (
+    Config,
+    EvaluateIns,
+    FitIns,
+    GetPropertiesIns,
+    NDArrays,
+    Scalar,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.common.parameter import TENSOR_TYPE_NUMPY_RAW
+from flwr.server.server import evaluate_clients, fit_clients
+from flwr.simulation.process_transport.process_client_proxy import ProcessClientProxy
+from flwr.simulation.process_transport.process_pool import ProcessClientPool
+
+
+class DummyClient(NumPyClient):
+    """A dummy NumPyClient for tests."""
+
+    def __init__(self, cid: str) -> None:
+        self.cid = int(cid)
+        self.num_runs = 0
+
+    def get_properties(self, config: Config) -> Dict[str, Scalar]:
+        """Return the number of runs of this instance and the worker pid."""
+        self.num_runs += 1
+        if "fail" in config:
+            raise ValueError("Failing on purpose")
+        return {"num_runs": self.num_runs, "pid": os.getpid()}
+
+    def fit(
+        self, parameters: NDArrays, config: Config
+    ) -> Tuple[NDArrays, int, Dict[str, Scalar]]:
+        """Return the parameters plus the cid, and count the runs in the state."""
+        runs = int(self.state.state.get("runs", "0")) + 1
+        self.state.state["runs"] = str(runs)
+        return [parameters[0] + self.cid], 1, {"runs": runs}
+
+    def evaluate(
+        self, parameters: NDArrays, config: Config
+    ) -> Tuple[float, int, Dict[str, Scalar]]:
+        """Return the sum of the parameters as loss."""
+        return float(parameters[0].sum()), 1, {}
+
+
+def get_dummy_client(cid: str) -> Client:
+    """Return a DummyClient converted to Client type."""
+    return DummyClient(cid).to_client()
+
+
+def prep(
+    num_clients: int = 8, client_cache_size: int = 0
+) -> Tuple[List[ProcessClientProxy], ProcessClientPool]:
+    """Prepare ClientProxies and pool for tests."""
+    pool = ProcessClientPool(
+        get_dummy_client, max_workers=2, client_cache_size=client_cache_size
+    )
+    proxies = [
+        ProcessClientProxy(cid=str(cid), pool=pool) for cid in range(num_clients)
+    ]
+    return proxies, pool
+
+
+def test_fit_and_evaluate() -> None:
+    """Test that clients get the shared parameters and keep their state."""
+    # Prepare
+    proxies, pool = prep()
+    parameters = ndarrays_to_parameters(
+        [np.arange(4, dtype=np.float32)], tensor_type=TENSOR_TYPE_NUMPY_RAW
+    )
+
+    try:
+        # Execute
+        fit_results = [
+            prox.fit(FitIns(parameters, {}), timeout=None) for prox in proxies
+        ]
+        refit_res = proxies[0].fit(FitIns(parameters, {}), timeout=None)
+        evaluate_res = proxies[1].evaluate(EvaluateIns(parameters, {}), timeout=None)
+        shared = pool.put_parameters(parameters)
+
+        # Assert
+        for prox, fit_res in zip(proxies, fit_results):
+            [ndarray] = parameters_to_ndarrays(fit_res.parameters)
+            assert (ndarray == np.arange(4) + int(prox.cid)).all()
+            assert fit_res.metrics["runs"] == 1
+        assert refit_res.metrics["runs"] == 2
+        assert evaluate_res.loss == 6.0
+        assert pool.put_parameters(parameters) is shared
+    finally:
+        pool.shutdown()
+    assert not os.path.exists(shared.path)
+
+
+def test_parameters_are_kept_for_jobs_in_flight() -> None:
+    """Test that parameters put again while referenced by jobs are reused."""
+    # Prepare
+    pool = ProcessClientPool(get_dummy_client, max_workers=1)
+    parameters_a, parameters_b, parameters_c = [
+        ndarrays_to_parameters(
+            [np.full(4, value, dtype=np.float32)], tensor_type=TENSOR_TYPE_NUMPY_RAW
+        )
+        for value in range(3)
+    ]
+
+    try:
+        # Execute
+        shared_a = pool.put_parameters(parameters_a)
+        shared_b = pool.put_parameters(parameters_b)
+        pool.release_parameters(shared_b)
+        shared_c = pool.put_parameters(parameters_c)
+        pool.release_parameters(shared_c)
+        shared_a_again = pool.put_parameters(parameters_a)
+        a_kept = os.path.exists(shared_a.path)
+        b_deleted = not os.path.exists(shared_b.path)
+        pool.release_parameters(shared_a)
+        pool.release_parameters(shared_a_again)
+        a_kept_as_latest = os.path.exists(shared_a.path)
+        c_deleted = not os.path.exists(shared_c.path)
+    finally:
+        pool.shutdown()
+
+    # Assert
+    assert shared_a_again is shared_a
+    assert a_kept and b_deleted and a_kept_as_latest and c_deleted
+
+
+def test_client_cache_keeps_clients_in_workers() -> None:
+    """Test that workers run cached clients again."""
+    # Prepare
+    proxies, pool = prep(num_clients=1, client_cache_size=4)
+
+    try:
+        # Execute
+        results = [
+            proxies[0].get_properties(GetPropertiesIns({}), timeout=None)
+            for _ in range(6)
+        ]
+    finally:
+        pool.shutdown()
+
+    # Assert
+    num_runs: Dict[Scalar, int] = {}
+    for res in results:
+        num_runs[res.properties["pid"]] = int(res.properties["num_runs"])
+    assert sum(num_runs.values()) == 6
+
+
+def test_client_exception_is_raised() -> None:
+    """Test that exceptions raised by clients reach the proxy."""
+    # Prepare
+    proxies, pool = prep(num_clients=1)
+
+    try:
+        # Execute and assert
+        with pytest.raises(ValueError):
+            proxies[0].get_properties(GetPropertiesIns({"fail": True}), timeout=None)
+        res = proxies[0].get_properties(GetPropertiesIns({}), timeout=None)
+        assert res.properties["num_runs"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_server_runs_rounds_in_batches() -> None:
+    """Test that the server submits the jobs of a round to the pool at once."""
+    # Prepare
+    proxies, pool = prep()
+    parameters = ndarrays_to_parameters(
+        [np.arange(4, dtype=np.float32)], tensor_type=TENSOR_TYPE_NUMPY_RAW
+    )
+
+    try:
+        # Execute
+        with patch("flwr.server.server.fit_client", side_effect=AssertionError):
+            fit_results, fit_failures = fit_clients(
+                [(prox, FitIns(parameters, {})) for prox in proxies],
+                max_workers=None,
+                timeout=None,
+            )
+        evaluate_results, evaluate_failures = evaluate_clients(
+            [(prox, EvaluateIns(parameters, {})) for prox in proxies],
+            max_workers=None,
+            timeout=None,
+        )
+    finally:
+        pool.shutdown()
+
+    # Assert
+    assert not fit_failures and not evaluate_failures
+    assert len(fit_results) == len(evaluate_results) == len(proxies)
+    for prox, fit_res in fit_results:
+        [ndarray] = parameters_to_ndarrays(fit_res.parameters)
+        assert (ndarray == np.arange(4) + int(prox.cid)).all()
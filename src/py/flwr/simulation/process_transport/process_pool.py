@@ -0,0 +1,279 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A pool of local worker processes running the jobs of virtual clients."""
+
+
+import mmap
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from flwr import common
+from flwr.client import Client, ClientFn
+from flwr.client.client import (
+    maybe_call_evaluate,
+    maybe_call_fit,
+    maybe_call_get_parameters,
+    maybe_call_get_properties,
+)
+from flwr.client.run_state import RunState
+from flwr.simulation.ray_transport.utils import (
+    ClientCache,
+    check_clientfn_returns_client,
+)
+
+# All possible returns by a client
+ClientRes = Union[
+    common.GetPropertiesRes, common.GetParametersRes, common.FitRes, common.EvaluateRes
+]
+
+# The client methods jobs can call, by name
+_METHODS: Dict[str, Callable[[Client, Any], ClientRes]] = {
+    "get_properties": maybe_call_get_properties,
+    "get_parameters": maybe_call_get_parameters,
+    "fit": maybe_call_fit,
+    "evaluate": maybe_call_evaluate,
+}
+
+
+class SharedParameters(NamedTuple):
+    """Parameters written once to a file shared by all workers."""
+
+    path: str
+    tensor_type: str
+    sizes: List[int]
+
+
+@dataclass
+class _SharedFile:
+    """Parameters written to a file, deleted once no longer referenced."""
+
+    parameters: common.Parameters
+    shared: SharedParameters
+    references: int = 0
+
+
+# State of each worker process, set by `_init_worker`
+_client_fn: Optional[ClientFn] = None
+_client_cache: Optional[ClientCache] = None
+_parameters: Optional[Tuple[str, common.Parameters]] = None
+
+
+def _init_worker(
+    client_fn: ClientFn,
+    on_actor_init_fn: Optional[Callable[[], None]],
+    client_cache_size: int,
+    client_cache_memory: Optional[int],
+) -> None:
+    global _client_fn, _client_cache  # pylint: disable=global-statement
+    _client_fn = client_fn
+    if client_cache_size > 0:
+        _client_cache = ClientCache(client_cache_size, client_cache_memory)
+    if on_actor_init_fn:
+        on_actor_init_fn()
+
+
+def _load_parameters(shared: SharedParameters) -> common.Parameters:
+    """Read shared parameters, unless already read by this worker."""
+    global _parameters  # pylint: disable=global-statement
+    if _parameters is None or _parameters[0] != shared.path:
+        tensors: List[bytes] = []
+        if sum(shared.sizes) > 0:  # Empty files can't be mapped
+            with open(shared.path, "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    offset = 0
+                    for size in shared.sizes:
+                        tensors.append(mapped[offset : offset + size])
+                        offset += size
+        else:
+            tensors = [b"" for _ in shared.sizes]
+        _parameters = (
+            shared.path,
+            common.Parameters(tensors=tensors, tensor_type=shared.tensor_type),
+        )
+    return _parameters[1]
+
+
+def _run_job(
+    method: str,
+    cid: str,
+    state: RunState,
+    ins: Any,
+    shared: Optional[SharedParameters],
+) -> Tuple[ClientRes, RunState]:
+    """Run a client job in a worker process."""
+    if shared is not None:
+        ins = replace(ins, parameters=_load_parameters(shared))
+    try:
+        if _client_cache is None:
+            client = check_clientfn_returns_client(_client_fn(cid))  # type: ignore
+        else:
+            client = _client_cache.get(_client_fn, cid)  # type: ignore
+        client.set_state(state)
+        res = _METHODS[method](client, ins)
+        return res, client.get_state()
+    except Exception:
+        if _client_cache is not None:
+            # Don't reuse a client left in an unknown state
+            _client_cache.discard(cid)
+        raise
+
+
+class ProcessClientPool:
+    """Run the jobs of virtual clients on a pool of local worker processes.
+
+    A lightweight alternative to the Ray actor pool for simulations running on
+    a single machine. The parameters sent to the clients in a round are written
+    once to a file, in shared memory (`/dev/shm`) if available, which each
+    worker reads once. Where supported, the workers are forked, so `client_fn`
+    doesn't need to be picklable, but the jobs, i.e., instructions, run states,
+    and results, are pickled.
+
+    Parameters
+    ----------
+    client_fn : ClientFn
+        A function creating client instances.
+    max_workers : Optional[int] (default: None)
+        Number of worker processes, by default the number of CPUs.
+    on_actor_init_fn: Optional[Callable[[], None]] (default: None)
+        A function to execute upon worker initialization.
+    client_cache_size: int (default: 0)
+        Number of clients each worker keeps after running them (see
+        `DefaultActor`). Disabled by default.
+    client_cache_memory: Optional[int] (default: None)
+        Resident memory of a worker, in bytes, above which its cache stops
+        growing (see `ClientCache`).
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client_fn: ClientFn,
+        max_workers: Optional[int] = None,
+        on_actor_init_fn: Optional[Callable[[], None]] = None,
+        client_cache_size: int = 0,
+        client_cache_memory: Optional[int] = None,
+    ) -> None:
+        self.num_workers = max_workers or os.cpu_count() or 1
+        mp_context = None
+        if "fork" in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context("fork")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(
+                client_fn,
+                on_actor_init_fn,
+                client_cache_size,
+                client_cache_memory,
+            ),
+        )
+        # Start the workers now, before the server starts its threads
+        self._executor.submit(int).result()
+
+        shm = "/dev/shm"
+        self._directory = tempfile.mkdtemp(
+            prefix="flwr-vce-", dir=shm if os.path.isdir(shm) else None
+        )
+        self._lock = threading.Lock()
+        self._num_parameters = 0
+        # The files of the parameters still referenced by the jobs, and by the
+        # pool for the parameters last written
+        self._files: List[_SharedFile] = []
+        self._latest: Optional[_SharedFile] = None
+
+    def put_parameters(self, parameters: common.Parameters) -> SharedParameters:
+        """Write parameters once for all clients of a round.
+
+        Strategies send the same `Parameters` object to all the clients they
+        sample, so it is only written again when another object is given. The
+        file is kept until the jobs given the returned `SharedParameters` are
+        done and other parameters were written since.
+        """
+        with self._lock:
+            file = next(
+                (file for file in self._files if file.parameters is parameters),
+                None,
+            )
+            if file is None:
+                file = _SharedFile(parameters, self._write(parameters))
+                self._files.append(file)
+            if file is not self._latest:
+                file.references += 1
+                if self._latest is not None:
+                    self._release(self._latest)
+                self._latest = file
+            file.references += 1
+            return file.shared
+
+    def release_parameters(self, shared: SharedParameters) -> None:
+        """Drop a reference taken by `put_parameters`."""
+        with self._lock:
+            for file in self._files:
+                if file.shared is shared:
+                    self._release(file)
+                    return
+
+    def _write(self, parameters: common.Parameters) -> SharedParameters:
+        path = os.path.join(self._directory, str(self._num_parameters))
+        with open(path, "wb") as file:
+            for tensor in parameters.tensors:
+                file.write(tensor)
+        self._num_parameters += 1
+        return SharedParameters(
+            path=path,
+            tensor_type=parameters.tensor_type,
+            sizes=[len(tensor) for tensor in parameters.tensors],
+        )
+
+    def _release(self, file: _SharedFile) -> None:
+        file.references -= 1
+        if file.references == 0:
+            self._files.remove(file)
+            os.unlink(file.shared.path)
+
+    def submit(
+        self,
+        method: str,
+        cid: str,
+        state: RunState,
+        ins: Any,
+        shared: Optional[SharedParameters] = None,
+    ) -> "Future[Tuple[ClientRes, RunState]]":
+        """Run the client method `method` on a worker.
+
+        If `shared` is given, it replaces the parameters of `ins`, and the
+        reference to it taken by `put_parameters` is dropped once the job is
+        done.
+        """
+        future = self._executor.submit(_run_job, method, cid, state, ins, shared)
+        if shared is not None:
+            reference = shared
+            future.add_done_callback(lambda _: self.release_parameters(reference))
+        return future
+
+    def shutdown(self) -> None:
+        """Stop the workers and delete the shared parameters."""
+        if sys.version_info >= (3, 9):
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            self._executor.shutdown(wait=True)
+        shutil.rmtree(self._directory, ignore_errors=True)
@@ -16,10 +16,23 @@
 
 
 import threading
+import time
 import traceback
 from abc import ABC
 from logging import ERROR, WARNING
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import ray
 from ray import ObjectRef
@@ -29,7 +42,11 @@ from flwr import common
 from flwr.client import Client, ClientFn
 from flwr.client.run_state import RunState
 from flwr.common.logger import log
-from flwr.simulation.ray_transport.utils import check_clientfn_returns_client
+from flwr.simulation.ray_transport.scheduler import LongestJobFirstScheduler
+from flwr.simulation.ray_transport.utils import (
+    ClientCache,
+    check_clientfn_returns_client,
+)
 
 # All possible returns by a client
 ClientRes = Union[
@@ -38,6 +55,29 @@ ClientRes = Union[
 # A function to be executed by a client to obtain some results
 JobFn = Callable[[Client], ClientRes]
 
+# Parameters broadcast to the clients, resolved once per actor process. Only the
+# last ones are kept, which releases those of previous rounds.
+_parameters_cache: Dict[ObjectRef, common.Parameters] = {}
+_parameters_lock = threading.Lock()
+
+
+def resolve_parameters(
+    parameters_ref: "ObjectRef[common.Parameters]",
+) -> common.Parameters:
+    """Fetch broadcast parameters from the object store, unless already cached.
+
+    All clients run by an actor in a round share the returned object, which
+    must not be modified. With the `numpy.ndarray.raw` tensor type, the arrays
+    decoded by the clients are read-only views on this single copy.
+    """
+    with _parameters_lock:
+        parameters = _parameters_cache.get(parameters_ref)
+        if parameters is None:
+            parameters = ray.get(parameters_ref)
+            _parameters_cache.clear()
+            _parameters_cache[parameters_ref] = parameters
+        return parameters
+
 
 class ClientException(Exception):
     """Raised when client side logic crashes with an exception."""
@@ -51,6 +91,9 @@ class ClientException(Exception):
 class VirtualClientEngineActor(ABC):
     """Abstract base class for VirtualClientEngine Actors."""
 
+    # Clients kept across runs, disabled unless set by the actor
+    client_cache: Optional[ClientCache] = None
+
     def terminate(self) -> None:
         """Manually terminate Actor object."""
         log(WARNING, "Manually terminating %s}", self.__class__.__name__)
@@ -69,7 +112,10 @@ class VirtualClientEngineActor(ABC):
         # from the pool are correctly assigned to each ClientProxy
         try:
             # Instantiate client (check 'Client' type is returned)
-            client = check_clientfn_returns_client(client_fn(cid))
+            if self.client_cache is None:
+                client = check_clientfn_returns_client(client_fn(cid))
+            else:
+                client = self.client_cache.get(client_fn, cid)
             # Inject state
             client.set_state(state)
             # Run client job
@@ -77,6 +123,9 @@ class VirtualClientEngineActor(ABC):
             # Retrieve state (potentially updated)
             updated_state = client.get_state()
         except Exception as ex:
+            if self.client_cache is not None:
+                # Don't reuse a client left in an unknown state
+                self.client_cache.discard(cid)
             client_trace = traceback.format_exc()
             message = (
                 "\n\tSomething went wrong when running your client run."
@@ -91,6 +140,22 @@ class VirtualClientEngineActor(ABC):
 
         return cid, job_results, updated_state
 
+    def run_packed(
+        self, jobs: List[Tuple[ClientFn, JobFn, str, RunState]]
+    ) -> Tuple[Union[Tuple[str, ClientRes, RunState], ClientException], ...]:
+        """Run the jobs of several clients, one after the other.
+
+        Returns one result per job. A failed job returns its `ClientException`
+        instead of raising it, so that the results of the other jobs are kept.
+        """
+        results: List[Union[Tuple[str, ClientRes, RunState], ClientException]] = []
+        for client_fn, job_fn, cid, state in jobs:
+            try:
+                results.append(self.run(client_fn, job_fn, cid, state))
+            except ClientException as ex:
+                results.append(ex)
+        return tuple(results)
+
 
 @ray.remote
 class DefaultActor(VirtualClientEngineActor):
@@ -100,12 +165,27 @@ class DefaultActor(VirtualClientEngineActor):
     ----------
     on_actor_init_fn: Optional[Callable[[], None]] (default: None)
         A function to execute upon actor initialization.
+    client_cache_size: int (default: 0)
+        Number of clients the actor keeps after running them, so that they are
+        not created again by `client_fn` the next time they are sampled. This
+        is only correct if clients don't depend on being constructed for every
+        run. Disabled by default.
+    client_cache_memory: Optional[int] (default: None)
+        Resident memory of the actor, in bytes, above which the cache stops
+        growing (see `ClientCache`).
     """
 
-    def __init__(self, on_actor_init_fn: Optional[Callable[[], None]] = None) -> None:
+    def __init__(
+        self,
+        on_actor_init_fn: Optional[Callable[[], None]] = None,
+        client_cache_size: int = 0,
+        client_cache_memory: Optional[int] = None,
+    ) -> None:
         super().__init__()
         if on_actor_init_fn:
             on_actor_init_fn()
+        if client_cache_size > 0:
+            self.client_cache = ClientCache(client_cache_size, client_cache_memory)
 
 
 def pool_size_from_resources(client_resources: Dict[str, Union[int, float]]) -> int:
@@ -164,6 +244,11 @@ def pool_size_from_resources(client_resources: Dict[str, Union[int, float]]) ->
     return total_num_actors
 
 
+def _actor_id(actor: VirtualClientEngineActor) -> str:
+    """Return the id of an actor."""
+    return actor._actor_id.hex()  # type: ignore # pylint: disable=protected-access
+
+
 class VirtualClientEngineActorPool(ActorPool):
     """A pool of VirtualClientEngine Actors.
 
@@ -185,6 +270,12 @@ class VirtualClientEngineActorPool(ActorPool):
         This argument should not be used. It's only needed for serialization purposes
         (see the `__reduce__` method). Each time it is executed, we want to retain
         the same list of actors.
+
+    scheduler: Optional[LongestJobFirstScheduler] (default: None)
+        If given, jobs are queued and dispatched to idle actors longest first,
+        instead of in the order they were submitted, and the scheduler records
+        the metrics of each round. Clients are then not sent back to the actor
+        which last ran them.
     """
 
     def __init__(
@@ -192,9 +283,11 @@ class VirtualClientEngineActorPool(ActorPool):
         create_actor_fn: Callable[[], Type[VirtualClientEngineActor]],
         client_resources: Dict[str, Union[int, float]],
         actor_list: Optional[List[Type[VirtualClientEngineActor]]] = None,
+        scheduler: Optional[LongestJobFirstScheduler] = None,
     ):
         self.client_resources = client_resources
         self.create_actor_fn = create_actor_fn
+        self.scheduler = scheduler
 
         if actor_list is None:
             # Figure out how many actors can be created given the cluster resources
@@ -215,6 +308,14 @@ class VirtualClientEngineActorPool(ActorPool):
         ] = {}
         self.actor_to_remove: Set[str] = set()  # a set
         self.num_actors = len(actors)
+        # The actor which last ran each client, which may still have it cached
+        self._cid_to_actor_id: Dict[str, str] = {}
+        # The start time and clients of the actor invocations of the scheduler
+        self._invocations: Dict[Any, Tuple[float, List[str]]] = {}
+
+        # The parameters last put in the object store, and their reference
+        self._parameters: Optional[common.Parameters] = None
+        self._parameters_ref: Optional[ObjectRef[common.Parameters]] = None
 
         self.lock = threading.RLock()
 
@@ -224,6 +325,7 @@ class VirtualClientEngineActorPool(ActorPool):
             self.create_actor_fn,
             self.client_resources,
             self._idle_actors,  # Pass existing actors to avoid killing/re-creating
+            self.scheduler,
         )
 
     def add_actors_to_pool(self, num_actors: int) -> None:
@@ -237,15 +339,33 @@ class VirtualClientEngineActorPool(ActorPool):
             self._idle_actors.extend(new_actors)
             self.num_actors += num_actors
 
-    def submit(self, fn: Any, value: Tuple[ClientFn, JobFn, str, RunState]) -> None:
+    def put_parameters(
+        self, parameters: common.Parameters
+    ) -> "ObjectRef[common.Parameters]":
+        """Put parameters in the object store once for all clients of a round.
+
+        Strategies send the same `Parameters` object to all the clients they
+        sample, so it is only stored again when another object is given. The
+        parameters of the previous round are then released by the pool.
+        """
+        with self.lock:
+            if parameters is not self._parameters:
+                self._parameters_ref = ray.put(parameters)
+                self._parameters = parameters
+            return self._parameters_ref  # type: ignore
+
+    def submit(self, fn: Any, value: Any) -> None:
         """Take idle actor and assign it a client run.
 
         Submit a job to an actor by first removing it from the list of idle actors, then
-        check if this actor was flagged to be removed from the pool
+        check if this actor was flagged to be removed from the pool. `value` is the
+        job of a client, i.e., `(client_fn, job_fn, cid, state)`.
         """
-        client_fn, job_fn, cid, state = value
-        actor = self._idle_actors.pop()
+        job: Tuple[ClientFn, JobFn, str, RunState] = value
+        client_fn, job_fn, cid, state = job
+        actor = self._pop_idle_actor(cid)
         if self._check_and_remove_actor_from_pool(actor):
+            self._cid_to_actor_id[cid] = _actor_id(actor)
             future = fn(actor, client_fn, job_fn, cid, state)
             future_key = tuple(future) if isinstance(future, List) else future
             self._future_to_actor[future_key] = (self._next_task_index, actor, cid)
@@ -254,24 +374,99 @@ class VirtualClientEngineActorPool(ActorPool):
             # Update with future
             self._cid_to_future[cid]["future"] = future_key
 
+    def _pop_idle_actor(self, cid: str) -> VirtualClientEngineActor:
+        """Take the idle actor which last ran `cid`, or any idle actor."""
+        actor_id = self._cid_to_actor_id.get(cid)
+        if actor_id is not None:
+            for i, actor in enumerate(self._idle_actors):
+                if _actor_id(actor) == actor_id:
+                    return self._idle_actors.pop(i)  # type: ignore
+        return self._idle_actors.pop()  # type: ignore
+
+    def _return_actor(
+        self, actor: VirtualClientEngineActor, is_alive: bool = True
+    ) -> None:
+        """Return an actor to the pool, unless dead, and give it a pending job.
+
+        Among the next `num_actors` pending jobs, the first one whose client
+        last ran on this actor is preferred to the oldest one.
+        """
+        if not is_alive:
+            # Don't give jobs to a dead actor
+            return
+        self._idle_actors.append(actor)
+        if self.scheduler is not None:
+            self._dispatch()
+            return
+        if not self._pending_submits:
+            return
+        actor_id = _actor_id(actor)
+        index = 0
+        for i, (_, job) in enumerate(self._pending_submits[: self.num_actors]):
+            if self._cid_to_actor_id.get(job[2]) == actor_id:
+                index = i
+                break
+        self.submit(*self._pending_submits.pop(index))
+
     def submit_client_job(
         self, actor_fn: Any, job: Tuple[ClientFn, JobFn, str, RunState]
     ) -> None:
         """Submit a job while tracking client ids."""
-        _, _, cid, _ = job
+        self.submit_client_jobs(actor_fn, [job])
 
+    def submit_client_jobs(
+        self, actor_fn: Any, jobs: List[Tuple[ClientFn, JobFn, str, RunState]]
+    ) -> None:
+        """Submit the jobs of several clients at once, e.g., all jobs of a round."""
         # We need to put this behind a lock since .submit() involves
         # removing and adding elements from a dictionary. Which creates
         # issues in multi-threaded settings
         with self.lock:
-            # Create cid to future mapping
-            self._reset_cid_to_future_dict(cid)
-            if self._idle_actors:
-                # Submit job since there is an Actor that's available
-                self.submit(actor_fn, job)
+            for job in jobs:
+                _, _, cid, _ = job
+                # Create cid to future mapping
+                self._reset_cid_to_future_dict(cid)
+                if self.scheduler is not None:
+                    self.scheduler.push(cid, (actor_fn, job))
+                elif self._idle_actors:
+                    # Submit job since there is an Actor that's available
+                    self.submit(actor_fn, job)
+                else:
+                    # No actors are available, append to list of jobs to run later
+                    self._pending_submits.append((actor_fn, job))
+            if self.scheduler is not None:
+                self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Give the jobs queued by the scheduler to the idle actors."""
+        scheduler: LongestJobFirstScheduler = self.scheduler  # type: ignore
+        while self._idle_actors and len(scheduler) > 0:
+            actor = self._idle_actors.pop()
+            if not self._check_and_remove_actor_from_pool(actor):
+                continue
+            scheduled = scheduler.pop()
+            cids = [cid for cid, _ in scheduled]
+            if len(scheduled) == 1:
+                [(_, (actor_fn, (client_fn, job_fn, cid, state)))] = scheduled
+                futures = [actor_fn(actor, client_fn, job_fn, cid, state)]
             else:
-                # No actors are available, append to list of jobs to run later
-                self._pending_submits.append((actor_fn, job))
+                # One invocation running several clients, with one result each
+                futures = actor.run_packed.options(num_returns=len(scheduled)).remote(
+                    [job for _, (_, job) in scheduled]
+                )
+
+            actor_id = _actor_id(actor)
+            for cid, future in zip(cids, futures):
+                self._cid_to_future[cid]["future"] = future
+                self._cid_to_actor_id[cid] = actor_id
+            # All results of an invocation are ready at the same time
+            self._future_to_actor[futures[-1]] = (
+                self._next_task_index,
+                actor,
+                cids[-1],
+            )
+            self._next_task_index += 1
+            self._invocations[futures[-1]] = (time.monotonic(), cids)
 
     def _flag_future_as_ready(self, cid: str) -> None:
         """Flag future for VirtualClient with cid=cid as ready."""
@@ -303,9 +498,11 @@ class VirtualClientEngineActorPool(ActorPool):
         """
         try:
             future: ObjectRef[Any] = self._cid_to_future[cid]["future"]  # type: ignore
-            res_cid, res, updated_state = ray.get(
-                future
-            )  # type: (str, ClientRes, RunState)
+            result = ray.get(future)
+            if isinstance(result, ClientException):
+                # Failed job packed with others (see `run_packed`)
+                raise result
+            res_cid, res, updated_state = result  # type: (str, ClientRes, RunState)
         except ray.exceptions.RayActorError as ex:
             log(ERROR, ex)
             if hasattr(ex, "actor_id"):
@@ -338,9 +535,7 @@ class VirtualClientEngineActorPool(ActorPool):
         Remove the actor if so.
         """
         with self.lock:
-            actor_id = (
-                actor._actor_id.hex()  # type: ignore # pylint: disable=protected-access
-            )
+            actor_id = _actor_id(actor)
 
             if actor_id in self.actor_to_remove:
                 # The actor should be removed
@@ -352,13 +547,16 @@ class VirtualClientEngineActorPool(ActorPool):
 
             return True
 
-    def _check_actor_fits_in_pool(self) -> bool:
+    def _check_actor_fits_in_pool(
+        self, num_actors_updated: Optional[int] = None
+    ) -> bool:
         """Determine if available resources haven't changed.
 
         If true, allow the actor to be added back to the pool. Else don't allow it
         (effectively reducing the size of the pool).
         """
-        num_actors_updated = pool_size_from_resources(self.client_resources)
+        if num_actors_updated is None:
+            num_actors_updated = pool_size_from_resources(self.client_resources)
 
         if num_actors_updated < self.num_actors:
             log(
@@ -377,35 +575,77 @@ class VirtualClientEngineActorPool(ActorPool):
 
         return True
 
-    def process_unordered_future(self, timeout: Optional[float] = None) -> None:
-        """Similar to parent's get_next_unordered() but without final ray.get()."""
+    def process_unordered_future(self, timeout: Optional[float] = None) -> List[str]:
+        """Similar to parent's get_next_unordered() but without final ray.get().
+
+        All the futures which are ready are processed at once. Returns the cids
+        of the clients whose results are ready.
+        """
         if not self.has_next():  # type: ignore
             raise StopIteration("No more results to get")
 
-        # Block until one result is ready
-        res, _ = ray.wait(list(self._future_to_actor), num_returns=1, timeout=timeout)
+        with self.lock:
+            futures = list(self._future_to_actor)
 
-        if res:
-            [future] = res
-        else:
+        # Block until one result is ready, then take all the results ready
+        res, _ = ray.wait(futures, num_returns=1, timeout=timeout)
+        if not res:
             raise TimeoutError("Timed out waiting for result")
+        res, _ = ray.wait(futures, num_returns=len(futures), timeout=0)
 
+        ready_cids = []
         with self.lock:
-            # Get actor that completed a job
-            _, actor, cid = self._future_to_actor.pop(future, (None, None, -1))
-            if actor is not None:
+            num_actors_updated = pool_size_from_resources(self.client_resources)
+            for future in res:
+                # Get actor that completed a job
+                _, actor, cid = self._future_to_actor.pop(future, (None, None, -1))
+                if actor is None:
+                    # Already processed by another thread
+                    continue
+                cids = [cid]
+                if future in self._invocations:
+                    start, cids = self._invocations.pop(future)
+                    self.scheduler.observe(  # type: ignore
+                        cids, time.monotonic() - start, self.num_actors
+                    )
                 # Still space in queue? (no if a node in the cluster died)
-                if self._check_actor_fits_in_pool():
+                if self._check_actor_fits_in_pool(num_actors_updated):
                     if self._check_and_remove_actor_from_pool(actor):
-                        self._return_actor(actor)  # type: ignore
-                    # Flag future as ready so ClientProxy with cid
-                    # can break from the while loop (in `get_client_result()`)
-                    # and fetch its result
-                    self._flag_future_as_ready(cid)
+                        self._return_actor(actor)
                 else:
                     # The actor doesn't fit in the pool anymore.
                     # Manually terminate the actor
                     actor.terminate.remote()
+                # Flag futures as ready so ClientProxy with cid
+                # can break from the while loop (in `get_client_result()`)
+                # and fetch its result
+                for cid in cids:
+                    self._flag_future_as_ready(cid)
+                ready_cids.extend(cids)
+        return ready_cids
+
+    def as_completed(
+        self, cids: Iterable[str], timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        """Yield the given cids as the results of their jobs become ready.
+
+        A single thread can wait for all the jobs of a round this way. The
+        results are then fetched with `get_client_result`, which returns
+        immediately.
+        """
+        waiting = set(cids)
+        ready_cids = [cid for cid in waiting if self._is_future_ready(cid)]
+        while True:
+            for cid in ready_cids:
+                if cid in waiting:
+                    waiting.remove(cid)
+                    yield cid
+            if not waiting or not self.has_next():  # type: ignore
+                break
+            ready_cids = self.process_unordered_future(timeout=timeout)
+
+        # Results of jobs processed by other threads in the meantime
+        yield from [cid for cid in waiting if self._is_future_ready(cid)]
 
     def get_client_result(
         self, cid: str, timeout: Optional[float]
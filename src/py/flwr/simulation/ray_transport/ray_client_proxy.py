@@ -17,7 +17,7 @@
 
 import traceback
 from logging import ERROR
-from typing import Dict, Optional, cast
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, cast
 
 import ray
 
@@ -30,12 +30,15 @@ from flwr.client.client import (
     maybe_call_get_properties,
 )
 from flwr.client.node_state import NodeState
+from flwr.client.run_state import RunState
 from flwr.common.logger import log
-from flwr.server.client_proxy import ClientProxy
+from flwr.server.client_proxy import BatchClientProxy, ClientProxy
 from flwr.simulation.ray_transport.ray_actor import (
     ClientRes,
     JobFn,
+    VirtualClientEngineActor,
     VirtualClientEngineActorPool,
+    resolve_parameters,
 )
 
 
@@ -120,8 +123,13 @@ class RayClientProxy(ClientProxy):
         return common.DisconnectRes(reason="")  # Nothing to do here (yet)
 
 
-class RayActorClientProxy(ClientProxy):
-    """Flower client proxy which delegates work using Ray."""
+class RayActorClientProxy(BatchClientProxy):
+    """Flower client proxy which delegates work using Ray.
+
+    The server runs the rounds of these proxies from a single thread: all jobs
+    are submitted to the actor pool at once, and their results collected as
+    they complete.
+    """
 
     def __init__(
         self, client_fn: ClientFn, cid: str, actor_pool: VirtualClientEngineActorPool
@@ -131,7 +139,7 @@ class RayActorClientProxy(ClientProxy):
         self.actor_pool = actor_pool
         self.proxy_state = NodeState()
 
-    def _submit_job(self, job_fn: JobFn, timeout: Optional[float]) -> ClientRes:
+    def _prepare_job(self, job_fn: JobFn) -> Tuple[ClientFn, JobFn, str, RunState]:
         # The VCE is not exposed to TaskIns, it won't handle multilple runs
         # For the time being, fixing run_id is a small compromise
         # This will be one of the first points to address integrating VCE + DriverAPI
@@ -143,27 +151,35 @@ class RayActorClientProxy(ClientProxy):
         # Retrieve state
         state = self.proxy_state.retrieve_runstate(run_id=run_id)
 
-        try:
-            self.actor_pool.submit_client_job(
-                lambda a, c_fn, j_fn, cid, state: a.run.remote(c_fn, j_fn, cid, state),
-                (self.client_fn, job_fn, self.cid, state),
-            )
-            res, updated_state = self.actor_pool.get_client_result(self.cid, timeout)
+        return self.client_fn, job_fn, self.cid, state
 
-            # Update state
-            self.proxy_state.update_runstate(run_id=run_id, run_state=updated_state)
+    def _fetch_result(self, timeout: Optional[float]) -> ClientRes:
+        res, updated_state = self.actor_pool.get_client_result(self.cid, timeout)
+
+        # Update state
+        self.proxy_state.update_runstate(run_id=0, run_state=updated_state)
+
+        return res
+
+    def _submit_job(self, job_fn: JobFn, timeout: Optional[float]) -> ClientRes:
+        try:
+            self.actor_pool.submit_client_job(_run, self._prepare_job(job_fn))
+            res = self._fetch_result(timeout)
 
         except Exception as ex:
-            if self.actor_pool.num_actors == 0:
-                # At this point we want to stop the simulation.
-                # since no more client runs will be executed
-                log(ERROR, "ActorPool is empty!!!")
-            log(ERROR, traceback.format_exc())
-            log(ERROR, ex)
+            self._log_failure(ex)
             raise ex
 
         return res
 
+    def _log_failure(self, ex: BaseException) -> None:
+        if self.actor_pool.num_actors == 0:
+            # At this point we want to stop the simulation.
+            # since no more client runs will be executed
+            log(ERROR, "ActorPool is empty!!!")
+        log(ERROR, traceback.format_exc())
+        log(ERROR, ex)
+
     def get_properties(
         self, ins: common.GetPropertiesIns, timeout: Optional[float]
     ) -> common.GetPropertiesRes:
@@ -202,37 +218,81 @@ class RayActorClientProxy(ClientProxy):
 
     def fit(self, ins: common.FitIns, timeout: Optional[float]) -> common.FitRes:
         """Train model parameters on the locally held dataset."""
+        res = self._submit_job(self._fit_job(ins), timeout)
+
+        return cast(
+            common.FitRes,
+            res,
+        )
+
+    def _fit_job(self, ins: common.FitIns) -> JobFn:
+        # Only reference the parameters, so that they are not pickled with the job
+        parameters_ref = self.actor_pool.put_parameters(ins.parameters)
+        config = ins.config
 
         def fit(client: Client) -> common.FitRes:
             return maybe_call_fit(
                 client=client,
-                fit_ins=ins,
+                fit_ins=common.FitIns(resolve_parameters(parameters_ref), config),
             )
 
-        res = self._submit_job(fit, timeout)
-
-        return cast(
-            common.FitRes,
-            res,
-        )
+        return fit
 
     def evaluate(
         self, ins: common.EvaluateIns, timeout: Optional[float]
     ) -> common.EvaluateRes:
         """Evaluate model parameters on the locally held dataset."""
+        res = self._submit_job(self._evaluate_job(ins), timeout)
+
+        return cast(
+            common.EvaluateRes,
+            res,
+        )
+
+    def _evaluate_job(self, ins: common.EvaluateIns) -> JobFn:
+        # Only reference the parameters, so that they are not pickled with the job
+        parameters_ref = self.actor_pool.put_parameters(ins.parameters)
+        config = ins.config
 
         def evaluate(client: Client) -> common.EvaluateRes:
             return maybe_call_evaluate(
                 client=client,
-                evaluate_ins=ins,
+                evaluate_ins=common.EvaluateIns(
+                    resolve_parameters(parameters_ref), config
+                ),
             )
 
-        res = self._submit_job(evaluate, timeout)
-
-        return cast(
-            common.EvaluateRes,
-            res,
-        )
+        return evaluate
+
+    @classmethod
+    def fit_batch(
+        cls,
+        client_instructions: List[Tuple[ClientProxy, common.FitIns]],
+        timeout: Optional[float],
+    ) -> Iterator[Tuple[ClientProxy, Union[common.FitRes, BaseException]]]:
+        """Refine parameters on all clients, yielding results as they come."""
+        # pylint: disable=protected-access
+        client_jobs = [
+            (proxy, proxy._fit_job(cast(common.FitIns, ins)))
+            for proxy, ins in _actor_client_proxies(client_instructions)
+        ]
+        for proxy, res in _run_round(client_jobs, timeout):
+            yield proxy, cast(Union[common.FitRes, BaseException], res)
+
+    @classmethod
+    def evaluate_batch(
+        cls,
+        client_instructions: List[Tuple[ClientProxy, common.EvaluateIns]],
+        timeout: Optional[float],
+    ) -> Iterator[Tuple[ClientProxy, Union[common.EvaluateRes, BaseException]]]:
+        """Evaluate parameters on all clients, yielding results as they come."""
+        # pylint: disable=protected-access
+        client_jobs = [
+            (proxy, proxy._evaluate_job(cast(common.EvaluateIns, ins)))
+            for proxy, ins in _actor_client_proxies(client_instructions)
+        ]
+        for proxy, res in _run_round(client_jobs, timeout):
+            yield proxy, cast(Union[common.EvaluateRes, BaseException], res)
 
     def reconnect(
         self, ins: common.ReconnectIns, timeout: Optional[float]
@@ -241,6 +301,69 @@ class RayActorClientProxy(ClientProxy):
         return common.DisconnectRes(reason="")  # Nothing to do here (yet)
 
 
+def _run(
+    actor: VirtualClientEngineActor,
+    client_fn: ClientFn,
+    job_fn: JobFn,
+    cid: str,
+    state: RunState,
+) -> Any:
+    """Run a client job on an actor."""
+    return actor.run.remote(client_fn, job_fn, cid, state)  # type: ignore
+
+
+def _actor_client_proxies(
+    client_instructions: Sequence[Tuple[ClientProxy, Any]]
+) -> List[Tuple[RayActorClientProxy, Any]]:
+    """Check that the server only gave instructions for RayActorClientProxy."""
+    for proxy, _ in client_instructions:
+        if not isinstance(proxy, RayActorClientProxy):
+            raise TypeError(f"Expected a RayActorClientProxy, got {type(proxy)}")
+    return cast(List[Tuple[RayActorClientProxy, Any]], list(client_instructions))
+
+
+def _run_round(
+    client_jobs: List[Tuple[RayActorClientProxy, JobFn]],
+    timeout: Optional[float],
+) -> Iterator[Tuple[RayActorClientProxy, Union[ClientRes, BaseException]]]:
+    """Submit the jobs of a round at once and yield their results as they come.
+
+    The jobs of proxies sharing an actor pool are run together, one pool after
+    the other.
+    """
+    pools: Dict[int, List[Tuple[RayActorClientProxy, JobFn]]] = {}
+    for proxy, job_fn in client_jobs:
+        pools.setdefault(id(proxy.actor_pool), []).append((proxy, job_fn))
+    for pool_jobs in pools.values():
+        yield from _run_pool_round(pool_jobs, timeout)
+
+
+def _run_pool_round(
+    client_jobs: List[Tuple[RayActorClientProxy, JobFn]],
+    timeout: Optional[float],
+) -> Iterator[Tuple[RayActorClientProxy, Union[ClientRes, BaseException]]]:
+    # pylint: disable=protected-access
+    actor_pool = client_jobs[0][0].actor_pool
+    proxies = {proxy.cid: proxy for proxy, _ in client_jobs}
+    actor_pool.submit_client_jobs(
+        _run, [proxy._prepare_job(job_fn) for proxy, job_fn in client_jobs]
+    )
+    try:
+        for cid in actor_pool.as_completed(proxies, timeout):
+            proxy = proxies[cid]
+            try:
+                yield proxy, proxy._fetch_result(timeout)
+            except Exception as ex:  # pylint: disable=broad-except
+                proxy._log_failure(ex)
+                yield proxy, ex
+    except Exception as ex:  # pylint: disable=broad-except
+        # E.g., a timeout, which fails the clients without result
+        log(ERROR, ex)
+        for proxy in proxies.values():
+            if not actor_pool._is_future_ready(proxy.cid):
+                yield proxy, ex
+
+
 @ray.remote
 def launch_and_get_properties(
     client_fn: ClientFn, cid: str, get_properties_ins: common.GetPropertiesIns
@@ -17,13 +17,28 @@
 
 from math import pi
 from random import shuffle
-from typing import List, Tuple, Type, cast
+from typing import Any, Dict, List, Optional, Tuple, Type, cast
+from unittest.mock import patch
 
+import numpy as np
 import ray
 
-from flwr.client import Client, NumPyClient
+from flwr.client import Client, ClientFn, NumPyClient
 from flwr.client.run_state import RunState
-from flwr.common import Code, GetPropertiesRes, Status
+from flwr.common import (
+    Code,
+    Config,
+    EvaluateIns,
+    FitIns,
+    GetPropertiesRes,
+    NDArrays,
+    Scalar,
+    Status,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+)
+from flwr.common.parameter import TENSOR_TYPE_NUMPY_RAW
+from flwr.server.server import fit_clients
 from flwr.simulation.ray_transport.ray_actor import (
     ClientRes,
     DefaultActor,
@@ -32,6 +47,8 @@ from flwr.simulation.ray_transport.ray_actor import (
     VirtualClientEngineActorPool,
 )
 from flwr.simulation.ray_transport.ray_client_proxy import RayActorClientProxy
+from flwr.simulation.ray_transport.scheduler import LongestJobFirstScheduler
+from flwr.simulation.ray_transport.utils import ClientCache
 
 
 class DummyClient(NumPyClient):
@@ -39,6 +56,20 @@ class DummyClient(NumPyClient):
 
     def __init__(self, cid: str) -> None:
         self.cid = int(cid)
+        self.num_runs = 0
+
+    def fit(
+        self, parameters: NDArrays, config: Config
+    ) -> Tuple[NDArrays, int, Dict[str, Scalar]]:
+        """Return the parameters plus the cid."""
+        return [parameters[0] + self.cid], 1, {}
+
+    def evaluate(
+        self, parameters: NDArrays, config: Config
+    ) -> Tuple[float, int, Dict[str, Scalar]]:
+        """Return the sum of the parameters as loss."""
+        writeable = bool(parameters[0].flags.writeable)
+        return float(parameters[0].sum()), 1, {"writeable": writeable}
 
 
 def get_dummy_client(cid: str) -> Client:
@@ -64,20 +95,36 @@ def job_fn(cid: str) -> JobFn:  # pragma: no cover
     return cid_times_pi
 
 
+def count_runs(client: Client) -> ClientRes:  # pragma: no cover
+    """Return how many times the client instance was run."""
+    numpy_client = cast(DummyClient, client.numpy_client)  # type: ignore
+    numpy_client.num_runs += 1
+    return GetPropertiesRes(
+        status=Status(Code(0), message="test"),
+        properties={"num_runs": numpy_client.num_runs},
+    )
+
+
 def prep(
     actor_type: Type[VirtualClientEngineActor] = DefaultActor,
+    actor_kwargs: Optional[Dict[str, Any]] = None,
+    scheduler: Optional[LongestJobFirstScheduler] = None,
 ) -> Tuple[List[RayActorClientProxy], VirtualClientEngineActorPool]:  # pragma: no cover
     """Prepare ClientProxies and pool for tests."""
     client_resources = {"num_cpus": 1, "num_gpus": 0.0}
+    actor_args = {} if actor_kwargs is None else actor_kwargs
 
     def create_actor_fn() -> Type[VirtualClientEngineActor]:
-        return actor_type.options(**client_resources).remote()  # type: ignore
+        return actor_type.options(**client_resources).remote(  # type: ignore
+            **actor_args
+        )
 
     # Create actor pool
     ray.init(include_dashboard=False)
     pool = VirtualClientEngineActorPool(
         create_actor_fn=create_actor_fn,
         client_resources=client_resources,
+        scheduler=scheduler,
     )
 
     # Create 373 client proxies
@@ -173,3 +220,215 @@ def test_cid_consistency_without_proxies() -> None:
         assert int(cid) * pi == res.properties["result"]
 
     ray.shutdown()
+
+
+def test_fit_and_evaluate_with_broadcast_parameters() -> None:
+    """Test that parameters are put in the object store once per round."""
+    # Prepare
+    proxies, pool = prep()
+    parameters = ndarrays_to_parameters(
+        [np.arange(4, dtype=np.float32)], tensor_type=TENSOR_TYPE_NUMPY_RAW
+    )
+
+    # Execute
+    fit_results = [
+        prox.fit(FitIns(parameters, {}), timeout=None) for prox in proxies[:10]
+    ]
+    evaluate_res = proxies[0].evaluate(EvaluateIns(parameters, {}), timeout=None)
+    parameters_ref = pool.put_parameters(parameters)
+
+    # Assert
+    for prox, fit_res in zip(proxies, fit_results):
+        [ndarray] = parameters_to_ndarrays(fit_res.parameters)
+        assert (ndarray == np.arange(4) + int(prox.cid)).all()
+    assert evaluate_res.loss == 6.0
+    assert not evaluate_res.metrics["writeable"]
+    assert pool.put_parameters(parameters) is parameters_ref
+    next_parameters = ndarrays_to_parameters([np.zeros(4)])
+    assert pool.put_parameters(next_parameters) is not parameters_ref
+
+    ray.shutdown()
+
+
+def test_client_cache_reuses_clients_on_the_same_actor() -> None:
+    """Test that clients cached by actors are run again on the same actor."""
+    # Prepare
+    proxies, _ = prep(actor_kwargs={"client_cache_size": 4})
+
+    # Execute
+    num_runs = []
+    for prox in proxies[:3] + proxies[:3]:
+        res = prox._submit_job(  # pylint: disable=protected-access
+            job_fn=count_runs, timeout=None
+        )
+        num_runs.append(cast(GetPropertiesRes, res).properties["num_runs"])
+
+    # Assert
+    assert num_runs == [1, 1, 1, 2, 2, 2]
+
+    ray.shutdown()
+
+
+def test_client_cache_evicts_least_recently_used() -> None:
+    """Test that the least recently used client is evicted."""
+    # Prepare
+    cache = ClientCache(max_size=2)
+    client_0 = cache.get(get_dummy_client, "0")
+    cache.get(get_dummy_client, "1")
+
+    # Execute
+    cache.get(get_dummy_client, "0")
+    cache.get(get_dummy_client, "2")
+
+    # Assert
+    assert len(cache) == 2
+    assert cache.get(get_dummy_client, "0") is client_0
+    assert cache.get(get_dummy_client, "1") is not client_0
+    assert len(cache) == 2
+
+
+def test_client_cache_stops_growing_above_max_memory() -> None:
+    """Test that the cache doesn't grow once the actor exceeds its memory."""
+    # Prepare
+    cache = ClientCache(max_size=4, max_memory=0)
+
+    # Execute
+    for cid in range(3):
+        cache.get(get_dummy_client, str(cid))
+
+    # Assert
+    assert len(cache) == 1
+    cache.discard("2")
+    assert len(cache) == 0
+
+
+def test_cid_consistency_submit_all_at_once() -> None:
+    """Test that jobs submitted at once are yielded once each as they complete."""
+    # Prepare
+    proxies, pool = prep()
+    cids = [prox.cid for prox in proxies]
+    jobs: List[Tuple[ClientFn, JobFn, str, RunState]] = [
+        (get_dummy_client, job_fn(cid), cid, RunState(state={})) for cid in cids
+    ]
+
+    # Execute
+    pool.submit_client_jobs(
+        lambda a, c_fn, j_fn, cid_, state: a.run.remote(c_fn, j_fn, cid_, state),
+        jobs,
+    )
+    completed = list(pool.as_completed(cids))
+
+    # Assert
+    assert sorted(completed) == sorted(cids)
+    for cid in completed:
+        res, _ = pool.get_client_result(cid, timeout=None)
+        assert int(cid) * pi == cast(GetPropertiesRes, res).properties["result"]
+    assert not pool.has_next()  # type: ignore
+
+    ray.shutdown()
+
+
+def test_fit_clients_from_a_single_thread() -> None:
+    """Test that the server runs a round of fit jobs in a batch."""
+    # Prepare
+    proxies, _ = prep()
+    parameters = ndarrays_to_parameters([np.zeros(2)])
+
+    # Execute
+    with patch(
+        "flwr.server.server.fit_client", side_effect=AssertionError
+    ) as fit_client:
+        results, failures = fit_clients(
+            [(prox, FitIns(parameters, {})) for prox in proxies],
+            max_workers=None,
+            timeout=None,
+        )
+
+    # Assert
+    fit_client.assert_not_called()
+    assert not failures
+    assert len(results) == len(proxies)
+    for prox, fit_res in results:
+        [ndarray] = parameters_to_ndarrays(fit_res.parameters)
+        assert (ndarray == int(prox.cid)).all()
+
+    ray.shutdown()
+
+
+class _IdleActor:  # pylint: disable=too-few-public-methods
+    """An actor handle which is never invoked."""
+
+    class _ActorID:  # pylint: disable=too-few-public-methods
+        def hex(self) -> str:
+            return "idle"
+
+    _actor_id = _ActorID()
+
+
+def test_scheduler_dispatches_round_longest_first() -> None:
+    """Test that a round submitted at once starts with its longest client."""
+    # Prepare
+    scheduler = LongestJobFirstScheduler()
+    for cid, runtime in [("0", 1.0), ("1", 3.0), ("2", 2.0)]:
+        scheduler.push(cid, None)
+        scheduler.pop()
+        scheduler.observe([cid], runtime, num_actors=1)
+    actor = _IdleActor()
+    pool = VirtualClientEngineActorPool(
+        create_actor_fn=lambda: DefaultActor,
+        client_resources={"num_cpus": 1},
+        actor_list=[actor],  # type: ignore
+        scheduler=scheduler,
+    )
+    started: List[str] = []
+
+    def actor_fn(*args: Any) -> object:
+        started.append(args[3])
+        return object()
+
+    # Execute
+    pool.submit_client_jobs(
+        actor_fn,
+        [
+            (get_dummy_client, job_fn(cid), cid, RunState(state={}))
+            for cid in ["0", "1", "2"]
+        ],
+    )
+    first = list(started)
+    pool._return_actor(actor)  # type: ignore # pylint: disable=protected-access
+
+    # Assert
+    assert first == ["1"]
+    assert started == ["1", "2"]
+
+
+def test_fit_clients_with_scheduler() -> None:
+    """Test that scheduled and packed jobs return the results of all clients."""
+    # Prepare
+    scheduler = LongestJobFirstScheduler(pack_runtime=1.0, max_pack_size=8)
+    proxies, _ = prep(scheduler=scheduler)
+    parameters = ndarrays_to_parameters([np.zeros(2)])
+
+    for _ in range(2):
+        # Execute
+        results, failures = fit_clients(
+            [(prox, FitIns(parameters, {})) for prox in proxies],
+            max_workers=None,
+            timeout=None,
+        )
+
+        # Assert
+        assert not failures
+        assert len(results) == len(proxies)
+        for prox, fit_res in results:
+            [ndarray] = parameters_to_ndarrays(fit_res.parameters)
+            assert (ndarray == int(prox.cid)).all()
+
+    assert len(scheduler) == 0
+    assert scheduler.estimate(proxies[0].cid) is not None
+    assert len(scheduler.rounds) == 2
+    for metrics in scheduler.rounds:
+        assert metrics.makespan > 0.0
+        assert 0.0 < metrics.utilization <= 1.0
+
+    ray.shutdown()
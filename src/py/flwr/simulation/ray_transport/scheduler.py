@@ -0,0 +1,150 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Heterogeneity-aware scheduling of virtual clients onto actors."""
+
+
+import heapq
+import itertools
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class RoundMetrics:
+    """Metrics of a round, i.e., a period during which the pool had jobs.
+
+    Rounds are best delimited when all their jobs are submitted at once, e.g.,
+    by the server running the rounds of `RayActorClientProxy` in batches.
+    """
+
+    # Seconds from the first job submitted to the last job completed
+    makespan: float
+    # Fraction of the time of the actors spent running jobs
+    utilization: float
+    num_jobs: int
+
+
+class LongestJobFirstScheduler:
+    """Order the jobs of virtual clients longest first.
+
+    The runtime of each client is estimated by an exponentially weighted moving
+    average (EWMA) of the durations of its past jobs. Starting long jobs first
+    shortens the tail of rounds in which clients have different runtimes.
+    Clients without estimate, e.g., in the first round, are run first, in the
+    order they were submitted.
+
+    The scheduler is used by `VirtualClientEngineActorPool`, under its lock.
+
+    Parameters
+    ----------
+    alpha : float (default: 0.5)
+        Weight of the last duration of a client in its runtime estimate.
+    pack_runtime : float (default: 0.0)
+        Clients estimated to run in less than `pack_runtime` seconds in total
+        are run one after the other by a single actor invocation, which saves
+        the overhead of invoking the actor for each. Disabled by default.
+    max_pack_size : int (default: 16)
+        Maximum number of clients run by one actor invocation.
+
+    Attributes
+    ----------
+    rounds : List[RoundMetrics]
+        Metrics of the rounds completed so far.
+    """
+
+    def __init__(
+        self, alpha: float = 0.5, pack_runtime: float = 0.0, max_pack_size: int = 16
+    ) -> None:
+        self.alpha = alpha
+        self.pack_runtime = pack_runtime
+        self.max_pack_size = max_pack_size
+        self.rounds: List[RoundMetrics] = []
+        self._estimates: Dict[str, float] = {}
+        # Heap of (-estimate, submission order, cid, job)
+        self._queue: List[Tuple[float, int, str, Any]] = []
+        self._counter = itertools.count()
+        # The current round
+        self._round_start: Optional[float] = None
+        self._busy_time = 0.0
+        self._num_jobs = 0
+        self._num_running = 0
+
+    def __len__(self) -> int:
+        """Return the number of queued jobs."""
+        return len(self._queue)
+
+    def estimate(self, cid: str) -> Optional[float]:
+        """Return the estimated runtime of a client in seconds, if known."""
+        return self._estimates.get(cid)
+
+    def push(self, cid: str, job: Any) -> None:
+        """Queue the job of a client."""
+        estimate = self._estimates.get(cid, math.inf)
+        heapq.heappush(self._queue, (-estimate, next(self._counter), cid, job))
+        if self._round_start is None:
+            self._round_start = time.monotonic()
+        self._num_jobs += 1
+
+    def pop(self) -> List[Tuple[str, Any]]:
+        """Take the jobs of the next actor invocation.
+
+        This is the longest job queued, followed by as many short jobs as can
+        be packed with it.
+        """
+        priority, _, cid, job = heapq.heappop(self._queue)
+        jobs = [(cid, job)]
+        total = -priority
+        while self._queue and len(jobs) < self.max_pack_size:
+            estimate = -self._queue[0][0]
+            if total + estimate >= self.pack_runtime:
+                break
+            _, _, cid, job = heapq.heappop(self._queue)
+            jobs.append((cid, job))
+            total += estimate
+        self._num_running += 1
+        return jobs
+
+    def observe(self, cids: List[str], duration: float, num_actors: int) -> None:
+        """Record the duration of the actor invocation which ran `cids`.
+
+        The duration is split evenly between clients packed together.
+        """
+        runtime = duration / len(cids)
+        for cid in cids:
+            estimate = self._estimates.get(cid)
+            if estimate is not None:
+                runtime_cid = self.alpha * runtime + (1 - self.alpha) * estimate
+            else:
+                runtime_cid = runtime
+            self._estimates[cid] = runtime_cid
+        self._busy_time += duration
+        self._num_running -= 1
+
+        if self._num_running > 0 or self._queue or self._round_start is None:
+            return
+        makespan = time.monotonic() - self._round_start
+        capacity = makespan * num_actors
+        self.rounds.append(
+            RoundMetrics(
+                makespan=makespan,
+                utilization=self._busy_time / capacity if capacity > 0 else 0.0,
+                num_jobs=self._num_jobs,
+            )
+        )
+        self._round_start = None
+        self._busy_time = 0.0
+        self._num_jobs = 0
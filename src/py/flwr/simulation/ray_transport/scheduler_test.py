@@ -0,0 +1,98 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for LongestJobFirstScheduler."""
+
+
+from typing import Dict, List
+
+from .scheduler import LongestJobFirstScheduler
+
+
+def _run_round(
+    scheduler: LongestJobFirstScheduler, runtimes: Dict[str, float]
+) -> List[List[str]]:
+    """Queue one job per client, then run them one invocation at a time."""
+    for cid in runtimes:
+        scheduler.push(cid, None)
+    invocations = []
+    while len(scheduler) > 0:
+        cids = [cid for cid, _ in scheduler.pop()]
+        invocations.append(cids)
+        scheduler.observe(cids, sum(runtimes[cid] for cid in cids), num_actors=1)
+    return invocations
+
+
+def test_unknown_clients_in_submission_order() -> None:
+    """Test that clients without estimate run first, in submission order."""
+    # Prepare
+    scheduler = LongestJobFirstScheduler()
+
+    # Execute
+    invocations = _run_round(scheduler, {"a": 1.0, "b": 3.0, "c": 2.0})
+
+    # Assert
+    assert invocations == [["a"], ["b"], ["c"]]
+    assert scheduler.estimate("b") == 3.0
+
+
+def test_longest_job_first_with_ewma() -> None:
+    """Test that clients are ordered by their EWMA runtime."""
+    # Prepare
+    scheduler = LongestJobFirstScheduler(alpha=0.5)
+    _run_round(scheduler, {"a": 1.0, "b": 3.0, "c": 2.0})
+
+    # Execute
+    _run_round(scheduler, {"a": 7.0, "b": 3.0, "c": 2.0})
+    invocations = _run_round(scheduler, {"a": 1.0, "b": 1.0, "c": 1.0, "d": 1.0})
+
+    # Assert
+    assert scheduler.estimate("a") == 2.5
+    assert invocations == [["d"], ["a"], ["b"], ["c"]]
+
+
+def test_pack_short_clients() -> None:
+    """Test that short clients are packed into one invocation."""
+    # Prepare
+    scheduler = LongestJobFirstScheduler(pack_runtime=1.0, max_pack_size=3)
+    runtimes = {"long": 5.0, "s1": 0.4, "s2": 0.3, "s3": 0.2, "s4": 0.1, "s5": 0.1}
+    _run_round(scheduler, runtimes)
+
+    # Execute
+    invocations = _run_round(scheduler, runtimes)
+
+    # Assert
+    assert invocations == [["long"], ["s1", "s2", "s3"], ["s4", "s5"]]
+
+
+def test_round_metrics() -> None:
+    """Test that the makespan and utilization of each round are recorded."""
+    # Prepare
+    scheduler = LongestJobFirstScheduler()
+
+    # Execute
+    scheduler.push("a", None)
+    scheduler.push("b", None)
+    jobs_a = scheduler.pop()
+    jobs_b = scheduler.pop()
+    scheduler.observe([cid for cid, _ in jobs_a], 0.0, num_actors=2)
+    num_rounds = len(scheduler.rounds)
+    scheduler.observe([cid for cid, _ in jobs_b], 0.0, num_actors=2)
+
+    # Assert
+    assert num_rounds == 0
+    assert len(scheduler.rounds) == 1
+    assert scheduler.rounds[0].num_jobs == 2
+    assert scheduler.rounds[0].makespan >= 0.0
+    assert 0.0 <= scheduler.rounds[0].utilization <= 1.0
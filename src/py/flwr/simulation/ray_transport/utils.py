@@ -14,10 +14,13 @@
 # ==============================================================================
 """Utilities for Actors in the Virtual Client Engine."""
 
+import os
 import traceback
+from collections import OrderedDict
 from logging import ERROR
+from typing import Optional
 
-from flwr.client import Client
+from flwr.client import Client, ClientFn
 from flwr.common.logger import log
 
 try:
@@ -81,3 +84,61 @@ def check_clientfn_returns_client(client: Client) -> Client:
         # warnings.warn(mssg, DeprecationWarning, stacklevel=2)
         client = client.to_client()
     return client
+
+
+def _resident_memory() -> Optional[int]:
+    """Return the resident memory of this process in bytes, if known."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class ClientCache:
+    """Least recently used clients of an actor or worker, kept across rounds.
+
+    Clients, and the datasets and models they load when they are constructed,
+    are reused the next time the process runs them instead of being created
+    again by `client_fn`.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum number of clients kept.
+    max_memory : Optional[int] (default: None)
+        Resident memory of the process, in bytes, above which the least
+        recently used client is evicted each time a client is added. The cache
+        therefore stops growing once the process uses that much memory. This is
+        only supported on Linux.
+    """
+
+    def __init__(self, max_size: int, max_memory: Optional[int] = None) -> None:
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self._clients: "OrderedDict[str, Client]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached clients."""
+        return len(self._clients)
+
+    def get(self, client_fn: ClientFn, cid: str) -> Client:
+        """Return the cached client with `cid`, or create and cache it."""
+        client = self._clients.get(cid)
+        if client is not None:
+            self._clients.move_to_end(cid)
+            return client
+
+        client = check_clientfn_returns_client(client_fn(cid))
+        self._clients[cid] = client
+        while len(self._clients) > self.max_size:
+            self._clients.popitem(last=False)
+        if self.max_memory is not None and len(self._clients) > 1:
+            memory = _resident_memory()
+            if memory is not None and memory > self.max_memory:
+                self._clients.popitem(last=False)
+        return client
+
+    def discard(self, cid: str) -> None:
+        """Remove the client with `cid`, e.g., after it crashed."""
+        self._clients.pop(cid, None)
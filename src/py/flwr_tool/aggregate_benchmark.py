@@ -0,0 +1,101 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark the weighted average kernel used by mean-based strategies.
+
+Usage: python -m flwr_tool.aggregate_benchmark [--clients N] [--repeat R]
+"""
+
+
+import argparse
+import timeit
+from functools import reduce
+from typing import List, Tuple
+
+import numpy as np
+
+from flwr.common import NDArrays
+from flwr.server.strategy.aggregate import aggregate
+
+# Layer shapes of a small CNN (~1.6M parameters) and a larger MLP (~25M)
+MODELS = {
+    "cnn": [
+        (32, 3, 5, 5),
+        (32,),
+        (64, 32, 5, 5),
+        (64,),
+        (1600, 1000),
+        (1000,),
+        (1000, 10),
+        (10,),
+    ],
+    "mlp": [(2048, 4096), (4096,), (4096, 4096), (4096,), (4096, 10), (10,)],
+}
+
+
+def _aggregate_reference(results: List[Tuple[NDArrays, int]]) -> NDArrays:
+    """Weighted average as implemented before the flat buffer kernel."""
+    num_examples_total = sum(num_examples for _, num_examples in results)
+    weighted_weights = [
+        [layer * num_examples for layer in weights] for weights, num_examples in results
+    ]
+    return [
+        reduce(np.add, layer_updates) / num_examples_total
+        for layer_updates in zip(*weighted_weights)
+    ]
+
+
+def _results(
+    shapes: List[Tuple[int, ...]], num_clients: int
+) -> List[Tuple[NDArrays, int]]:
+    rng = np.random.default_rng(0)
+    return [
+        (
+            [rng.standard_normal(shape, dtype=np.float32) for shape in shapes],
+            int(rng.integers(1, 100)),
+        )
+        for _ in range(num_clients)
+    ]
+
+
+def main() -> None:
+    """Print the time per aggregation of both implementations."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, shapes in MODELS.items():
+        results = _results(shapes, args.clients)
+        np.testing.assert_allclose(
+            np.concatenate([x.ravel() for x in aggregate(results)]),
+            np.concatenate([x.ravel() for x in _aggregate_reference(results)]),
+            atol=1e-5,
+        )
+        reference = min(
+            timeit.repeat(
+                lambda: _aggregate_reference(results), number=1, repeat=args.repeat
+            )
+        )
+        kernel = min(
+            timeit.repeat(lambda: aggregate(results), number=1, repeat=args.repeat)
+        )
+        print(
+            f"{name:>4} ({args.clients} clients): reference {reference * 1e3:8.1f} ms"
+            f" | flat buffer {kernel * 1e3:8.1f} ms | speedup {reference / kernel:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark the Ray and process backends of the Virtual Client Engine.
+
+Usage: python -m flwr_tool.simulation_benchmark [--clients 100 1000 10000]
+       [--params P] [--rounds R] [--backends ray ray-threads process]
+
+By default, rounds of 100, 1,000 and 10,000 virtual clients are run on each
+backend, as created by `start_simulation`.
+
+The server runs each round of these backends from a single thread (see
+`flwr.server.client_proxy.BatchClientProxy`). "ray-threads" runs the rounds
+of the Ray backend with one thread per client instead.
+"""
+
+
+import argparse
+import concurrent.futures
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import ray
+
+from flwr.client import Client, NumPyClient
+from flwr.common import Config, FitIns, NDArrays, Scalar, ndarrays_to_parameters
+from flwr.common.parameter import TENSOR_TYPE_NUMPY_RAW
+from flwr.server.client_proxy import ClientProxy
+from flwr.server.server import FitResultsAndFailures, fit_client, fit_clients
+from flwr.simulation.backend import (
+    ProcessBackend,
+    RayBackend,
+    VirtualClientEngineBackend,
+)
+
+
+class _Client(NumPyClient):
+    def fit(
+        self, parameters: NDArrays, config: Config
+    ) -> Tuple[NDArrays, int, Dict[str, Scalar]]:
+        return [parameters[0][:1]], 1, {}
+
+
+def _client_fn(cid: str) -> Client:  # pylint: disable=unused-argument
+    return _Client().to_client()
+
+
+def _fit_round(instructions: List[Tuple[ClientProxy, FitIns]]) -> FitResultsAndFailures:
+    return fit_clients(instructions, max_workers=None, timeout=None)
+
+
+def _fit_round_threads(
+    instructions: List[Tuple[ClientProxy, FitIns]]
+) -> FitResultsAndFailures:
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        submitted_fs = [
+            executor.submit(fit_client, proxy, ins, None) for proxy, ins in instructions
+        ]
+        results = [
+            future.result() for future in concurrent.futures.as_completed(submitted_fs)
+        ]
+    return results, []
+
+
+BACKENDS: Dict[
+    str,
+    Tuple[
+        Callable[[], VirtualClientEngineBackend],
+        Callable[[List[Tuple[ClientProxy, FitIns]]], FitResultsAndFailures],
+    ],
+] = {
+    "ray": (RayBackend, _fit_round),
+    "ray-threads": (RayBackend, _fit_round_threads),
+    "process": (ProcessBackend, _fit_round),
+}
+
+
+def main() -> None:
+    """Print the startup time and the time per round of each backend."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--params", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    args = parser.parse_args()
+
+    for num_clients in args.clients:
+        cids = [str(cid) for cid in range(num_clients)]
+        for backend in args.backends:
+            start = time.perf_counter()
+            create_backend, fit_round = BACKENDS[backend]
+            vce_backend = create_backend()
+            vce_backend.start(_client_fn, {"num_cpus": 1, "num_gpus": 0.0}, {})
+            proxies = [vce_backend.client_proxy(cid) for cid in cids]
+            startup = time.perf_counter() - start
+            rounds = []
+            try:
+                for _ in range(args.rounds):
+                    parameters = ndarrays_to_parameters(
+                        [np.zeros(args.params, dtype=np.float32)],
+                        tensor_type=TENSOR_TYPE_NUMPY_RAW,
+                    )
+                    fit_ins = FitIns(parameters, {})
+                    start = time.perf_counter()
+                    results, failures = fit_round(
+                        [(proxy, fit_ins) for proxy in proxies]
+                    )
+                    rounds.append(time.perf_counter() - start)
+                    assert len(results) == num_clients, failures
+            finally:
+                vce_backend.shutdown()
+                ray.shutdown()
+            print(
+                f"{backend:>11} ({num_clients:>5} clients): startup {startup:6.2f} s"
+                f" | round {min(rounds):7.2f} s"
+                f" | {min(rounds) / num_clients * 1e3:6.2f} ms per client"
+            )
+
+
+if __name__ == "__main__":
+    main()
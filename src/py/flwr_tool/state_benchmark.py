@@ -0,0 +1,145 @@
+# Copyright 2023 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark the latency of PullTaskIns against the number of nodes.
+
+Usage: python -m flwr_tool.state_benchmark [--nodes 10 100 1000 10000] [--pulls P]
+       [--sqlite] [--threads T]
+"""
+
+
+import argparse
+import os
+import random
+import tempfile
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from flwr.common import now
+from flwr.proto.node_pb2 import Node
+from flwr.proto.task_pb2 import Task, TaskIns
+from flwr.proto.transport_pb2 import ServerMessage
+from flwr.server.state import InMemoryState, SqliteState
+
+
+def _task_ins(node_id: int, run_id: int) -> TaskIns:
+    return TaskIns(
+        task_id="",
+        group_id="",
+        run_id=run_id,
+        task=Task(
+            producer=Node(node_id=0, anonymous=True),
+            consumer=Node(node_id=node_id, anonymous=False),
+            legacy_server_message=ServerMessage(
+                reconnect_ins=ServerMessage.ReconnectIns()
+            ),
+        ),
+    )
+
+
+def _get_task_ins_reference(
+    state: InMemoryState, node_id: Optional[int], limit: Optional[int]
+) -> List[TaskIns]:
+    """Scan all TaskIns as implemented before the per-node index."""
+    task_ins_list: List[TaskIns] = []
+    for task_ins in state.task_ins_store.values():
+        if (
+            task_ins.task.consumer.anonymous is False
+            and task_ins.task.consumer.node_id == node_id
+            and task_ins.task.delivered_at == ""
+        ):
+            task_ins_list.append(task_ins)
+        if limit and len(task_ins_list) == limit:
+            break
+    delivered_at = now().isoformat()
+    for task_ins in task_ins_list:
+        task_ins.task.delivered_at = delivered_at
+    return task_ins_list
+
+
+def _state(num_nodes: int) -> InMemoryState:
+    """Create a state with one pending TaskIns per node."""
+    state = InMemoryState()
+    run_id = state.create_run()
+    for _ in range(num_nodes):
+        state.store_task_ins(_task_ins(state.create_node(), run_id))
+    return state
+
+
+def _pull(state: InMemoryState, pull_fn, num_pulls: int) -> float:  # type: ignore
+    """Return the mean time of one pull by `num_pulls` random nodes."""
+    node_ids = random.Random(0).sample(sorted(state.node_ids), num_pulls)
+    start = timeit.default_timer()
+    for node_id in node_ids:
+        if len(pull_fn(state, node_id, None)) != 1:
+            raise AssertionError("Expected exactly one TaskIns per node")
+    return (timeit.default_timer() - start) / len(node_ids)
+
+
+def _concurrent_pulls(num_nodes: int, num_threads: int, directory: str) -> float:
+    """Return the wall time per pull when all nodes pull a SqliteState file DB."""
+    state = SqliteState(os.path.join(directory, f"state_{num_nodes}.db"))
+    state.initialize()
+    run_id = state.create_run()
+    node_ids = [state.create_node() for _ in range(num_nodes)]
+    for node_id in node_ids:
+        state.store_task_ins(_task_ins(node_id, run_id))
+    start = timeit.default_timer()
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        pulled = sum(
+            len(task_ins_list)
+            for task_ins_list in executor.map(
+                lambda node_id: state.get_task_ins(node_id, None), node_ids
+            )
+        )
+    if pulled != num_nodes:
+        raise AssertionError("Expected exactly one TaskIns per node")
+    return (timeit.default_timer() - start) / num_nodes
+
+
+def main() -> None:
+    """Print the time per PullTaskIns of both implementations."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--pulls", type=int, default=100)
+    parser.add_argument("--sqlite", action="store_true")
+    parser.add_argument("--threads", type=int, default=64)
+    args = parser.parse_args()
+
+    for num_nodes in args.nodes:
+        num_pulls = min(num_nodes, args.pulls)
+        reference = _pull(_state(num_nodes), _get_task_ins_reference, num_pulls)
+        indexed = _pull(
+            _state(num_nodes),
+            lambda state, node_id, limit: state.get_task_ins(node_id, limit),
+            num_pulls,
+        )
+        print(
+            f"{num_nodes:>6} nodes: reference {reference * 1e6:10.1f} us/pull"
+            f" | indexed {indexed * 1e6:6.1f} us/pull"
+        )
+
+    if args.sqlite:
+        with tempfile.TemporaryDirectory() as directory:
+            for num_nodes in args.nodes:
+                sqlite = _concurrent_pulls(num_nodes, args.threads, directory)
+                print(
+                    f"{num_nodes:>6} nodes: SqliteState, {args.threads} threads"
+                    f" {sqlite * 1e6:8.1f} us/pull"
+                )
+
+
+if __name__ == "__main__":
+    main()